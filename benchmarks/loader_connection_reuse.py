@@ -0,0 +1,120 @@
+"""
+Compares a session-per-request loader with the pooled ``AiohttpWebLoader`` against a local aiohttp stub server.
+
+Run with ``python -m benchmarks.loader_connection_reuse [--pages N] [--concurrency N]`` from the project root.
+"""
+import argparse
+import asyncio
+import time
+from typing import NamedTuple, Awaitable, Callable
+
+import aiohttp
+from aiohttp import web
+
+from src.infrastructure.loaders.aiohttp_web_loader import AiohttpWebLoader, ConnectorSettings
+
+
+class BenchmarkResult(NamedTuple):
+    name: str
+    pages: int
+    connections: int
+    dns_lookups: int
+    seconds: float
+
+
+class _TraceCounters:
+    def __init__(self) -> None:
+        self.connections = 0
+        self.dns_lookups = 0
+
+    def create_trace_config(self) -> aiohttp.TraceConfig:
+        trace_config = aiohttp.TraceConfig()
+        trace_config.on_connection_create_end.append(self._on_connection_created)
+        trace_config.on_dns_resolvehost_end.append(self._on_dns_resolved)
+        return trace_config
+
+    async def _on_connection_created(self, *_: object) -> None:
+        self.connections += 1
+
+    async def _on_dns_resolved(self, *_: object) -> None:
+        self.dns_lookups += 1
+
+
+async def _programme_detail(request: web.Request) -> web.Response:
+    return web.Response(text=f"<html><body><main>{request.match_info['code']}</main></body></html>")
+
+
+async def _start_stub_server() -> tuple[web.AppRunner, int]:
+    application = web.Application()
+    application.router.add_get("/api/programme_detail/{code}", _programme_detail)
+    runner = web.AppRunner(application, access_log=None)
+    await runner.setup()
+    site = web.TCPSite(runner, "localhost", 0)
+    await site.start()
+    port: int = site._server.sockets[0].getsockname()[1]  # type: ignore[union-attr]
+    return runner, port
+
+
+async def _load_all(urls: list[str], load: Callable[[str], Awaitable[str]], concurrency: int) -> None:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def load_one(page_url: str) -> None:
+        async with semaphore:
+            await load(page_url)
+
+    await asyncio.gather(*(load_one(page_url) for page_url in urls))
+
+
+async def _benchmark_session_per_request(urls: list[str], concurrency: int) -> BenchmarkResult:
+    counters = _TraceCounters()
+
+    async def load(page_url: str) -> str:
+        async with aiohttp.ClientSession(trace_configs=[counters.create_trace_config()]) as session:
+            async with session.get(page_url) as response:
+                return await response.text()
+
+    started = time.perf_counter()
+    await _load_all(urls, load, concurrency)
+    return BenchmarkResult(
+        "session per request", len(urls), counters.connections, counters.dns_lookups, time.perf_counter() - started
+    )
+
+
+async def _benchmark_pooled_loader(urls: list[str], concurrency: int) -> BenchmarkResult:
+    counters = _TraceCounters()
+    started = time.perf_counter()
+    async with AiohttpWebLoader(
+            ConnectorSettings(limit_per_host=concurrency),
+            trace_configs=[counters.create_trace_config()]
+    ) as loader:
+        await _load_all(urls, loader.load, concurrency)
+    return BenchmarkResult(
+        "pooled session", len(urls), counters.connections, counters.dns_lookups, time.perf_counter() - started
+    )
+
+
+async def main(pages: int, concurrency: int) -> None:
+    runner, port = await _start_stub_server()
+    try:
+        urls = [f"http://localhost:{port}/api/programme_detail/{code}?lang=en" for code in range(pages)]
+        results = [
+            await _benchmark_session_per_request(urls, concurrency),
+            await _benchmark_pooled_loader(urls, concurrency),
+        ]
+    finally:
+        await runner.cleanup()
+
+    print(f"{'loader':<22}{'pages':>8}{'connections':>14}{'dns lookups':>14}{'seconds':>10}")
+    for result in results:
+        print(
+            f"{result.name:<22}{result.pages:>8}{result.connections:>14}{result.dns_lookups:>14}"
+            f"{result.seconds:>10.3f}"
+        )
+
+
+if __name__ == "__main__":
+    argument_parser = argparse.ArgumentParser()
+    argument_parser.add_argument("--pages", type=int, default=2000)
+    argument_parser.add_argument("--concurrency", type=int, default=10)
+    arguments = argument_parser.parse_args()
+    asyncio.run(main(arguments.pages, arguments.concurrency))
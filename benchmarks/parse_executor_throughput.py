@@ -0,0 +1,85 @@
+"""
+Measures parsing throughput of the inline, thread pool and process pool parse executors on the test HTML fixtures.
+
+Run with ``python -m benchmarks.parse_executor_throughput [--pages N] [--chunk-size N] [--max-workers N]`` from the
+project root. Process pool throughput is expected to scale with the number of CPU cores.
+"""
+import argparse
+import asyncio
+import os
+import time
+from pathlib import Path
+from typing import NamedTuple
+
+from src.application.interfaces import ParseExecutor
+from src.domain.entities.res_tuke_study_programme_data import ResTukeStudyProgrammeData
+from src.domain.enums import Language
+from src.interface_adapters.factories.language_parser_factory import ResTukeLanguageParserFactory
+from src.interface_adapters.services.parse_executor import InlineParseExecutor, PoolParseExecutor, ParseExecutorKind
+
+_FIXTURES = {
+    Language.SLOVAK: Path("tests/resources/res_tuke_test_page_sk.html"),
+    Language.ENGLISH: Path("tests/resources/res_tuke_test_page_en.html"),
+}
+
+
+class BenchmarkResult(NamedTuple):
+    executor: str
+    workers: int
+    pages: int
+    seconds: float
+
+    @property
+    def pages_per_second(self) -> float:
+        return self.pages / self.seconds
+
+
+def _load_pages(pages: int) -> list[tuple[Language, str]]:
+    fixtures = [(language, path.read_text(encoding="utf-8")) for language, path in _FIXTURES.items()]
+    return [fixtures[index % len(fixtures)] for index in range(pages)]
+
+
+async def _measure(
+        name: str,
+        workers: int,
+        parse_executor: ParseExecutor[ResTukeStudyProgrammeData],
+        pages: list[tuple[Language, str]]
+) -> BenchmarkResult:
+    await parse_executor.parse_multiple(pages[:parse_executor.batch_size])
+    started = time.perf_counter()
+    await parse_executor.parse_multiple(pages)
+    return BenchmarkResult(name, workers, len(pages), time.perf_counter() - started)
+
+
+def _worker_counts(max_workers: int) -> list[int]:
+    counts = [1]
+    while counts[-1] * 2 <= max_workers:
+        counts.append(counts[-1] * 2)
+    if counts[-1] != max_workers:
+        counts.append(max_workers)
+    return counts
+
+
+async def main(pages: int, chunk_size: int, max_workers: int) -> None:
+    page_contents = _load_pages(pages)
+    results = [await _measure("inline", 1, InlineParseExecutor(ResTukeLanguageParserFactory()), page_contents)]
+    for kind in (ParseExecutorKind.THREAD, ParseExecutorKind.PROCESS):
+        for workers in _worker_counts(max_workers):
+            with PoolParseExecutor(ResTukeLanguageParserFactory, kind, workers, chunk_size) as parse_executor:
+                results.append(await _measure(kind.value, workers, parse_executor, page_contents))
+
+    print(f"{'executor':<10}{'workers':>9}{'pages':>8}{'seconds':>10}{'pages/s':>10}")
+    for result in results:
+        print(
+            f"{result.executor:<10}{result.workers:>9}{result.pages:>8}{result.seconds:>10.3f}"
+            f"{result.pages_per_second:>10.0f}"
+        )
+
+
+if __name__ == "__main__":
+    argument_parser = argparse.ArgumentParser()
+    argument_parser.add_argument("--pages", type=int, default=4000)
+    argument_parser.add_argument("--chunk-size", type=int, default=16)
+    argument_parser.add_argument("--max-workers", type=int, default=os.cpu_count() or 1)
+    arguments = argument_parser.parse_args()
+    asyncio.run(main(arguments.pages, arguments.chunk_size, arguments.max_workers))
@@ -0,0 +1,51 @@
+"""
+Compares per-field XPath evaluation with the fast extraction mode of ``ResTukeStudyProgrammeHtmlParser``.
+
+Run with ``python -m benchmarks.parser_extraction [--pages N]`` from the project root.
+"""
+import argparse
+import time
+from pathlib import Path
+from typing import NamedTuple
+
+from src.domain.enums import Language
+from src.interface_adapters.parsers.res_tuke_study_programme_html_parser import ResTukeStudyProgrammeHtmlParser
+
+_FIXTURES = {
+    Language.SLOVAK: Path("tests/resources/res_tuke_test_page_sk.html"),
+    Language.ENGLISH: Path("tests/resources/res_tuke_test_page_en.html"),
+}
+
+
+class BenchmarkResult(NamedTuple):
+    extraction: str
+    pages: int
+    seconds: float
+
+    @property
+    def pages_per_second(self) -> float:
+        return self.pages / self.seconds
+
+
+def _measure(name: str, fast_extraction: bool, pages: int) -> BenchmarkResult:
+    parsers = {language: ResTukeStudyProgrammeHtmlParser(language, fast_extraction) for language in _FIXTURES}
+    contents = [(language, path.read_text(encoding="utf-8")) for language, path in _FIXTURES.items()]
+    started = time.perf_counter()
+    for index in range(pages):
+        language, content = contents[index % len(contents)]
+        parsers[language].parse_one(content)
+    return BenchmarkResult(name, pages, time.perf_counter() - started)
+
+
+def main(pages: int) -> None:
+    results = [_measure("xpath per field", False, pages), _measure("fast", True, pages)]
+    print(f"{'extraction':<18}{'pages':>8}{'seconds':>10}{'pages/s':>10}")
+    for result in results:
+        print(f"{result.extraction:<18}{result.pages:>8}{result.seconds:>10.3f}{result.pages_per_second:>10.0f}")
+
+
+if __name__ == "__main__":
+    argument_parser = argparse.ArgumentParser()
+    argument_parser.add_argument("--pages", type=int, default=5000)
+    arguments = argument_parser.parse_args()
+    main(arguments.pages)
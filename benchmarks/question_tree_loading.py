@@ -0,0 +1,86 @@
+"""
+Compares loading the pickled questions tree with mapping the same tree in the compiled binary format.
+
+Run with ``python -m benchmarks.question_tree_loading [--tree PATH] [--repeats N]`` from the project root. The pickled
+tree is unpickled and compiled as the API did before, and the compiled file is written to a temporary directory and
+memory-mapped. For both, the time to load the tree and answer the first question of a session and the memory
+allocated by loading are reported.
+"""
+import argparse
+import asyncio
+import pickle
+import statistics
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable, NamedTuple
+
+from loguru import logger
+
+from src.interface_adapters.persistence.compiled_question_tree_storage import CompiledQuestionTreeStorage
+from src.interface_adapters.services.question_tree.api import QuestionTreeAPI
+from src.interface_adapters.services.question_tree.compiled_question_tree import CompiledQuestionTree
+
+
+class BenchmarkResult(NamedTuple):
+    loader: str
+    file_bytes: int
+    load_seconds: float
+    first_answer_seconds: float
+    allocated_bytes: int
+
+
+def _load_pickle(path: Path) -> CompiledQuestionTree:
+    with path.open("rb") as file:
+        return CompiledQuestionTree.compile(pickle.load(file)[0])
+
+
+def _answer_first_question(tree: CompiledQuestionTree) -> None:
+    api = QuestionTreeAPI(tree)
+    session_id = api.create_session()
+    api.answer_question(session_id, next(iter(api.get_current_question(session_id).answers)))
+
+
+def _measure(name: str, path: Path, load: Callable[[Path], CompiledQuestionTree], repeats: int) -> BenchmarkResult:
+    load_times, first_answer_times = [], []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        tree = load(path)
+        loaded = time.perf_counter()
+        _answer_first_question(tree)
+        load_times.append(loaded - started)
+        first_answer_times.append(time.perf_counter() - loaded)
+    tracemalloc.start()
+    tree = load(path)
+    allocated_bytes = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return BenchmarkResult(
+        name, path.stat().st_size, statistics.median(load_times), statistics.median(first_answer_times), allocated_bytes
+    )
+
+
+def main(tree_path: Path, repeats: int) -> None:
+    logger.remove()
+    with tempfile.TemporaryDirectory() as directory:
+        compiled_path = Path(directory) / "questions-tree.bin"
+        asyncio.run(CompiledQuestionTreeStorage(compiled_path).save(_load_pickle(tree_path)))
+        results = [
+            _measure("pickle", tree_path, _load_pickle, repeats),
+            _measure("mmap", compiled_path, lambda path: CompiledQuestionTreeStorage(path).load(), repeats),
+        ]
+
+    print(f"{'loader':<8}{'file KiB':>10}{'load ms':>10}{'1st answer ms':>15}{'allocated KiB':>15}")
+    for result in results:
+        print(
+            f"{result.loader:<8}{result.file_bytes / 1024:>10.0f}{result.load_seconds * 1000:>10.2f}"
+            f"{result.first_answer_seconds * 1000:>15.2f}{result.allocated_bytes / 1024:>15.0f}"
+        )
+
+
+if __name__ == "__main__":
+    argument_parser = argparse.ArgumentParser()
+    argument_parser.add_argument("--tree", type=Path, default=Path("data/questions-tree.pkl"))
+    argument_parser.add_argument("--repeats", type=int, default=20)
+    arguments = argument_parser.parse_args()
+    main(arguments.tree, arguments.repeats)
@@ -0,0 +1,126 @@
+"""
+Compares ORM ``add_all`` inserts with the bulk upsert path of ``SQLAlchemyStudyProgrammeRepository``.
+
+Run with ``python -m benchmarks.repository_bulk_upsert [--rows N ...] [--batch-size N] [--database-url URL]`` from the
+project root. Without ``--database-url`` a temporary SQLite database is used as a stand-in for PostgreSQL, which needs
+the ``aiosqlite`` driver. The tables of the given database are dropped and recreated for every measurement.
+"""
+import argparse
+import asyncio
+import tempfile
+import time
+from pathlib import Path
+from typing import NamedTuple, Optional
+
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncEngine, AsyncSession
+
+from src.domain.entities.res_tuke_study_programme_data import ResTukeStudyProgrammeData
+from src.domain.enums import Language, StudyForm, Degree
+from src.infrastructure.orm.mappers.sqlalchemy_study_programme_mapper import SQLAlchemyStudyProgrammeMapper
+from src.infrastructure.orm.models import Base
+from src.infrastructure.persistence.sqlalchemy_study_programme_repository import SQLAlchemyStudyProgrammeRepository
+from src.interface_adapters.gateways.study_programmes_gateway_base import Page, PageMetadata
+
+
+class BenchmarkResult(NamedTuple):
+    name: str
+    rows: int
+    seconds: float
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.seconds
+
+
+def _create_pages(rows: int) -> list[Page[ResTukeStudyProgrammeData]]:
+    return [
+        Page(
+            data=ResTukeStudyProgrammeData(
+                name=f"Programme {index}",
+                study_field="Computer Science",
+                level_of_degree=1,
+                study_form=StudyForm.PRESENT,
+                degree=Degree.BACHELOR,
+                length_of_study_in_years=3,
+                professionally_oriented=False,
+                joint_study_program=False,
+                languages_of_delivery=language,
+                description=f"Description of programme {index}" * 20,
+                learning_objectives=f"Learning objectives of programme {index}" * 20,
+                main_learning_outcomes=f"Main learning outcomes of programme {index}" * 20,
+                faculty="Faculty"
+            ),
+            metadata=PageMetadata(language, f"SP{index:06d}", f"https://example.com/{index}?lang={language.value}")
+        )
+        for index in range(rows // len(Language) + 1)
+        for language in Language
+    ][:rows]
+
+
+async def _recreate_tables(engine: AsyncEngine) -> None:
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.drop_all)
+        await connection.run_sync(Base.metadata.create_all)
+
+
+async def _insert_with_add_all(
+        session_maker: async_sessionmaker[AsyncSession],
+        pages: list[Page[ResTukeStudyProgrammeData]]
+) -> None:
+    mapper = SQLAlchemyStudyProgrammeMapper()
+    models = [await mapper.from_entity(page) for page in pages]
+    async with session_maker() as session:
+        session.add_all(models)
+        await session.commit()
+
+
+async def _measure_add_all(engine: AsyncEngine, pages: list[Page[ResTukeStudyProgrammeData]]) -> BenchmarkResult:
+    await _recreate_tables(engine)
+    started = time.perf_counter()
+    await _insert_with_add_all(async_sessionmaker(engine), pages)
+    return BenchmarkResult("orm add_all", len(pages), time.perf_counter() - started)
+
+
+async def _measure_bulk_upsert(
+        engine: AsyncEngine,
+        pages: list[Page[ResTukeStudyProgrammeData]],
+        batch_size: int,
+        name: str,
+        existing: bool
+) -> BenchmarkResult:
+    repository = SQLAlchemyStudyProgrammeRepository(
+        async_sessionmaker(engine), SQLAlchemyStudyProgrammeMapper(), batch_size
+    )
+    if not existing:
+        await _recreate_tables(engine)
+    started = time.perf_counter()
+    await repository.save_multiple(pages)
+    return BenchmarkResult(name, len(pages), time.perf_counter() - started)
+
+
+async def main(row_counts: list[int], batch_size: int, database_url: Optional[str]) -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        url = database_url or f"sqlite+aiosqlite:///{Path(directory) / 'benchmark.sqlite'}"
+        engine = create_async_engine(url)
+        results = []
+        try:
+            for rows in row_counts:
+                pages = _create_pages(rows)
+                results.append(await _measure_add_all(engine, pages))
+                results.append(await _measure_bulk_upsert(engine, pages, batch_size, "bulk insert", existing=False))
+                results.append(await _measure_bulk_upsert(engine, pages, batch_size, "bulk update", existing=True))
+        finally:
+            await engine.dispose()
+
+    print(f"{'write path':<14}{'rows':>9}{'seconds':>10}{'rows/s':>10}")
+    for result in results:
+        print(f"{result.name:<14}{result.rows:>9}{result.seconds:>10.3f}{result.rows_per_second:>10.0f}")
+
+
+if __name__ == "__main__":
+    argument_parser = argparse.ArgumentParser()
+    argument_parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 100_000])
+    argument_parser.add_argument("--batch-size", type=int, default=1000)
+    argument_parser.add_argument("--database-url", type=str, default=None)
+    arguments = argument_parser.parse_args()
+    asyncio.run(main(arguments.rows, arguments.batch_size, arguments.database_url))
@@ -1,7 +1,12 @@
 from abc import ABC, abstractmethod
-from typing import Protocol, Iterable
+from contextlib import AbstractAsyncContextManager
+from typing import Protocol, Iterable, Optional, Mapping, AsyncIterator, Sequence
 
+from src.domain.dtos.conditional_page import ConditionalPage, PageValidators
 from src.domain.dtos.decision_tree_question import DecisionTreeQuestion
+from src.domain.dtos.incremental_fetch_result import IncrementalFetchResult
+from src.domain.dtos.question_tree_statistics import QuestionTreeStatistics
+from src.domain.dtos.study_programme_page_key import StudyProgrammePageKey
 from src.domain.entities.question_tree import QuestionTree
 from src.domain.enums import Language
 
@@ -50,6 +55,45 @@ class WebPageLoader(Protocol):
         """
 
 
+class ConditionalWebPageLoader(WebPageLoader, Protocol):
+    async def load_conditional(self, url: str, validators: PageValidators) -> ConditionalPage:
+        """
+        Fetches the content of a web page unless it has not changed since the validators were issued.
+
+        :param url: URL of the web page.
+        :param validators: ETag and Last-Modified values of the cached copy.
+        :return: Content of the web page with its new validators, or a not-modified marker.
+        """
+
+
+class KeyValueCache(Protocol):
+    def get(self, key: str) -> Optional[bytes]:
+        """
+        Fetches a cached value.
+
+        :param key: Key of the value.
+        :return: Cached value, or None if it is missing or expired.
+        """
+
+    def put(self, key: str, value: bytes) -> None:
+        """
+        Stores a value, evicting old entries when the cache is over its limits.
+
+        :param key: Key of the value.
+        :param value: Value to store.
+        """
+
+
+class ConcurrencyController(Protocol):
+    def limit(self, url: str) -> AbstractAsyncContextManager[None]:
+        """
+        Waits for a free concurrency slot for the URL and holds it while the context is active.
+
+        :param url: URL of the request.
+        :return: Context manager holding the slot.
+        """
+
+
 class Parser[RawData, ParsedData](Protocol):
     def parse_one(self, data: RawData) -> ParsedData:
         """
@@ -69,6 +113,24 @@ class Parser[RawData, ParsedData](Protocol):
         return [self.parse_one(page) for page in data]
 
 
+class ParseExecutor[ParsedData](Protocol):
+    @property
+    def batch_size(self) -> int:
+        """
+        Number of pages worth submitting at once to keep every parsing worker busy.
+
+        :return: Number of pages.
+        """
+
+    async def parse_multiple(self, pages: list[tuple[Language, str]]) -> list[ParsedData]:
+        """
+        Parses pages without blocking the event loop for longer than the executor requires.
+
+        :param pages: Language and content of every page.
+        :return: Parsed data in the order of the pages.
+        """
+
+
 class StudyProgrammesRepositoryByCodes[StudyProgramme](Protocol):
     async def get_by_codes(self, programmes_codes: list[str]) -> list[StudyProgramme]:
         """
@@ -79,6 +141,63 @@ class StudyProgrammesRepositoryByCodes[StudyProgramme](Protocol):
         """
 
 
+class StudyProgrammesStreamByCodes[StudyProgramme](Protocol):
+    def stream_by_codes(self, programmes_codes: list[str]) -> AsyncIterator[StudyProgramme]:
+        """
+        Streams study programmes by their codes as soon as their pages are loaded and parsed.
+
+        :param programmes_codes: List of study programmes codes.
+        :return: Asynchronous iterator of study programmes in completion order.
+        """
+
+
+class IncrementalStudyProgrammesSource[StudyProgramme](Protocol):
+    async def get_changed_by_codes(
+            self,
+            programmes_codes: list[str],
+            known_content_hashes: Mapping[StudyProgrammePageKey, str]
+    ) -> IncrementalFetchResult[StudyProgramme]:
+        """
+        Fetches study programmes by their codes, parsing only pages whose content hash differs from the known one.
+
+        :param programmes_codes: List of study programmes codes.
+        :param known_content_hashes: Content hashes of already stored study programme pages.
+        :return: Changed study programmes and keys of unchanged pages.
+        """
+
+
+class IncrementalStudyProgrammesStorage[StudyProgramme](Protocol):
+    async def get_content_hashes(self) -> dict[StudyProgrammePageKey, str]:
+        """
+        Fetches content hashes of stored study programme pages, which are not marked as removed.
+
+        :return: Content hash per study programme page.
+        """
+
+    async def upsert_multiple(self, study_programmes: list[StudyProgramme]) -> None:
+        """
+        Inserts study programmes or replaces their stored versions.
+
+        :param study_programmes: List of study programmes.
+        """
+
+    async def mark_removed(self, keys: list[StudyProgrammePageKey]) -> None:
+        """
+        Marks stored study programme pages as removed from the catalogue.
+
+        :param keys: Keys of the study programme pages.
+        """
+
+
+class FailedCodesSource(Protocol):
+    def get_failed_codes(self) -> list[str]:
+        """
+        Returns codes of study programmes which could not be fetched during the last run.
+
+        :return: List of study programmes codes.
+        """
+
+
 class GetAllRepository[Object](Protocol):
     async def get_all(self) -> list[Object]:
         """
@@ -119,11 +238,61 @@ class QuestionTreeGraphGenerator[StudyProgrammeData](ABC):
         """
 
 
+class MultiSubsetQuestionGenerator[StudyProgramme](Protocol):
+    async def generate_questions(
+            self,
+            subsets: list[list[StudyProgramme]],
+            rejected_questions: Sequence[Sequence[DecisionTreeQuestion]] = ()
+    ) -> list[DecisionTreeQuestion]:
+        """
+        Generates one question for every subset of study programmes.
+
+        :param subsets: Subsets of study programmes to split.
+        :param rejected_questions: Previously rejected questions of every subset, if any, a different split is wanted.
+        :return: Questions in the order of the subsets.
+        """
+
+
+class QuestionTreeCheckpointJournal(Protocol):
+    def get(self, subset_key: str) -> Optional[DecisionTreeQuestion]:
+        """
+        Fetches the question recorded for a subset of study programmes.
+
+        :param subset_key: Hash of the subset of study programmes.
+        :return: Recorded question, or None if the subset has not been split yet.
+        """
+
+    def record(self, subset_key: str, question: DecisionTreeQuestion) -> None:
+        """
+        Durably records the question splitting a subset of study programmes.
+
+        :param subset_key: Hash of the subset of study programmes.
+        :param question: Question splitting the subset.
+        """
+
+
+class QuestionTreeStatisticsCalculator[StudyProgrammeData](ABC):
+    @abstractmethod
+    def calculate(self, question_tree: QuestionTree[StudyProgrammeData]) -> QuestionTreeStatistics:
+        """
+        Calculates the shape statistics of a questions tree.
+
+        :param question_tree: Questions tree.
+        :return: Depth histogram, expected path length and balance of the tree.
+        """
+
+
 class LLMDecisionTreeQuestionGenerator[StudyProgramme](Protocol):
-    async def generate_question(self, study_programmes: list[StudyProgramme]) -> DecisionTreeQuestion:
+    async def generate_question(
+            self,
+            study_programmes: list[StudyProgramme],
+            rejected_questions: Sequence[DecisionTreeQuestion] = ()
+    ) -> DecisionTreeQuestion:
         """
         Generate a JSON response containing the question
 
         :param study_programmes: List of study programmes.
+        :param rejected_questions: Previously generated questions rejected for the study programmes, the new question
+            has to split them differently.
         :return: JSON response containing the question.
         """
@@ -0,0 +1,76 @@
+import asyncio
+from typing import AsyncGenerator, AsyncIterator, Awaitable, Callable, Iterable, NamedTuple
+
+
+class _Value[Result](NamedTuple):
+    value: Result
+
+
+class _Failure(NamedTuple):
+    error: Exception
+
+
+async def map_unordered[Item, Result](
+        items: Iterable[Item],
+        function: Callable[[Item], Awaitable[Result]],
+        workers: int,
+        queue_size: int
+) -> AsyncGenerator[Result, None]:
+    """
+    Applies an asynchronous function to items concurrently and yields the results in completion order.
+
+    Items are pulled lazily by a fixed number of workers, which block once the bounded result queue is full, so at
+    most ``workers + queue_size`` results are held in memory however many items there are. When the consumer stops
+    iterating, the remaining work is cancelled.
+
+    :param items: Items to process, consumed lazily.
+    :param function: Asynchronous function applied to every item.
+    :param workers: Number of items processed concurrently.
+    :param queue_size: Number of finished results waiting for the consumer.
+    :return: Asynchronous iterator of results.
+    :raises Exception: The first exception raised by the function, after which the remaining work is cancelled.
+    """
+    iterator = iter(items)
+    queue: asyncio.Queue[_Value[Result] | _Failure | None] = asyncio.Queue(maxsize=queue_size)
+
+    async def work() -> None:
+        try:
+            for item in iterator:
+                await queue.put(_Value(await function(item)))
+        except Exception as e:
+            await queue.put(_Failure(e))
+        await queue.put(None)
+
+    tasks = [asyncio.create_task(work()) for _ in range(workers)]
+    try:
+        finished_workers = 0
+        while finished_workers < len(tasks):
+            outcome = await queue.get()
+            if outcome is None:
+                finished_workers += 1
+            elif isinstance(outcome, _Failure):
+                raise outcome.error
+            else:
+                yield outcome.value
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+async def batched[Item](stream: AsyncIterator[Item], size: int) -> AsyncGenerator[list[Item], None]:
+    """
+    Groups items of an asynchronous stream into lists of the given size; the last list may be shorter.
+
+    :param stream: Source stream.
+    :param size: Maximum number of items in one batch.
+    :return: Asynchronous iterator of batches.
+    """
+    batch: list[Item] = []
+    async for item in stream:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
@@ -1,4 +1,8 @@
-from src.application.interfaces import Fetchable
+from typing import Optional
+
+from loguru import logger
+
+from src.application.interfaces import Fetchable, FailedCodesSource
 from src.application.interfaces import Savable, StudyProgrammesRepositoryByCodes
 
 
@@ -7,16 +11,29 @@ class FetchAndSaveStudyProgrammesUseCase[StudyProgrammeData]:
             self,
             codes_source: Fetchable[str],
             study_programmes_repository: StudyProgrammesRepositoryByCodes[StudyProgrammeData],
-            storage: Savable[StudyProgrammeData]
+            storage: Savable[StudyProgrammeData],
+            failed_codes_source: Optional[FailedCodesSource] = None
     ):
         self._codes_source = codes_source
         self._study_programmes_repository = study_programmes_repository
         self._storage = storage
+        self._failed_codes_source = failed_codes_source
 
-    async def __call__(self) -> None:
+    async def __call__(self) -> list[str]:
         """
         Fetches and saves the list of study programmes.
+
+        :return: Codes of study programmes which could not be fetched.
         """
         study_programme_codes = await self._codes_source.fetch_all()
         study_programmes = await self._study_programmes_repository.get_by_codes(study_programme_codes)
         await self._storage.save_multiple(study_programmes)
+        return self._report_failed_codes()
+
+    def _report_failed_codes(self) -> list[str]:
+        if self._failed_codes_source is None:
+            return []
+        failed_codes = self._failed_codes_source.get_failed_codes()
+        if failed_codes:
+            logger.warning(f"{len(failed_codes)} study programmes could not be fetched: {', '.join(failed_codes)}")
+        return failed_codes
@@ -0,0 +1,22 @@
+from src.application.interfaces import GetAllRepository, QuestionTreeStatisticsCalculator
+from src.domain.dtos.question_tree_statistics import QuestionTreeStatistics
+from src.domain.entities.question_tree import QuestionTree
+
+
+class LoadQuestionTreesAndCalculateStatisticsUseCase[StudyProgrammeData]:
+    def __init__(
+            self,
+            questions_tree_storage: GetAllRepository[QuestionTree[StudyProgrammeData]],
+            statistics_calculator: QuestionTreeStatisticsCalculator[StudyProgrammeData]
+    ) -> None:
+        self._questions_tree_repository = questions_tree_storage
+        self._statistics_calculator = statistics_calculator
+
+    async def __call__(self) -> list[QuestionTreeStatistics]:
+        """
+        Loads question trees and calculates their shape statistics.
+
+        :return: Statistics of every loaded questions tree.
+        """
+        question_trees = await self._questions_tree_repository.get_all()
+        return [self._statistics_calculator.calculate(question_tree) for question_tree in question_trees]
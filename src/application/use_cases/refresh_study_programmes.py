@@ -0,0 +1,55 @@
+from typing import Optional
+
+from loguru import logger
+
+from src.application.interfaces import (
+    Fetchable,
+    FailedCodesSource,
+    IncrementalStudyProgrammesSource,
+    IncrementalStudyProgrammesStorage,
+)
+from src.domain.dtos.refresh_summary import RefreshSummary
+
+
+class RefreshStudyProgrammesUseCase[StudyProgrammeData]:
+    def __init__(
+            self,
+            codes_source: Fetchable[str],
+            study_programmes_source: IncrementalStudyProgrammesSource[StudyProgrammeData],
+            storage: IncrementalStudyProgrammesStorage[StudyProgrammeData],
+            failed_codes_source: Optional[FailedCodesSource] = None
+    ) -> None:
+        self._codes_source = codes_source
+        self._study_programmes_source = study_programmes_source
+        self._storage = storage
+        self._failed_codes_source = failed_codes_source
+
+    async def __call__(self) -> RefreshSummary:
+        """
+        Fetches study programmes and stores only those whose pages changed since the last run.
+
+        Pages with unchanged content are neither parsed nor written, changed pages replace their stored versions
+        and pages of codes which are no longer in the catalogue are marked as removed.
+
+        :return: Summary of the refresh.
+        """
+        study_programme_codes = await self._codes_source.fetch_all()
+        known_content_hashes = await self._storage.get_content_hashes()
+        fetch_result = await self._study_programmes_source.get_changed_by_codes(
+            study_programme_codes, known_content_hashes
+        )
+        await self._storage.upsert_multiple(list(fetch_result.changed.values()))
+
+        current_codes = set(study_programme_codes)
+        removed_keys = [key for key in known_content_hashes if key.code not in current_codes]
+        await self._storage.mark_removed(removed_keys)
+
+        summary = RefreshSummary(
+            added=[key for key in fetch_result.changed if key not in known_content_hashes],
+            changed=[key for key in fetch_result.changed if key in known_content_hashes],
+            unchanged=fetch_result.unchanged,
+            removed=removed_keys,
+            failed_codes=self._failed_codes_source.get_failed_codes() if self._failed_codes_source else [],
+        )
+        logger.info(f"Study programmes refresh finished: {summary}")
+        return summary
@@ -0,0 +1,46 @@
+from typing import Optional
+
+from loguru import logger
+
+from src.application.interfaces import Fetchable, FailedCodesSource, Savable, StudyProgrammesStreamByCodes
+from src.application.streams import batched
+
+
+class StreamAndSaveStudyProgrammesUseCase[StudyProgrammeData]:
+    def __init__(
+            self,
+            codes_source: Fetchable[str],
+            study_programmes_stream: StudyProgrammesStreamByCodes[StudyProgrammeData],
+            storage: Savable[StudyProgrammeData],
+            batch_size: int = 50,
+            failed_codes_source: Optional[FailedCodesSource] = None
+    ):
+        self._codes_source = codes_source
+        self._study_programmes_stream = study_programmes_stream
+        self._storage = storage
+        self._batch_size = batch_size
+        self._failed_codes_source = failed_codes_source
+
+    async def __call__(self) -> list[str]:
+        """
+        Fetches study programmes and saves them in batches while the remaining pages are still being fetched.
+
+        :return: Codes of study programmes which could not be fetched.
+        """
+        study_programme_codes = await self._codes_source.fetch_all()
+        saved = 0
+        study_programmes = self._study_programmes_stream.stream_by_codes(study_programme_codes)
+        async for batch in batched(study_programmes, self._batch_size):
+            await self._storage.save_multiple(batch)
+            saved += len(batch)
+            logger.debug(f"Saved {saved} study programmes")
+        logger.info(f"Saved {saved} study programmes")
+        return self._report_failed_codes()
+
+    def _report_failed_codes(self) -> list[str]:
+        if self._failed_codes_source is None:
+            return []
+        failed_codes = self._failed_codes_source.get_failed_codes()
+        if failed_codes:
+            logger.warning(f"{len(failed_codes)} study programmes could not be fetched: {', '.join(failed_codes)}")
+        return failed_codes
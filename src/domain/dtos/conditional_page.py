@@ -0,0 +1,12 @@
+from typing import NamedTuple, Optional
+
+
+class PageValidators(NamedTuple):
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+
+
+class ConditionalPage(NamedTuple):
+    not_modified: bool
+    content: Optional[str] = None
+    validators: PageValidators = PageValidators()
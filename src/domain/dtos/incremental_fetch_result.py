@@ -0,0 +1,8 @@
+from typing import NamedTuple
+
+from src.domain.dtos.study_programme_page_key import StudyProgrammePageKey
+
+
+class IncrementalFetchResult[StudyProgramme](NamedTuple):
+    changed: dict[StudyProgrammePageKey, StudyProgramme]
+    unchanged: list[StudyProgrammePageKey]
@@ -0,0 +1,23 @@
+from typing import NamedTuple
+
+
+class QuestionTreeStatistics(NamedTuple):
+    leaves: int
+    questions: int
+    depth_histogram: dict[int, int]
+    max_depth: int
+    expected_path_length: float
+    leaf_balance: float
+
+    def __str__(self) -> str:
+        histogram = "\n".join(
+            f"  {depth:>3} questions: {count}" for depth, count in sorted(self.depth_histogram.items())
+        )
+        return (
+            f"Programmes: {self.leaves}\n"
+            f"Questions: {self.questions}\n"
+            f"Maximum depth: {self.max_depth}\n"
+            f"Expected path length: {self.expected_path_length:.2f}\n"
+            f"Leaf balance: {self.leaf_balance:.2f}\n"
+            f"Depth histogram:\n{histogram}"
+        )
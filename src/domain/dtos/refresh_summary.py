@@ -0,0 +1,17 @@
+from typing import NamedTuple
+
+from src.domain.dtos.study_programme_page_key import StudyProgrammePageKey
+
+
+class RefreshSummary(NamedTuple):
+    added: list[StudyProgrammePageKey]
+    changed: list[StudyProgrammePageKey]
+    unchanged: list[StudyProgrammePageKey]
+    removed: list[StudyProgrammePageKey]
+    failed_codes: list[str]
+
+    def __str__(self) -> str:
+        return (
+            f"added: {len(self.added)}, changed: {len(self.changed)}, unchanged: {len(self.unchanged)}, "
+            f"removed: {len(self.removed)}, failed: {len(self.failed_codes)}"
+        )
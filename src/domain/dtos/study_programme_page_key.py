@@ -0,0 +1,8 @@
+from typing import NamedTuple
+
+from src.domain.enums import Language
+
+
+class StudyProgrammePageKey(NamedTuple):
+    code: str
+    language: Language
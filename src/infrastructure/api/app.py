@@ -1,12 +1,45 @@
 import asyncio
+import time
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from loguru import logger
 import uvicorn
 
+from src.infrastructure.api.dependencies.question_tree_api_provider import QuestionTreeAPIProvider
+from src.infrastructure.api.routers.admin_api import router as admin_router
+from src.infrastructure.api.routers.health_api import router as health_router
 from src.infrastructure.api.routers.question_tree_api import router as qt_router
-
-app = FastAPI()
+from src.infrastructure.config.question_tree_api_config import QuestionTreeAPIConfig
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    started = time.perf_counter()
+    config = QuestionTreeAPIConfig()
+    provider = QuestionTreeAPIProvider(config.question_tree_path, config.session_limits, config.allow_pickle)
+    app.state.question_tree_api_provider = provider
+    app.state.admin_token = config.admin_token
+    await provider.warm_up()
+    background_tasks: list[asyncio.Task[None]] = []
+    if config.reload_interval:
+        background_tasks.append(asyncio.create_task(provider.watch(config.reload_interval)))
+    if config.session_sweep_interval and config.session_limits.idle_ttl is not None:
+        background_tasks.append(asyncio.create_task(provider.sweep_sessions(config.session_sweep_interval)))
+    logger.info(f"API ready in {(time.perf_counter() - started) * 1000:.1f} ms")
+    try:
+        yield
+    finally:
+        for background_task in background_tasks:
+            background_task.cancel()
+        await asyncio.gather(*background_tasks, return_exceptions=True)
+        app.state.question_tree_api_provider = None
+        app.state.admin_token = None
+
+
+app = FastAPI(lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -16,6 +49,8 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+app.include_router(health_router)
+app.include_router(admin_router, prefix="/admin")
 app.include_router(qt_router, prefix="/api/tree")
 
 
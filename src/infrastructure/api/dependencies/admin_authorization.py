@@ -0,0 +1,12 @@
+import secrets
+from typing import Optional
+
+from fastapi import Header, HTTPException, Request
+
+
+async def verify_admin_token(request: Request, x_admin_token: Optional[str] = Header(default=None)) -> None:
+    admin_token = getattr(request.app.state, "admin_token", None)
+    if not isinstance(admin_token, str):
+        raise HTTPException(status_code=403, detail="Admin API is disabled, set admin_token to enable it")
+    if x_admin_token is None or not secrets.compare_digest(x_admin_token.encode(), admin_token.encode()):
+        raise HTTPException(status_code=401, detail="Invalid admin token")
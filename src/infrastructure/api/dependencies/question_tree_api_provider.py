@@ -0,0 +1,196 @@
+import asyncio
+import time
+from pathlib import Path
+from typing import NamedTuple, Optional
+
+from loguru import logger
+
+from src.domain.entities.question_tree import QuestionTree
+from src.domain.entities.res_tuke_study_programme_data import ResTukeStudyProgrammeData
+from src.infrastructure.api.exceptions import QuestionTreeNotReadyError, QuestionTreeReloadError
+from src.interface_adapters.exceptions import InvalidQuestionTreeFileError
+from src.interface_adapters.gateways.study_programmes_gateway_base import Page
+from src.interface_adapters.persistence.compiled_question_tree_storage import CompiledQuestionTreeStorage
+from src.interface_adapters.persistence.serializer_storage import SerializerStorage
+from src.interface_adapters.services.question_tree.api import QuestionTreeAPI
+from src.interface_adapters.services.question_tree.compiled_question_tree import CompiledQuestionTree
+from src.interface_adapters.services.question_tree.session_manager import SessionLimits
+
+
+class WarmUpTimings(NamedTuple):
+    load_seconds: float
+    compile_seconds: float
+    validate_seconds: float
+
+    @property
+    def total_seconds(self) -> float:
+        return self.load_seconds + self.compile_seconds + self.validate_seconds
+
+
+class QuestionTreeReload(NamedTuple):
+    version: int
+    timings: WarmUpTimings
+    swap_seconds: float
+    nbytes: int
+
+
+class QuestionTreeAPIProvider:
+    """
+    Holds the question tree API of the server, created once by warming up the question tree at startup.
+
+    The warm-up maps the compiled tree, or loads and compiles a pickled one when explicitly allowed, and validates it
+    in a worker thread, so requests are only served from a tree that is fully prepared and never pay its loading cost.
+    A reload prepares the current file the same way while requests are served and then swaps it in as a new tree
+    version for new sessions.
+    """
+
+    def __init__(
+            self,
+            question_tree_path: Path,
+            session_limits: SessionLimits = SessionLimits(),
+            allow_pickle: bool = False
+    ) -> None:
+        """
+        :param question_tree_path: Compiled question tree, or a pickled one when allowed, told apart by the file
+            header.
+        :param session_limits: Idle TTL and maximum number of sessions of the API.
+        :param allow_pickle: Also load question trees pickled by earlier versions. Unpickling runs code from the file,
+            so only allow it for trusted files.
+        """
+        self._question_tree_path = question_tree_path
+        self._session_limits = session_limits
+        self._allow_pickle = allow_pickle
+        self._api: Optional[QuestionTreeAPI] = None
+        self._reload_lock = asyncio.Lock()
+        self._loaded_modification_time: Optional[int] = None
+
+    @property
+    def is_ready(self) -> bool:
+        return self._api is not None
+
+    @property
+    def api(self) -> QuestionTreeAPI:
+        """
+        :raises QuestionTreeNotReadyError: If the question tree is not warmed up yet.
+        """
+        if self._api is None:
+            raise QuestionTreeNotReadyError
+        return self._api
+
+    async def warm_up(self) -> WarmUpTimings:
+        """
+        Loads, compiles and validates the question tree and creates the API serving it.
+
+        :return: Durations of the warm-up steps.
+        :raises InvalidQuestionTreeFileError: If a compiled question tree file is corrupted, or the file is not a
+            compiled question tree and pickles are not allowed.
+        :raises InvalidQuestionTreeError: If the question tree is inconsistent.
+        """
+        question_tree, timings = await asyncio.to_thread(self._prepare_question_tree)
+        self._api = QuestionTreeAPI(question_tree, self._session_limits)
+        logger.info(
+            f"Warmed up the question tree from {self._question_tree_path} in {self._format_timings(timings)}: "
+            f"{len(question_tree)} nodes, {question_tree.programme_count} programmes, "
+            f"{question_tree.nbytes / 2 ** 20:.2f} MiB"
+        )
+        return timings
+
+    async def reload(self) -> QuestionTreeReload:
+        """
+        Prepares the question tree in the file as a new version and swaps it in for new sessions, while sessions
+        started on older versions finish on them.
+
+        :return: Number, preparation timings, swap duration and approximate size of the new version.
+        :raises QuestionTreeNotReadyError: If the question tree is not warmed up yet.
+        :raises QuestionTreeReloadError: If the new question tree cannot be loaded, leaving the current one in service.
+        """
+        api = self.api
+        async with self._reload_lock:
+            try:
+                question_tree, timings = await asyncio.to_thread(self._prepare_question_tree)
+            except Exception as e:
+                raise QuestionTreeReloadError(f"Cannot reload the question tree from {self._question_tree_path}: {e}") \
+                    from e
+            started = time.perf_counter()
+            version = api.swap_tree(question_tree)
+            swap_seconds = time.perf_counter() - started
+        reload = QuestionTreeReload(version, timings, swap_seconds, question_tree.nbytes)
+        logger.info(
+            f"Swapped in question tree version {version} from {self._question_tree_path}, prepared in "
+            f"{self._format_timings(timings)}, swapped in {swap_seconds * 1e6:.0f} µs: "
+            f"{reload.nbytes / 2 ** 20:.2f} MiB"
+        )
+        for statistics in api.tree_versions:
+            logger.info(
+                f"Question tree version {statistics.version}: {statistics.sessions} sessions, "
+                f"{statistics.nbytes / 2 ** 20:.2f} MiB{' (current)' if statistics.is_current else ''}"
+            )
+        return reload
+
+    async def watch(self, interval: float) -> None:
+        """
+        Reloads the question tree whenever the modification time of its file changes, until cancelled.
+
+        :param interval: Seconds between checks of the file.
+        """
+        while True:
+            await asyncio.sleep(interval)
+            if self._modification_time() in (None, self._loaded_modification_time):
+                continue
+            try:
+                await self.reload()
+            except QuestionTreeReloadError as e:
+                logger.error(f"{e}, keeping the current question tree")
+
+    async def sweep_sessions(self, interval: float) -> None:
+        """
+        Removes the expired sessions of the API periodically, until cancelled.
+
+        :param interval: Seconds between removals.
+        """
+        while True:
+            await asyncio.sleep(interval)
+            api = self.api
+            if api.remove_expired_sessions():
+                statistics = api.session_statistics
+                logger.info(
+                    f"Sessions: {statistics.live_sessions} live, {statistics.expired_sessions} expired, "
+                    f"{statistics.evicted_sessions} evicted, ~{statistics.bytes_per_session} bytes per session"
+                )
+
+    def _modification_time(self) -> Optional[int]:
+        try:
+            return self._question_tree_path.stat().st_mtime_ns
+        except OSError:
+            return None
+
+    @staticmethod
+    def _format_timings(timings: WarmUpTimings) -> str:
+        return (
+            f"{timings.total_seconds * 1000:.1f} ms (load {timings.load_seconds * 1000:.1f} ms, "
+            f"compile {timings.compile_seconds * 1000:.1f} ms, validate {timings.validate_seconds * 1000:.1f} ms)"
+        )
+
+    def _prepare_question_tree(self) -> tuple[CompiledQuestionTree, WarmUpTimings]:
+        started = time.perf_counter()
+        # Taken before loading, so a file replaced during the load is reloaded by the watcher once more.
+        modification_time = self._modification_time()
+        if CompiledQuestionTreeStorage.is_compiled_tree_file(self._question_tree_path):
+            question_tree = CompiledQuestionTreeStorage(self._question_tree_path).load()
+            loaded = compiled = time.perf_counter()
+        elif not self._allow_pickle:
+            raise InvalidQuestionTreeFileError(
+                f"{self._question_tree_path} is not a compiled question tree file, convert it with "
+                "convert-questions-tree"
+            )
+        else:
+            pickled_tree = SerializerStorage[QuestionTree[Page[ResTukeStudyProgrammeData]]](
+                str(self._question_tree_path)
+            ).load()[0]
+            loaded = time.perf_counter()
+            question_tree = CompiledQuestionTree.compile(pickled_tree)
+            compiled = time.perf_counter()
+        question_tree.validate()
+        validated = time.perf_counter()
+        self._loaded_modification_time = modification_time
+        return question_tree, WarmUpTimings(loaded - started, compiled - loaded, validated - compiled)
@@ -1,6 +1,19 @@
+from fastapi import Depends, HTTPException, Request
+
+from src.infrastructure.api.dependencies.question_tree_api_provider import QuestionTreeAPIProvider
+from src.infrastructure.api.exceptions import QuestionTreeNotReadyError
 from src.interface_adapters.services.question_tree.api import QuestionTreeAPI
-from src.infrastructure.api.dependencies.singleton_question_tree_api_session import SingletonQuestionTreeAPI
 
 
-async def get_question_tree_api() -> QuestionTreeAPI:
-    return await SingletonQuestionTreeAPI.get_instance()
+async def get_question_tree_api_provider(request: Request) -> QuestionTreeAPIProvider:
+    provider = getattr(request.app.state, "question_tree_api_provider", None)
+    if not isinstance(provider, QuestionTreeAPIProvider):
+        raise HTTPException(status_code=503, detail="Question tree is not loaded")
+    return provider
+
+
+async def get_question_tree_api(provider: QuestionTreeAPIProvider = Depends(get_question_tree_api_provider)) -> QuestionTreeAPI:
+    try:
+        return provider.api
+    except QuestionTreeNotReadyError:
+        raise HTTPException(status_code=503, detail="Question tree is not loaded")
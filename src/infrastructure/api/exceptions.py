@@ -0,0 +1,13 @@
+class QuestionTreeNotReadyError(Exception):
+    """Raised when the question tree API is requested before the question tree is warmed up."""
+    pass
+
+
+class QuestionTreeReloadError(Exception):
+    """Raised when a new question tree version cannot be loaded, leaving the current version in service."""
+    pass
+
+
+class InvalidQuestionTreeAPISettingError(Exception):
+    """Raised when a question tree API environment variable has an invalid value."""
+    pass
@@ -0,0 +1,53 @@
+from fastapi import APIRouter, HTTPException, Depends
+
+from src.infrastructure.api.dependencies.admin_authorization import verify_admin_token
+from src.infrastructure.api.dependencies.question_tree_api_provider import QuestionTreeAPIProvider
+from src.infrastructure.api.dependencies.question_tree_api_session import get_question_tree_api_provider
+from src.infrastructure.api.exceptions import QuestionTreeNotReadyError, QuestionTreeReloadError
+from src.infrastructure.api.types.question_tree_reload_response import QuestionTreeReloadResponse
+from src.infrastructure.api.types.question_tree_version_response import QuestionTreeVersionResponse
+from src.infrastructure.api.types.session_statistics_response import SessionStatisticsResponse
+
+router = APIRouter(dependencies=[Depends(verify_admin_token)])
+
+
+@router.post("/question-tree/reload", response_model=QuestionTreeReloadResponse)
+async def reload_question_tree(
+        provider: QuestionTreeAPIProvider = Depends(get_question_tree_api_provider)
+) -> QuestionTreeReloadResponse:
+    try:
+        reload = await provider.reload()
+    except QuestionTreeNotReadyError:
+        raise HTTPException(status_code=503, detail="Question tree is not loaded")
+    except QuestionTreeReloadError as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    return QuestionTreeReloadResponse(
+        version=reload.version,
+        load_seconds=reload.timings.load_seconds,
+        compile_seconds=reload.timings.compile_seconds,
+        validate_seconds=reload.timings.validate_seconds,
+        swap_seconds=reload.swap_seconds,
+        nbytes=reload.nbytes
+    )
+
+
+@router.get("/question-tree/versions", response_model=list[QuestionTreeVersionResponse])
+async def get_question_tree_versions(
+        provider: QuestionTreeAPIProvider = Depends(get_question_tree_api_provider)
+) -> list[QuestionTreeVersionResponse]:
+    try:
+        tree_versions = provider.api.tree_versions
+    except QuestionTreeNotReadyError:
+        raise HTTPException(status_code=503, detail="Question tree is not loaded")
+    return [QuestionTreeVersionResponse(**statistics._asdict()) for statistics in tree_versions]
+
+
+@router.get("/sessions", response_model=SessionStatisticsResponse)
+async def get_session_statistics(
+        provider: QuestionTreeAPIProvider = Depends(get_question_tree_api_provider)
+) -> SessionStatisticsResponse:
+    try:
+        statistics = provider.api.session_statistics
+    except QuestionTreeNotReadyError:
+        raise HTTPException(status_code=503, detail="Question tree is not loaded")
+    return SessionStatisticsResponse(**statistics._asdict())
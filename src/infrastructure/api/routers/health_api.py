@@ -0,0 +1,13 @@
+from fastapi import APIRouter, HTTPException, Request
+
+from src.infrastructure.api.dependencies.question_tree_api_provider import QuestionTreeAPIProvider
+
+router = APIRouter()
+
+
+@router.get("/ready", response_model=str)
+async def ready(request: Request) -> str:
+    provider = getattr(request.app.state, "question_tree_api_provider", None)
+    if not isinstance(provider, QuestionTreeAPIProvider) or not provider.is_ready:
+        raise HTTPException(status_code=503, detail="Question tree is not loaded")
+    return "ready"
@@ -18,6 +18,17 @@ async def create_session(session_service: QuestionTreeAPI = Depends(get_question
     return session_id
 
 
+@router.delete("/session/{session_id}", status_code=204)
+async def close_session(
+        session_id: str,
+        session_service: QuestionTreeAPI = Depends(get_question_tree_api)
+) -> None:
+    try:
+        session_service.close_session(session_id)
+    except SessionNotFoundError:
+        raise HTTPException(status_code=404, detail="Session not found")
+
+
 @router.get("/session/{session_id}/question", response_model=CurrentQuestionResponse)
 async def get_current_question(
         session_id: str,
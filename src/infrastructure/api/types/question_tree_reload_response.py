@@ -0,0 +1,10 @@
+from pydantic import BaseModel
+
+
+class QuestionTreeReloadResponse(BaseModel):
+    version: int
+    load_seconds: float
+    compile_seconds: float
+    validate_seconds: float
+    swap_seconds: float
+    nbytes: int
@@ -0,0 +1,8 @@
+from pydantic import BaseModel
+
+
+class QuestionTreeVersionResponse(BaseModel):
+    version: int
+    sessions: int
+    nbytes: int
+    is_current: bool
@@ -0,0 +1,8 @@
+from pydantic import BaseModel
+
+
+class SessionStatisticsResponse(BaseModel):
+    live_sessions: int
+    expired_sessions: int
+    evicted_sessions: int
+    bytes_per_session: int
@@ -1,51 +1,99 @@
 import asyncio
+import json
+import sys
+from contextlib import AbstractContextManager, nullcontext
 from pathlib import Path
+from typing import NamedTuple, Optional
 
 import click
+from loguru import logger
 from sqlalchemy.ext.asyncio import async_sessionmaker, AsyncSession
 from tqdm.asyncio import tqdm  # type: ignore
 
 from src.application.interfaces import (
-    StudyProgrammesRepositoryByCodes,
     Fetchable,
     Savable,
-    WebPageLoader,
     Parser,
     LanguageParserFactory,
-    GetAllRepository, QuestionTreeGraphGenerator,
+    GetAllRepository, QuestionTreeGraphGenerator, ConcurrencyController, WebPageLoader, KeyValueCache, ParseExecutor,
+    LLMDecisionTreeQuestionGenerator, QuestionTreeCheckpointJournal,
 )
 from src.application.use_cases.fetch_and_save_study_programmes import FetchAndSaveStudyProgrammesUseCase
 from src.application.use_cases.generate_and_save_questions_tree import GenerateAndSaveQuestionsTreeUseCase
 from src.application.use_cases.load_question_trees_and_generate_graphs_use_case import \
     LoadQuestionTreesAndGenerateGraphsUseCase
+from src.application.use_cases.load_question_trees_and_calculate_statistics import (
+    LoadQuestionTreesAndCalculateStatisticsUseCase
+)
+from src.application.use_cases.refresh_study_programmes import RefreshStudyProgrammesUseCase
+from src.application.use_cases.stream_and_save_study_programmes import StreamAndSaveStudyProgrammesUseCase
 from src.domain.entities.question_tree import QuestionTree
 from src.domain.entities.res_tuke_study_programme_data import ResTukeStudyProgrammeData
 from src.infrastructure.config.sqlalchemy_database_config import SQLAlchemyDatabaseConfig
-from src.infrastructure.loaders.aiohttp_web_loader import AiohttpWebLoader
+from src.infrastructure.config.sqlalchemy_pool_config import SQLAlchemyPoolConfig
+from src.infrastructure.loaders.aiohttp_web_loader import AiohttpWebLoader, ConnectorSettings
 from src.infrastructure.orm.database_initializer import DatabaseInitializer
 from src.infrastructure.orm.factories.engine_factory import EngineFactory
 from src.infrastructure.orm.factories.session_maker_factory import SessionMakerFactory
 from src.infrastructure.orm.mappers.sqlalchemy_study_programme_mapper import SQLAlchemyStudyProgrammeMapper
 from src.infrastructure.orm.models import Base
+from src.infrastructure.orm.pool_statistics import PoolStatisticsCollector
 from src.infrastructure.persistence.sqlalchemy_study_programme_repository import SQLAlchemyStudyProgrammeRepository
+from src.infrastructure.persistence.json_lines_checkpoint_journal import JsonLinesCheckpointJournal
+from src.infrastructure.persistence.sqlite_key_value_cache import SQLiteKeyValueCache
+from src.interface_adapters.exceptions import QuestionsExportedError
 from src.interface_adapters.factories.language_parser_factory import ResTukeLanguageParserFactory
 from src.interface_adapters.gateways.study_programmes_gateway_base import Page
 from src.interface_adapters.gateways.trackable_study_programmes_gateway import TrackableResTukeStudyProgrammeGateway
+from src.interface_adapters.loaders.caching_web_page_loader import CachingWebPageLoader
+from src.interface_adapters.loaders.retrying_web_page_loader import RetryingWebPageLoader, RetryPolicy, ErrorBudget
 from src.interface_adapters.persistence.plain_text_repository import PlainTextRepository
+from src.interface_adapters.persistence.compiled_question_tree_storage import (
+    CompiledQuestionTreeStorage, DecompilingQuestionTreeRepository
+)
 from src.interface_adapters.persistence.serializer_storage import SerializerStorage
 from src.interface_adapters.persistence.study_programmes_codes_excel_repository import (
     StudyProgrammesCodesExcelRepository
 )
+from src.interface_adapters.services.batching_decision_tree_question_generator import (
+    BatchingDecisionTreeQuestionGenerator
+)
+from src.interface_adapters.services.caching_decision_tree_question_generator import (
+    CachingDecisionTreeQuestionGenerator, question_cache_key
+)
+from src.interface_adapters.services.host_concurrency_controller import (
+    HostConcurrencyController, AIMDSettings, UnlimitedConcurrencyController
+)
 from src.interface_adapters.services.mermaid_graph_generator import MermaidGraphGenerator
-from src.interface_adapters.services.openai_decision_tree_question_generator import OpenAIDecisionTreeQuestionGenerator
-from src.interface_adapters.services.res_tuke_question_tree_generator import ResTukeQuestionTreeGenerator
+from src.interface_adapters.services.compact_prompt_encoder import CompactPromptEncoder
+from src.interface_adapters.services.heuristic_decision_tree_question_generator import (
+    HeuristicDecisionTreeQuestionGenerator
+)
+from src.interface_adapters.services.hybrid_decision_tree_question_generator import HybridDecisionTreeQuestionGenerator
+from src.interface_adapters.services.openai_batch_files import OpenAIBatchRequestExporter, OpenAIBatchResultImporter
+from src.interface_adapters.services.openai_decision_tree_question_generator import (
+    OpenAIDecisionTreeQuestionGenerator, OpenAIClientSettings
+)
+from src.interface_adapters.services.parse_executor import PoolParseExecutor, ParseExecutorKind
+from src.interface_adapters.services.rate_limited_decision_tree_question_generator import (
+    RateLimitedDecisionTreeQuestionGenerator
+)
+from src.interface_adapters.services.question_tree_statistics_calculator import DepthQuestionTreeStatisticsCalculator
+from src.interface_adapters.services.res_tuke_question_tree_generator import (
+    ResTukeQuestionTreeGenerator, TreeShapeConstraints
+)
 from src.infrastructure.api.app import app
 import uvicorn
 
 
+_pool_statistics = PoolStatisticsCollector()
+
+
 async def _create_session_maker_and_init_db() -> async_sessionmaker[AsyncSession]:
     database_config = SQLAlchemyDatabaseConfig()
-    database_engine = EngineFactory(database_config.async_database_url).create()
+    database_engine = EngineFactory(
+        database_config.async_database_url, SQLAlchemyPoolConfig().pool_settings, _pool_statistics
+    ).create()
     session_maker = SessionMakerFactory(database_engine).create()
     database_initializer = DatabaseInitializer(
         engine=database_engine, session_maker=session_maker, base=Base, config=database_config
@@ -54,9 +102,22 @@ async def _create_session_maker_and_init_db() -> async_sessionmaker[AsyncSession
     return session_maker
 
 
-def _create_session_maker_and_init_db_sync() -> async_sessionmaker[AsyncSession]:
-    loop = asyncio.get_event_loop()
-    return loop.run_until_complete(_create_session_maker_and_init_db())
+class _WebPageLoaderOptions(NamedTuple):
+    connector_settings: ConnectorSettings
+    retry_policy: RetryPolicy
+    error_budget: ErrorBudget
+    page_cache: Optional[KeyValueCache]
+    offline: bool
+
+
+class _SaveOptions(NamedTuple):
+    incremental: bool
+    stream: bool
+    batch_size: int
+    stream_buffer_size: int
+    parse_executor_kind: ParseExecutorKind
+    parse_workers: Optional[int]
+    parse_chunk_size: int
 
 
 @click.group()
@@ -66,60 +127,493 @@ def cli() -> None:
 
 @cli.command()
 @click.argument("study_programmes_codes_excel_file_path", type=Path)
-def save_study_programmes(study_programmes_codes_excel_file_path: Path) -> None:
-    session_maker = _create_session_maker_and_init_db_sync()
+@click.option("--concurrency", type=click.IntRange(min=1), default=5, show_default=True,
+              help="Concurrent requests per host (initial value in adaptive mode).")
+@click.option("--adaptive/--fixed", default=False, show_default=True,
+              help="Adapt the per-host concurrency with AIMD based on throttling responses and latency.")
+@click.option("--max-concurrency", type=click.IntRange(min=1), default=32, show_default=True,
+              help="Upper bound of the per-host concurrency in adaptive mode.")
+@click.option("--max-retries", type=click.IntRange(min=0), default=3, show_default=True,
+              help="Retries of a transiently failing page.")
+@click.option("--request-timeout", type=click.FloatRange(min=0, min_open=True), default=30.0, show_default=True,
+              help="Timeout of one page request in seconds.")
+@click.option("--page-deadline", type=click.FloatRange(min=0, min_open=True), default=120.0, show_default=True,
+              help="Deadline in seconds for loading one page, including all retries.")
+@click.option("--error-budget", type=click.IntRange(min=0), default=200, show_default=True,
+              help="Maximum number of retries spent during the whole run.")
+@click.option("--cache-path", type=Path, default=None,
+              help="SQLite file caching downloaded pages, revalidated with conditional requests.")
+@click.option("--offline", is_flag=True, default=False,
+              help="Replay pages from the cache only, without using the network. Requires --cache-path.")
+@click.option("--cache-max-size-mb", type=click.IntRange(min=1), default=512, show_default=True,
+              help="Maximum size of the page cache, least recently used pages are evicted first.")
+@click.option("--cache-max-age-days", type=click.FloatRange(min=0, min_open=True), default=365.0, show_default=True,
+              help="Pages not revalidated for this many days are evicted from the cache.")
+@click.option("--incremental", is_flag=True, default=False,
+              help="Store only added and changed pages and mark pages of removed codes, instead of appending all.")
+@click.option("--stream", is_flag=True, default=False,
+              help="Parse pages as they arrive and save them in batches while the crawl is still running.")
+@click.option("--batch-size", type=click.IntRange(min=1), default=50, show_default=True,
+              help="Number of study programmes saved at once in streaming mode.")
+@click.option("--stream-buffer-size", type=click.IntRange(min=1), default=100, show_default=True,
+              help="Pages loaded concurrently and pages waiting to be parsed in streaming mode.")
+@click.option("--parse-executor", type=click.Choice([kind.value for kind in ParseExecutorKind]),
+              default=ParseExecutorKind.INLINE.value, show_default=True,
+              help="Where pages are parsed: on the event loop thread, in a thread pool or in a process pool.")
+@click.option("--parse-workers", type=click.IntRange(min=1), default=None,
+              help="Workers of the parse pool, defaults to the number of CPU cores.")
+@click.option("--parse-chunk-size", type=click.IntRange(min=1), default=16, show_default=True,
+              help="Pages sent to a parse worker at once.")
+def save_study_programmes(
+        study_programmes_codes_excel_file_path: Path,
+        concurrency: int,
+        adaptive: bool,
+        max_concurrency: int,
+        max_retries: int,
+        request_timeout: float,
+        page_deadline: float,
+        error_budget: int,
+        cache_path: Optional[Path],
+        offline: bool,
+        cache_max_size_mb: int,
+        cache_max_age_days: float,
+        incremental: bool,
+        stream: bool,
+        batch_size: int,
+        stream_buffer_size: int,
+        parse_executor: str,
+        parse_workers: Optional[int],
+        parse_chunk_size: int
+) -> None:
+    if offline and cache_path is None:
+        raise click.UsageError("--offline requires --cache-path")
+    if incremental and stream:
+        raise click.UsageError("--incremental and --stream cannot be combined")
+    max_limit = max(concurrency, max_concurrency) if adaptive else concurrency
+    concurrency_controller = HostConcurrencyController(
+        limit_per_host=concurrency,
+        aimd=AIMDSettings(max_limit=max_limit) if adaptive else None
+    )
+    page_cache = SQLiteKeyValueCache(
+        cache_path, max_size_bytes=cache_max_size_mb * 1024 * 1024, max_age=cache_max_age_days * 24 * 60 * 60
+    ) if cache_path else None
+    loader_options = _WebPageLoaderOptions(
+        connector_settings=ConnectorSettings(limit_per_host=max_limit),
+        retry_policy=RetryPolicy(max_retries=max_retries, request_timeout=request_timeout, total_deadline=page_deadline),
+        error_budget=ErrorBudget(error_budget),
+        page_cache=page_cache,
+        offline=offline
+    )
+    save_options = _SaveOptions(
+        incremental, stream, batch_size, stream_buffer_size,
+        ParseExecutorKind(parse_executor), parse_workers, parse_chunk_size
+    )
+    loop = asyncio.get_event_loop()
+    try:
+        failed_codes = loop.run_until_complete(
+            _save_study_programmes_async(
+                study_programmes_codes_excel_file_path, concurrency_controller, loader_options, save_options
+            )
+        )
+    finally:
+        if page_cache is not None:
+            page_cache.close()
+    for host, statistics in concurrency_controller.statistics().items():
+        logger.info(f"Concurrency statistics for {host}: {statistics}")
+    logger.info(f"Database pool statistics: {_pool_statistics.statistics()}")
+    if failed_codes:
+        click.echo(f"Failed study programmes codes: {' '.join(failed_codes)}", err=True)
+
+
+async def _save_study_programmes_async(
+        study_programmes_codes_excel_file_path: Path,
+        concurrency_controller: ConcurrencyController,
+        loader_options: _WebPageLoaderOptions,
+        save_options: _SaveOptions
+) -> list[str]:
+    session_maker = await _create_session_maker_and_init_db()
     codes_source: Fetchable[str] = StudyProgrammesCodesExcelRepository(study_programmes_codes_excel_file_path)
-    web_page_loader: WebPageLoader = AiohttpWebLoader()
     parser_factory: LanguageParserFactory[Parser[str, ResTukeStudyProgrammeData]] = ResTukeLanguageParserFactory()
-    study_programmes_gateway: StudyProgrammesRepositoryByCodes[
-        Page[ResTukeStudyProgrammeData]
-    ] = TrackableResTukeStudyProgrammeGateway(
-        web_page_loader, parser_factory, tqdm.gather
+    storage = SQLAlchemyStudyProgrammeRepository(session_maker, SQLAlchemyStudyProgrammeMapper())
+    with _create_parse_executor(save_options) as parse_executor:
+        async with AiohttpWebLoader(loader_options.connector_settings) as aiohttp_web_loader:
+            web_page_loader = _create_web_page_loader(aiohttp_web_loader, loader_options, concurrency_controller)
+            gateway_concurrency_controller = (
+                concurrency_controller if loader_options.offline else UnlimitedConcurrencyController()
+            )
+            study_programmes_gateway = TrackableResTukeStudyProgrammeGateway(
+                web_page_loader, parser_factory, tqdm.gather, gateway_concurrency_controller,
+                save_options.stream_buffer_size, parse_executor
+            )
+            return await _run_save_use_case(codes_source, study_programmes_gateway, storage, save_options)
+
+
+async def _run_save_use_case(
+        codes_source: Fetchable[str],
+        study_programmes_gateway: TrackableResTukeStudyProgrammeGateway,
+        storage: SQLAlchemyStudyProgrammeRepository,
+        save_options: _SaveOptions
+) -> list[str]:
+    if save_options.stream:
+        stream_use_case = StreamAndSaveStudyProgrammesUseCase(
+            codes_source, study_programmes_gateway, storage, save_options.batch_size,
+            failed_codes_source=study_programmes_gateway
+        )
+        return await stream_use_case()
+    if save_options.incremental:
+        refresh_use_case = RefreshStudyProgrammesUseCase(
+            codes_source, study_programmes_gateway, storage, failed_codes_source=study_programmes_gateway
+        )
+        summary = await refresh_use_case()
+        click.echo(f"Refreshed study programmes: {summary}")
+        return summary.failed_codes
+    use_case = FetchAndSaveStudyProgrammesUseCase(
+        codes_source, study_programmes_gateway, storage, failed_codes_source=study_programmes_gateway
     )
-    storage: Savable[Page[ResTukeStudyProgrammeData]] = SQLAlchemyStudyProgrammeRepository(
-        session_maker, SQLAlchemyStudyProgrammeMapper()
+    return await use_case()
+
+
+def _create_parse_executor(
+        save_options: _SaveOptions
+) -> AbstractContextManager[Optional[ParseExecutor[ResTukeStudyProgrammeData]]]:
+    if save_options.parse_executor_kind == ParseExecutorKind.INLINE:
+        return nullcontext()
+    return PoolParseExecutor(
+        ResTukeLanguageParserFactory,
+        save_options.parse_executor_kind,
+        save_options.parse_workers,
+        save_options.parse_chunk_size
+    )
+
+
+def _create_web_page_loader(
+        aiohttp_web_loader: AiohttpWebLoader,
+        loader_options: _WebPageLoaderOptions,
+        concurrency_controller: ConcurrencyController
+) -> WebPageLoader:
+    """Creates the page loader, which takes a concurrency slot per attempt unless it only reads the offline cache."""
+    if loader_options.page_cache is None:
+        return RetryingWebPageLoader(
+            aiohttp_web_loader, loader_options.retry_policy, loader_options.error_budget, concurrency_controller
+        )
+    caching_web_page_loader = CachingWebPageLoader(
+        aiohttp_web_loader, loader_options.page_cache, offline=loader_options.offline
+    )
+    if loader_options.offline:
+        return caching_web_page_loader
+    return RetryingWebPageLoader(
+        caching_web_page_loader, loader_options.retry_policy, loader_options.error_budget, concurrency_controller
     )
-    use_case = FetchAndSaveStudyProgrammesUseCase(codes_source, study_programmes_gateway, storage)
-    asyncio.get_event_loop().run_until_complete(use_case())
+
+
+class _TreeGenerationOptions(NamedTuple):
+    concurrent_subtrees: bool
+    llm_concurrency: int
+    llm_requests_per_minute: Optional[float]
+    question_cache: Optional[KeyValueCache]
+    client_settings: OpenAIClientSettings
+    prompt_token_budget: int
+    model_max_output_tokens: int
+    split_strategy: str
+    min_split_balance: float
+    shape_constraints: TreeShapeConstraints
+    level_batching: bool
+    max_batch_subsets: int
+    batch_export_path: Optional[Path]
+    checkpoint_journal: QuestionTreeCheckpointJournal
 
 
 @cli.command()
 @click.argument("openai_api_key", type=str)
 @click.argument("destination_file_path", type=Path)
-def generate_and_save_questions_tree(openai_api_key: str, destination_file_path: Path) -> None:
+@click.option("--concurrent/--serial", default=True, show_default=True,
+              help="Expand sibling subtrees concurrently or one after another.")
+@click.option("--llm-concurrency", type=click.IntRange(min=1), default=8, show_default=True,
+              help="Maximum number of language model requests in flight.")
+@click.option("--llm-requests-per-minute", type=click.FloatRange(min=0, min_open=True), default=None,
+              help="Maximum rate of language model requests, unlimited by default.")
+@click.option("--question-cache-path", type=Path, default=None,
+              help="SQLite file caching generated questions, so unchanged subtrees are reused in later runs.")
+@click.option("--question-cache-max-size-mb", type=click.IntRange(min=1), default=64, show_default=True,
+              help="Maximum size of the question cache, least recently used questions are evicted first.")
+@click.option("--question-cache-max-age-days", type=click.FloatRange(min=0, min_open=True), default=90.0,
+              show_default=True, help="Questions older than this many days are regenerated.")
+@click.option("--openai-base-url", type=str, default=None,
+              help="Base URL of an OpenAI compatible API, e.g. a local stub server.")
+@click.option("--openai-http2/--openai-http1", default=False, show_default=True,
+              help="Talk to the API over HTTP/2, requires the h2 package.")
+@click.option("--openai-timeout", type=click.FloatRange(min=0, min_open=True), default=120.0, show_default=True,
+              help="Timeout of one language model request in seconds.")
+@click.option("--openai-max-retries", type=click.IntRange(min=0), default=2, show_default=True,
+              help="Retries of a failed language model request done by the API client.")
+@click.option("--prompt-token-budget", type=click.IntRange(min=1), default=12000, show_default=True,
+              help="Estimated tokens of the programmes in one prompt, longer texts are summarised to fit.")
+@click.option("--model-max-output-tokens", type=click.IntRange(min=1), default=16384, show_default=True,
+              help="Output token limit of the language model; batched requests ask for at most this many tokens.")
+@click.option("--split-strategy", type=click.Choice(["llm", "local", "hybrid"]), default="llm", show_default=True,
+              help="Split programmes by the language model, by local attribute and text heuristics, or by "
+                   "attributes first and the language model only when no attribute splits them well enough.")
+@click.option("--min-split-balance", type=click.FloatRange(min=0, max=0.5), default=0.25, show_default=True,
+              help="Minimum share of the programmes in the smaller group of an acceptable attribute split.")
+@click.option("--max-size-ratio", type=click.FloatRange(min=1), default=None,
+              help="Re-request binary questions whose larger group is more than this many times the smaller one.")
+@click.option("--max-depth", type=click.IntRange(min=1), default=None,
+              help="Re-request binary questions which cannot keep every programme within this many questions.")
+@click.option("--level-batching/--no-level-batching", default=False, show_default=True,
+              help="Request the questions of all subsets of one tree level together in as few requests as the "
+                   "prompt token budget allows. The requests per minute limit does not apply to these requests.")
+@click.option("--max-batch-subsets", type=click.IntRange(min=1), default=16, show_default=True,
+              help="Maximum number of subsets collected into one batch with --level-batching.")
+@click.option("--batch-export-path", type=Path, default=None,
+              help="Write the requests of the first tree level missing from the question cache to an OpenAI Batch API "
+                   "JSONL file instead of sending them. Import the results with import-question-batch-results and "
+                   "repeat until the tree is complete.")
+@click.option("--checkpoint-path", type=Path, default=None,
+              help="Journal recording every generated question as soon as it is accepted, "
+                   "DESTINATION_FILE_PATH with the .journal.jsonl suffix by default.")
+@click.option("--resume/--no-resume", default=False, show_default=True,
+              help="Rebuild the subtrees recorded in the checkpoint journal of an interrupted generation and "
+                   "generate only the missing questions. Recorded questions are reused only for unchanged subsets "
+                   "of programmes, the same model, split strategy and shape constraints. Otherwise the journal is "
+                   "started anew.")
+def generate_and_save_questions_tree(
+        openai_api_key: str,
+        destination_file_path: Path,
+        concurrent: bool,
+        llm_concurrency: int,
+        llm_requests_per_minute: Optional[float],
+        question_cache_path: Optional[Path],
+        question_cache_max_size_mb: int,
+        question_cache_max_age_days: float,
+        openai_base_url: Optional[str],
+        openai_http2: bool,
+        openai_timeout: float,
+        openai_max_retries: int,
+        prompt_token_budget: int,
+        model_max_output_tokens: int,
+        split_strategy: str,
+        min_split_balance: float,
+        max_size_ratio: Optional[float],
+        max_depth: Optional[int],
+        level_batching: bool,
+        max_batch_subsets: int,
+        batch_export_path: Optional[Path],
+        checkpoint_path: Optional[Path],
+        resume: bool
+) -> None:
+    if (level_batching or batch_export_path) and not concurrent:
+        raise click.UsageError("--level-batching and --batch-export-path require --concurrent")
+    if batch_export_path and not question_cache_path:
+        raise click.UsageError("--batch-export-path requires --question-cache-path")
+    question_cache = SQLiteKeyValueCache(
+        question_cache_path,
+        max_size_bytes=question_cache_max_size_mb * 1024 * 1024,
+        max_age=question_cache_max_age_days * 24 * 60 * 60
+    ) if question_cache_path else None
+    client_settings = OpenAIClientSettings(
+        base_url=openai_base_url,
+        http2=openai_http2,
+        max_connections=llm_concurrency,
+        max_keepalive_connections=llm_concurrency,
+        request_timeout=openai_timeout,
+        max_retries=openai_max_retries
+    )
+    checkpoint_journal = JsonLinesCheckpointJournal(
+        checkpoint_path or destination_file_path.with_suffix(".journal.jsonl"),
+        resume=resume
+    )
+    options = _TreeGenerationOptions(
+        concurrent, llm_concurrency, llm_requests_per_minute, question_cache, client_settings, prompt_token_budget,
+        model_max_output_tokens, split_strategy, min_split_balance, TreeShapeConstraints(max_size_ratio, max_depth),
+        level_batching, max_batch_subsets, batch_export_path, checkpoint_journal
+    )
     loop = asyncio.get_event_loop()
-    loop.run_until_complete(_build_questions_tree_async(openai_api_key, destination_file_path))
+    try:
+        loop.run_until_complete(_build_questions_tree_async(openai_api_key, destination_file_path, options))
+    finally:
+        checkpoint_journal.close()
+        if question_cache is not None:
+            question_cache.close()
 
 
-async def _build_questions_tree_async(openai_api_key: str, destination_file_path: Path) -> None:
+async def _build_questions_tree_async(
+        openai_api_key: str,
+        destination_file_path: Path,
+        options: _TreeGenerationOptions
+) -> None:
     session_maker = await _create_session_maker_and_init_db()
     study_programmes_repository = SQLAlchemyStudyProgrammeRepository(session_maker, SQLAlchemyStudyProgrammeMapper())
-    llm_decision_tree_question_generator_service = OpenAIDecisionTreeQuestionGenerator(openai_api_key)
-    questions_tree_generator = ResTukeQuestionTreeGenerator(llm_decision_tree_question_generator_service)
-    questions_tree_storage: Savable[QuestionTree[Page[ResTukeStudyProgrammeData]]] = (
-        SerializerStorage(str(destination_file_path.absolute()))
-    )
-    use_case = GenerateAndSaveQuestionsTreeUseCase(
-        study_programmes_repository,
-        questions_tree_generator,
-        questions_tree_storage
+    openai_question_generator = OpenAIDecisionTreeQuestionGenerator(
+        openai_api_key,
+        client_settings=options.client_settings,
+        prompt_encoder=CompactPromptEncoder(token_budget=options.prompt_token_budget),
+        max_output_tokens=options.model_max_output_tokens
     )
-    await use_case()
+    async with openai_question_generator:
+        llm_decision_tree_question_generator_service = _create_llm_question_generator(
+            openai_question_generator, options
+        )
+        question_generator = _select_split_strategy(llm_decision_tree_question_generator_service, options)
+        questions_tree_generator = ResTukeQuestionTreeGenerator(
+            question_generator,
+            concurrent_subtrees=options.concurrent_subtrees,
+            shape_constraints=options.shape_constraints,
+            checkpoint_journal=options.checkpoint_journal,
+            checkpoint_scope=json.dumps([
+                openai_question_generator.model, OpenAIDecisionTreeQuestionGenerator.PROMPT_VERSION,
+                options.split_strategy, options.min_split_balance
+            ])
+        )
+        questions_tree_storage: Savable[QuestionTree[Page[ResTukeStudyProgrammeData]]] = (
+            CompiledQuestionTreeStorage(destination_file_path)
+        )
+        use_case = GenerateAndSaveQuestionsTreeUseCase(
+            study_programmes_repository,
+            questions_tree_generator,
+            questions_tree_storage
+        )
+        try:
+            await use_case()
+        except* QuestionsExportedError as exported:
+            click.echo(f"{exported.exceptions[0]}, submit them as a batch and import the results")
+        logger.info(f"Question repair statistics: {openai_question_generator.repair_statistics}")
+        logger.info(f"Shape constraint statistics: {questions_tree_generator.shape_statistics}")
+        logger.info(f"Checkpoint statistics: {questions_tree_generator.checkpoint_statistics}")
+        logger.info(f"Language model token usage: {openai_question_generator.token_usage}")
+        if isinstance(llm_decision_tree_question_generator_service, CachingDecisionTreeQuestionGenerator):
+            logger.info(f"Question cache statistics: {llm_decision_tree_question_generator_service.statistics}")
+        if isinstance(question_generator, HybridDecisionTreeQuestionGenerator):
+            logger.info(f"Hybrid split statistics: {question_generator.statistics}")
+
+
+def _create_llm_question_generator(
+        openai_question_generator: OpenAIDecisionTreeQuestionGenerator,
+        options: _TreeGenerationOptions
+) -> LLMDecisionTreeQuestionGenerator[Page[ResTukeStudyProgrammeData]]:
+    model, prompt_version = openai_question_generator.model, OpenAIDecisionTreeQuestionGenerator.PROMPT_VERSION
+    llm_question_generator: LLMDecisionTreeQuestionGenerator[Page[ResTukeStudyProgrammeData]]
+    if options.batch_export_path is not None:
+        aliases_path = options.batch_export_path.with_suffix(".aliases.json")
+        options.batch_export_path.unlink(missing_ok=True)
+        aliases_path.unlink(missing_ok=True)
+        exporter = OpenAIBatchRequestExporter(
+            openai_question_generator,
+            lambda study_programmes, rejected_questions: question_cache_key(
+                study_programmes, model, prompt_version, rejected_questions
+            ),
+            options.batch_export_path,
+            aliases_path
+        )
+        llm_question_generator = BatchingDecisionTreeQuestionGenerator(exporter, max_batch_size=sys.maxsize)
+    elif options.level_batching:
+        llm_question_generator = BatchingDecisionTreeQuestionGenerator(
+            openai_question_generator,
+            max_batch_size=options.max_batch_subsets,
+            max_concurrent_batches=options.llm_concurrency
+        )
+    else:
+        llm_question_generator = RateLimitedDecisionTreeQuestionGenerator(
+            openai_question_generator,
+            max_concurrency=options.llm_concurrency,
+            requests_per_minute=options.llm_requests_per_minute
+        )
+    if options.question_cache is None:
+        return llm_question_generator
+    return CachingDecisionTreeQuestionGenerator(llm_question_generator, options.question_cache, model, prompt_version)
+
+
+def _select_split_strategy(
+        llm_question_generator: LLMDecisionTreeQuestionGenerator[Page[ResTukeStudyProgrammeData]],
+        options: _TreeGenerationOptions
+) -> LLMDecisionTreeQuestionGenerator[Page[ResTukeStudyProgrammeData]]:
+    if options.split_strategy == "llm":
+        return llm_question_generator
+    heuristic_question_generator = HeuristicDecisionTreeQuestionGenerator(min_balance=options.min_split_balance)
+    if options.split_strategy == "local":
+        return heuristic_question_generator
+    return HybridDecisionTreeQuestionGenerator(heuristic_question_generator, llm_question_generator)
+
+
+def _questions_tree_repository(
+        questions_tree_file_path: Path,
+        allow_pickle: bool
+) -> GetAllRepository[QuestionTree[Page[ResTukeStudyProgrammeData]]]:
+    if CompiledQuestionTreeStorage.is_compiled_tree_file(questions_tree_file_path):
+        return DecompilingQuestionTreeRepository(questions_tree_file_path)
+    if not allow_pickle:
+        raise click.UsageError(
+            f"{questions_tree_file_path} is not a compiled questions tree, convert it with convert-questions-tree or "
+            "pass --allow-pickle if the file is trusted"
+        )
+    return SerializerStorage(str(questions_tree_file_path.absolute()))
+
+
+_allow_pickle_option = click.option(
+    "--allow-pickle/--no-allow-pickle", default=False, show_default=True,
+    help="Also read questions trees pickled by earlier versions. Unpickling runs code from the file, so only use it "
+         "for trusted files."
+)
 
 
 @cli.command()
 @click.argument("questions_tree_file_path", type=Path)
 @click.argument("output_file_path", type=Path)
-def generate_graph_from_questions_tree(questions_tree_file_path: Path, output_file_path: Path) -> None:
-    questions_tree_storage: GetAllRepository[QuestionTree[Page[ResTukeStudyProgrammeData]]] = (
-        SerializerStorage(str(questions_tree_file_path.absolute()))
-    )
+@_allow_pickle_option
+def generate_graph_from_questions_tree(
+        questions_tree_file_path: Path,
+        output_file_path: Path,
+        allow_pickle: bool
+) -> None:
+    questions_tree_storage = _questions_tree_repository(questions_tree_file_path, allow_pickle)
     graph_generator: QuestionTreeGraphGenerator[Page[ResTukeStudyProgrammeData]] = MermaidGraphGenerator()
     plain_text_repository = PlainTextRepository(output_file_path)
     use_case = LoadQuestionTreesAndGenerateGraphsUseCase(questions_tree_storage, graph_generator, plain_text_repository)
     asyncio.get_event_loop().run_until_complete(use_case())
 
 
+@cli.command()
+@click.argument("questions_tree_file_path", type=Path)
+@click.argument("compiled_tree_file_path", type=Path)
+def convert_questions_tree(questions_tree_file_path: Path, compiled_tree_file_path: Path) -> None:
+    """
+    Converts a questions tree pickled by earlier versions into the memory-mappable compiled tree format. Unpickling
+    runs code from the file, so only convert trusted files.
+    """
+    async def convert() -> None:
+        questions_tree = (await SerializerStorage[QuestionTree[Page[ResTukeStudyProgrammeData]]](
+            str(questions_tree_file_path.absolute())
+        ).get_all())[0]
+        await CompiledQuestionTreeStorage(compiled_tree_file_path).save(questions_tree)
+
+    asyncio.get_event_loop().run_until_complete(convert())
+    click.echo(f"Saved the compiled questions tree to {compiled_tree_file_path}")
+
+
+@cli.command()
+@click.argument("results_path", type=Path)
+@click.argument("aliases_path", type=Path)
+@click.argument("question_cache_path", type=Path)
+def import_question_batch_results(results_path: Path, aliases_path: Path, question_cache_path: Path) -> None:
+    question_cache = SQLiteKeyValueCache(question_cache_path)
+    try:
+        summary = OpenAIBatchResultImporter(question_cache).import_results(results_path, aliases_path)
+    finally:
+        question_cache.close()
+    click.echo(f"Imported {summary.imported} questions, {summary.invalid} invalid, {summary.failed} failed requests")
+
+
+@cli.command()
+@click.argument("questions_tree_file_path", type=Path)
+@_allow_pickle_option
+def report_questions_tree_statistics(questions_tree_file_path: Path, allow_pickle: bool) -> None:
+    questions_tree_storage = _questions_tree_repository(questions_tree_file_path, allow_pickle)
+    use_case = LoadQuestionTreesAndCalculateStatisticsUseCase(
+        questions_tree_storage, DepthQuestionTreeStatisticsCalculator[Page[ResTukeStudyProgrammeData]]()
+    )
+    for statistics in asyncio.get_event_loop().run_until_complete(use_case()):
+        click.echo(str(statistics))
+
+
 @cli.command()
 @click.argument("host", type=str)
 @click.argument("port", type=int)
@@ -0,0 +1,95 @@
+from os import getenv
+from pathlib import Path
+from typing import Optional
+
+from src.infrastructure.api.exceptions import InvalidQuestionTreeAPISettingError
+from src.interface_adapters.services.question_tree.session_manager import SessionLimits
+
+_DEFAULT_QUESTION_TREE_PATH = Path("data/questions-tree.bin")
+_TRUE_VALUES = {"1", "true", "yes", "on"}
+_FALSE_VALUES = {"0", "false", "no", "off"}
+
+
+class QuestionTreeAPIConfig:
+    """
+    Question tree API settings read from the environment:
+
+    ``question_tree_path``, the compiled question tree served by the API, relative to the working directory unless
+    absolute, defaulting to ``data/questions-tree.bin``, ``allow_pickled_question_tree``, whether a tree pickled by
+    earlier versions is loaded too, disabled by default as unpickling runs arbitrary code, and
+    ``question_tree_reload_interval``, the seconds between checks of the file for a new tree version to swap in.
+    Sessions are bounded by ``session_idle_ttl``, the seconds after which an unused session expires, and
+    ``max_sessions``, above which the least recently used session is evicted, both falling back to the ``SessionLimits``
+    defaults, while ``session_sweep_interval`` sets the seconds between removals of expired sessions and defaults to 60.
+    A value of ``0`` disables the respective setting; the reload checks are disabled by default. ``admin_token`` is the
+    token the admin endpoints require in the ``X-Admin-Token`` header, without it they are disabled.
+    """
+
+    def __init__(self) -> None:
+        defaults = SessionLimits()
+        self._question_tree_path = Path(getenv("question_tree_path") or _DEFAULT_QUESTION_TREE_PATH)
+        self._allow_pickle = self._get_bool("allow_pickled_question_tree", False)
+        self._reload_interval = self._get_seconds("question_tree_reload_interval", 0.0)
+        idle_ttl = self._get_seconds("session_idle_ttl", defaults.idle_ttl or 0.0)
+        max_sessions = self._get_int("max_sessions", defaults.max_sessions or 0)
+        self._session_limits = SessionLimits(idle_ttl=idle_ttl or None, max_sessions=max_sessions or None)
+        self._session_sweep_interval = self._get_seconds("session_sweep_interval", 60.0)
+        self._admin_token = getenv("admin_token") or None
+
+    @staticmethod
+    def _get_seconds(name: str, default: float) -> float:
+        if not (value := getenv(name)):
+            return default
+        try:
+            seconds = float(value)
+        except ValueError:
+            raise InvalidQuestionTreeAPISettingError(f"{name} must be a number of seconds, got {value!r}")
+        if seconds < 0:
+            raise InvalidQuestionTreeAPISettingError(f"{name} must not be negative, got {seconds}")
+        return seconds
+
+    @staticmethod
+    def _get_bool(name: str, default: bool) -> bool:
+        if not (value := getenv(name)):
+            return default
+        if value.lower() in _TRUE_VALUES:
+            return True
+        if value.lower() in _FALSE_VALUES:
+            return False
+        raise InvalidQuestionTreeAPISettingError(f"{name} must be a boolean, got {value!r}")
+
+    @staticmethod
+    def _get_int(name: str, default: int) -> int:
+        if not (value := getenv(name)):
+            return default
+        try:
+            number = int(value)
+        except ValueError:
+            raise InvalidQuestionTreeAPISettingError(f"{name} must be an integer, got {value!r}")
+        if number < 0:
+            raise InvalidQuestionTreeAPISettingError(f"{name} must not be negative, got {number}")
+        return number
+
+    @property
+    def question_tree_path(self) -> Path:
+        return self._question_tree_path
+
+    @property
+    def allow_pickle(self) -> bool:
+        return self._allow_pickle
+
+    @property
+    def reload_interval(self) -> float:
+        return self._reload_interval
+
+    @property
+    def session_limits(self) -> SessionLimits:
+        return self._session_limits
+
+    @property
+    def session_sweep_interval(self) -> float:
+        return self._session_sweep_interval
+
+    @property
+    def admin_token(self) -> Optional[str]:
+        return self._admin_token
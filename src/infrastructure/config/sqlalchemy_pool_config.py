@@ -0,0 +1,54 @@
+from os import getenv
+
+from src.infrastructure.orm.exceptions import InvalidDatabasePoolSettingError
+from src.infrastructure.orm.factories.engine_factory import PoolSettings
+
+_TRUE_VALUES = {"1", "true", "yes", "on"}
+_FALSE_VALUES = {"0", "false", "no", "off"}
+
+
+class SQLAlchemyPoolConfig:
+    """
+    Connection pool settings read from the environment, falling back to the ``PoolSettings`` defaults:
+
+    ``db_pool_size``, ``db_max_overflow``, ``db_pool_pre_ping``, ``db_pool_recycle`` (seconds, -1 disables it),
+    ``db_statement_cache_size`` and ``db_pgbouncer``, which disables prepared statement caching and uses unique
+    prepared statement names, as required by PgBouncer in transaction pooling mode.
+    """
+
+    def __init__(self) -> None:
+        defaults = PoolSettings()
+        self._pool_settings = PoolSettings(
+            pool_size=self._get_int("db_pool_size", defaults.pool_size, minimum=0),
+            max_overflow=self._get_int("db_max_overflow", defaults.max_overflow, minimum=-1),
+            pre_ping=self._get_bool("db_pool_pre_ping", defaults.pre_ping),
+            recycle=self._get_int("db_pool_recycle", defaults.recycle, minimum=-1),
+            statement_cache_size=self._get_int("db_statement_cache_size", defaults.statement_cache_size, minimum=0),
+            pgbouncer=self._get_bool("db_pgbouncer", defaults.pgbouncer),
+        )
+
+    @staticmethod
+    def _get_int(name: str, default: int, minimum: int) -> int:
+        if not (value := getenv(name)):
+            return default
+        try:
+            number = int(value)
+        except ValueError:
+            raise InvalidDatabasePoolSettingError(f"{name} must be an integer, got {value!r}")
+        if number < minimum:
+            raise InvalidDatabasePoolSettingError(f"{name} must be at least {minimum}, got {number}")
+        return number
+
+    @staticmethod
+    def _get_bool(name: str, default: bool) -> bool:
+        if not (value := getenv(name)):
+            return default
+        if value.lower() in _TRUE_VALUES:
+            return True
+        if value.lower() in _FALSE_VALUES:
+            return False
+        raise InvalidDatabasePoolSettingError(f"{name} must be a boolean, got {value!r}")
+
+    @property
+    def pool_settings(self) -> PoolSettings:
+        return self._pool_settings
@@ -1,27 +1,146 @@
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from types import TracebackType
+from typing import NamedTuple, Optional, Self, Type
+
 import aiohttp
 
-from src.application.interfaces import WebPageLoader
-from src.interface_adapters.exceptions import PageLoadingError
+from src.application.interfaces import ConditionalWebPageLoader
+from src.domain.dtos.conditional_page import ConditionalPage, PageValidators
+from src.interface_adapters.exceptions import PageLoadingError, HttpStatusError
 
 type url = str
 
 
-class AiohttpWebLoader(WebPageLoader):
+class ConnectorSettings(NamedTuple):
+    limit: int = 100
+    limit_per_host: int = 10
+    keepalive_timeout: float = 30.0
+    ttl_dns_cache: Optional[int] = 300
+
+
+class AiohttpWebLoader(ConditionalWebPageLoader):
+    """
+    Web page loader that owns one long-lived ``aiohttp.ClientSession``.
+
+    The session and its connection pool are created when the loader is entered as an async context manager
+    (or ``open`` is awaited) and are reused by every ``load`` call until the loader is closed, so TCP/TLS
+    handshakes and DNS lookups are paid once per host instead of once per page.
+    """
+
+    def __init__(
+            self,
+            connector_settings: ConnectorSettings = ConnectorSettings(),
+            trace_configs: Optional[list[aiohttp.TraceConfig]] = None
+    ) -> None:
+        self._connector_settings = connector_settings
+        self._trace_configs = trace_configs
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    async def __aenter__(self) -> Self:
+        await self.open()
+        return self
+
+    async def __aexit__(
+            self,
+            exc_type: Optional[Type[BaseException]],
+            exc_val: Optional[BaseException],
+            exc_tb: Optional[TracebackType]
+    ) -> None:
+        await self.close()
+
+    async def open(self) -> None:
+        """
+        Creates the shared client session, if it is not open yet.
+        """
+        if self._session is not None and not self._session.closed:
+            return
+        connector = aiohttp.TCPConnector(
+            limit=self._connector_settings.limit,
+            limit_per_host=self._connector_settings.limit_per_host,
+            keepalive_timeout=self._connector_settings.keepalive_timeout,
+            ttl_dns_cache=self._connector_settings.ttl_dns_cache,
+            use_dns_cache=self._connector_settings.ttl_dns_cache is not None,
+        )
+        self._session = aiohttp.ClientSession(
+            connector=connector,
+            trust_env=True,
+            trace_configs=self._trace_configs
+        )
+
+    async def close(self) -> None:
+        """
+        Closes the shared client session and its connection pool.
+        """
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
     async def load(self, page_url: url) -> str:
         """
         Loads the content of a web page.
 
         :param page_url: URL of the web page.
         :return: Content of the web page.
+        :raises RuntimeError: If the loader session is not open.
         """
-        async with aiohttp.ClientSession(trust_env=True) as session:
-            try:
-                async with session.get(page_url) as response:
-                    try:
-                        response.raise_for_status()
-                    except aiohttp.ClientResponseError as e:
-                        raise PageLoadingError from e
-                    content: str = await response.text()
-                    return content
-            except aiohttp.ClientError as e:
-                raise PageLoadingError from e
+        conditional_page = await self.load_conditional(page_url, PageValidators())
+        if conditional_page.content is None:
+            raise PageLoadingError(f"No content returned for {page_url}")
+        return conditional_page.content
+
+    async def load_conditional(self, page_url: url, validators: PageValidators) -> ConditionalPage:
+        """
+        Loads the content of a web page, sending the validators of a cached copy as conditional request headers.
+
+        :param page_url: URL of the web page.
+        :param validators: ETag and Last-Modified values of the cached copy.
+        :return: Content of the web page with its validators, or a not-modified marker.
+        :raises RuntimeError: If the loader session is not open.
+        """
+        session = self._get_session()
+        try:
+            async with session.get(page_url, headers=self._get_conditional_headers(validators)) as response:
+                if response.status == 304:
+                    return ConditionalPage(not_modified=True, validators=validators)
+                try:
+                    response.raise_for_status()
+                except aiohttp.ClientResponseError as e:
+                    retry_after = self._parse_retry_after(response.headers.get("Retry-After"))
+                    raise HttpStatusError(e.status, retry_after) from e
+                content: str = await response.text()
+                return ConditionalPage(
+                    not_modified=False,
+                    content=content,
+                    validators=PageValidators(response.headers.get("ETag"), response.headers.get("Last-Modified"))
+                )
+        except aiohttp.ClientError as e:
+            raise PageLoadingError from e
+
+    @staticmethod
+    def _get_conditional_headers(validators: PageValidators) -> dict[str, str]:
+        headers = {}
+        if validators.etag:
+            headers["If-None-Match"] = validators.etag
+        if validators.last_modified:
+            headers["If-Modified-Since"] = validators.last_modified
+        return headers
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            raise RuntimeError("Loader session is not open, use the loader as an async context manager")
+        return self._session
+
+    @staticmethod
+    def _parse_retry_after(value: Optional[str]) -> Optional[float]:
+        if not value:
+            return None
+        if value.strip().isdigit():
+            return float(value)
+        try:
+            retry_at = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        if retry_at.tzinfo is None:
+            retry_at = retry_at.replace(tzinfo=timezone.utc)
+        return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
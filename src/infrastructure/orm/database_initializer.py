@@ -1,5 +1,7 @@
 from typing import Type
 
+from sqlalchemy import Connection, Index, delete, func, inspect, select, text
+from sqlalchemy.schema import CreateColumn
 from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, AsyncSession
 from sqlalchemy.orm import DeclarativeBase
 from sqlalchemy_utils import database_exists, create_database  # type: ignore
@@ -30,6 +32,54 @@ class DatabaseInitializer:
             await connection.run_sync(self._base.metadata.create_all)
             await connection.commit()
 
+    async def upgrade_models(self) -> None:
+        """
+        Brings the tables of an existing database up to the models without dropping them: creates missing tables and
+        adds the missing columns and indexes of existing ones. Missing columns take their server default, so a column
+        that cannot be null needs one. Before a unique index is created, rows repeating its key are deleted, keeping
+        the most recently inserted one.
+        """
+        logger.info("Upgrading models")
+        async with self._engine.begin() as connection:
+            await connection.run_sync(self._base.metadata.create_all)
+            await connection.run_sync(self._add_missing_columns)
+            await connection.run_sync(self._create_missing_indexes)
+
+    def _add_missing_columns(self, connection: Connection) -> None:
+        inspector = inspect(connection)
+        for table in self._base.metadata.sorted_tables:
+            existing_columns = {column["name"] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in existing_columns:
+                    continue
+                logger.info(f"Adding column {column.name} to {table.name}")
+                column_definition = CreateColumn(column).compile(  # type: ignore[no-untyped-call]
+                    dialect=connection.dialect
+                )
+                connection.execute(text(f"ALTER TABLE {table.name} ADD COLUMN {column_definition}"))
+
+    def _create_missing_indexes(self, connection: Connection) -> None:
+        inspector = inspect(connection)
+        for table in self._base.metadata.sorted_tables:
+            existing_indexes = {index["name"] for index in inspector.get_indexes(table.name)}
+            for index in sorted(table.indexes, key=lambda index: str(index.name)):
+                if index.name in existing_indexes:
+                    continue
+                if index.unique:
+                    self._delete_duplicates(connection, index)
+                logger.info(f"Creating index {index.name}")
+                index.create(connection)
+
+    @staticmethod
+    def _delete_duplicates(connection: Connection, index: Index) -> None:
+        table = index.table
+        assert table is not None
+        primary_key, = table.primary_key.columns
+        latest_rows = select(func.max(primary_key)).group_by(*index.columns)
+        deleted = connection.execute(delete(table).where(primary_key.not_in(latest_rows))).rowcount
+        if deleted:
+            logger.warning(f"Deleted {deleted} rows of {table.name} repeating the key of {index.name}")
+
     async def add_defaults(self) -> None:
         logger.info("Adding defaults")
         async with self._session_maker() as session:
@@ -55,5 +105,6 @@ class DatabaseInitializer:
                 logger.success("Database was created")
             else:
                 logger.info("Database was found")
+            await self.upgrade_models()
 
         logger.success("Database initialization was finished")
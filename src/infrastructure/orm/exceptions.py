@@ -16,3 +16,11 @@ class DatabaseHostNotSetError(Exception):
 
 class DatabasePortNotSetError(Exception):
     pass
+
+
+class UnsupportedDialectError(Exception):
+    pass
+
+
+class InvalidDatabasePoolSettingError(Exception):
+    pass
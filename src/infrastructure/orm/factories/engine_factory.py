@@ -1,26 +1,72 @@
+from typing import Any, NamedTuple, Optional
 from uuid import uuid4
 
-from asyncpg import Connection  # type: ignore
+from sqlalchemy import make_url
 from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
 from src.application.interfaces import Creator
+from src.infrastructure.orm.pool_statistics import PoolStatisticsCollector
 
 type url = str
 
 
+class PoolSettings(NamedTuple):
+    pool_size: int = 5
+    max_overflow: int = 10
+    pre_ping: bool = True
+    recycle: int = 1800
+    statement_cache_size: int = 100
+    pgbouncer: bool = False
+
+
+def _unique_prepared_statement_name() -> str:
+    return f"__asyncpg_{uuid4()}__"
+
+
 class EngineFactory(Creator[AsyncEngine]):
-    def __init__(self, async_url: url) -> None:
+    def __init__(
+            self,
+            async_url: url,
+            pool_settings: Optional[PoolSettings] = None,
+            pool_statistics: Optional[PoolStatisticsCollector] = None
+    ) -> None:
+        """
+        :param async_url: Asynchronous database URL.
+        :param pool_settings: Connection pool and prepared statements settings.
+        :param pool_statistics: Collector attached to the pool of every created engine.
+        """
         self._async_url = async_url
+        self._pool_settings = pool_settings or PoolSettings()
+        self._pool_statistics = pool_statistics
 
     def create(self) -> AsyncEngine:
-        return create_async_engine(
-            url=self._async_url,
-            echo=False,
-            pool_size=0,
-            connect_args={"connection_class": CConnection},
-        )
+        engine = create_async_engine(self._async_url, **self.engine_options())
+        if self._pool_statistics is not None:
+            self._pool_statistics.attach(engine)
+        return engine
 
+    def engine_options(self) -> dict[str, Any]:
+        return {
+            "echo": False,
+            "poolclass": AsyncAdaptedQueuePool,
+            "pool_size": self._pool_settings.pool_size,
+            "max_overflow": self._pool_settings.max_overflow,
+            "pool_pre_ping": self._pool_settings.pre_ping,
+            "pool_recycle": self._pool_settings.recycle,
+            "connect_args": self._connect_args(),
+        }
 
-class CConnection(Connection):  # type: ignore[misc]
-    def _get_unique_id(self, prefix: str) -> str:
-        return f"__asyncpg_{prefix}_{uuid4()}__"
+    def _connect_args(self) -> dict[str, Any]:
+        if make_url(self._async_url).get_driver_name() != "asyncpg":
+            return {}
+        if self._pool_settings.pgbouncer:
+            return {
+                "statement_cache_size": 0,
+                "prepared_statement_cache_size": 0,
+                "prepared_statement_name_func": _unique_prepared_statement_name,
+            }
+        return {
+            "statement_cache_size": self._pool_settings.statement_cache_size,
+            "prepared_statement_cache_size": self._pool_settings.statement_cache_size,
+        }
@@ -52,7 +52,8 @@ class SQLAlchemyStudyProgrammeMapper(
         metadata = PageMetadata(
             language=self._language_to_entity_mapper(source.page_language),
             code=source.programme_code,
-            url=source.page_url
+            url=source.page_url,
+            content_hash=source.content_hash
         )
         return Page(data=data, metadata=metadata)
 
@@ -76,4 +77,6 @@ class SQLAlchemyStudyProgrammeMapper(
             learning_objectives=entity.data.learning_objectives,
             main_learning_outcomes=entity.data.main_learning_outcomes,
             faculty=entity.data.faculty,
+            content_hash=entity.metadata.content_hash,
+            removed=False,
         )
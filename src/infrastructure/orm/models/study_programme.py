@@ -1,5 +1,7 @@
+from typing import Optional
+
 from sqlalchemy import Enum as SQLAlchemyEnum
-from sqlalchemy import Integer, String, Text
+from sqlalchemy import Boolean, Integer, String, Text, Index, false
 from sqlalchemy.orm import Mapped, mapped_column
 
 from src.infrastructure.orm.enums import StudyForm, Degree, Language
@@ -8,6 +10,9 @@ from src.infrastructure.orm.models import Base
 
 class StudyProgramme(Base):
     __tablename__ = 'study_programmes'
+    __table_args__ = (
+        Index("ix_study_programmes_programme_code_page_language", "programme_code", "page_language", unique=True),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     page_url: Mapped[str] = mapped_column(String, nullable=False)
@@ -26,3 +31,5 @@ class StudyProgramme(Base):
     learning_objectives: Mapped[str] = mapped_column(Text, nullable=False)
     main_learning_outcomes: Mapped[str] = mapped_column(Text, nullable=False)
     faculty: Mapped[str] = mapped_column(String, nullable=False)
+    content_hash: Mapped[Optional[str]] = mapped_column(String, nullable=True)
+    removed: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False, server_default=false())
@@ -0,0 +1,44 @@
+from typing import Any, NamedTuple
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import QueuePool
+
+
+class PoolStatistics(NamedTuple):
+    size: int
+    checked_out: int
+    overflow: int
+    connections_opened: int
+    checkouts: int
+
+
+class PoolStatisticsCollector:
+    """Counts connections opened and checked out by the pools of the attached engines."""
+
+    def __init__(self) -> None:
+        self._engines: list[AsyncEngine] = []
+        self._connections_opened = 0
+        self._checkouts = 0
+
+    def attach(self, engine: AsyncEngine) -> None:
+        event.listen(engine.sync_engine.pool, "connect", self._on_connect)
+        event.listen(engine.sync_engine.pool, "checkout", self._on_checkout)
+        self._engines.append(engine)
+
+    def statistics(self) -> PoolStatistics:
+        pools = [engine.sync_engine.pool for engine in self._engines]
+        queue_pools = [pool for pool in pools if isinstance(pool, QueuePool)]
+        return PoolStatistics(
+            size=sum(pool.size() for pool in queue_pools),
+            checked_out=sum(pool.checkedout() for pool in queue_pools),
+            overflow=sum(max(pool.overflow(), 0) for pool in queue_pools),
+            connections_opened=self._connections_opened,
+            checkouts=self._checkouts,
+        )
+
+    def _on_connect(self, *_: Any) -> None:
+        self._connections_opened += 1
+
+    def _on_checkout(self, *_: Any) -> None:
+        self._checkouts += 1
@@ -0,0 +1,66 @@
+import json
+import os
+from pathlib import Path
+from typing import Optional
+
+from loguru import logger
+
+from src.application.interfaces import QuestionTreeCheckpointJournal
+from src.domain.dtos.decision_tree_question import DecisionTreeQuestion
+
+
+class JsonLinesCheckpointJournal(QuestionTreeCheckpointJournal):
+    """
+    Append-only journal of the questions of a questions tree, one JSON line per split subset.
+
+    Every record is flushed to disk before ``record`` returns, so a crashed generation loses at most the request in
+    flight. A line torn by a crash is dropped when the journal is resumed.
+    """
+
+    def __init__(self, path: Path, resume: bool = False) -> None:
+        """
+        :param path: Journal file.
+        :param resume: Keep the records of the previous generation. Otherwise the journal starts empty.
+        """
+        self._path = path
+        self._questions: dict[str, DecisionTreeQuestion] = {}
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        if resume and self._path.exists():
+            self._load()
+        else:
+            self._path.write_bytes(b"")
+        self._file = self._path.open("a", encoding="utf-8")
+
+    def __len__(self) -> int:
+        return len(self._questions)
+
+    def _load(self) -> None:
+        valid_size = 0
+        with self._path.open("rb") as journal_file:
+            for line in journal_file:
+                try:
+                    if not line.endswith(b"\n"):
+                        raise ValueError("Record is not terminated")
+                    record = json.loads(line)
+                    self._questions[record["subset"]] = DecisionTreeQuestion(
+                        text=record["question"], yes_nodes=record["yes"], no_nodes=record["no"]
+                    )
+                except (ValueError, KeyError, TypeError):
+                    logger.warning(f"Dropping the torn end of the checkpoint journal {self._path}")
+                    break
+                valid_size += len(line)
+        os.truncate(self._path, valid_size)
+        logger.info(f"Resuming from {len(self._questions)} checkpointed questions in {self._path}")
+
+    def get(self, subset_key: str) -> Optional[DecisionTreeQuestion]:
+        return self._questions.get(subset_key)
+
+    def record(self, subset_key: str, question: DecisionTreeQuestion) -> None:
+        self._questions[subset_key] = question
+        record = {"subset": subset_key, "question": question.text, "yes": question.yes_nodes, "no": question.no_nodes}
+        self._file.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def close(self) -> None:
+        self._file.close()
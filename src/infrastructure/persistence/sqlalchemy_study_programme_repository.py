@@ -1,46 +1,128 @@
-from sqlalchemy import select
+from typing import Any
+
+from sqlalchemy import select, update, tuple_, ColumnElement
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.ext.asyncio import async_sessionmaker, AsyncSession
 
-from src.application.interfaces import Savable, GetAllRepository
+from src.application.interfaces import Savable, GetAllRepository, IncrementalStudyProgrammesStorage
+from src.domain.dtos.study_programme_page_key import StudyProgrammePageKey
 from src.domain.entities.res_tuke_study_programme_data import ResTukeStudyProgrammeData
+from src.domain.enums import Language
 from src.infrastructure.interfaces import EntityMapper
+from src.infrastructure.orm.enums import Language as LanguageORM
+from src.infrastructure.orm.exceptions import UnsupportedDialectError
 from src.infrastructure.orm.models import StudyProgramme as StudyProgrammeORM
 from src.interface_adapters.gateways.study_programmes_gateway_base import Page
 
 
 class SQLAlchemyStudyProgrammeRepository(
     Savable[Page[ResTukeStudyProgrammeData]],
-    GetAllRepository[Page[ResTukeStudyProgrammeData]]
+    GetAllRepository[Page[ResTukeStudyProgrammeData]],
+    IncrementalStudyProgrammesStorage[Page[ResTukeStudyProgrammeData]]
 ):
     def __init__(
             self,
             session_maker: async_sessionmaker[AsyncSession],
-            study_programme_mapper: EntityMapper[Page[ResTukeStudyProgrammeData], StudyProgrammeORM]
+            study_programme_mapper: EntityMapper[Page[ResTukeStudyProgrammeData], StudyProgrammeORM],
+            batch_size: int = 1000
     ):
+        """
+        :param session_maker: Session maker of the database.
+        :param study_programme_mapper: Mapper between study programme pages and ORM models.
+        :param batch_size: Rows written by one multi-row INSERT statement. Every row binds one parameter per column,
+            so the batch must stay under the bound parameters limit of the database driver.
+        """
         self._session_maker = session_maker
         self._study_programme_mapper = study_programme_mapper
+        self._batch_size = batch_size
 
     async def save(self, study_programme: Page[ResTukeStudyProgrammeData]) -> None:
-        model = await self._study_programme_mapper.from_entity(study_programme)
-        async with self._session_maker() as session:
-            session.add(model)
-            await session.commit()
+        await self._bulk_upsert([study_programme])
 
     async def save_multiple(self, study_programmes: list[Page[ResTukeStudyProgrammeData]]) -> None:
-        models = [
-            await self._study_programme_mapper.from_entity(study_programme)
-            for study_programme in study_programmes
-        ]
-        async with self._session_maker() as session:
-            session.add_all(models)
-            await session.commit()
+        await self._bulk_upsert(study_programmes)
 
     async def get_all(self) -> list[Page[ResTukeStudyProgrammeData]]:
         async with self._session_maker() as session:
-            result = await session.execute(select(StudyProgrammeORM))
+            result = await session.execute(select(StudyProgrammeORM).where(StudyProgrammeORM.removed.is_(False)))
             orm_study_programmes = result.scalars().all()
             study_programmes = [
                 await self._study_programme_mapper.to_entity(orm_sp)
                 for orm_sp in orm_study_programmes
             ]
             return study_programmes
+
+    async def get_content_hashes(self) -> dict[StudyProgrammePageKey, str]:
+        async with self._session_maker() as session:
+            result = await session.execute(
+                select(
+                    StudyProgrammeORM.programme_code,
+                    StudyProgrammeORM.page_language,
+                    StudyProgrammeORM.content_hash
+                ).where(StudyProgrammeORM.removed.is_(False))
+            )
+            return {
+                StudyProgrammePageKey(code, Language(language.value)): content_hash or ""
+                for code, language, content_hash in result.all()
+            }
+
+    async def upsert_multiple(self, study_programmes: list[Page[ResTukeStudyProgrammeData]]) -> None:
+        await self._bulk_upsert(study_programmes)
+
+    async def mark_removed(self, keys: list[StudyProgrammePageKey]) -> None:
+        if not keys:
+            return
+        async with self._session_maker() as session:
+            await session.execute(update(StudyProgrammeORM).where(self._keys_clause(keys)).values(removed=True))
+            await session.commit()
+
+    async def _bulk_upsert(self, study_programmes: list[Page[ResTukeStudyProgrammeData]]) -> None:
+        if not study_programmes:
+            return
+        rows = [
+            self._to_row(await self._study_programme_mapper.from_entity(study_programme))
+            for study_programme in study_programmes
+        ]
+        async with self._session_maker() as session:
+            statement = self._upsert_statement(session.get_bind().dialect.name)
+            for start in range(0, len(rows), self._batch_size):
+                await session.execute(statement, rows[start:start + self._batch_size])
+            await session.commit()
+
+    @staticmethod
+    def _to_row(model: StudyProgrammeORM) -> dict[str, Any]:
+        return {
+            column.key: getattr(model, column.key)
+            for column in StudyProgrammeORM.__table__.columns
+            if column.key != "id"
+        }
+
+    @staticmethod
+    def _upsert_statement(dialect_name: str) -> postgresql.Insert | sqlite.Insert:
+        """
+        Builds an INSERT which updates the rows already stored under the same programme code and page language.
+
+        Executed with a list of rows, SQLAlchemy sends it as multi-row ``INSERT ... VALUES`` batches and compiles it
+        only once.
+        """
+        if dialect_name == "postgresql":
+            statement: postgresql.Insert | sqlite.Insert = postgresql.insert(StudyProgrammeORM)
+        elif dialect_name == "sqlite":
+            statement = sqlite.insert(StudyProgrammeORM)
+        else:
+            raise UnsupportedDialectError(f"Upserting study programmes is not supported for {dialect_name}")
+        updated_columns = {
+            column.key: statement.excluded[column.key]
+            for column in StudyProgrammeORM.__table__.columns
+            if column.key not in ("id", "programme_code", "page_language")
+        }
+        return statement.on_conflict_do_update(
+            index_elements=[StudyProgrammeORM.programme_code, StudyProgrammeORM.page_language],
+            set_=updated_columns
+        )
+
+    @staticmethod
+    def _keys_clause(keys: list[StudyProgrammePageKey]) -> ColumnElement[bool]:
+        return tuple_(StudyProgrammeORM.programme_code, StudyProgrammeORM.page_language).in_(
+            [(key.code, LanguageORM(key.language.value)) for key in keys]
+        )
@@ -0,0 +1,143 @@
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Optional
+
+from loguru import logger
+
+from src.application.interfaces import KeyValueCache
+
+
+class SQLiteKeyValueCache(KeyValueCache):
+    """
+    Key-value cache stored in a single SQLite file.
+
+    Entries older than ``max_age`` seconds are treated as missing and removed. When the total size of the stored
+    values exceeds ``max_size_bytes``, the least recently used entries are evicted. The cache can be used from worker
+    threads, e.g. through ``asyncio.to_thread``; its operations are serialised by a lock.
+    """
+
+    def __init__(
+            self,
+            path: Path,
+            max_size_bytes: Optional[int] = None,
+            max_age: Optional[float] = None,
+            clock: Callable[[], float] = time.time
+    ) -> None:
+        self._path = path
+        self._max_size_bytes = max_size_bytes
+        self._max_age = max_age
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._connection = self._connect()
+        self.evict_expired()
+        self._total_size = self._load_total_size()
+
+    def _connect(self) -> sqlite3.Connection:
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        connection = sqlite3.connect(self._path, check_same_thread=False)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS cache_entries ("
+            "key TEXT PRIMARY KEY, value BLOB NOT NULL, size INTEGER NOT NULL, "
+            "stored_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+        )
+        connection.execute("CREATE INDEX IF NOT EXISTS cache_entries_accessed_at ON cache_entries (accessed_at)")
+        connection.execute("CREATE INDEX IF NOT EXISTS cache_entries_stored_at ON cache_entries (stored_at)")
+        connection.commit()
+        return connection
+
+    def _load_total_size(self) -> int:
+        total_size: Optional[int] = self._connection.execute("SELECT SUM(size) FROM cache_entries").fetchone()[0]
+        return total_size or 0
+
+    @property
+    def total_size(self) -> int:
+        return self._total_size
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            return self._get(key)
+
+    def _get(self, key: str) -> Optional[bytes]:
+        row = self._connection.execute(
+            "SELECT value, stored_at FROM cache_entries WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        value, stored_at = row
+        now = self._clock()
+        if self._is_expired(stored_at, now):
+            self._delete(key)
+            return None
+        self._connection.execute("UPDATE cache_entries SET accessed_at = ? WHERE key = ?", (now, key))
+        self._connection.commit()
+        return bytes(value)
+
+    def put(self, key: str, value: bytes) -> None:
+        with self._lock:
+            self._put(key, value)
+
+    def _put(self, key: str, value: bytes) -> None:
+        now = self._clock()
+        previous_size = self._get_size(key)
+        self._connection.execute(
+            "INSERT INTO cache_entries (key, value, size, stored_at, accessed_at) VALUES (?, ?, ?, ?, ?) "
+            "ON CONFLICT (key) DO UPDATE SET "
+            "value = excluded.value, size = excluded.size, stored_at = excluded.stored_at, "
+            "accessed_at = excluded.accessed_at",
+            (key, value, len(value), now, now)
+        )
+        self._connection.commit()
+        self._total_size += len(value) - previous_size
+        self._evict_over_size()
+
+    def evict_expired(self) -> int:
+        """
+        Removes entries older than the maximum age.
+
+        :return: Number of removed entries.
+        """
+        if self._max_age is None:
+            return 0
+        with self._lock:
+            cursor = self._connection.execute(
+                "DELETE FROM cache_entries WHERE stored_at < ?", (self._clock() - self._max_age,)
+            )
+            self._connection.commit()
+            if cursor.rowcount:
+                logger.debug(f"Evicted {cursor.rowcount} expired cache entries")
+                self._total_size = self._load_total_size()
+            return cursor.rowcount
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
+
+    def _is_expired(self, stored_at: float, now: float) -> bool:
+        return self._max_age is not None and stored_at < now - self._max_age
+
+    def _get_size(self, key: str) -> int:
+        row = self._connection.execute("SELECT size FROM cache_entries WHERE key = ?", (key,)).fetchone()
+        return int(row[0]) if row else 0
+
+    def _delete(self, key: str) -> None:
+        size = self._get_size(key)
+        self._connection.execute("DELETE FROM cache_entries WHERE key = ?", (key,))
+        self._connection.commit()
+        self._total_size -= size
+
+    def _evict_over_size(self) -> None:
+        if self._max_size_bytes is None or self._total_size <= self._max_size_bytes:
+            return
+        evicted = 0
+        rows = self._connection.execute("SELECT key, size FROM cache_entries ORDER BY accessed_at").fetchall()
+        for key, size in rows:
+            if self._total_size <= self._max_size_bytes:
+                break
+            self._connection.execute("DELETE FROM cache_entries WHERE key = ?", (key,))
+            self._total_size -= size
+            evicted += 1
+        self._connection.commit()
+        logger.debug(f"Evicted {evicted} least recently used cache entries")
@@ -6,6 +6,25 @@ class PageLoadingError(Exception):
     pass
 
 
+class HttpStatusError(PageLoadingError):
+    """Raised when a web page responds with an unsuccessful HTTP status."""
+
+    def __init__(self, status: int, retry_after: float | None = None) -> None:
+        super().__init__(f"HTTP status {status}")
+        self.status = status
+        self.retry_after = retry_after
+
+
+class PageLoadingTimeoutError(PageLoadingError):
+    """Raised when a web page is not loaded within its deadline."""
+    pass
+
+
+class PageNotCachedError(PageLoadingError):
+    """Raised when a web page is requested in offline mode, but it is not cached."""
+    pass
+
+
 class InvalidExcelFileStructure(Exception):
     pass
 
@@ -13,3 +32,18 @@ class InvalidExcelFileStructure(Exception):
 class ParserError(Exception):
     """Custom exception raised when parsing fails due to missing required fields."""
     pass
+
+
+class QuestionGenerationError(Exception):
+    """Raised when no valid decision tree question is generated within the allowed attempts."""
+    pass
+
+
+class QuestionsExportedError(Exception):
+    """Raised when question requests are exported to a batch file instead of being generated."""
+    pass
+
+
+class InvalidQuestionTreeFileError(Exception):
+    """Raised when a compiled question tree file has an unknown format, version or a corrupted layout."""
+    pass
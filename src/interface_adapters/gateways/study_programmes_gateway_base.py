@@ -1,17 +1,32 @@
 import asyncio
+import hashlib
 from abc import ABC
-from asyncio import Semaphore
-from typing import Generator, Coroutine, Any, Optional, Iterable, NamedTuple
+from contextlib import aclosing
+from typing import Generator, Coroutine, Any, Optional, Iterable, NamedTuple, Mapping, AsyncIterator
 
-from src.application.interfaces import WebPageLoader, Parser, LanguageParserFactory
+from loguru import logger
+
+from src.application.interfaces import (
+    WebPageLoader, Parser, LanguageParserFactory, ConcurrencyController, ParseExecutor
+)
+from src.application.streams import map_unordered, batched
+from src.domain.dtos.incremental_fetch_result import IncrementalFetchResult
+from src.domain.dtos.study_programme_page_key import StudyProgrammePageKey
 from src.domain.enums import Language
 from src.interface_adapters.exceptions import InvalidUrlError, PageLoadingError
+from src.interface_adapters.services.host_concurrency_controller import HostConcurrencyController
+from src.interface_adapters.services.parse_executor import InlineParseExecutor
 
 
 class PageMetadata(NamedTuple):
     language: Language
     code: str
     url: str
+    content_hash: Optional[str] = None
+
+    @property
+    def key(self) -> StudyProgrammePageKey:
+        return StudyProgrammePageKey(self.code, self.language)
 
 
 class Page[Data](NamedTuple):
@@ -22,22 +37,78 @@ class Page[Data](NamedTuple):
 class StudyProgrammesGatewayBase[Data](ABC):
     _URL_TEMPLATE = "https://www.example.com/{lang}/{code}"
 
-    def __init__(self, loader: WebPageLoader, language_parser_factory: LanguageParserFactory[Parser[str, Data]]):
+    def __init__(
+            self,
+            loader: WebPageLoader,
+            language_parser_factory: LanguageParserFactory[Parser[str, Data]],
+            concurrency_controller: Optional[ConcurrencyController] = None,
+            stream_buffer_size: int = 100,
+            parse_executor: Optional[ParseExecutor[Data]] = None
+    ):
         self._loader = loader
         self._language_parser_factory = language_parser_factory
+        self._concurrency_controller = concurrency_controller or HostConcurrencyController()
+        self._stream_buffer_size = stream_buffer_size
+        self._parse_executor = parse_executor or InlineParseExecutor(language_parser_factory)
+        self._failed_pages: list[PageMetadata] = []
 
-        self._semaphore = Semaphore(5)
+    def get_failed_codes(self) -> list[str]:
+        return list(dict.fromkeys(metadata.code for metadata in self._failed_pages))
 
     async def get_by_codes(self, programmes_codes: list[str]) -> list[Page[Data]]:
+        pages = await self._load_pages(programmes_codes)
+        return await self._apply_parser(pages)
+
+    async def stream_by_codes(self, programmes_codes: list[str]) -> AsyncIterator[Page[Data]]:
+        self._failed_pages.clear()
+        pages = map_unordered(
+            self._get_all_pages_metadata_generator(programmes_codes),
+            self._load_with_metadata,
+            workers=self._stream_buffer_size,
+            queue_size=self._stream_buffer_size
+        )
+        async with aclosing(pages):
+            async for pages_batch in batched(pages, self._parse_executor.batch_size):
+                for parsed_page in await self._apply_parser(self._remove_none_values(pages_batch)):
+                    yield parsed_page
+
+    async def get_changed_by_codes(
+            self,
+            programmes_codes: list[str],
+            known_content_hashes: Mapping[StudyProgrammePageKey, str]
+    ) -> IncrementalFetchResult[Page[Data]]:
+        pages = await self._load_pages(programmes_codes)
+        changed_pages = []
+        unchanged_keys = []
+        for page in pages:
+            if known_content_hashes.get(page.metadata.key) == page.metadata.content_hash:
+                unchanged_keys.append(page.metadata.key)
+            else:
+                changed_pages.append(page)
+        return IncrementalFetchResult(
+            changed={page.metadata.key: page for page in await self._apply_parser(changed_pages)},
+            unchanged=unchanged_keys
+        )
+
+    async def _load_pages(self, programmes_codes: list[str]) -> list[Page[str]]:
+        self._failed_pages.clear()
         all_page_loading_coroutines = self._get_all_pages_loading_coroutines_generator(programmes_codes)
-        gathered_values = await asyncio.gather(*all_page_loading_coroutines)
-        pages = self._remove_none_values(gathered_values)
-        return self._apply_parser(pages)
+        gathered_values = await self._gather(*all_page_loading_coroutines)
+        return self._remove_none_values(gathered_values)
+
+    async def _gather(self, *coroutines: Coroutine[Any, Any, Optional[Page[str]]]) -> list[Optional[Page[str]]]:
+        return await asyncio.gather(*coroutines)
 
     def _get_all_pages_loading_coroutines_generator(self, programmes_codes: list[str]) \
             -> Generator[Coroutine[Any, Any, Optional[Page[str]]], None, None]:
         return (
-            self._load_with_metadata(PageMetadata(language, code, self._get_page_url(code, language)))
+            self._load_with_metadata(metadata)
+            for metadata in self._get_all_pages_metadata_generator(programmes_codes)
+        )
+
+    def _get_all_pages_metadata_generator(self, programmes_codes: list[str]) -> Generator[PageMetadata, None, None]:
+        return (
+            PageMetadata(language, code, self._get_page_url(code, language))
             for language in Language
             for code in programmes_codes
         )
@@ -46,35 +117,36 @@ class StudyProgrammesGatewayBase[Data](ABC):
     def _get_page_url(cls, study_programme_code: str, language: Language) -> str:
         return cls._URL_TEMPLATE.format(code=study_programme_code, lang=language.value)
 
-    async def _load_with_concurrency_limit(self, metadata: PageMetadata) -> Optional[Page[str]]:
-        async with self._semaphore:
-            return await self._load_with_metadata(metadata)
-
     async def _load_with_metadata(self, metadata: PageMetadata) -> Optional[Page[str]]:
         page_text = await self._load_with_error_handling(metadata.url)
         if not page_text:
+            self._failed_pages.append(metadata)
             return None
-        return Page(data=page_text, metadata=metadata)
+        return Page(data=page_text, metadata=metadata._replace(content_hash=self._hash_content(page_text)))
+
+    @staticmethod
+    def _hash_content(page_text: str) -> str:
+        return hashlib.sha256(page_text.encode("utf-8")).hexdigest()
 
     async def _load_with_error_handling(self, url: str) -> Optional[str]:
         try:
-            return await self._loader.load(url)
-        except PageLoadingError:
+            return await self._load_with_concurrency_limit(url)
+        except PageLoadingError as e:
+            logger.warning(f"Failed to load {url}: {e!r}")
             return None
         except InvalidUrlError as e:
             raise InvalidUrlError from e
 
+    async def _load_with_concurrency_limit(self, url: str) -> str:
+        async with self._concurrency_controller.limit(url):
+            return await self._loader.load(url)
+
     @staticmethod
     def _remove_none_values[Item](source: Iterable[Optional[Item]]) -> list[Item]:
         return [value for value in source if value is not None]
 
-    def _apply_parser(self, pages: list[Page[str]]) -> list[Page[Data]]:
-        return list(
-            map(
-                lambda page: Page(
-                    data=self._language_parser_factory.create(page.metadata.language).parse_one(page.data),
-                    metadata=page.metadata
-                ),
-                pages
-            )
+    async def _apply_parser(self, pages: list[Page[str]]) -> list[Page[Data]]:
+        parsed_data = await self._parse_executor.parse_multiple(
+            [(page.metadata.language, page.data) for page in pages]
         )
+        return [Page(data=data, metadata=page.metadata) for data, page in zip(parsed_data, pages)]
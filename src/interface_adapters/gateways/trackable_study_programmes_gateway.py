@@ -1,6 +1,8 @@
-from typing import Awaitable, Callable, Any
+from typing import Awaitable, Callable, Any, Optional, Coroutine
 
-from src.application.interfaces import WebPageLoader, Parser, LanguageParserFactory
+from src.application.interfaces import (
+    WebPageLoader, Parser, LanguageParserFactory, ConcurrencyController, ParseExecutor
+)
 from src.domain.entities.res_tuke_study_programme_data import ResTukeStudyProgrammeData
 from src.interface_adapters.gateways.study_programmes_gateway_base import Page
 from src.interface_adapters.gateways.tuke_study_programmes_gateway import ResTukeStudyProgrammesGateway
@@ -11,14 +13,16 @@ class TrackableResTukeStudyProgrammeGateway(ResTukeStudyProgrammesGateway[ResTuk
             self,
             loader: WebPageLoader,
             language_parser_factory: LanguageParserFactory[Parser[str, ResTukeStudyProgrammeData]],
-            gathering_function: Callable[..., Awaitable[Any]]
+            gathering_function: Callable[..., Awaitable[Any]],
+            concurrency_controller: Optional[ConcurrencyController] = None,
+            stream_buffer_size: int = 100,
+            parse_executor: Optional[ParseExecutor[ResTukeStudyProgrammeData]] = None
     ) -> None:
-        super().__init__(loader, language_parser_factory)
+        super().__init__(
+            loader, language_parser_factory, concurrency_controller, stream_buffer_size, parse_executor
+        )
         self._gathering_function = gathering_function
 
-    async def get_by_codes(self, programmes_codes: list[str]) -> list[Page[ResTukeStudyProgrammeData]]:
-        gathered_values = await self._gathering_function(
-            *self._get_all_pages_loading_coroutines_generator(programmes_codes)
-        )
-        pages: list[Page[str]] = self._remove_none_values(gathered_values)
-        return self._apply_parser(pages)
+    async def _gather(self, *coroutines: Coroutine[Any, Any, Optional[Page[str]]]) -> list[Optional[Page[str]]]:
+        gathered_values: list[Optional[Page[str]]] = await self._gathering_function(*coroutines)
+        return gathered_values
@@ -1,10 +1,11 @@
-from src.application.interfaces import StudyProgrammesRepositoryByCodes
+from src.application.interfaces import StudyProgrammesRepositoryByCodes, StudyProgrammesStreamByCodes
 from src.interface_adapters.gateways.study_programmes_gateway_base import StudyProgrammesGatewayBase, Page
 
 
 class ResTukeStudyProgrammesGateway[PageContent](
     StudyProgrammesGatewayBase[PageContent],
-    StudyProgrammesRepositoryByCodes[Page[PageContent]]
+    StudyProgrammesRepositoryByCodes[Page[PageContent]],
+    StudyProgrammesStreamByCodes[Page[PageContent]]
 ):
     _URL_TEMPLATE = "https://res.tuke.sk/api/programme_detail/{code}?lang={lang}"
 
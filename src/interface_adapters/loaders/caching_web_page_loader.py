@@ -0,0 +1,89 @@
+import asyncio
+import json
+import zlib
+from typing import NamedTuple, Optional
+
+from loguru import logger
+
+from src.application.interfaces import WebPageLoader, ConditionalWebPageLoader, KeyValueCache
+from src.domain.dtos.conditional_page import PageValidators
+from src.interface_adapters.exceptions import PageNotCachedError
+
+
+class _CacheEntry(NamedTuple):
+    content: str
+    validators: PageValidators
+
+
+class CachingStatistics(NamedTuple):
+    downloaded: int
+    not_modified: int
+    served_offline: int
+
+
+class CachingWebPageLoader(WebPageLoader):
+    """
+    Web page loader decorator keeping pages in a persistent cache and revalidating them with conditional requests.
+
+    A cached page is sent with its ``ETag``/``Last-Modified`` validators and served from the cache when the server
+    answers 304 Not Modified. In offline mode the network is never used and only cached pages are returned. The cache
+    is read and written in a worker thread, so its disk I/O and the compression do not block the event loop.
+    """
+
+    def __init__(self, loader: ConditionalWebPageLoader, cache: KeyValueCache, offline: bool = False) -> None:
+        self._loader = loader
+        self._cache = cache
+        self._offline = offline
+        self._downloaded = 0
+        self._not_modified = 0
+        self._served_offline = 0
+
+    @property
+    def statistics(self) -> CachingStatistics:
+        return CachingStatistics(self._downloaded, self._not_modified, self._served_offline)
+
+    async def load(self, url: str) -> str:
+        """
+        Loads the content of a web page from the cache or the network.
+
+        :param url: URL of the web page.
+        :return: Content of the web page.
+        :raises PageNotCachedError: If the page is not cached in offline mode.
+        """
+        cached_entry = await asyncio.to_thread(self._get_cached_entry, url)
+        if self._offline:
+            return self._load_offline(url, cached_entry)
+
+        validators = cached_entry.validators if cached_entry else PageValidators()
+        conditional_page = await self._loader.load_conditional(url, validators)
+        if conditional_page.not_modified and cached_entry is not None:
+            self._not_modified += 1
+            await asyncio.to_thread(self._store, url, cached_entry)
+            return cached_entry.content
+        if conditional_page.content is None:
+            logger.warning(f"Server reported {url} as not modified, but it is not cached, reloading")
+            content = await self._loader.load(url)
+            await asyncio.to_thread(self._store, url, _CacheEntry(content, PageValidators()))
+            self._downloaded += 1
+            return content
+
+        self._downloaded += 1
+        await asyncio.to_thread(self._store, url, _CacheEntry(conditional_page.content, conditional_page.validators))
+        return conditional_page.content
+
+    def _load_offline(self, url: str, cached_entry: Optional[_CacheEntry]) -> str:
+        if cached_entry is None:
+            raise PageNotCachedError(f"Page {url} is not cached")
+        self._served_offline += 1
+        return cached_entry.content
+
+    def _get_cached_entry(self, url: str) -> Optional[_CacheEntry]:
+        value = self._cache.get(url)
+        if value is None:
+            return None
+        content, etag, last_modified = json.loads(zlib.decompress(value))
+        return _CacheEntry(content, PageValidators(etag, last_modified))
+
+    def _store(self, url: str, entry: _CacheEntry) -> None:
+        value = json.dumps([entry.content, entry.validators.etag, entry.validators.last_modified])
+        self._cache.put(url, zlib.compress(value.encode("utf-8")))
@@ -0,0 +1,147 @@
+import asyncio
+import random
+import time
+from typing import Awaitable, Callable, NamedTuple, Optional
+
+from loguru import logger
+
+from src.application.interfaces import ConcurrencyController, WebPageLoader
+from src.interface_adapters.exceptions import (
+    HttpStatusError, PageLoadingError, PageLoadingTimeoutError, PageNotCachedError
+)
+
+
+class RetryPolicy(NamedTuple):
+    max_retries: int = 3
+    base_delay: float = 0.5
+    max_delay: float = 30.0
+    request_timeout: Optional[float] = 30.0
+    total_deadline: Optional[float] = 120.0
+    retryable_statuses: frozenset[int] = frozenset({408, 425, 429, 500, 502, 503, 504})
+
+
+class ErrorBudget:
+    """
+    Limits the number of retries spent during one run, so a failing host cannot stall the whole crawl.
+    """
+
+    def __init__(self, max_retries: int) -> None:
+        self._max_retries = max_retries
+        self._spent = 0
+
+    @property
+    def spent(self) -> int:
+        return self._spent
+
+    @property
+    def is_exhausted(self) -> bool:
+        return self._spent >= self._max_retries
+
+    def consume(self) -> bool:
+        """
+        Spends one retry from the budget.
+
+        :return: True if the retry may be performed, False if the budget is exhausted.
+        """
+        if self.is_exhausted:
+            return False
+        self._spent += 1
+        if self.is_exhausted:
+            logger.warning(f"Error budget of {self._max_retries} retries is exhausted, failures will not be retried")
+        return True
+
+
+class RetryingWebPageLoader(WebPageLoader):
+    """
+    Web page loader decorator retrying transient failures with capped exponential backoff and full jitter.
+
+    A ``Retry-After`` value sent by the server takes precedence over the computed backoff. Every attempt is bounded
+    by ``request_timeout`` and all attempts for one URL by ``total_deadline``. With a concurrency controller, every
+    attempt holds its own slot, so backoff sleeps leave the slot to other URLs and the controller sees the outcome
+    of each attempt, including failures that a later attempt recovers from.
+    """
+
+    def __init__(
+            self,
+            loader: WebPageLoader,
+            policy: RetryPolicy = RetryPolicy(),
+            error_budget: Optional[ErrorBudget] = None,
+            concurrency_controller: Optional[ConcurrencyController] = None,
+            sleep: Callable[[float], Awaitable[None]] = asyncio.sleep,
+            jitter: Callable[[], float] = random.random
+    ) -> None:
+        self._loader = loader
+        self._policy = policy
+        self._error_budget = error_budget
+        self._concurrency_controller = concurrency_controller
+        self._sleep = sleep
+        self._jitter = jitter
+
+    async def load(self, url: str) -> str:
+        """
+        Loads the content of a web page, retrying transient failures.
+
+        :param url: URL of the web page.
+        :return: Content of the web page.
+        :raises PageLoadingError: If the page could not be loaded within the retry policy.
+        """
+        deadline = self._get_deadline()
+        attempt = 0
+        while True:
+            try:
+                return await self._load_attempt(url, deadline)
+            except PageLoadingError as e:
+                delay = self._get_retry_delay(e, attempt, deadline)
+                if delay is None:
+                    raise
+                attempt += 1
+                logger.debug(f"Retrying {url} in {delay:.2f}s (attempt {attempt}) after {e!r}")
+                await self._sleep(delay)
+
+    def _get_deadline(self) -> Optional[float]:
+        if self._policy.total_deadline is None:
+            return None
+        return time.monotonic() + self._policy.total_deadline
+
+    async def _load_attempt(self, url: str, deadline: Optional[float]) -> str:
+        if self._concurrency_controller is None:
+            return await self._load_with_timeout(url, deadline)
+        async with self._concurrency_controller.limit(url):
+            return await self._load_with_timeout(url, deadline)
+
+    async def _load_with_timeout(self, url: str, deadline: Optional[float]) -> str:
+        timeout = self._get_attempt_timeout(deadline)
+        try:
+            async with asyncio.timeout(timeout):
+                return await self._loader.load(url)
+        except TimeoutError as e:
+            raise PageLoadingTimeoutError(f"Loading {url} timed out") from e
+
+    def _get_attempt_timeout(self, deadline: Optional[float]) -> Optional[float]:
+        remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+        if self._policy.request_timeout is None:
+            return remaining
+        if remaining is None:
+            return self._policy.request_timeout
+        return min(self._policy.request_timeout, remaining)
+
+    def _get_retry_delay(self, error: PageLoadingError, attempt: int, deadline: Optional[float]) -> Optional[float]:
+        if attempt >= self._policy.max_retries or not self._is_retryable(error):
+            return None
+        delay = self._get_backoff_delay(error, attempt)
+        if deadline is not None and time.monotonic() + delay >= deadline:
+            return None
+        if self._error_budget is not None and not self._error_budget.consume():
+            return None
+        return delay
+
+    def _is_retryable(self, error: PageLoadingError) -> bool:
+        if isinstance(error, HttpStatusError):
+            return error.status in self._policy.retryable_statuses
+        return not isinstance(error, PageNotCachedError)
+
+    def _get_backoff_delay(self, error: PageLoadingError, attempt: int) -> float:
+        if isinstance(error, HttpStatusError) and error.retry_after is not None:
+            return error.retry_after
+        exponential_delay = min(self._policy.max_delay, self._policy.base_delay * 2.0 ** attempt)
+        return self._jitter() * exponential_delay
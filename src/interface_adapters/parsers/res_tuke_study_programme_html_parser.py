@@ -1,4 +1,5 @@
-from typing import Dict, Any, cast
+import re
+from typing import Dict, Any, Optional, Protocol, cast
 
 from lxml import etree
 from lxml.etree import _Element
@@ -9,10 +10,69 @@ from src.domain.enums import Language, Degree, StudyForm
 from src.interface_adapters.exceptions import ParserError
 
 
+_MAIN_SPAN_XPATH = re.compile(r"^/html/body/main/span\[(\d+)]$")
+
+
+class _Fields(Protocol):
+    def find(self, key: str) -> Optional[_Element]:
+        ...
+
+
+class _XPathFields(_Fields):
+    def __init__(self, tree: _Element, xpath_mapping: dict[str, str]) -> None:
+        self._tree = tree
+        self._xpath_mapping = xpath_mapping
+
+    def find(self, key: str) -> Optional[_Element]:
+        xpath = self._xpath_mapping.get(key)
+        if not xpath:
+            raise KeyError(f"XPath not defined for key: {key}")
+        elements: list[_Element] = cast(list[_Element], self._tree.xpath(xpath))
+        return elements[0] if elements else None
+
+
+class _IndexedFields(_Fields):
+    """
+    Fields located with precompiled XPath expressions, except ``/html/body/main/span[n]`` fields, which are looked up
+    by position among the span children of ``main`` collected in a single pass.
+    """
+
+    def __init__(
+            self,
+            tree: _Element,
+            compiled_xpaths: dict[str, etree.XPath],
+            span_positions: dict[str, int],
+            main_xpath: etree.XPath
+    ) -> None:
+        self._tree = tree
+        self._compiled_xpaths = compiled_xpaths
+        self._span_positions = span_positions
+        mains = cast(list[_Element], main_xpath(tree))
+        self._span_groups = [main.findall("span") for main in mains]
+
+    def find(self, key: str) -> Optional[_Element]:
+        position = self._span_positions.get(key)
+        if position is not None:
+            return next((spans[position - 1] for spans in self._span_groups if len(spans) >= position), None)
+        compiled_xpath = self._compiled_xpaths.get(key)
+        if compiled_xpath is None:
+            raise KeyError(f"XPath not defined for key: {key}")
+        elements = cast(list[_Element], compiled_xpath(self._tree))
+        return elements[0] if elements else None
+
+
 class ResTukeStudyProgrammeHtmlParser(Parser[str, ResTukeStudyProgrammeData]):
-    def __init__(self, page_language: Language):
+    def __init__(self, page_language: Language, fast_extraction: bool = True):
+        """
+        :param page_language: Language of the parsed pages.
+        :param fast_extraction: Locate fields with precompiled XPath expressions and a single pass over the span
+            children of ``main`` instead of evaluating every XPath expression separately.
+        """
         self.page_language = page_language
+        self._fast_extraction = fast_extraction
         self._init_mappings()
+        self._init_compiled_xpaths()
+        self._init_exact_match_lookups()
 
     def _init_mappings(self) -> None:
         self._XPATH_MAPPING = {
@@ -60,28 +120,67 @@ class ResTukeStudyProgrammeHtmlParser(Parser[str, ResTukeStudyProgrammeData]):
         else:
             raise ValueError(f"Unsupported language: {self.page_language}")
 
+    def _init_compiled_xpaths(self) -> None:
+        self._main_xpath = etree.XPath("/html/body/main")
+        self._compiled_xpaths = {key: etree.XPath(xpath) for key, xpath in self._XPATH_MAPPING.items()}
+        self._span_positions = {
+            key: int(match.group(1))
+            for key, xpath in self._XPATH_MAPPING.items()
+            if (match := _MAIN_SPAN_XPATH.match(xpath))
+        }
+
+    def _init_exact_match_lookups(self) -> None:
+        self._exact_match_lookups = {
+            key: self._build_exact_match_lookup(mapping)
+            for key, mapping in (
+                ("study_form", self._STUDY_FORM_MAPPING),
+                ("degree", self._DEGREE_MAPPING),
+                ("languages_of_delivery", self._LANGUAGE_MAPPING),
+            )
+        }
+
+    @staticmethod
+    def _build_exact_match_lookup(mapping: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Builds a lookup by the whole lowercased text for keys that no earlier key of the mapping is a substring of,
+        since only for those the first substring match is guaranteed to be the key itself.
+        """
+        lookup: Dict[str, Any] = {}
+        earlier_keys: list[str] = []
+        for map_key, value in mapping.items():
+            lowered_key = map_key.lower()
+            if not any(earlier_key in lowered_key for earlier_key in earlier_keys):
+                lookup.setdefault(lowered_key, value)
+            earlier_keys.append(lowered_key)
+        return lookup
+
     def parse_one(self, page: str) -> ResTukeStudyProgrammeData:
         tree = etree.HTML(page)
         try:
-            data = self._extract_study_programme(tree)
+            data = self._extract_study_programme(self._locate_fields(tree))
         except (ValueError, KeyError) as e:
             raise ParserError(f"Error parsing study programme: {e}")
         return data
 
-    def _extract_study_programme(self, tree: _Element) -> ResTukeStudyProgrammeData:
-        name = self._extract_text(tree, "title")
-        study_field = self._extract_text(tree, "study_field")
-        description = self._extract_text(tree, "description")
-        learning_objectives = self._extract_text(tree, "learning_objectives")
-        main_learning_outcomes = self._extract_text(tree, "main_learning_outcomes")
-        level_of_degree = int(self._extract_text(tree, "level_of_degree"))
-        study_form = self._extract_mapped_value(tree, "study_form", self._STUDY_FORM_MAPPING)
-        degree = self._extract_mapped_value(tree, "degree", self._DEGREE_MAPPING)
-        length_of_study_in_years = self._extract_int(tree, "length_of_study_in_years")
-        professionally_oriented = self._extract_bool(tree, "professionally_oriented")
-        joint_study_program = self._extract_bool(tree, "joint_study_program")
-        languages_of_delivery = self._extract_mapped_value(tree, "languages_of_delivery", self._LANGUAGE_MAPPING)
-        faculty = self._extract_text(tree, "faculty")
+    def _locate_fields(self, tree: _Element) -> _Fields:
+        if self._fast_extraction:
+            return _IndexedFields(tree, self._compiled_xpaths, self._span_positions, self._main_xpath)
+        return _XPathFields(tree, self._XPATH_MAPPING)
+
+    def _extract_study_programme(self, fields: _Fields) -> ResTukeStudyProgrammeData:
+        name = self._extract_text(fields, "title")
+        study_field = self._extract_text(fields, "study_field")
+        description = self._extract_text(fields, "description")
+        learning_objectives = self._extract_text(fields, "learning_objectives")
+        main_learning_outcomes = self._extract_text(fields, "main_learning_outcomes")
+        level_of_degree = int(self._extract_text(fields, "level_of_degree"))
+        study_form = self._extract_mapped_value(fields, "study_form", self._STUDY_FORM_MAPPING)
+        degree = self._extract_mapped_value(fields, "degree", self._DEGREE_MAPPING)
+        length_of_study_in_years = self._extract_int(fields, "length_of_study_in_years")
+        professionally_oriented = self._extract_bool(fields, "professionally_oriented")
+        joint_study_program = self._extract_bool(fields, "joint_study_program")
+        languages_of_delivery = self._extract_mapped_value(fields, "languages_of_delivery", self._LANGUAGE_MAPPING)
+        faculty = self._extract_text(fields, "faculty")
 
         return ResTukeStudyProgrammeData(
             name=name,
@@ -99,26 +198,27 @@ class ResTukeStudyProgrammeHtmlParser(Parser[str, ResTukeStudyProgrammeData]):
             faculty=faculty,
         )
 
-    def _extract_text(self, tree: _Element, key: str) -> str:
-        xpath = self._XPATH_MAPPING.get(key)
-        if not xpath:
-            raise KeyError(f"XPath not defined for key: {key}")
-        elements: list[_Element] = cast(list[_Element], tree.xpath(xpath))
-        if elements and elements[0].text:
-            return elements[0].text.strip()
+    def _extract_text(self, fields: _Fields, key: str) -> str:
+        element = fields.find(key)
+        if element is not None and element.text:
+            return element.text.strip()
         raise ValueError(f"Missing or empty required field: {key}")
 
-    def _extract_mapped_value(self, tree: _Element, key: str, mapping: Dict[str, Any]) -> Any:
-        text = self._extract_text(tree, key).lower()
+    def _extract_mapped_value(self, fields: _Fields, key: str, mapping: Dict[str, Any]) -> Any:
+        text = self._extract_text(fields, key).lower()
+        if self._fast_extraction:
+            exact_match_lookup = self._exact_match_lookups.get(key, {})
+            if text in exact_match_lookup:
+                return exact_match_lookup[text]
         for map_key, value in mapping.items():
             if map_key.lower() in text:
                 return value
         raise ValueError(f"Invalid value for field '{key}': {text}")
 
-    def _extract_bool(self, tree: _Element, key: str) -> bool:
-        text = self._extract_text(tree, key).lower()
+    def _extract_bool(self, fields: _Fields, key: str) -> bool:
+        text = self._extract_text(fields, key).lower()
         return self._BOOLEAN_VALUES.get(text, False)
 
-    def _extract_int(self, tree: _Element, key: str) -> int:
-        text = self._extract_text(tree, key)
+    def _extract_int(self, fields: _Fields, key: str) -> int:
+        text = self._extract_text(fields, key)
         return int(text)
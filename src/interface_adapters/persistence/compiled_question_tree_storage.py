@@ -0,0 +1,227 @@
+"""
+Versioned binary file format of compiled question trees, navigated through a read-only memory map.
+
+The file starts with a header of the magic bytes ``DUKETREE``, the format version and the number of sections, all
+little-endian, followed by the offset and length in bytes of every section. The sections are, in this order, the node
+kinds (int8), question text ids, answer text ids, child offsets and programme ids (int32), the string offsets (uint32)
+and UTF-8 string data, and the programme offsets (uint32) and JSON programme data. Every section starts at a multiple
+of 8 bytes. Nothing is deserialised when a tree is loaded; the integer sections are viewed in place and a string or
+programme is decoded only when it is accessed, so processes mapping the same file share its pages.
+"""
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+from collections.abc import Callable, Sequence
+from enum import Enum
+from pathlib import Path
+from typing import Any, Literal, overload
+
+from src.application.interfaces import Savable, GetAllRepository
+from src.domain.entities.question_tree import QuestionTree
+from src.domain.entities.res_tuke_study_programme_data import ResTukeStudyProgrammeData
+from src.domain.enums import Degree, Language, StudyForm
+from src.interface_adapters.exceptions import InvalidQuestionTreeFileError
+from src.interface_adapters.gateways.study_programmes_gateway_base import Page, PageMetadata
+from src.interface_adapters.services.question_tree.compiled_question_tree import CompiledQuestionTree, NodeKind
+
+_MAGIC = b"DUKETREE"
+FORMAT_VERSION = 1
+_HEADER = struct.Struct("<8sII")
+_SECTION = struct.Struct("<QQ")
+_ALIGNMENT = 8
+type _SectionFormat = Literal["b", "i", "I", "B"]
+_SECTION_FORMATS: tuple[_SectionFormat, ...] = ("b", "i", "i", "i", "i", "I", "B", "I", "B")
+
+
+class _EncodedRecords[Record](Sequence[Record]):
+    """Records of a data section delimited by an offsets section, decoded on every access."""
+
+    def __init__(self, offsets: "memoryview[int]", data: memoryview, decode: Callable[[bytes], Record]) -> None:
+        self._offsets = offsets
+        self._data = data
+        self._decode = decode
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    @property
+    def nbytes(self) -> int:
+        return self._offsets.nbytes + self._data.nbytes
+
+    @overload
+    def __getitem__(self, index: int) -> Record: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> Sequence[Record]: ...
+
+    def __getitem__(self, index: int | slice) -> Record | Sequence[Record]:
+        if isinstance(index, slice):
+            return [self[position] for position in range(*index.indices(len(self)))]
+        if not -len(self) <= index < len(self):
+            raise IndexError(index)
+        index %= len(self)
+        return self._decode(bytes(self._data[self._offsets[index]:self._offsets[index + 1]]))
+
+
+class CompiledQuestionTreeStorage(
+    Savable[QuestionTree[Page[ResTukeStudyProgrammeData]]],
+    GetAllRepository[CompiledQuestionTree]
+):
+    def __init__(self, path: Path) -> None:
+        self._path = path
+
+    @staticmethod
+    def is_compiled_tree_file(path: Path) -> bool:
+        with path.open("rb") as file:
+            return file.read(len(_MAGIC)) == _MAGIC
+
+    async def save(self, one_object: QuestionTree[Page[ResTukeStudyProgrammeData]] | CompiledQuestionTree) -> None:
+        tree = one_object if isinstance(one_object, CompiledQuestionTree) else CompiledQuestionTree.compile(one_object)
+        temporary_path = self._path.with_name(f"{self._path.name}.tmp")
+        temporary_path.write_bytes(self._encode(tree))
+        os.replace(temporary_path, self._path)
+
+    async def save_multiple(
+            self,
+            objects: Sequence[QuestionTree[Page[ResTukeStudyProgrammeData]] | CompiledQuestionTree]
+    ) -> None:
+        if len(objects) != 1:
+            raise ValueError(f"A compiled question tree file holds one tree, got {len(objects)}")
+        await self.save(objects[0])
+
+    async def get_all(self) -> list[CompiledQuestionTree]:
+        return [self.load()]
+
+    def load(self) -> CompiledQuestionTree:
+        """
+        Maps the file into memory and views the tree in place.
+
+        :return: Compiled question tree backed by the memory map.
+        :raises InvalidQuestionTreeFileError: If the file is not a compiled question tree of the supported version.
+        """
+        if sys.byteorder != "little":
+            raise InvalidQuestionTreeFileError("Compiled question tree files can only be mapped on little-endian hosts")
+        with self._path.open("rb") as file:
+            try:
+                mapped_file = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError as e:
+                raise InvalidQuestionTreeFileError(f"{self._path} is empty") from e
+        view = memoryview(mapped_file)
+        if len(view) < _HEADER.size:
+            raise InvalidQuestionTreeFileError(f"{self._path} is too short")
+        magic, version, section_count = _HEADER.unpack_from(view)
+        if magic != _MAGIC:
+            raise InvalidQuestionTreeFileError(f"{self._path} is not a compiled question tree file")
+        if version != FORMAT_VERSION:
+            raise InvalidQuestionTreeFileError(
+                f"{self._path} has format version {version}, only version {FORMAT_VERSION} is supported"
+            )
+        if section_count != len(_SECTION_FORMATS):
+            raise InvalidQuestionTreeFileError(
+                f"{self._path} is corrupted, it declares {section_count} sections, "
+                f"format version {FORMAT_VERSION} has {len(_SECTION_FORMATS)}"
+            )
+        if len(view) < _HEADER.size + section_count * _SECTION.size:
+            raise InvalidQuestionTreeFileError(f"{self._path} is corrupted, its section table is truncated")
+        try:
+            sections = [
+                self._section(view, _HEADER.size + index * _SECTION.size, section_format)
+                for index, section_format in enumerate(_SECTION_FORMATS)
+            ]
+        except (struct.error, IndexError) as e:
+            raise InvalidQuestionTreeFileError(f"{self._path} is corrupted, its section table is unreadable") from e
+        kinds, text_ids, answer_text_ids, child_offsets, programme_ids = sections[:5]
+        string_offsets, string_data, programme_offsets, programme_data = sections[5:]
+        if not len(kinds) == len(text_ids) == len(answer_text_ids) == len(programme_ids) == len(child_offsets) - 1:
+            raise InvalidQuestionTreeFileError(f"{self._path} has node sections of different lengths")
+        return CompiledQuestionTree(
+            kinds, text_ids, answer_text_ids, child_offsets, programme_ids,
+            _EncodedRecords(string_offsets, string_data, lambda data: data.decode("utf-8")),
+            _EncodedRecords(programme_offsets, programme_data, _decode_programme)
+        )
+
+    def _section(self, view: memoryview, entry_offset: int, section_format: _SectionFormat) -> "memoryview[int]":
+        offset, length = _SECTION.unpack_from(view, entry_offset)
+        item_size = struct.calcsize(section_format)
+        if offset + length > len(view) or length % item_size:
+            raise InvalidQuestionTreeFileError(f"{self._path} has a corrupted section at byte {offset}")
+        return view[offset:offset + length].cast(section_format)
+
+    @staticmethod
+    def _encode(tree: CompiledQuestionTree) -> bytes:
+        node_count = len(tree)
+        string_ids: dict[str, int] = {}
+
+        def intern(text: str) -> int:
+            return string_ids.setdefault(text, len(string_ids))
+
+        kinds = array("b", (tree.kind(node) for node in range(node_count)))
+        text_ids = array("i", (
+            -1 if tree.kind(node) == NodeKind.PROGRAMME else intern(tree.text(node)) for node in range(node_count)
+        ))
+        answer_text_ids = array("i", [-1] + [intern(tree.answer_text(node)) for node in range(1, node_count)])
+        child_offsets = array("i", [tree.answers(node).start for node in range(node_count)] + [node_count])
+        programme_ids = array("i", (tree.programme_id(node) for node in range(node_count)))
+        encoded_strings = [text.encode("utf-8") for text in string_ids]
+        encoded_programmes = [
+            _encode_programme(tree.programme_by_id(programme_id)) for programme_id in range(tree.programme_count)
+        ]
+        sections = [
+            kinds, text_ids, answer_text_ids, child_offsets, programme_ids,
+            _offsets(encoded_strings), array("B", b"".join(encoded_strings)),
+            _offsets(encoded_programmes), array("B", b"".join(encoded_programmes))
+        ]
+
+        contents = bytearray(_HEADER.pack(_MAGIC, FORMAT_VERSION, len(sections)))
+        contents.extend(bytes(_SECTION.size * len(sections)))
+        for index, section in enumerate(sections):
+            contents.extend(bytes(-len(contents) % _ALIGNMENT))
+            _SECTION.pack_into(contents, _HEADER.size + index * _SECTION.size, len(contents), len(section.tobytes()))
+            contents.extend(section.tobytes())
+        return bytes(contents)
+
+
+class DecompilingQuestionTreeRepository(GetAllRepository[QuestionTree[Page[ResTukeStudyProgrammeData]]]):
+    """
+    Reads a compiled question tree file as a question tree of nested questions.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self._storage = CompiledQuestionTreeStorage(path)
+
+    async def get_all(self) -> list[QuestionTree[Page[ResTukeStudyProgrammeData]]]:
+        return [self._storage.load().decompile()]
+
+
+def _offsets(records: list[bytes]) -> array[int]:
+    offsets = array("I", [0])
+    for record in records:
+        offsets.append(offsets[-1] + len(record))
+    return offsets
+
+
+def _encode_programme(programme: Page[ResTukeStudyProgrammeData]) -> bytes:
+    def encode_value(value: Any) -> Any:
+        return value.value if isinstance(value, Enum) else value
+
+    return json.dumps({
+        "data": {field: encode_value(value) for field, value in programme.data._asdict().items()},
+        "metadata": {field: encode_value(value) for field, value in programme.metadata._asdict().items()}
+    }, ensure_ascii=False).encode("utf-8")
+
+
+def _decode_programme(encoded_programme: bytes) -> Page[ResTukeStudyProgrammeData]:
+    programme = json.loads(encoded_programme)
+    data, metadata = programme["data"], programme["metadata"]
+    return Page(
+        data=ResTukeStudyProgrammeData(**{
+            **data,
+            "study_form": StudyForm(data["study_form"]),
+            "degree": Degree(data["degree"]),
+            "languages_of_delivery": Language(data["languages_of_delivery"])
+        }),
+        metadata=PageMetadata(**{**metadata, "language": Language(metadata["language"])})
+    )
@@ -16,6 +16,12 @@ class SerializerStorage[Object](Savable[Object], GetAllRepository[Object]):
             pickle.dump(objects, file)
 
     async def get_all(self) -> list[Object]:
+        return self.load()
+
+    def load(self) -> list[Object]:
+        """
+        Reads the objects without an event loop, e.g. in a worker thread.
+        """
         with open(self._destination, 'rb') as file:
             data = pickle.load(file)
             if not isinstance(data, list):
@@ -0,0 +1,103 @@
+import asyncio
+from collections.abc import Sequence
+from typing import NamedTuple, Optional
+
+from loguru import logger
+
+from src.application.interfaces import LLMDecisionTreeQuestionGenerator, MultiSubsetQuestionGenerator
+from src.domain.dtos.decision_tree_question import DecisionTreeQuestion
+
+
+class BatchingStatistics(NamedTuple):
+    batches: int
+    subsets: int
+
+
+type _PendingSubset[StudyProgramme] = tuple[
+    list[StudyProgramme], Sequence[DecisionTreeQuestion], asyncio.Future[DecisionTreeQuestion]
+]
+
+
+class BatchingDecisionTreeQuestionGenerator[StudyProgramme](LLMDecisionTreeQuestionGenerator[StudyProgramme]):
+    """
+    Question generator decorator collecting concurrently requested subsets and generating their questions together.
+
+    A batch is sent once no new subset arrived for ``max_wait`` seconds or ``max_batch_size`` subsets are waiting.
+    With sibling subtrees expanded concurrently, all subsets of one tree level are requested at nearly the same time,
+    so every level costs one batch instead of one request per node.
+    """
+
+    def __init__(
+            self,
+            generator: MultiSubsetQuestionGenerator[StudyProgramme],
+            max_batch_size: int = 16,
+            max_wait: float = 0.05,
+            max_concurrent_batches: int = 4
+    ) -> None:
+        """
+        :param generator: Generator of the questions of a whole batch.
+        :param max_batch_size: Maximum number of subsets in one batch.
+        :param max_wait: Seconds without a new subset after which the waiting subsets are sent.
+        :param max_concurrent_batches: Maximum number of batches generated at the same time.
+        """
+        self._generator = generator
+        self._max_batch_size = max_batch_size
+        self._max_wait = max_wait
+        self._semaphore = asyncio.Semaphore(max_concurrent_batches)
+        self._pending: list[_PendingSubset[StudyProgramme]] = []
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self._batch_tasks: set[asyncio.Task[None]] = set()
+        self._batches = 0
+        self._subsets = 0
+
+    @property
+    def statistics(self) -> BatchingStatistics:
+        return BatchingStatistics(self._batches, self._subsets)
+
+    async def generate_question(
+            self,
+            study_programmes: list[StudyProgramme],
+            rejected_questions: Sequence[DecisionTreeQuestion] = ()
+    ) -> DecisionTreeQuestion:
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future[DecisionTreeQuestion] = loop.create_future()
+        self._pending.append((study_programmes, rejected_questions, future))
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+        if len(self._pending) >= self._max_batch_size:
+            self._flush()
+        else:
+            self._flush_handle = loop.call_later(self._max_wait, self._flush)
+        return await future
+
+    def _flush(self) -> None:
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        batch, self._pending = self._pending, []
+        if not batch:
+            return
+        task = asyncio.create_task(self._generate_batch(batch))
+        self._batch_tasks.add(task)
+        task.add_done_callback(self._batch_tasks.discard)
+
+    async def _generate_batch(
+            self,
+            batch: list[_PendingSubset[StudyProgramme]]
+    ) -> None:
+        async with self._semaphore:
+            self._batches += 1
+            self._subsets += len(batch)
+            logger.debug(f"Generating questions for a batch of {len(batch)} subsets")
+            try:
+                questions = await self._generator.generate_questions(
+                    [subset for subset, _, _ in batch], [rejected_questions for _, rejected_questions, _ in batch]
+                )
+            except Exception as e:
+                for _, _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                return
+        for (_, _, future), question in zip(batch, questions):
+            if not future.done():
+                future.set_result(question)
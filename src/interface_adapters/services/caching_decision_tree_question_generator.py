@@ -0,0 +1,105 @@
+import asyncio
+import hashlib
+import json
+from collections.abc import Sequence
+from typing import NamedTuple
+
+from loguru import logger
+
+from src.application.interfaces import LLMDecisionTreeQuestionGenerator, KeyValueCache
+from src.domain.dtos.decision_tree_question import DecisionTreeQuestion
+from src.domain.entities.res_tuke_study_programme_data import ResTukeStudyProgrammeData
+from src.interface_adapters.gateways.study_programmes_gateway_base import Page
+
+
+class QuestionCacheStatistics(NamedTuple):
+    hits: int
+    misses: int
+
+
+class CachingDecisionTreeQuestionGenerator(LLMDecisionTreeQuestionGenerator[Page[ResTukeStudyProgrammeData]]):
+    """
+    Question generator decorator memoising generated questions in a persistent cache.
+
+    Questions are addressed by the model, the prompt version, the sorted codes of the split programmes and a hash of
+    their content, so after a catalogue change only subsets containing a changed programme reach the language model,
+    and every unchanged subtree of the question tree is rebuilt from the cache. Questions re-requested after a
+    rejection are addressed by the rejected questions too, so a retry never gets the rejected question back.
+    """
+
+    def __init__(
+            self,
+            generator: LLMDecisionTreeQuestionGenerator[Page[ResTukeStudyProgrammeData]],
+            cache: KeyValueCache,
+            model: str,
+            prompt_version: str
+    ) -> None:
+        self._generator = generator
+        self._cache = cache
+        self._model = model
+        self._prompt_version = prompt_version
+        self._hits = 0
+        self._misses = 0
+
+    @property
+    def statistics(self) -> QuestionCacheStatistics:
+        return QuestionCacheStatistics(self._hits, self._misses)
+
+    async def generate_question(
+            self,
+            study_programmes: list[Page[ResTukeStudyProgrammeData]],
+            rejected_questions: Sequence[DecisionTreeQuestion] = ()
+    ) -> DecisionTreeQuestion:
+        key = self.cache_key(study_programmes, rejected_questions)
+        cached_value = await asyncio.to_thread(self._cache.get, key)
+        if cached_value is not None:
+            self._hits += 1
+            question = self.decode_question(cached_value)
+            logger.debug(f"Reusing cached question: {question.text}")
+            return question
+
+        self._misses += 1
+        question = await self._generator.generate_question(study_programmes, rejected_questions)
+        await asyncio.to_thread(self._cache.put, key, self.encode_question(question))
+        return question
+
+    @staticmethod
+    def encode_question(question: DecisionTreeQuestion) -> bytes:
+        return json.dumps([question.text, question.yes_nodes, question.no_nodes]).encode("utf-8")
+
+    @staticmethod
+    def decode_question(value: bytes) -> DecisionTreeQuestion:
+        text, yes_nodes, no_nodes = json.loads(value)
+        return DecisionTreeQuestion(text=text, yes_nodes=yes_nodes, no_nodes=no_nodes)
+
+    def cache_key(
+            self,
+            study_programmes: list[Page[ResTukeStudyProgrammeData]],
+            rejected_questions: Sequence[DecisionTreeQuestion] = ()
+    ) -> str:
+        return question_cache_key(study_programmes, self._model, self._prompt_version, rejected_questions)
+
+
+def question_cache_key(
+        study_programmes: list[Page[ResTukeStudyProgrammeData]],
+        model: str,
+        prompt_version: str,
+        rejected_questions: Sequence[DecisionTreeQuestion] = ()
+) -> str:
+    sorted_programmes = sorted(study_programmes, key=lambda programme: programme.metadata.code)
+    content_hash = hashlib.sha256()
+    for programme in sorted_programmes:
+        content_hash.update(json.dumps(programme.data._asdict(), default=str).encode("utf-8"))
+    key_parts: list[object] = [
+        model,
+        prompt_version,
+        [programme.metadata.code for programme in sorted_programmes],
+        content_hash.hexdigest(),
+    ]
+    # Left out of first requests, so their keys match the questions cached before rejections were addressed.
+    if rejected_questions:
+        key_parts.append([
+            [question.text, sorted(question.yes_nodes), sorted(question.no_nodes)] for question in rejected_questions
+        ])
+    content = json.dumps(key_parts)
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
@@ -0,0 +1,116 @@
+import math
+import re
+from typing import NamedTuple, Optional
+
+from loguru import logger
+
+from src.domain.entities.res_tuke_study_programme_data import ResTukeStudyProgrammeData
+from src.interface_adapters.gateways.study_programmes_gateway_base import Page
+
+
+class EncodedProgrammes(NamedTuple):
+    text: str
+    aliases: dict[str, str]
+    approximate_tokens: int
+
+
+class CompactPromptEncoder:
+    """
+    Encodes study programmes for a language model prompt as a compact table within a token budget.
+
+    Every programme is one ``|`` separated row referenced by a short alias (``p1``, ``p2``, ...) instead of its code.
+    When the full texts do not fit into the budget, the descriptions and learning objectives are replaced by
+    progressively shorter extractive summaries, which are computed once per text and kept for later prompts.
+    Tokens are estimated from the number of characters.
+    """
+
+    HEADER = "id|study_field|description|learning_objectives"
+
+    _SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+
+    def __init__(
+            self,
+            token_budget: int = 12000,
+            summary_lengths: tuple[int, ...] = (800, 400, 200, 100, 0),
+            characters_per_token: float = 4.0
+    ) -> None:
+        """
+        :param token_budget: Maximum estimated number of tokens of the encoded programmes.
+        :param summary_lengths: Maximum lengths in characters of the summarised fields, tried in order when the full
+            texts exceed the budget. The last length is used even if it still exceeds the budget.
+        :param characters_per_token: Average number of characters of one token, used to estimate token counts.
+        """
+        self._token_budget = token_budget
+        self._summary_lengths = summary_lengths
+        self._characters_per_token = characters_per_token
+        self._summaries: dict[tuple[str, int], str] = {}
+
+    @property
+    def token_budget(self) -> int:
+        return self._token_budget
+
+    def estimate_tokens(self, text: str) -> int:
+        return math.ceil(len(text) / self._characters_per_token)
+
+    def encode(self, study_programmes: list[Page[ResTukeStudyProgrammeData]]) -> EncodedProgrammes:
+        aliases = {f"p{index}": programme.metadata.code for index, programme in enumerate(study_programmes, 1)}
+        text = self._encode_table(list(aliases), study_programmes, None)
+        approximate_tokens = self.estimate_tokens(text)
+        for summary_length in self._summary_lengths:
+            if approximate_tokens <= self._token_budget:
+                break
+            text = self._encode_table(list(aliases), study_programmes, summary_length)
+            approximate_tokens = self.estimate_tokens(text)
+            logger.debug(
+                f"Encoded {len(study_programmes)} programmes with {summary_length} character summaries "
+                f"in ~{approximate_tokens} tokens"
+            )
+        if approximate_tokens > self._token_budget:
+            logger.warning(
+                f"Encoded {len(study_programmes)} programmes exceed the token budget: "
+                f"~{approximate_tokens} > {self._token_budget}"
+            )
+        return EncodedProgrammes(text, aliases, approximate_tokens)
+
+    def _encode_table(
+            self,
+            aliases: list[str],
+            study_programmes: list[Page[ResTukeStudyProgrammeData]],
+            summary_length: Optional[int]
+    ) -> str:
+        rows = [self.HEADER]
+        for alias, programme in zip(aliases, study_programmes):
+            rows.append("|".join((
+                alias,
+                self._clean(programme.data.study_field),
+                self._summarise(programme.data.description, summary_length),
+                self._summarise(programme.data.learning_objectives, summary_length)
+            )))
+        return "\n".join(rows)
+
+    def _summarise(self, text: str, max_length: Optional[int]) -> str:
+        if max_length is None:
+            return self._clean(text)
+        key = (text, max_length)
+        summary = self._summaries.get(key)
+        if summary is None:
+            summary = self._extract_summary(self._clean(text), max_length)
+            self._summaries[key] = summary
+        return summary
+
+    @classmethod
+    def _extract_summary(cls, text: str, max_length: int) -> str:
+        if len(text) <= max_length:
+            return text
+        summary = ""
+        for sentence in cls._SENTENCE_END.split(text):
+            if len(summary) + len(sentence) + 1 > max_length:
+                break
+            summary = f"{summary} {sentence}" if summary else sentence
+        if not summary and max_length > 0:
+            summary = text[:max_length].rsplit(" ", 1)[0] + "…"
+        return summary
+
+    @staticmethod
+    def _clean(text: str) -> str:
+        return " ".join(text.replace("|", "/").split())
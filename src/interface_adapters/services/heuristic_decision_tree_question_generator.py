@@ -0,0 +1,242 @@
+import math
+import re
+from collections import Counter
+from collections.abc import Sequence
+from typing import Callable, NamedTuple, Optional
+
+import numpy as np
+import numpy.typing as npt
+
+from src.application.interfaces import LLMDecisionTreeQuestionGenerator
+from src.domain.dtos.decision_tree_question import DecisionTreeQuestion
+from src.domain.entities.res_tuke_study_programme_data import ResTukeStudyProgrammeData
+from src.interface_adapters.gateways.study_programmes_gateway_base import Page
+
+type _Programme = Page[ResTukeStudyProgrammeData]
+
+
+class _AttributeSplit(NamedTuple):
+    question: str
+    predicate: Callable[[ResTukeStudyProgrammeData], bool]
+
+
+class ScoredSplit(NamedTuple):
+    question: DecisionTreeQuestion
+    information_gain: float
+    balance: float
+
+
+def _equals(
+        get_value: Callable[[ResTukeStudyProgrammeData], str],
+        value: str
+) -> Callable[[ResTukeStudyProgrammeData], bool]:
+    return lambda data: get_value(data) == value
+
+
+def _lasts_at_most(length: int) -> Callable[[ResTukeStudyProgrammeData], bool]:
+    return lambda data: data.length_of_study_in_years <= length
+
+
+def _equal_value_splits(
+        values: list[str],
+        template: str,
+        get_value: Callable[[ResTukeStudyProgrammeData], str]
+) -> list[_AttributeSplit]:
+    return [_AttributeSplit(template.format(value=value), _equals(get_value, value)) for value in values]
+
+
+class HeuristicDecisionTreeQuestionGenerator(LLMDecisionTreeQuestionGenerator[_Programme]):
+    """
+    Question generator splitting study programmes locally, without a language model.
+
+    Candidate splits on the structured attributes (faculty, study field, professional orientation, joint programme,
+    length of study) are scored by their information gain, which for programmes recommended with equal probability
+    is the entropy of the group sizes, and the best split is asked as a templated question. When no attribute split
+    is balanced enough, the programmes are clustered into two groups by k-means over TF-IDF vectors of their
+    descriptions and learning objectives, and the question names the most characteristic terms of one cluster.
+    Splits dividing the programmes like a rejected question are skipped, so a re-request gets the next best split.
+    """
+
+    _TOKEN = re.compile(r"[^\W\d_]{3,}")
+
+    def __init__(self, min_balance: float = 0.25, text_clustering: bool = True, max_iterations: int = 50) -> None:
+        """
+        :param min_balance: Minimum share of the programmes in the smaller group of an acceptable attribute split.
+        :param text_clustering: Split by clustering the programme texts when no attribute split is acceptable.
+            Otherwise the most balanced attribute split is used, or the programmes are halved when there is none.
+        :param max_iterations: Maximum number of k-means iterations.
+        """
+        self._min_balance = min_balance
+        self._text_clustering = text_clustering
+        self._max_iterations = max_iterations
+
+    async def generate_question(
+            self,
+            study_programmes: list[_Programme],
+            rejected_questions: Sequence[DecisionTreeQuestion] = ()
+    ) -> DecisionTreeQuestion:
+        attribute_split = self.attribute_split(study_programmes, rejected_questions)
+        if attribute_split is not None:
+            return attribute_split
+        rejected_partitions = self._rejected_partitions(rejected_questions)
+        if self._text_clustering:
+            cluster_split = self._cluster_split(study_programmes)
+            if self._partition(cluster_split.yes_nodes, cluster_split.no_nodes) not in rejected_partitions:
+                return cluster_split
+        best_split = self.best_attribute_split(study_programmes, rejected_questions)
+        if best_split is not None:
+            return best_split.question
+        return self._halve(study_programmes)
+
+    def attribute_split(
+            self,
+            study_programmes: list[_Programme],
+            rejected_questions: Sequence[DecisionTreeQuestion] = ()
+    ) -> Optional[DecisionTreeQuestion]:
+        """
+        Finds a structured attribute split balanced at least by the minimum balance.
+
+        :param study_programmes: List of study programmes.
+        :param rejected_questions: Rejected questions, splits dividing the programmes like one of them are skipped.
+        :return: Question of the best acceptable split, or ``None`` when no attribute splits the programmes well.
+        """
+        best_split = self.best_attribute_split(study_programmes, rejected_questions)
+        if best_split is None or best_split.balance < self._min_balance:
+            return None
+        return best_split.question
+
+    def best_attribute_split(
+            self,
+            study_programmes: list[_Programme],
+            rejected_questions: Sequence[DecisionTreeQuestion] = ()
+    ) -> Optional[ScoredSplit]:
+        rejected_partitions = self._rejected_partitions(rejected_questions)
+        best_split: Optional[ScoredSplit] = None
+        for candidate in self._candidate_splits(study_programmes):
+            answers = [candidate.predicate(programme.data) for programme in study_programmes]
+            yes_nodes = [programme.metadata.code for programme, answer in zip(study_programmes, answers) if answer]
+            no_nodes = [programme.metadata.code for programme, answer in zip(study_programmes, answers) if not answer]
+            if not yes_nodes or not no_nodes or self._partition(yes_nodes, no_nodes) in rejected_partitions:
+                continue
+            scored_split = ScoredSplit(
+                DecisionTreeQuestion(text=candidate.question, yes_nodes=yes_nodes, no_nodes=no_nodes),
+                self._information_gain(len(yes_nodes), len(no_nodes)),
+                min(len(yes_nodes), len(no_nodes)) / len(study_programmes)
+            )
+            if best_split is None or scored_split.information_gain > best_split.information_gain:
+                best_split = scored_split
+        return best_split
+
+    @classmethod
+    def _rejected_partitions(cls, rejected_questions: Sequence[DecisionTreeQuestion]) -> set[frozenset[frozenset[str]]]:
+        return {cls._partition(question.yes_nodes, question.no_nodes) for question in rejected_questions}
+
+    @staticmethod
+    def _partition(yes_nodes: list[str], no_nodes: list[str]) -> frozenset[frozenset[str]]:
+        return frozenset((frozenset(yes_nodes), frozenset(no_nodes)))
+
+    @staticmethod
+    def _candidate_splits(study_programmes: list[_Programme]) -> list[_AttributeSplit]:
+        faculties = sorted({programme.data.faculty for programme in study_programmes})
+        study_fields = sorted({programme.data.study_field for programme in study_programmes})
+        lengths = sorted({programme.data.length_of_study_in_years for programme in study_programmes})
+        return [
+            *_equal_value_splits(faculties, "Would you like to study at the {value}?", lambda data: data.faculty),
+            *_equal_value_splits(study_fields, "Are you interested in {value}?", lambda data: data.study_field),
+            _AttributeSplit(
+                "Do you prefer a professionally oriented programme focused on practice?",
+                lambda data: data.professionally_oriented
+            ),
+            _AttributeSplit(
+                "Are you interested in a joint study programme run together with another university?",
+                lambda data: data.joint_study_program
+            ),
+            *(
+                _AttributeSplit(f"Would you prefer a programme lasting at most {length} years?", _lasts_at_most(length))
+                for length in lengths[:-1]
+            )
+        ]
+
+    @staticmethod
+    def _information_gain(yes_count: int, no_count: int) -> float:
+        total = yes_count + no_count
+        return -sum(count / total * math.log2(count / total) for count in (yes_count, no_count) if count)
+
+    def _cluster_split(self, study_programmes: list[_Programme]) -> DecisionTreeQuestion:
+        documents = [
+            self._TOKEN.findall(f"{programme.data.description} {programme.data.learning_objectives}".lower())
+            for programme in study_programmes
+        ]
+        vocabulary = sorted({token for document in documents for token in document})
+        if not vocabulary:
+            return self._halve(study_programmes)
+        vectors = self._tfidf(documents, vocabulary)
+        assignments = self._two_means(vectors)
+        if assignments.all() or not assignments.any():
+            return self._halve(study_programmes)
+
+        yes_mask = assignments == 0
+        weights = vectors[yes_mask].mean(axis=0) - vectors[~yes_mask].mean(axis=0)
+        terms = [vocabulary[index] for index in np.argsort(-weights, kind="stable")[:3]]
+        return DecisionTreeQuestion(
+            text=f"Are you interested in topics such as {', '.join(terms[:-1])} and {terms[-1]}?"
+            if len(terms) > 1 else f"Are you interested in {terms[0]}?",
+            yes_nodes=[programme.metadata.code for programme, is_yes in zip(study_programmes, yes_mask) if is_yes],
+            no_nodes=[programme.metadata.code for programme, is_yes in zip(study_programmes, yes_mask) if not is_yes]
+        )
+
+    @staticmethod
+    def _tfidf(documents: list[list[str]], vocabulary: list[str]) -> npt.NDArray[np.float64]:
+        indices = {token: index for index, token in enumerate(vocabulary)}
+        counts = np.zeros((len(documents), len(vocabulary)))
+        for row, document in enumerate(documents):
+            for token, count in Counter(document).items():
+                counts[row, indices[token]] = count
+        term_frequencies = counts / np.maximum(counts.sum(axis=1, keepdims=True), 1)
+        document_frequencies = (counts > 0).sum(axis=0)
+        inverse_document_frequencies = np.log((1 + len(documents)) / (1 + document_frequencies)) + 1
+        vectors = term_frequencies * inverse_document_frequencies
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors / np.where(norms == 0, 1, norms)  # type: ignore[no-any-return]
+
+    def _two_means(self, vectors: npt.NDArray[np.float64]) -> npt.NDArray[np.intp]:
+        """
+        Clusters unit vectors into two groups by spherical k-means, seeded deterministically with the vector least
+        similar to the mean and the vector least similar to that one.
+        """
+        first_seed = int(np.argmin(vectors @ vectors.mean(axis=0)))
+        second_seed = int(np.argmin(vectors @ vectors[first_seed]))
+        centroids = vectors[[first_seed, second_seed]]
+        assignments = np.zeros(len(vectors), dtype=np.intp)
+        for _ in range(self._max_iterations):
+            new_assignments = np.argmax(vectors @ centroids.T, axis=1)
+            if (new_assignments == new_assignments[0]).all():
+                return new_assignments  # type: ignore[no-any-return]
+            if (new_assignments == assignments).all():
+                break
+            assignments = new_assignments
+            centroids = np.stack([vectors[assignments == cluster].mean(axis=0) for cluster in (0, 1)])
+            centroids /= np.linalg.norm(centroids, axis=1, keepdims=True)
+        return assignments
+
+    @staticmethod
+    def _halve(study_programmes: list[_Programme]) -> DecisionTreeQuestion:
+        """
+        Splits the programmes sorted by name in half and asks about the programmes of the first half by name, adding
+        the code to the names shared with the second half.
+        """
+        programmes = sorted(study_programmes, key=lambda programme: (programme.data.name, programme.metadata.code))
+        middle = len(programmes) // 2
+        yes_programmes, no_programmes = programmes[:middle], programmes[middle:]
+        no_names = {programme.data.name for programme in no_programmes}
+        labels = list(dict.fromkeys(
+            f"{programme.data.name} ({programme.metadata.code})" if programme.data.name in no_names
+            else programme.data.name
+            for programme in yes_programmes
+        ))
+        return DecisionTreeQuestion(
+            text=f"Are you interested in one of the programmes {', '.join(labels[:-1])} or {labels[-1]}?"
+            if len(labels) > 1 else f"Are you interested in {labels[0]}?",
+            yes_nodes=[programme.metadata.code for programme in yes_programmes],
+            no_nodes=[programme.metadata.code for programme in no_programmes]
+        )
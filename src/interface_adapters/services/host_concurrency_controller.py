@@ -0,0 +1,166 @@
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, NamedTuple, Optional
+from urllib.parse import urlsplit
+
+from loguru import logger
+
+from src.application.interfaces import ConcurrencyController
+from src.interface_adapters.exceptions import HttpStatusError, PageLoadingTimeoutError
+
+
+class AIMDSettings(NamedTuple):
+    min_limit: int = 1
+    max_limit: int = 32
+    additive_increase: float = 1.0
+    multiplicative_decrease: float = 0.5
+    latency_tolerance: float = 2.0
+    latency_smoothing: float = 0.2
+    congestion_statuses: frozenset[int] = frozenset({429, 500, 502, 503, 504})
+
+
+class HostConcurrencyStatistics(NamedTuple):
+    limit: int
+    in_flight: int
+    peak_in_flight: int
+    completed: int
+    failed: int
+    congestion_events: int
+
+
+class _HostState:
+    def __init__(self, limit: int) -> None:
+        self.limit = float(limit)
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.completed = 0
+        self.failed = 0
+        self.congestion_events = 0
+        self.smoothed_latency: Optional[float] = None
+        self.baseline_latency: Optional[float] = None
+        self.last_decrease_at = 0.0
+        self.slot_released = asyncio.Condition()
+
+    def has_free_slot(self) -> bool:
+        return self.in_flight < max(1, int(self.limit))
+
+
+class HostConcurrencyController(ConcurrencyController):
+    """
+    Limits the number of concurrent requests per host.
+
+    With ``aimd`` settings the per-host limit adapts: it grows additively (by ``additive_increase`` per window of
+    ``limit`` successful requests) while the host is healthy and is cut multiplicatively when a request fails with
+    a congestion status (429/5xx), times out, or its latency exceeds ``latency_tolerance`` times the best smoothed
+    latency seen so far. At most one decrease happens per smoothed round-trip, so a burst of failures from the same
+    window is counted as a single congestion event.
+    """
+
+    def __init__(self, limit_per_host: int = 5, aimd: Optional[AIMDSettings] = None) -> None:
+        if limit_per_host < 1:
+            raise ValueError("Concurrency limit must be at least 1")
+        self._initial_limit = limit_per_host
+        self._aimd = aimd
+        self._hosts: dict[str, _HostState] = {}
+
+    @asynccontextmanager
+    async def limit(self, url: str) -> AsyncIterator[None]:
+        host = self._get_host_state(url)
+        await self._acquire(host)
+        started_at = time.monotonic()
+        try:
+            yield
+        except BaseException as e:
+            self._on_failure(host, url, self._is_congestion_error(e))
+            raise
+        else:
+            self._on_success(host, url, time.monotonic() - started_at)
+        finally:
+            await self._release(host)
+
+    def statistics(self) -> dict[str, HostConcurrencyStatistics]:
+        """
+        Returns concurrency counters for every host seen so far.
+
+        :return: Mapping of host to its statistics.
+        """
+        return {
+            host: HostConcurrencyStatistics(
+                limit=int(state.limit),
+                in_flight=state.in_flight,
+                peak_in_flight=state.peak_in_flight,
+                completed=state.completed,
+                failed=state.failed,
+                congestion_events=state.congestion_events,
+            )
+            for host, state in self._hosts.items()
+        }
+
+    def _get_host_state(self, url: str) -> _HostState:
+        host = urlsplit(url).netloc
+        if host not in self._hosts:
+            self._hosts[host] = _HostState(self._initial_limit)
+        return self._hosts[host]
+
+    @staticmethod
+    async def _acquire(host: _HostState) -> None:
+        async with host.slot_released:
+            await host.slot_released.wait_for(host.has_free_slot)
+            host.in_flight += 1
+            host.peak_in_flight = max(host.peak_in_flight, host.in_flight)
+
+    @staticmethod
+    async def _release(host: _HostState) -> None:
+        async with host.slot_released:
+            host.in_flight -= 1
+            host.slot_released.notify_all()
+
+    def _is_congestion_error(self, error: BaseException) -> bool:
+        if isinstance(error, (TimeoutError, PageLoadingTimeoutError)):
+            return True
+        congestion_statuses = self._aimd.congestion_statuses if self._aimd else AIMDSettings().congestion_statuses
+        return isinstance(error, HttpStatusError) and error.status in congestion_statuses
+
+    def _on_success(self, host: _HostState, url: str, latency: float) -> None:
+        host.completed += 1
+        if self._aimd is None:
+            return
+        if self._is_latency_rising(host, latency):
+            self._decrease_limit(host, url)
+        else:
+            host.limit = min(float(self._aimd.max_limit), host.limit + self._aimd.additive_increase / host.limit)
+
+    def _on_failure(self, host: _HostState, url: str, is_congestion: bool) -> None:
+        host.failed += 1
+        if self._aimd is not None and is_congestion:
+            self._decrease_limit(host, url)
+
+    def _is_latency_rising(self, host: _HostState, latency: float) -> bool:
+        assert self._aimd is not None
+        if host.smoothed_latency is None:
+            host.smoothed_latency = latency
+        else:
+            smoothing = self._aimd.latency_smoothing
+            host.smoothed_latency = smoothing * latency + (1 - smoothing) * host.smoothed_latency
+        if host.baseline_latency is None or host.smoothed_latency < host.baseline_latency:
+            host.baseline_latency = host.smoothed_latency
+        return host.smoothed_latency > self._aimd.latency_tolerance * host.baseline_latency
+
+    def _decrease_limit(self, host: _HostState, url: str) -> None:
+        assert self._aimd is not None
+        now = time.monotonic()
+        if now - host.last_decrease_at < (host.smoothed_latency or 0.0):
+            return
+        host.last_decrease_at = now
+        host.congestion_events += 1
+        host.limit = max(float(self._aimd.min_limit), host.limit * self._aimd.multiplicative_decrease)
+        logger.warning(f"Congestion detected for {urlsplit(url).netloc}, concurrency limit is now {int(host.limit)}")
+
+
+class UnlimitedConcurrencyController(ConcurrencyController):
+    """Concurrency controller that never waits, for loaders limiting concurrency themselves."""
+
+    @asynccontextmanager
+    async def limit(self, url: str) -> AsyncIterator[None]:
+        yield
@@ -0,0 +1,48 @@
+from collections.abc import Sequence
+from typing import NamedTuple
+
+from src.application.interfaces import LLMDecisionTreeQuestionGenerator
+from src.domain.dtos.decision_tree_question import DecisionTreeQuestion
+from src.domain.entities.res_tuke_study_programme_data import ResTukeStudyProgrammeData
+from src.interface_adapters.gateways.study_programmes_gateway_base import Page
+from src.interface_adapters.services.heuristic_decision_tree_question_generator import (
+    HeuristicDecisionTreeQuestionGenerator
+)
+
+
+class HybridSplitStatistics(NamedTuple):
+    local: int
+    language_model: int
+
+
+class HybridDecisionTreeQuestionGenerator(LLMDecisionTreeQuestionGenerator[Page[ResTukeStudyProgrammeData]]):
+    """
+    Question generator splitting by a structured attribute locally when it divides the programmes well enough and
+    asking the language model only for the remaining subsets.
+    """
+
+    def __init__(
+            self,
+            heuristic_generator: HeuristicDecisionTreeQuestionGenerator,
+            language_model_generator: LLMDecisionTreeQuestionGenerator[Page[ResTukeStudyProgrammeData]]
+    ) -> None:
+        self._heuristic_generator = heuristic_generator
+        self._language_model_generator = language_model_generator
+        self._local = 0
+        self._language_model = 0
+
+    @property
+    def statistics(self) -> HybridSplitStatistics:
+        return HybridSplitStatistics(self._local, self._language_model)
+
+    async def generate_question(
+            self,
+            study_programmes: list[Page[ResTukeStudyProgrammeData]],
+            rejected_questions: Sequence[DecisionTreeQuestion] = ()
+    ) -> DecisionTreeQuestion:
+        question = self._heuristic_generator.attribute_split(study_programmes, rejected_questions)
+        if question is not None:
+            self._local += 1
+            return question
+        self._language_model += 1
+        return await self._language_model_generator.generate_question(study_programmes, rejected_questions)
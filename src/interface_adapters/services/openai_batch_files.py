@@ -0,0 +1,117 @@
+import json
+from collections.abc import Sequence
+from pathlib import Path
+from typing import Any, Callable, NamedTuple, Optional
+
+from loguru import logger
+
+from src.application.interfaces import MultiSubsetQuestionGenerator, KeyValueCache
+from src.domain.dtos.decision_tree_question import DecisionTreeQuestion
+from src.domain.entities.res_tuke_study_programme_data import ResTukeStudyProgrammeData
+from src.interface_adapters.exceptions import QuestionsExportedError
+from src.interface_adapters.gateways.study_programmes_gateway_base import Page
+from src.interface_adapters.services.caching_decision_tree_question_generator import (
+    CachingDecisionTreeQuestionGenerator
+)
+from src.interface_adapters.services.openai_decision_tree_question_generator import (
+    OpenAIDecisionTreeQuestionGenerator
+)
+
+
+class BatchImportSummary(NamedTuple):
+    imported: int
+    invalid: int
+    failed: int
+
+
+class OpenAIBatchRequestExporter(MultiSubsetQuestionGenerator[Page[ResTukeStudyProgrammeData]]):
+    """
+    Writes question requests to an OpenAI Batch API input file instead of sending them.
+
+    Every request is identified by the question cache key of its programmes and the questions rejected for them, and
+    the aliases of the programme codes used in its prompt are kept in a separate JSON file. Once the batch is processed, ``OpenAIBatchResultImporter``
+    stores the results in the question cache, so the next tree generation reuses them and exports the next level.
+    """
+
+    def __init__(
+            self,
+            generator: OpenAIDecisionTreeQuestionGenerator,
+            request_id: Callable[[list[Page[ResTukeStudyProgrammeData]], Sequence[DecisionTreeQuestion]], str],
+            requests_path: Path,
+            aliases_path: Path
+    ) -> None:
+        """
+        :param generator: Generator building the requests.
+        :param request_id: Identifier of the request for the programmes and the questions rejected for them, the
+            question cache key.
+        :param requests_path: JSONL file the requests are appended to.
+        :param aliases_path: JSON file mapping the request identifiers to the aliases of the programme codes.
+        """
+        self._generator = generator
+        self._request_id = request_id
+        self._requests_path = requests_path
+        self._aliases_path = aliases_path
+
+    async def generate_questions(
+            self,
+            subsets: list[list[Page[ResTukeStudyProgrammeData]]],
+            rejected_questions: Sequence[Sequence[DecisionTreeQuestion]] = ()
+    ) -> list[DecisionTreeQuestion]:
+        """
+        :raises QuestionsExportedError: Always, after the requests are written.
+        """
+        aliases = json.loads(self._aliases_path.read_text("utf-8")) if self._aliases_path.exists() else {}
+        with self._requests_path.open("a", encoding="utf-8") as requests_file:
+            for index, subset in enumerate(subsets):
+                subset_rejected_questions = rejected_questions[index] if rejected_questions else ()
+                custom_id = self._request_id(subset, subset_rejected_questions)
+                request, aliases[custom_id] = self._generator.batch_request(custom_id, subset, subset_rejected_questions)
+                requests_file.write(json.dumps(request, ensure_ascii=False) + "\n")
+        self._aliases_path.write_text(json.dumps(aliases), "utf-8")
+        raise QuestionsExportedError(f"Exported {len(subsets)} question requests to {self._requests_path}")
+
+
+class OpenAIBatchResultImporter:
+    """
+    Stores questions from an OpenAI Batch API output file in the question cache.
+    """
+
+    def __init__(self, cache: KeyValueCache) -> None:
+        self._cache = cache
+
+    def import_results(self, results_path: Path, aliases_path: Path) -> BatchImportSummary:
+        """
+        :param results_path: JSONL output file of the batch.
+        :param aliases_path: JSON file with the aliases written by ``OpenAIBatchRequestExporter``.
+        :return: Numbers of imported questions, questions not partitioning their programmes and failed requests.
+        """
+        aliases = json.loads(aliases_path.read_text("utf-8"))
+        imported = invalid = failed = 0
+        with results_path.open(encoding="utf-8") as results_file:
+            for line in results_file:
+                if not line.strip():
+                    continue
+                result = json.loads(line)
+                custom_id = result["custom_id"]
+                response = result.get("response")
+                if result.get("error") or not response or response["status_code"] != 200 or custom_id not in aliases:
+                    logger.warning(f"Skipping failed batch request {custom_id}: {result.get('error')}")
+                    failed += 1
+                    continue
+                question = self._parse_question(response["body"], aliases[custom_id])
+                if question is None:
+                    logger.warning(f"Skipping invalid question of batch request {custom_id}")
+                    invalid += 1
+                    continue
+                self._cache.put(custom_id, CachingDecisionTreeQuestionGenerator.encode_question(question))
+                imported += 1
+        return BatchImportSummary(imported, invalid, failed)
+
+    @staticmethod
+    def _parse_question(body: dict[str, Any], aliases: dict[str, str]) -> Optional[DecisionTreeQuestion]:
+        try:
+            return OpenAIDecisionTreeQuestionGenerator.parse_batch_question(
+                body["choices"][0]["message"]["content"], aliases
+            )
+        except (ValueError, KeyError, TypeError):
+            return None
@@ -1,31 +1,75 @@
+import asyncio
 import json
-from typing import Union, Any
+from collections.abc import Sequence
+from types import TracebackType
+from typing import Union, Any, NamedTuple, Optional, Self, Type
 
+import httpx
 from loguru import logger
 from openai import AsyncOpenAI
-from openai.types import ChatModel
+from openai.types import ChatModel, CompletionUsage
 
-from src.application.interfaces import LLMDecisionTreeQuestionGenerator
+from src.application.interfaces import LLMDecisionTreeQuestionGenerator, MultiSubsetQuestionGenerator
 from src.domain.dtos.decision_tree_question import DecisionTreeQuestion
 from src.domain.entities.res_tuke_study_programme_data import ResTukeStudyProgrammeData
+from src.interface_adapters.exceptions import QuestionGenerationError
 from src.interface_adapters.gateways.study_programmes_gateway_base import Page
+from src.interface_adapters.services.compact_prompt_encoder import CompactPromptEncoder, EncodedProgrammes
+
+
+class OpenAIClientSettings(NamedTuple):
+    base_url: Optional[str] = None
+    http2: bool = False
+    max_connections: int = 20
+    max_keepalive_connections: int = 20
+    keepalive_expiry: float = 60.0
+    connect_timeout: float = 10.0
+    request_timeout: float = 120.0
+    max_retries: int = 2
+
+
+class PartitionRepairStatistics(NamedTuple):
+    questions: int
+    duplicates_dropped: int
+    missing_classified: int
+    regenerated: int
+    failed: int
+
+
+class TokenUsage(NamedTuple):
+    requests: int
+    estimated_prompt_tokens: int
+    prompt_tokens: int
+    completion_tokens: int
 
 
 class OpenAIDecisionTreeQuestionGenerator(
-    LLMDecisionTreeQuestionGenerator[Page[ResTukeStudyProgrammeData]]
+    LLMDecisionTreeQuestionGenerator[Page[ResTukeStudyProgrammeData]],
+    MultiSubsetQuestionGenerator[Page[ResTukeStudyProgrammeData]]
 ):
+    """
+    Question generator backed by the OpenAI chat completions API.
+
+    The generator owns one ``AsyncOpenAI`` client and its HTTP connection pool for its whole lifetime, so
+    connections to the API are reused by every tree node. Close it with ``aclose`` or use it as an async
+    context manager.
+    """
+
+    # Identifies the prompt and response schema in cached questions, bump it whenever either of them changes.
+    PROMPT_VERSION = "3"
+
     _system_prompt = (
         "You are an AI assistant tasked with designing a binary decision tree to recommend "
-        "university study programmes at TUKE. Each study programme is represented by its "
-        "'code' and attributes provided in JSON format. Your goal is to generate a yes/no "
+        "university study programmes at TUKE. The study programmes are given as a table with one programme "
+        "per row, each identified by its short 'id'. Your goal is to generate a yes/no "
         "question for the university applicant that divides the programmes into two "
         "meaningful (and not empty!) groups ('yes' and 'no') based on their attributes.\n\n"
         "Provide the output in the following JSON schema:\n\n"
         "```\n"
         "{\n"
         '  "question": "Your question here",\n'
-        '  "yes": ["List of study programme codes answering \'yes\'"],\n'
-        '  "no": ["List of study programme codes answering \'no\'"]\n'
+        '  "yes": ["List of study programme ids answering \'yes\'"],\n'
+        '  "no": ["List of study programme ids answering \'no\'"]\n'
         "}\n"
         "```\n\n"
         "**Rules:**\n\n"
@@ -36,8 +80,8 @@ class OpenAIDecisionTreeQuestionGenerator(
         "with these attributes.\n"
         "4. All paths in the decision tree must eventually cover all available study programmes, with no "
         "redundancy.\n\n"
-        "Attributes:\n"
-        "- `code`: str\n"
+        "Columns of the table (long texts may be shortened):\n"
+        "- `id`: str\n"
         "- `study_field`: str\n"
         "- `description`: str\n"
         "- `learning_objectives`: str\n"
@@ -56,14 +100,14 @@ class OpenAIDecisionTreeQuestionGenerator(
             },
             "yes": {
                 "type": "array",
-                "description": "Not empty list of study programme codes that answer 'yes'.",
+                "description": "Not empty list of study programme ids that answer 'yes'.",
                 "items": {
                     "type": "string"
                 }
             },
             "no": {
                 "type": "array",
-                "description": "Not empty list of study programme codes that answer 'no'.",
+                "description": "Not empty list of study programme ids that answer 'no'.",
                 "items": {
                     "type": "string"
                 }
@@ -73,6 +117,73 @@ class OpenAIDecisionTreeQuestionGenerator(
         "additionalProperties": False
     }
 
+    _batch_system_prompt = _system_prompt + (
+        "\n\nYou are given several independent subsets of study programmes, each with its own table and id. "
+        "Generate one question for every subset, following the rules above for each of them separately, and "
+        "return the subset id with every question."
+    )
+
+    _batch_response_schema = {
+        "type": "object",
+        "properties": {
+            "splits": {
+                "type": "array",
+                "description": "One question for every given subset of study programmes.",
+                "items": {
+                    "type": "object",
+                    "properties": {
+                        "subset": {
+                            "type": "string",
+                            "description": "Id of the subset divided by the question."
+                        },
+                        **_response_schema["properties"]  # type: ignore[dict-item]
+                    },
+                    "required": ["subset", "question", "yes", "no"],
+                    "additionalProperties": False
+                }
+            }
+        },
+        "required": ["splits"],
+        "additionalProperties": False
+    }
+
+    _classification_system_prompt = (
+        "You are an AI assistant helping to build a binary decision tree recommending university study "
+        "programmes at TUKE. You are given a yes/no question for the university applicant and a table of study "
+        "programmes, one programme per row identified by its short 'id'. Decide for every programme whether an "
+        "applicant answering 'yes' or 'no' to the question should be recommended this programme.\n\n"
+        "Provide the output in the following JSON schema:\n\n"
+        "```\n"
+        "{\n"
+        '  "yes": ["List of study programme ids answering \'yes\'"],\n'
+        '  "no": ["List of study programme ids answering \'no\'"]\n'
+        "}\n"
+        "```\n\n"
+        "Every given programme id must appear in exactly one of the lists."
+    )
+
+    _classification_schema = {
+        "type": "object",
+        "properties": {
+            "yes": {
+                "type": "array",
+                "description": "Study programme ids that answer 'yes'.",
+                "items": {
+                    "type": "string"
+                }
+            },
+            "no": {
+                "type": "array",
+                "description": "Study programme ids that answer 'no'.",
+                "items": {
+                    "type": "string"
+                }
+            }
+        },
+        "required": ["yes", "no"],
+        "additionalProperties": False
+    }
+
     def __init__(
             self,
             api_key: str,
@@ -82,81 +193,447 @@ class OpenAIDecisionTreeQuestionGenerator(
             top_p: float = 1.0,
             frequency_penalty: float = 0.0,
             presence_penalty: float = 0.0,
+            client_settings: OpenAIClientSettings = OpenAIClientSettings(),
+            max_attempts: int = 3,
+            prompt_encoder: Optional[CompactPromptEncoder] = None,
+            max_output_tokens: int = 16384,
     ) -> None:
-        self._api_key = api_key
+        """
+        :param api_key: OpenAI API key.
+        :param model: Chat model generating the questions.
+        :param client_settings: Connection pool, timeouts and endpoint of the API client. Setting ``base_url``
+            points the generator at another OpenAI compatible server, e.g. a local stub. HTTP/2 requires the
+            ``h2`` package.
+        :param max_attempts: Maximum number of questions requested for one set of programmes before giving up.
+        :param prompt_encoder: Encoder of the study programmes sent in prompts, defines the token budget.
+        :param max_output_tokens: Maximum number of output tokens the model allows in one response. A request for
+            several subsets asks for ``max_tokens`` per subset, so it holds at most this many tokens worth of them.
+        """
+        self._client = self._create_client(api_key, client_settings)
         self._model = model
         self._temperature = temperature
         self._max_tokens = max_tokens
+        self._max_output_tokens = max_output_tokens
         self._top_p = top_p
         self._frequency_penalty = frequency_penalty
         self._presence_penalty = presence_penalty
+        self._max_attempts = max_attempts
+        self._generated = 0
+        self._duplicates_dropped = 0
+        self._missing_classified = 0
+        self._regenerated = 0
+        self._failed = 0
+        self._prompt_encoder = prompt_encoder or CompactPromptEncoder()
+        self._token_usage = TokenUsage(0, 0, 0, 0)
+
+    @property
+    def model(self) -> str:
+        return self._model
+
+    @property
+    def repair_statistics(self) -> PartitionRepairStatistics:
+        return PartitionRepairStatistics(
+            self._generated, self._duplicates_dropped, self._missing_classified, self._regenerated, self._failed
+        )
+
+    @property
+    def token_usage(self) -> TokenUsage:
+        return self._token_usage
+
+    async def __aenter__(self) -> Self:
+        return self
+
+    async def __aexit__(
+            self,
+            exc_type: Optional[Type[BaseException]],
+            exc_val: Optional[BaseException],
+            exc_tb: Optional[TracebackType]
+    ) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        """
+        Closes the API client and its connection pool.
+        """
+        await self._client.close()
+
+    @staticmethod
+    def _create_client(api_key: str, settings: OpenAIClientSettings) -> AsyncOpenAI:
+        timeout = httpx.Timeout(settings.request_timeout, connect=settings.connect_timeout)
+        http_client = httpx.AsyncClient(
+            http2=settings.http2,
+            limits=httpx.Limits(
+                max_connections=settings.max_connections,
+                max_keepalive_connections=settings.max_keepalive_connections,
+                keepalive_expiry=settings.keepalive_expiry
+            ),
+            timeout=timeout,
+            follow_redirects=True
+        )
+        return AsyncOpenAI(
+            api_key=api_key,
+            base_url=settings.base_url,
+            timeout=timeout,
+            max_retries=settings.max_retries,
+            http_client=http_client
+        )
 
     async def generate_question(
             self,
-            study_programmes: list[Page[ResTukeStudyProgrammeData]]
+            study_programmes: list[Page[ResTukeStudyProgrammeData]],
+            rejected_questions: Sequence[DecisionTreeQuestion] = ()
     ) -> DecisionTreeQuestion:
-        client = AsyncOpenAI(api_key=self._api_key)
-        user_message = self._create_user_message(study_programmes)
+        """
+        Generates a question and validates that its groups partition the study programmes.
+
+        An invalid partition is repaired locally where possible: unknown and duplicated codes are dropped and
+        codes missing from both groups are classified by a follow-up prompt. Only when the repair fails, e.g. one
+        of the groups is empty, the question is regenerated, at most ``max_attempts`` times in total. Rejected
+        questions are listed in the prompt with the sizes of their groups, asking for a different, more even split.
+
+        :raises QuestionGenerationError: If no valid question is generated within the attempts.
+        """
+        self._generated += 1
+        for attempt in range(1, self._max_attempts + 1):
+            try:
+                question = await self._request_question(study_programmes, rejected_questions)
+                repaired_question = await self._repair_partition(question, study_programmes)
+            except (ValueError, KeyError, TypeError) as e:
+                logger.error(f"Invalid language model response: {e}")
+                repaired_question = None
+            if repaired_question is not None:
+                logger.debug(f"Generated question: {repaired_question}")
+                return repaired_question
+            if attempt < self._max_attempts:
+                self._regenerated += 1
+                logger.warning(f"Regenerating question, attempt {attempt + 1} of {self._max_attempts}")
+        self._failed += 1
+        raise QuestionGenerationError(
+            f"No valid question generated for {len(study_programmes)} programmes in {self._max_attempts} attempts"
+        )
+
+    async def generate_questions(
+            self,
+            subsets: list[list[Page[ResTukeStudyProgrammeData]]],
+            rejected_questions: Sequence[Sequence[DecisionTreeQuestion]] = ()
+    ) -> list[DecisionTreeQuestion]:
+        """
+        Generates questions for several subsets of study programmes in as few requests as the token budget allows.
+
+        The subsets are grouped so the encoded programmes of one request fit into the token budget of the prompt
+        encoder and their answers into the output token limit of the model, and every group is asked for all of its
+        questions in one request. Subsets with rejected questions, questions missing from the response and questions
+        failing the partition repair are generated one by one.
+        """
+        encoded_subsets = [self._prompt_encoder.encode(subset) for subset in subsets]
+        max_group_size = max(1, self._max_output_tokens // self._max_tokens)
+        groups: list[list[int]] = []
+        retries: list[int] = []
+        group_tokens = 0
+        for index, encoded_subset in enumerate(encoded_subsets):
+            if rejected_questions and rejected_questions[index]:
+                retries.append(index)
+                continue
+            if (
+                    not groups
+                    or len(groups[-1]) >= max_group_size
+                    or group_tokens + encoded_subset.approximate_tokens > self._prompt_encoder.token_budget
+            ):
+                groups.append([])
+                group_tokens = 0
+            groups[-1].append(index)
+            group_tokens += encoded_subset.approximate_tokens
+        grouped_questions, retried_questions = await asyncio.gather(
+            asyncio.gather(*(
+                self._generate_group_questions(
+                    [subsets[index] for index in group], [encoded_subsets[index] for index in group]
+                )
+                for group in groups
+            )),
+            asyncio.gather(*(self.generate_question(subsets[index], rejected_questions[index]) for index in retries))
+        )
+        questions: dict[int, DecisionTreeQuestion] = dict(zip(retries, retried_questions))
+        for group, group_questions in zip(groups, grouped_questions):
+            questions.update(zip(group, group_questions))
+        return [questions[index] for index in range(len(subsets))]
+
+    async def _generate_group_questions(
+            self,
+            subsets: list[list[Page[ResTukeStudyProgrammeData]]],
+            encoded_subsets: list[EncodedProgrammes]
+    ) -> list[DecisionTreeQuestion]:
+        if len(subsets) == 1:
+            return [await self.generate_question(subsets[0])]
+        tables = "\n\n".join(
+            f"Subset s{index}:\n{encoded_subset.text}" for index, encoded_subset in enumerate(encoded_subsets, 1)
+        )
+        try:
+            parsed_response = await self._complete(
+                self._batch_system_prompt,
+                f"Here are the subsets of study programmes:\n\n{tables}\n\n"
+                "Please generate a question for every subset as per the instructions.",
+                "binary_decision_tree_questions",
+                self._batch_response_schema,
+                max_tokens=self._max_tokens * len(subsets)
+            )
+            splits = {
+                split["subset"]: split for split in parsed_response["splits"]
+                if isinstance(split, dict) and "subset" in split
+            }
+        except (ValueError, KeyError, TypeError) as e:
+            logger.error(f"Invalid language model response to {len(subsets)} subsets: {e}")
+            splits = {}
+
+        questions: list[Optional[DecisionTreeQuestion]] = []
+        for index, (subset, encoded_subset) in enumerate(zip(subsets, encoded_subsets), 1):
+            split = splits.get(f"s{index}")
+            try:
+                repaired_question = await self._repair_partition(
+                    DecisionTreeQuestion(
+                        text=split["question"],
+                        yes_nodes=self._resolve_aliases(split["yes"], encoded_subset.aliases),
+                        no_nodes=self._resolve_aliases(split["no"], encoded_subset.aliases)
+                    ),
+                    subset
+                ) if split is not None else None
+            except (ValueError, KeyError, TypeError) as e:
+                logger.error(f"Invalid language model response for subset s{index}: {e}")
+                repaired_question = None
+            if repaired_question is None:
+                logger.warning(f"No valid question for subset s{index} in the batched response, generating it alone")
+            else:
+                self._generated += 1
+            questions.append(repaired_question)
+        missing_indices = [index for index, question in enumerate(questions) if question is None]
+        generated_questions = await asyncio.gather(*(
+            self.generate_question(subsets[index]) for index in missing_indices
+        ))
+        for index, question in zip(missing_indices, generated_questions):
+            questions[index] = question
+        return [question for question in questions if question is not None]
+
+    def batch_request(
+            self,
+            custom_id: str,
+            study_programmes: list[Page[ResTukeStudyProgrammeData]],
+            rejected_questions: Sequence[DecisionTreeQuestion] = ()
+    ) -> tuple[dict[str, Any], dict[str, str]]:
+        """
+        Builds one line of an OpenAI Batch API input file requesting a question for the study programmes.
+
+        :param custom_id: Identifier of the request, returned with its result.
+        :param study_programmes: List of study programmes.
+        :param rejected_questions: Previously rejected questions for the study programmes.
+        :return: The request line and the aliases of the programme codes used in the prompt, needed to read the
+            result with ``parse_batch_question``.
+        """
+        encoded_programmes = self._prompt_encoder.encode(study_programmes)
+        body = self._request_body(
+            self._system_prompt,
+            self._create_user_message(encoded_programmes.text, self._question_instruction(rejected_questions)),
+            "binary_decision_tree_question",
+            self._response_schema,
+            self._max_tokens
+        )
+        request = {"custom_id": custom_id, "method": "POST", "url": "/v1/chat/completions", "body": body}
+        return request, encoded_programmes.aliases
+
+    @classmethod
+    def parse_batch_question(cls, content: str, aliases: dict[str, str]) -> Optional[DecisionTreeQuestion]:
+        """
+        Reads a question from the content of an OpenAI Batch API result.
+
+        Unknown and duplicated codes are dropped, but there is no follow-up request for missing codes.
+
+        :param content: Message content of the chat completion.
+        :param aliases: Aliases of the programme codes returned by ``batch_request``.
+        :return: Question, or ``None`` if its groups do not partition the requested programmes.
+        """
+        parsed_response = cls._parse_model_response(content)
+        question = cls._drop_invalid_codes(
+            DecisionTreeQuestion(
+                text=parsed_response["question"],
+                yes_nodes=cls._resolve_aliases(parsed_response["yes"], aliases),
+                no_nodes=cls._resolve_aliases(parsed_response["no"], aliases)
+            ),
+            set(aliases.values())
+        )
+        if not question.yes_nodes or not question.no_nodes:
+            return None
+        if len(question.yes_nodes) + len(question.no_nodes) < len(aliases):
+            return None
+        return question
+
+    async def _request_question(
+            self,
+            study_programmes: list[Page[ResTukeStudyProgrammeData]],
+            rejected_questions: Sequence[DecisionTreeQuestion]
+    ) -> DecisionTreeQuestion:
+        encoded_programmes = self._prompt_encoder.encode(study_programmes)
+        parsed_response = await self._complete(
+            self._system_prompt,
+            self._create_user_message(encoded_programmes.text, self._question_instruction(rejected_questions)),
+            "binary_decision_tree_question",
+            self._response_schema
+        )
+        return DecisionTreeQuestion(
+            text=parsed_response["question"],
+            yes_nodes=self._resolve_aliases(parsed_response["yes"], encoded_programmes.aliases),
+            no_nodes=self._resolve_aliases(parsed_response["no"], encoded_programmes.aliases)
+        )
 
-        response = await client.chat.completions.create(
-            model=self._model,
-            messages=[
-                {"role": "system", "content": [{"text": self._system_prompt, "type": "text"}]},
+    async def _repair_partition(
+            self,
+            question: DecisionTreeQuestion,
+            study_programmes: list[Page[ResTukeStudyProgrammeData]]
+    ) -> Optional[DecisionTreeQuestion]:
+        codes = {study_programme.metadata.code for study_programme in study_programmes}
+        valid_question = self._drop_invalid_codes(question, codes)
+        yes_nodes, no_nodes = valid_question.yes_nodes, valid_question.no_nodes
+        if len(yes_nodes) + len(no_nodes) < len(question.yes_nodes) + len(question.no_nodes):
+            self._duplicates_dropped += 1
+            logger.warning(f"Dropped unknown or duplicated codes from the question '{question.text}'")
+
+        missing_programmes = [
+            study_programme for study_programme in study_programmes
+            if study_programme.metadata.code not in yes_nodes and study_programme.metadata.code not in no_nodes
+        ]
+        if missing_programmes:
+            logger.warning(f"Classifying {len(missing_programmes)} programmes missing from '{question.text}'")
+            classified_yes, classified_no = await self._classify(question.text, missing_programmes)
+            yes_nodes.extend(classified_yes)
+            no_nodes.extend(classified_no)
+            if len(yes_nodes) + len(no_nodes) < len(codes):
+                logger.error(f"Classification of the programmes missing from '{question.text}' is incomplete")
+                return None
+            self._missing_classified += 1
+
+        if not yes_nodes or not no_nodes:
+            logger.error(f"Question '{question.text}' resulted in an empty group")
+            return None
+        return DecisionTreeQuestion(text=question.text, yes_nodes=yes_nodes, no_nodes=no_nodes)
+
+    @staticmethod
+    def _drop_invalid_codes(question: DecisionTreeQuestion, codes: set[str]) -> DecisionTreeQuestion:
+        yes_nodes = list(dict.fromkeys(code for code in question.yes_nodes if code in codes))
+        no_nodes = list(dict.fromkeys(code for code in question.no_nodes if code in codes and code not in yes_nodes))
+        return DecisionTreeQuestion(text=question.text, yes_nodes=yes_nodes, no_nodes=no_nodes)
+
+    async def _classify(
+            self,
+            question_text: str,
+            study_programmes: list[Page[ResTukeStudyProgrammeData]]
+    ) -> tuple[list[str], list[str]]:
+        encoded_programmes = self._prompt_encoder.encode(study_programmes)
+        parsed_response = await self._complete(
+            self._classification_system_prompt,
+            f"Question: {question_text}\n\n" + self._create_user_message(
+                encoded_programmes.text, "Please classify every programme as per the instructions."
+            ),
+            "binary_decision_tree_classification",
+            self._classification_schema
+        )
+        codes = {study_programme.metadata.code for study_programme in study_programmes}
+        classified_yes = self._resolve_aliases(parsed_response["yes"], encoded_programmes.aliases)
+        classified_no = self._resolve_aliases(parsed_response["no"], encoded_programmes.aliases)
+        yes_nodes = list(dict.fromkeys(code for code in classified_yes if code in codes))
+        no_nodes = list(dict.fromkeys(code for code in classified_no if code in codes and code not in yes_nodes))
+        return yes_nodes, no_nodes
+
+    async def _complete(
+            self,
+            system_prompt: str,
+            user_message: str,
+            schema_name: str,
+            schema: dict[str, Any],
+            max_tokens: Optional[int] = None
+    ) -> dict[str, Any]:
+        response = await self._client.chat.completions.create(
+            **self._request_body(system_prompt, user_message, schema_name, schema, max_tokens or self._max_tokens)
+        )
+
+        estimated_prompt_tokens = self._prompt_encoder.estimate_tokens(system_prompt + user_message)
+        self._record_token_usage(schema_name, estimated_prompt_tokens, response.usage)
+        message = response.choices[0].message
+        if message.content is None:
+            raise ValueError(f"No JSON content returned from the language model API, refusal: {message.refusal!r}")
+        response_json = message.content
+        return self._parse_model_response(response_json)
+
+    def _request_body(
+            self,
+            system_prompt: str,
+            user_message: str,
+            schema_name: str,
+            schema: dict[str, Any],
+            max_tokens: int
+    ) -> dict[str, Any]:
+        return {
+            "model": self._model,
+            "messages": [
+                {"role": "system", "content": [{"text": system_prompt, "type": "text"}]},
                 {"role": "user", "content": [{"text": user_message, "type": "text"}]},
             ],
-            response_format={
+            "response_format": {
                 "type": "json_schema",
                 "json_schema": {
-                    "name": "binary_decision_tree_question",
+                    "name": schema_name,
                     "strict": True,
-                    "schema": self._response_schema
+                    "schema": schema
                 }
             },
-            temperature=self._temperature,
-            max_tokens=self._max_tokens,
-            top_p=self._top_p,
-            frequency_penalty=self._frequency_penalty,
-            presence_penalty=self._presence_penalty,
-        )
-
-        response_json = response.choices[0].message.content
-        if response_json is None:
-            raise RuntimeError("No JSON content returned from the language model API.")
-        parsed_response = self._parse_model_response(response_json)
-        logger.debug(f"Generated question: {parsed_response}")
-        yes_nodes = parsed_response["yes"]
-        no_nodes = parsed_response["no"]
-        if len(yes_nodes) == 0:
-            logger.error("Generated question resulted in an empty 'yes' group!")
-            logger.warning("Regenerating question...")
-            return await self.generate_question(study_programmes)
-        if len(no_nodes) == 0:
-            logger.error("Generated question resulted in an empty 'no' group!")
-            logger.warning("Regenerating question...")
-            return await self.generate_question(study_programmes)
-        return DecisionTreeQuestion(
-            text=parsed_response["question"],
-            yes_nodes=yes_nodes,
-            no_nodes=no_nodes
+            "temperature": self._temperature,
+            "max_tokens": max_tokens,
+            "top_p": self._top_p,
+            "frequency_penalty": self._frequency_penalty,
+            "presence_penalty": self._presence_penalty,
+        }
+
+    def _record_token_usage(
+            self,
+            request_name: str,
+            estimated_prompt_tokens: int,
+            usage: Optional[CompletionUsage]
+    ) -> None:
+        prompt_tokens = usage.prompt_tokens if usage else 0
+        completion_tokens = usage.completion_tokens if usage else 0
+        logger.debug(
+            f"Request {request_name}: ~{estimated_prompt_tokens} estimated prompt tokens, "
+            f"{prompt_tokens} prompt tokens, {completion_tokens} completion tokens"
+        )
+        self._token_usage = TokenUsage(
+            self._token_usage.requests + 1,
+            self._token_usage.estimated_prompt_tokens + estimated_prompt_tokens,
+            self._token_usage.prompt_tokens + prompt_tokens,
+            self._token_usage.completion_tokens + completion_tokens
         )
 
     @staticmethod
-    def _create_user_message(study_programmes: list[Page[ResTukeStudyProgrammeData]]) -> str:
-        programme_data = []
-
-        for programme in study_programmes:
-            programme_data.append({
-                "code": programme.metadata.code,
-                "study_field": programme.data.study_field,
-                "description": programme.data.description,
-                "learning_objectives": programme.data.learning_objectives,
-            })
+    def _question_instruction(rejected_questions: Sequence[DecisionTreeQuestion]) -> str:
+        if not rejected_questions:
+            return "Please generate a question as per the instructions."
+        rejected_list = "\n".join(
+            f"- {question.text} ({len(question.yes_nodes)} 'yes', {len(question.no_nodes)} 'no')"
+            for question in rejected_questions
+        )
         return (
-            "Here is the list of study programmes:\n"
-            f"{programme_data}\n\n"
-            "Please generate a question as per the instructions."
+            "These questions were already rejected, because their groups differ too much in size:\n"
+            f"{rejected_list}\n\n"
+            "Please generate a different question as per the instructions, dividing the programmes more evenly."
         )
 
+    @staticmethod
+    def _create_user_message(programmes_table: str, instruction: str) -> str:
+        return (
+            "Here is the table of study programmes:\n"
+            f"{programmes_table}\n\n"
+            f"{instruction}"
+        )
+
+    @staticmethod
+    def _resolve_aliases(aliases: list[str], codes: dict[str, str]) -> list[str]:
+        return [codes.get(alias, alias) for alias in aliases]
+
     @staticmethod
     def _parse_model_response(content: str) -> dict[str, Any]:
         try:
@@ -0,0 +1,99 @@
+import asyncio
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from enum import Enum
+from typing import Any, Callable, Optional, Self
+
+from src.application.interfaces import ParseExecutor, LanguageParserFactory, Parser
+from src.domain.enums import Language
+
+type ParserFactoryCreator[Data] = Callable[[], LanguageParserFactory[Parser[str, Data]]]
+
+_worker_state = threading.local()
+
+
+def _initialize_worker(parser_factory_creator: ParserFactoryCreator[Any]) -> None:
+    _worker_state.parser_factory = parser_factory_creator()
+
+
+def _parse_chunk(chunk: list[tuple[Language, str]]) -> list[Any]:
+    parser_factory: LanguageParserFactory[Parser[str, Any]] = _worker_state.parser_factory
+    return [parser_factory.create(language).parse_one(page) for language, page in chunk]
+
+
+class ParseExecutorKind(Enum):
+    INLINE = "inline"
+    THREAD = "thread"
+    PROCESS = "process"
+
+
+class InlineParseExecutor[Data](ParseExecutor[Data]):
+    """Parses pages directly on the event loop thread."""
+
+    def __init__(self, language_parser_factory: LanguageParserFactory[Parser[str, Data]]) -> None:
+        self._language_parser_factory = language_parser_factory
+
+    @property
+    def batch_size(self) -> int:
+        return 1
+
+    async def parse_multiple(self, pages: list[tuple[Language, str]]) -> list[Data]:
+        return [self._language_parser_factory.create(language).parse_one(page) for language, page in pages]
+
+
+class PoolParseExecutor[Data](ParseExecutor[Data]):
+    """
+    Parses pages in a thread or process pool.
+
+    Every worker builds its own parser factory once, when it starts, and receives pages in chunks to amortise the
+    cost of shipping them between processes. Process workers are spawned, so the parser factory creator and the
+    parsed data must be picklable.
+    """
+
+    def __init__(
+            self,
+            parser_factory_creator: ParserFactoryCreator[Data],
+            kind: ParseExecutorKind = ParseExecutorKind.PROCESS,
+            workers: Optional[int] = None,
+            chunk_size: int = 16
+    ) -> None:
+        self._workers = workers or os.cpu_count() or 1
+        self._chunk_size = chunk_size
+        self._executor = self._create_executor(parser_factory_creator, kind)
+
+    def _create_executor(self, parser_factory_creator: ParserFactoryCreator[Data], kind: ParseExecutorKind) -> Executor:
+        if kind == ParseExecutorKind.THREAD:
+            return ThreadPoolExecutor(
+                self._workers, initializer=_initialize_worker, initargs=(parser_factory_creator,)
+            )
+        if kind == ParseExecutorKind.PROCESS:
+            return ProcessPoolExecutor(
+                self._workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_initialize_worker,
+                initargs=(parser_factory_creator,)
+            )
+        raise ValueError(f"Unsupported pool parse executor kind: {kind}")
+
+    @property
+    def batch_size(self) -> int:
+        return self._workers * self._chunk_size
+
+    async def parse_multiple(self, pages: list[tuple[Language, str]]) -> list[Data]:
+        loop = asyncio.get_running_loop()
+        chunks = [pages[start:start + self._chunk_size] for start in range(0, len(pages), self._chunk_size)]
+        parsed_chunks: list[list[Data]] = await asyncio.gather(
+            *(loop.run_in_executor(self._executor, _parse_chunk, chunk) for chunk in chunks)
+        )
+        return [data for parsed_chunk in parsed_chunks for data in parsed_chunk]
+
+    def close(self) -> None:
+        self._executor.shutdown()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *_: object) -> None:
+        self.close()
@@ -2,21 +2,63 @@ from src.domain.entities.question_tree import QuestionTree
 from src.domain.entities.res_tuke_study_programme_data import ResTukeStudyProgrammeData
 from src.infrastructure.api.types.current_question_response import CurrentQuestionResponse
 from src.interface_adapters.gateways.study_programmes_gateway_base import Page
-from src.interface_adapters.services.question_tree.session_manager import SessionManager
+from src.interface_adapters.services.question_tree.compiled_question_tree import CompiledQuestionTree
+from src.interface_adapters.services.question_tree.session_manager import (
+    SessionLimits, SessionManager, SessionStatistics, TreeVersionStatistics
+)
 from loguru import logger
 
 
 class QuestionTreeAPI:
-    def __init__(self, decision_tree: QuestionTree[Page[ResTukeStudyProgrammeData]]) -> None:
+    def __init__(
+            self,
+            decision_tree: QuestionTree[Page[ResTukeStudyProgrammeData]] | CompiledQuestionTree,
+            session_limits: SessionLimits = SessionLimits()
+    ) -> None:
         """
         Initialize the QuestionTreeAPI with a decision tree.
 
-        :param decision_tree: The question tree to navigate
+        :param decision_tree: The question tree to navigate, compiled once here unless it already is
+        :param session_limits: Idle TTL and maximum number of sessions
         """
-        self._decision_tree = decision_tree
-        self._session_manager = SessionManager(decision_tree)
+        if not isinstance(decision_tree, CompiledQuestionTree):
+            decision_tree = CompiledQuestionTree.compile(decision_tree)
+        self._session_manager = SessionManager(decision_tree, session_limits)
         logger.info("Initialized QuestionTreeAPI")
 
+    @property
+    def tree_versions(self) -> list[TreeVersionStatistics]:
+        """
+        :return: Statistics of the tree versions still in use, including the current one
+        """
+        return self._session_manager.tree_versions
+
+    @property
+    def session_statistics(self) -> SessionStatistics:
+        """
+        :return: Live, expired and evicted session counts and the approximate memory of one session
+        """
+        return self._session_manager.statistics
+
+    def remove_expired_sessions(self) -> int:
+        """
+        Remove the sessions idle for longer than the TTL.
+
+        :return: The number of removed sessions
+        """
+        return self._session_manager.remove_expired_sessions()
+
+    def swap_tree(self, decision_tree: QuestionTree[Page[ResTukeStudyProgrammeData]] | CompiledQuestionTree) -> int:
+        """
+        Serve a new decision tree to new sessions while existing sessions finish on their tree.
+
+        :param decision_tree: The new question tree, compiled here unless it already is
+        :return: The number of the new tree version
+        """
+        if not isinstance(decision_tree, CompiledQuestionTree):
+            decision_tree = CompiledQuestionTree.compile(decision_tree)
+        return self._session_manager.swap_tree(decision_tree)
+
     def create_session(self) -> str:
         """
         Create a new session and return its ID.
@@ -27,6 +69,16 @@ class QuestionTreeAPI:
         logger.info(f"Created new API session: {session_id}")
         return session_id
 
+    def close_session(self, session_id: str) -> None:
+        """
+        Close a session.
+
+        :param session_id: The ID of the session
+        :raises SessionNotFoundError: If the session ID is not found
+        """
+        self._session_manager.close_session(session_id)
+        logger.info(f"Closed API session: {session_id}")
+
     def answer_question(self, session_id: str, answer: str) -> list[Page[ResTukeStudyProgrammeData]] | None:
         """
         Process an answer for the current question in a session.
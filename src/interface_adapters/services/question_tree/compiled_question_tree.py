@@ -0,0 +1,228 @@
+from array import array
+from collections.abc import Sequence
+from enum import IntEnum
+from typing import cast
+
+from src.domain.entities.binary_question import BinaryQuestion
+from src.domain.entities.options_question import OptionsQuestion, AnswerOption
+from src.domain.entities.question_tree import QuestionTree
+from src.interface_adapters.services.question_tree.exceptions import InvalidQuestionTreeError
+from src.interface_adapters.services.question_tree.memory_usage import estimate_nbytes
+from src.interface_adapters.services.question_tree.type_aliases import AnswerNode, TreeNode
+
+
+class NodeKind(IntEnum):
+    PROGRAMME = 0
+    BINARY_QUESTION = 1
+    OPTIONS_QUESTION = 2
+
+
+_NODE_KINDS = tuple(NodeKind)
+
+
+class CompiledQuestionTree:
+    """
+    Immutable question tree flattened into contiguous integer arrays for serving.
+
+    Nodes are numbered in breadth-first order with the root at 0, so the answers of node ``n`` lead to the nodes
+    ``child_offsets[n]`` to ``child_offsets[n + 1] - 1``. The answers of a binary question are yes and no, in this
+    order. Question and answer texts are interned in one string table and the programmes of the leaves are kept once
+    in a programme table, so sessions navigate the tree by node index only and all of them share one instance.
+    """
+
+    ROOT = 0
+
+    def __init__(
+            self,
+            kinds: Sequence[int],
+            text_ids: Sequence[int],
+            answer_text_ids: Sequence[int],
+            child_offsets: Sequence[int],
+            programme_ids: Sequence[int],
+            strings: Sequence[str],
+            programmes: Sequence[AnswerNode]
+    ) -> None:
+        """
+        The sequences are only indexed, so they may be views of a memory-mapped file.
+
+        :param kinds: ``NodeKind`` of every node.
+        :param text_ids: String id of the question of every node, -1 for programmes.
+        :param answer_text_ids: String id of the answer leading to every node, -1 for the root.
+        :param child_offsets: Index of the first child of every node, followed by the number of nodes.
+        :param programme_ids: Programme id of every node, -1 for questions.
+        :param strings: Interned question and answer texts.
+        :param programmes: Programmes of the leaves.
+        """
+        self._kinds = kinds
+        self._text_ids = text_ids
+        self._answer_text_ids = answer_text_ids
+        self._child_offsets = child_offsets
+        self._programme_ids = programme_ids
+        self._strings = strings
+        self._programmes = programmes
+
+    @classmethod
+    def compile(cls, question_tree: QuestionTree[AnswerNode]) -> "CompiledQuestionTree":
+        """
+        Flattens a question tree.
+
+        :param question_tree: Question tree of nested questions.
+        :return: Compiled question tree.
+        """
+        kinds, text_ids, answer_text_ids = array("b"), array("i"), array("i", [-1])
+        child_offsets, programme_ids = array("i"), array("i")
+        string_ids: dict[str, int] = {}
+        programme_ids_by_identity: dict[int, int] = {}
+        programmes: list[AnswerNode] = []
+        nodes: list[TreeNode] = [question_tree.root]
+
+        def intern(text: str) -> int:
+            return string_ids.setdefault(text, len(string_ids))
+
+        for node in nodes:
+            child_offsets.append(len(nodes))
+            if isinstance(node, BinaryQuestion):
+                kinds.append(NodeKind.BINARY_QUESTION)
+                text_ids.append(intern(node.text))
+                programme_ids.append(-1)
+                nodes.extend((node.yes_answer_node, node.no_answer_node))
+                answer_text_ids.extend((intern("yes"), intern("no")))
+            elif isinstance(node, OptionsQuestion):
+                kinds.append(NodeKind.OPTIONS_QUESTION)
+                text_ids.append(intern(node.text))
+                programme_ids.append(-1)
+                nodes.extend(option.answer_node for option in node.answer_options)
+                answer_text_ids.extend(intern(option.text) for option in node.answer_options)
+            else:
+                kinds.append(NodeKind.PROGRAMME)
+                text_ids.append(-1)
+                programme_id = programme_ids_by_identity.setdefault(id(node), len(programmes))
+                if programme_id == len(programmes):
+                    programmes.append(node)
+                programme_ids.append(programme_id)
+        child_offsets.append(len(nodes))
+        return cls(
+            kinds, text_ids, answer_text_ids, child_offsets, programme_ids, tuple(string_ids), tuple(programmes)
+        )
+
+    def decompile(self) -> QuestionTree[AnswerNode]:
+        """
+        Rebuilds the question tree of nested questions, e.g. for the graph and statistics tools.
+
+        :return: Question tree of nested questions sharing one programme instance per programme id.
+        """
+        programmes = [self.programme_by_id(programme_id) for programme_id in range(self.programme_count)]
+        nodes: dict[int, TreeNode] = {}
+        # Children follow their parents in breadth-first order, so every child is built before its parent.
+        for node in reversed(range(len(self))):
+            answers = self.answers(node)
+            kind = self.kind(node)
+            if kind == NodeKind.PROGRAMME:
+                nodes[node] = programmes[self.programme_id(node)]
+            elif kind == NodeKind.BINARY_QUESTION:
+                # Binary questions answer with binary questions or programmes, as in the trees they are compiled from.
+                yes_node, no_node = (
+                    cast(BinaryQuestion[AnswerNode] | AnswerNode, nodes.pop(child)) for child in answers
+                )
+                nodes[node] = BinaryQuestion(text=self.text(node), yes_answer_node=yes_node, no_answer_node=no_node)
+            else:
+                nodes[node] = OptionsQuestion(text=self.text(node), answer_options=[
+                    AnswerOption(text=self.answer_text(child), answer_node=nodes.pop(child)) for child in answers
+                ])
+        return QuestionTree(root=nodes[self.ROOT])
+
+    def __len__(self) -> int:
+        return len(self._kinds)
+
+    @property
+    def nbytes(self) -> int:
+        """
+        Approximate memory held by the tree: the length of the array and memory-mapped sections and the deep size of
+        in-memory texts and programmes, counting objects shared within the tree once.
+        """
+        return estimate_nbytes((
+            self._kinds, self._text_ids, self._answer_text_ids, self._child_offsets, self._programme_ids,
+            self._strings, self._programmes
+        ))
+
+    @property
+    def programme_count(self) -> int:
+        return len(self._programmes)
+
+    def kind(self, node: int) -> NodeKind:
+        return _NODE_KINDS[self._kinds[node]]
+
+    def text(self, node: int) -> str:
+        """
+        :param node: Index of a question node.
+        :return: Text of the question.
+        """
+        return self._strings[self._text_ids[node]]
+
+    def answers(self, node: int) -> range:
+        """
+        :param node: Index of a node.
+        :return: Indices of the nodes the answers of the node lead to, empty for programmes.
+        """
+        return range(self._child_offsets[node], self._child_offsets[node + 1])
+
+    def answer_text(self, node: int) -> str:
+        """
+        :param node: Index of a node other than the root.
+        :return: Text of the answer leading to the node.
+        """
+        return self._strings[self._answer_text_ids[node]]
+
+    def programme(self, node: int) -> AnswerNode:
+        """
+        :param node: Index of a programme node.
+        :return: Programme of the leaf.
+        """
+        return self._programmes[self._programme_ids[node]]
+
+    def programme_id(self, node: int) -> int:
+        """
+        :param node: Index of a node.
+        :return: Id of the programme of the leaf in the programme table, -1 for questions.
+        """
+        return self._programme_ids[node]
+
+    def programme_by_id(self, programme_id: int) -> AnswerNode:
+        return self._programmes[programme_id]
+
+    def validate(self) -> None:
+        """
+        Checks that the nodes form one breadth-first tree whose questions lead to answers and whose leaves hold
+        programmes, and decodes every string and programme once, so a broken tree fails before it is served.
+
+        :raises InvalidQuestionTreeError: If the tree is empty or its nodes are inconsistent.
+        """
+        node_count = len(self)
+        if node_count == 0:
+            raise InvalidQuestionTreeError("The question tree has no nodes")
+        if len(self._child_offsets) != node_count + 1 or self._child_offsets[node_count] != node_count:
+            raise InvalidQuestionTreeError("The child offsets do not cover the nodes")
+        for node in range(node_count):
+            self._validate_node(node)
+        try:
+            list(self._strings)
+            list(self._programmes)
+        except (ValueError, KeyError, TypeError) as e:
+            raise InvalidQuestionTreeError(f"A string or programme of the question tree cannot be decoded: {e}") from e
+
+    def _validate_node(self, node: int) -> None:
+        answers = self.answers(node)
+        if answers.start <= node or answers.stop < answers.start:
+            raise InvalidQuestionTreeError(f"Node {node} does not lead to later nodes in breadth-first order")
+        if node != self.ROOT and not 0 <= self._answer_text_ids[node] < len(self._strings):
+            raise InvalidQuestionTreeError(f"Node {node} has no answer text")
+        if not 0 <= self._kinds[node] < len(_NODE_KINDS):
+            raise InvalidQuestionTreeError(f"Node {node} has unknown kind {self._kinds[node]}")
+        if self.kind(node) == NodeKind.PROGRAMME:
+            if answers or not 0 <= self._programme_ids[node] < len(self._programmes):
+                raise InvalidQuestionTreeError(f"Leaf {node} has answers or no programme")
+            return
+        if not 0 <= self._text_ids[node] < len(self._strings) or self._programme_ids[node] != -1:
+            raise InvalidQuestionTreeError(f"Question {node} has no text or has a programme")
+        if not answers or self.kind(node) == NodeKind.BINARY_QUESTION and len(answers) != 2:
+            raise InvalidQuestionTreeError(f"Question {node} has {len(answers)} answers")
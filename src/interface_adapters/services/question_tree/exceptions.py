@@ -17,3 +17,7 @@ class HistoryEmptyError(Exception):
 class AnswerTokenNotFound(Exception):
     """Raised when an answer token is not found in the tree mapping."""
     pass
+
+class InvalidQuestionTreeError(Exception):
+    """Raised when a compiled question tree is empty or its nodes are inconsistent."""
+    pass
@@ -0,0 +1,75 @@
+import sys
+from array import array
+from collections.abc import Iterable, Iterator
+from enum import Enum
+
+
+def estimate_nbytes(value: object, exclude: Iterable[object] = ()) -> int:
+    """
+    Estimates the memory held by an object and everything it references, counting shared objects once.
+
+    Buffers and objects with an ``nbytes`` attribute count by their length in bytes, other objects by their
+    ``sys.getsizeof`` plus the objects in their containers, ``__dict__`` and ``__slots__``.
+
+    :param value: Object to measure.
+    :param exclude: Objects not to count, together with everything they reference.
+    :return: Approximate number of bytes.
+    """
+    return estimate_nbytes_each([value], exclude)[0]
+
+
+def estimate_nbytes_each(values: Iterable[object], exclude: Iterable[object] = ()) -> list[int]:
+    """
+    Estimates the memory of every object separately like ``estimate_nbytes``, walking the excluded objects once.
+
+    :param values: Objects to measure.
+    :param exclude: Objects not to count, together with everything they reference.
+    :return: Approximate number of bytes of every object.
+    """
+    excluded_ids: set[int] = set()
+    for excluded in exclude:
+        _mark_reachable(excluded, excluded_ids)
+    return [_nbytes(value, set(excluded_ids)) for value in values]
+
+
+def _mark_reachable(value: object, seen: set[int]) -> None:
+    # Unlike the estimate, does not stop at objects reporting their ``nbytes``, so what they reference is excluded too.
+    if id(value) in seen:
+        return
+    seen.add(id(value))
+    if isinstance(value, (array, memoryview, str, bytes, int, float, Enum)):
+        return
+    for reference in _references(value):
+        _mark_reachable(reference, seen)
+
+
+def _nbytes(value: object, seen: set[int]) -> int:
+    if id(value) in seen:
+        return 0
+    seen.add(id(value))
+    if isinstance(value, (array, memoryview)):
+        return memoryview(value).nbytes
+    nbytes = getattr(value, "nbytes", None)
+    if isinstance(nbytes, int):
+        return nbytes
+    size = sys.getsizeof(value)
+    if isinstance(value, (str, bytes, int, float, Enum)):
+        return size
+    return size + sum(_nbytes(reference, seen) for reference in _references(value))
+
+
+def _references(value: object) -> Iterator[object]:
+    if isinstance(value, dict):
+        for key, item in value.items():
+            yield key
+            yield item
+        return
+    if isinstance(value, (tuple, list, set, frozenset)):
+        yield from value
+        return
+    for cls in type(value).__mro__:
+        for name in getattr(cls, "__slots__", ()):
+            if hasattr(value, name):
+                yield getattr(value, name)
+    if hasattr(value, "__dict__"):
+        yield vars(value)
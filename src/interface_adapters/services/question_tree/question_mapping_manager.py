@@ -1,11 +1,9 @@
 from typing import NamedTuple
 from uuid import uuid4
 from collections import OrderedDict
-from src.domain.entities.options_question import OptionsQuestion
-from src.domain.entities.binary_question import BinaryQuestion
 from src.infrastructure.api.types.current_question_response import CurrentQuestionResponse
+from src.interface_adapters.services.question_tree.compiled_question_tree import CompiledQuestionTree, NodeKind
 from src.interface_adapters.services.question_tree.exceptions import AnswerTokenNotFound
-from src.interface_adapters.services.question_tree.type_aliases import QuestionNode
 
 
 class AnswerWrapper(NamedTuple):
@@ -17,20 +15,21 @@ class QuestionsMappingManager:
     """
     Manages the mapping between questions, their IDs, and answer options.
 
-    Provides functionality for tracking question nodes and their associated
-    answer options, generating unique tokens for answers.
+    Provides functionality for tracking the tree indices of question nodes and their
+    associated answer options, generating unique tokens for answers.
     """
 
-    def __init__(self) -> None:
-        self._question_nodes_mapping: dict[int, QuestionNode] = {}
+    def __init__(self, tree: CompiledQuestionTree) -> None:
+        self._tree = tree
+        self._question_nodes_mapping: dict[int, int] = {}
         self._answer_tokens_mapping: OrderedDict[str, AnswerWrapper] = OrderedDict()
         self._counter = 0
 
-    def add_node(self, node: QuestionNode) -> int:
+    def add_node(self, node: int) -> int:
         """
         Add a new question node to the mapping.
 
-        :param node: The question node to add
+        :param node: The tree index of the question node to add
         :return: The assigned node ID
         """
         node_id = self._generate_node_id()
@@ -62,12 +61,12 @@ class QuestionsMappingManager:
         except KeyError:
             raise AnswerTokenNotFound()
 
-    def get_node_by_id(self, node_id: int) -> QuestionNode:
+    def get_node_by_id(self, node_id: int) -> int:
         """
         Retrieve a node by its ID.
 
         :param node_id: The ID of the node to retrieve
-        :return: The corresponding tree node
+        :return: The tree index of the corresponding node
         :raises KeyError: If node ID is not found
         """
         return self._question_nodes_mapping[node_id]
@@ -90,23 +89,20 @@ class QuestionsMappingManager:
     def _generate_answer_token() -> str:
         return str(uuid4())
 
-    def _store_node(self, node_id: int, node: QuestionNode) -> None:
+    def _store_node(self, node_id: int, node: int) -> None:
         self._question_nodes_mapping[node_id] = node
 
     def get_last_node_id(self) -> int:
-        return int(list(self._question_nodes_mapping.keys())[-1])
+        return next(reversed(self._question_nodes_mapping))
 
     def get_current_node(self) -> CurrentQuestionResponse:
         return self._wrap_node(self.get_last_node_id())
 
     def _wrap_node(self, node_id: int) -> CurrentQuestionResponse:
         node = self._question_nodes_mapping[node_id]
-        if isinstance(node, OptionsQuestion):
-            question = node.text
-        elif isinstance(node, BinaryQuestion):
-            question = node.text
-        else:
-            raise TypeError(f"Invalid node type: {type(node)}")
+        if self._tree.kind(node) == NodeKind.PROGRAMME:
+            raise TypeError(f"Invalid node type: {self._tree.kind(node)}")
+        question = self._tree.text(node)
 
         answer_options: dict[str, str] = {}
 
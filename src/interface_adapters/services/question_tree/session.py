@@ -1,32 +1,33 @@
 from src.domain.entities.res_tuke_study_programme_data import ResTukeStudyProgrammeData
 from src.infrastructure.api.types.current_question_response import CurrentQuestionResponse
 from src.interface_adapters.gateways.study_programmes_gateway_base import Page
+from src.interface_adapters.services.question_tree.compiled_question_tree import CompiledQuestionTree
 from src.interface_adapters.services.question_tree.history_manager import HistoryManager
 from src.interface_adapters.services.question_tree.question_mapping_manager import QuestionsMappingManager
 from src.interface_adapters.services.question_tree.unvisited_queue import UnvisitedQueue
-from src.interface_adapters.services.question_tree.type_aliases import TreeNode
 from src.interface_adapters.services.question_tree.tree_iterator import TreeIterator
 from loguru import logger
 
 
 class Session:
-    def __init__(self, root_node: TreeNode) -> None:
+    def __init__(self, tree: CompiledQuestionTree) -> None:
         """
-        Initialize a new session with a root question node.
+        Initialize a new session starting at the root question node.
 
-        :param root_node: The starting node of the question tree
-        :raises RuntimeError: If root_node is a leaf node
+        :param tree: The compiled question tree, shared by all sessions
+        :raises RuntimeError: If the root is a leaf node
         """
         logger.info("Initializing new session")
         self._history = HistoryManager()
         self._unvisited_queue = UnvisitedQueue()
-        self._tree_mapping_manager = QuestionsMappingManager()
+        self._tree_mapping_manager = QuestionsMappingManager(tree)
         self._iterator = TreeIterator(
             history=self._history,
             queue=self._unvisited_queue,
-            tree_mapping_manager=self._tree_mapping_manager
+            tree_mapping_manager=self._tree_mapping_manager,
+            tree=tree
         )
-        self._iterator.start_with_node(root_node)
+        self._iterator.start_with_node(CompiledQuestionTree.ROOT)
         logger.info("Session initialized successfully")
 
     def get_current_node(self) -> CurrentQuestionResponse:
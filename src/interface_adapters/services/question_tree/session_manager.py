@@ -1,49 +1,220 @@
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from itertools import islice
+from typing import NamedTuple, Optional
 from uuid import uuid4
-from src.domain.entities.question_tree import QuestionTree
-from src.domain.entities.res_tuke_study_programme_data import ResTukeStudyProgrammeData
-from src.interface_adapters.gateways.study_programmes_gateway_base import Page
+from src.interface_adapters.services.question_tree.compiled_question_tree import CompiledQuestionTree
+from src.interface_adapters.services.question_tree.memory_usage import estimate_nbytes_each
 from src.interface_adapters.services.question_tree.session import Session
 from src.interface_adapters.services.question_tree.exceptions import SessionNotFoundError
 from loguru import logger
 
+_SIZE_SAMPLE = 100
+
+
+class SessionLimits(NamedTuple):
+    idle_ttl: Optional[float] = 1800.0
+    max_sessions: Optional[int] = 10_000
+
+
+class TreeVersionStatistics(NamedTuple):
+    version: int
+    sessions: int
+    nbytes: int
+    is_current: bool
+
+
+class SessionStatistics(NamedTuple):
+    live_sessions: int
+    expired_sessions: int
+    evicted_sessions: int
+    bytes_per_session: int
+
+
+class _TreeVersion:
+    def __init__(self, version: int, tree: CompiledQuestionTree) -> None:
+        self.version = version
+        self.tree = tree
+        self.sessions = 0
+        self._nbytes: Optional[int] = None
+
+    @property
+    def nbytes(self) -> int:
+        if self._nbytes is None:
+            self._nbytes = self.tree.nbytes
+        return self._nbytes
+
+
+class _SessionEntry:
+    __slots__ = ("session", "version", "last_accessed")
+
+    def __init__(self, session: Session, version: _TreeVersion, last_accessed: float) -> None:
+        self.session = session
+        self.version = version
+        self.last_accessed = last_accessed
+
 
 class SessionManager:
-    def __init__(self, decision_tree: QuestionTree[Page[ResTukeStudyProgrammeData]]) -> None:
+    def __init__(
+            self,
+            decision_tree: CompiledQuestionTree,
+            limits: SessionLimits = SessionLimits(),
+            clock: Callable[[], float] = time.monotonic
+    ) -> None:
         """
         Initialize the SessionManager with a decision tree.
 
-        :param decision_tree: The question tree to manage sessions for
+        Sessions are kept from the least to the most recently used, so sessions idle for longer than the TTL are
+        found at the front, and the least recently used session is evicted when a new one would exceed the limit.
+
+        :param decision_tree: The compiled question tree to manage sessions for, served as version 1
+        :param limits: Idle time in seconds after which a session expires and the maximum number of sessions,
+            ``None`` disables the respective limit
+        :param clock: Source of the current time in seconds
         """
-        self._sessions: dict[str, Session] = {}
-        self._decision_tree = decision_tree
+        self._sessions: OrderedDict[str, _SessionEntry] = OrderedDict()
+        self._limits = limits
+        self._clock = clock
+        self._expired_sessions = 0
+        self._evicted_sessions = 0
+        self._current_version = _TreeVersion(1, decision_tree)
+        self._versions = {self._current_version.version: self._current_version}
         logger.info("Initialized SessionManager")
 
+    @property
+    def tree_versions(self) -> list[TreeVersionStatistics]:
+        """
+        :return: Statistics of the current tree version and of the older versions still used by sessions
+        """
+        return [
+            TreeVersionStatistics(version.version, version.sessions, version.nbytes, version is self._current_version)
+            for version in self._versions.values()
+        ]
+
+    @property
+    def statistics(self) -> SessionStatistics:
+        """
+        :return: Number of live sessions, of sessions expired and evicted so far, and the approximate memory of one
+            session, averaged over the most recently used sessions without the trees they share
+        """
+        sample = list(islice(reversed(self._sessions.items()), _SIZE_SAMPLE))
+        sample_nbytes = sum(estimate_nbytes_each(sample, exclude=self._versions.values()))
+        return SessionStatistics(
+            len(self._sessions),
+            self._expired_sessions,
+            self._evicted_sessions,
+            sample_nbytes // len(sample) if sample else 0
+        )
+
+    def swap_tree(self, decision_tree: CompiledQuestionTree) -> int:
+        """
+        Serve a new tree version to the sessions created from now on.
+
+        Existing sessions stay on the version they started with, which is released once its last session is closed.
+
+        :param decision_tree: The compiled question tree of the new version
+        :return: The number of the new version
+        """
+        previous_version = self._current_version
+        self._current_version = _TreeVersion(previous_version.version + 1, decision_tree)
+        self._versions[self._current_version.version] = self._current_version
+        self._release_if_unused(previous_version)
+        logger.info(
+            f"Swapped question tree version {previous_version.version} "
+            f"({previous_version.sessions} sessions left) for version {self._current_version.version}"
+        )
+        return self._current_version.version
+
     def create_session(self) -> str:
         """
-        Create a new session.
+        Create a new session on the current tree version, evicting the least recently used session at the limit.
 
         :return: The unique session ID
         """
+        if self._limits.max_sessions is not None and len(self._sessions) >= self._limits.max_sessions:
+            self.remove_expired_sessions()
+            while len(self._sessions) >= self._limits.max_sessions:
+                evicted_session_id = next(iter(self._sessions))
+                self._remove_session(evicted_session_id)
+                self._evicted_sessions += 1
+                logger.info(f"Evicted least recently used session: {evicted_session_id}")
         session_id = self._generate_session_id()
-        session = Session(self._decision_tree.root)
-        self._sessions[session_id] = session
+        session = Session(self._current_version.tree)
+        self._sessions[session_id] = _SessionEntry(session, self._current_version, self._clock())
+        self._current_version.sessions += 1
         logger.info(f"Created new session with ID: {session_id}")
         return session_id
 
     def get_session(self, session_id: str) -> Session:
         """
-        Retrieve a session by its ID.
+        Retrieve a session by its ID and mark it as used.
 
         :param session_id: The ID of the session to retrieve
         :return: The session object
-        :raises SessionNotFoundError: If the session ID does not exist
+        :raises SessionNotFoundError: If the session ID does not exist or the session expired
         """
-        session = self._sessions.get(session_id)
-        if not session:
+        now = self._clock()
+        entry = self._sessions.get(session_id)
+        if entry is not None and self._is_expired(entry, now):
+            self._remove_session(session_id)
+            self._expired_sessions += 1
+            entry = None
+        if entry is None:
             logger.error(f"Session not found: {session_id}")
             raise SessionNotFoundError(f"Session {session_id} not found")
+        entry.last_accessed = now
+        self._sessions.move_to_end(session_id)
         logger.debug(f"Retrieved session: {session_id}")
-        return session
+        return entry.session
+
+    def close_session(self, session_id: str) -> None:
+        """
+        Remove a session, releasing its tree version when it was the last session of an older version.
+
+        :param session_id: The ID of the session to close
+        :raises SessionNotFoundError: If the session ID does not exist
+        """
+        if session_id not in self._sessions:
+            logger.error(f"Session not found: {session_id}")
+            raise SessionNotFoundError(f"Session {session_id} not found")
+        self._remove_session(session_id)
+        logger.info(f"Closed session: {session_id}")
+
+    def remove_expired_sessions(self) -> int:
+        """
+        Remove the sessions idle for longer than the TTL.
+
+        :return: The number of removed sessions
+        """
+        if self._limits.idle_ttl is None:
+            return 0
+        now = self._clock()
+        expired_session_ids = []
+        for session_id, entry in self._sessions.items():
+            if not self._is_expired(entry, now):
+                break
+            expired_session_ids.append(session_id)
+        for session_id in expired_session_ids:
+            self._remove_session(session_id)
+        self._expired_sessions += len(expired_session_ids)
+        if expired_session_ids:
+            logger.info(f"Removed {len(expired_session_ids)} expired sessions")
+        return len(expired_session_ids)
+
+    def _is_expired(self, entry: _SessionEntry, now: float) -> bool:
+        return self._limits.idle_ttl is not None and now - entry.last_accessed > self._limits.idle_ttl
+
+    def _remove_session(self, session_id: str) -> None:
+        version = self._sessions.pop(session_id).version
+        version.sessions -= 1
+        self._release_if_unused(version)
+
+    def _release_if_unused(self, version: _TreeVersion) -> None:
+        if version is self._current_version or version.sessions:
+            return
+        del self._versions[version.version]
+        logger.info(f"Released question tree version {version.version}")
 
     @staticmethod
     def _generate_session_id() -> str:
@@ -52,4 +223,4 @@ class SessionManager:
 
         :return: A new unique session identifier
         """
-        return str(uuid4())
\ No newline at end of file
+        return str(uuid4())
@@ -1,12 +1,9 @@
 from typing import Optional
-from src.domain.entities.options_question import OptionsQuestion
-from src.domain.entities.binary_question import BinaryQuestion
 from src.domain.entities.res_tuke_study_programme_data import ResTukeStudyProgrammeData
 from src.interface_adapters.gateways.study_programmes_gateway_base import Page
+from src.interface_adapters.services.question_tree.compiled_question_tree import CompiledQuestionTree, NodeKind
 from src.interface_adapters.services.question_tree.history_manager import HistoryManager
 from src.interface_adapters.services.question_tree.unvisited_queue import UnvisitedQueue
-from src.interface_adapters.services.question_tree.type_aliases import TreeNode
-from src.interface_adapters.services.question_tree.type_aliases import QuestionNode
 from src.interface_adapters.services.question_tree.question_mapping_manager import QuestionsMappingManager
 from loguru import logger
 
@@ -16,56 +13,49 @@ class TreeIterator:
         self,
         history: HistoryManager,
         queue: UnvisitedQueue,
-        tree_mapping_manager: QuestionsMappingManager
+        tree_mapping_manager: QuestionsMappingManager,
+        tree: CompiledQuestionTree
     ) -> None:
         self._history = history
         self._unvisited_queue = queue
         self._tree_mapping_manager = tree_mapping_manager
+        self._tree = tree
         logger.debug("Initialized tree iterator")
 
-    def _add_node_to_mapper(self, node: QuestionNode) -> None:
+    def _add_node_to_mapper(self, node: int) -> None:
         node_id = self._tree_mapping_manager.add_node(node)
-        if isinstance(node, OptionsQuestion):
-            for answer_option in node.answer_options:
-                self._tree_mapping_manager.add_answer_option(node_id, answer_option.text)
-                logger.debug(f"Added answer option: {answer_option.text}")
-        elif isinstance(node, BinaryQuestion):
-            self._tree_mapping_manager.add_answer_option(node_id, "yes")
-            self._tree_mapping_manager.add_answer_option(node_id, "no")
+        for answer_node in self._tree.answers(node):
+            answer_text = self._tree.answer_text(answer_node)
+            self._tree_mapping_manager.add_answer_option(node_id, answer_text)
+            logger.debug(f"Added answer option: {answer_text}")
+        if self._tree.kind(node) == NodeKind.BINARY_QUESTION:
             self._tree_mapping_manager.add_answer_option(node_id, "probably")
 
-    @staticmethod
-    def _process_probably(answer_node: TreeNode) -> list[TreeNode]:
+    def _process_probably(self, answer_node: int) -> list[int]:
         logger.debug("Processing probably answer")
-        if isinstance(answer_node, OptionsQuestion):
-            return [option.answer_node for option in answer_node.answer_options]
-        elif isinstance(answer_node, BinaryQuestion):
-            return [answer_node.no_answer_node, answer_node.yes_answer_node]
-        raise RuntimeError(f"Probably answer not valid for node type: {type(answer_node)}")
+        kind = self._tree.kind(answer_node)
+        if kind == NodeKind.OPTIONS_QUESTION:
+            return list(self._tree.answers(answer_node))
+        elif kind == NodeKind.BINARY_QUESTION:
+            return list(reversed(self._tree.answers(answer_node)))
+        raise RuntimeError(f"Probably answer not valid for node type: {kind}")
 
-    @staticmethod
-    def _process_standard_response(answer_node: TreeNode, answer_value: str) -> TreeNode:
+    def _process_standard_response(self, answer_node: int, answer_value: str) -> int:
         logger.debug(f"Processing standard answer: {answer_value}")
-        if isinstance(answer_node, OptionsQuestion):
-            for option in answer_node.answer_options:
-                if option.text == answer_value:
-                    return option.answer_node
-            raise RuntimeError(f"Answer '{answer_value}' not found in answer options")
-        elif isinstance(answer_node, BinaryQuestion):
-            if answer_value == "yes":
-                return answer_node.yes_answer_node
-            elif answer_value == "no":
-                return answer_node.no_answer_node
-            raise RuntimeError(f"Answer '{answer_value}' not valid for binary question")
-        raise RuntimeError(f"Answer node type not recognized: {type(answer_node)}")
+        kind = self._tree.kind(answer_node)
+        if kind == NodeKind.PROGRAMME:
+            raise RuntimeError(f"Answer node type not recognized: {kind}")
+        for next_node in self._tree.answers(answer_node):
+            if self._tree.answer_text(next_node) == answer_value:
+                return next_node
+        raise RuntimeError(f"Answer '{answer_value}' not found in answer options")
 
-    @classmethod
-    def _process_answer_value(cls, answer_node: TreeNode, answer_value: str) -> list[TreeNode]:
+    def _process_answer_value(self, answer_node: int, answer_value: str) -> list[int]:
         if answer_value == "probably":
-            return cls._process_probably(answer_node)
-        return [cls._process_standard_response(answer_node, answer_value)]
+            return self._process_probably(answer_node)
+        return [self._process_standard_response(answer_node, answer_value)]
 
-    def _get_next_nodes(self, answer_node: TreeNode, answer_token: str) -> list[TreeNode]:
+    def _get_next_nodes(self, answer_node: int, answer_token: str) -> list[int]:
         answer_value = self._tree_mapping_manager.get_answer_value_by_token(answer_token)
         logger.debug("Retrieved answer value: {}", answer_value)
         return self._process_answer_value(answer_node, answer_value)
@@ -78,17 +68,17 @@ class TreeIterator:
         is_added_to_mapping = False
 
         for next_node in next_nodes:
-            if isinstance(next_node, Page):
-                self._history.add_entry(answer_node_id, next_node)
-                logger.debug(f"Added study program from answer: {next_node.data.name}")
-            elif isinstance(next_node, (BinaryQuestion, OptionsQuestion)):
-                if not is_added_to_mapping:
-                    self._add_node_to_mapper(next_node)
-                    is_added_to_mapping = True
-                    logger.debug("Added node to mapper")
-                else:
-                    self._unvisited_queue.add_node_to_visit(answer_node_id, next_node)
-                    logger.debug("Added node to unvisited queue")
+            if self._tree.kind(next_node) == NodeKind.PROGRAMME:
+                programme = self._tree.programme(next_node)
+                self._history.add_entry(answer_node_id, programme)
+                logger.debug(f"Added study program from answer: {programme.data.name}")
+            elif not is_added_to_mapping:
+                self._add_node_to_mapper(next_node)
+                is_added_to_mapping = True
+                logger.debug("Added node to mapper")
+            else:
+                self._unvisited_queue.add_node_to_visit(answer_node_id, next_node)
+                logger.debug("Added node to unvisited queue")
 
         if not is_added_to_mapping:
             logger.debug("Last leaf node reached in the current branch")
@@ -119,7 +109,7 @@ class TreeIterator:
         self._tree_mapping_manager.clear_from_node_id(node_id)
         return self._process_next_nodes(node_id, answer_token)
 
-    def start_with_node(self, root_node: TreeNode) -> None:
-        if isinstance(root_node, Page):
+    def start_with_node(self, root_node: int) -> None:
+        if self._tree.kind(root_node) == NodeKind.PROGRAMME:
             raise RuntimeError("Root node cannot be a leaf node")  # TODO: Review this
         self._add_node_to_mapper(root_node)
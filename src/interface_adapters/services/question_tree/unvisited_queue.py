@@ -1,40 +1,38 @@
 from collections import OrderedDict
 from loguru import logger
 
-from src.interface_adapters.services.question_tree.type_aliases import QuestionNode
-
 
 class UnvisitedQueue:
     """
     Manages a queue of unvisited nodes in the question tree.
 
-    Maintains a mapping of parent nodes to their unvisited children.
+    Maintains a mapping of parent nodes to the tree indices of their unvisited children.
     """
 
     def __init__(self) -> None:
         """
         Initialize a new UnvisitedQueue
         """
-        self._queue: OrderedDict[int, list[QuestionNode]] = OrderedDict()
+        self._queue: OrderedDict[int, list[int]] = OrderedDict()
         logger.debug("Initialized new UnvisitedQueue")
 
-    def add_node_to_visit(self, parent_node_id: int, node: QuestionNode) -> None:
+    def add_node_to_visit(self, parent_node_id: int, node: int) -> None:
         """
         Add a node to the unvisited queue.
 
         :param parent_node_id: ID of the parent node
-        :param node: The question node to be visited later
+        :param node: The tree index of the question node to be visited later
         """
         if parent_node_id not in self._queue:
             self._queue[parent_node_id] = []
         self._queue[parent_node_id].append(node)
         logger.debug(f"Added node {parent_node_id} to queue")
 
-    def pop_next(self) -> QuestionNode | None:
+    def pop_next(self) -> int | None:
         """
         Get and remove the next unvisited node from the queue.
 
-        :return: The next question node to visit, or None if queue is empty
+        :return: The tree index of the next question node to visit, or None if queue is empty
         """
         if not self._queue:
             logger.debug("Queue is empty")
@@ -0,0 +1,54 @@
+from collections import Counter
+from typing import override
+
+from src.application.interfaces import QuestionTreeStatisticsCalculator
+from src.domain.dtos.question_tree_statistics import QuestionTreeStatistics
+from src.domain.entities.binary_question import BinaryQuestion
+from src.domain.entities.options_question import OptionsQuestion
+from src.domain.entities.question_tree import QuestionTree
+
+
+class DepthQuestionTreeStatisticsCalculator[StudyProgrammeData](QuestionTreeStatisticsCalculator[StudyProgrammeData]):
+    """
+    Calculates how many questions an applicant answers before reaching each study programme.
+
+    The depth of a programme is the number of questions on the path from the root, options questions included.
+    The expected path length assumes every programme is equally likely to be the result. The leaf balance is the
+    mean ratio of the smaller to the larger number of programmes below the two answers of the binary questions,
+    1.0 for a perfectly balanced tree.
+    """
+
+    @override
+    def calculate(self, question_tree: QuestionTree[StudyProgrammeData]) -> QuestionTreeStatistics:
+        depths: Counter[int] = Counter()
+        balances: list[float] = []
+        questions, leaves = self._visit(question_tree.root, 0, depths, balances)
+        return QuestionTreeStatistics(
+            leaves=leaves,
+            questions=questions,
+            depth_histogram=dict(sorted(depths.items())),
+            max_depth=max(depths, default=0),
+            expected_path_length=sum(depth * count for depth, count in depths.items()) / leaves if leaves else 0.0,
+            leaf_balance=sum(balances) / len(balances) if balances else 1.0
+        )
+
+    def _visit(
+            self,
+            node: OptionsQuestion[StudyProgrammeData] | BinaryQuestion[StudyProgrammeData] | StudyProgrammeData,
+            depth: int,
+            depths: Counter[int],
+            balances: list[float]
+    ) -> tuple[int, int]:
+        """
+        :return: Number of questions and number of leaves of the subtree.
+        """
+        if isinstance(node, OptionsQuestion):
+            subtrees = [self._visit(option.answer_node, depth + 1, depths, balances) for option in node.answer_options]
+            return 1 + sum(questions for questions, _ in subtrees), sum(leaves for _, leaves in subtrees)
+        if isinstance(node, BinaryQuestion):
+            yes_questions, yes_leaves = self._visit(node.yes_answer_node, depth + 1, depths, balances)
+            no_questions, no_leaves = self._visit(node.no_answer_node, depth + 1, depths, balances)
+            balances.append(min(yes_leaves, no_leaves) / max(yes_leaves, no_leaves))
+            return 1 + yes_questions + no_questions, yes_leaves + no_leaves
+        depths[depth] += 1
+        return 0, 1
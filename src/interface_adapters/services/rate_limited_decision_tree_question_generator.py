@@ -0,0 +1,49 @@
+import asyncio
+import time
+from collections.abc import Sequence
+from typing import Awaitable, Callable, Optional
+
+from src.application.interfaces import LLMDecisionTreeQuestionGenerator
+from src.domain.dtos.decision_tree_question import DecisionTreeQuestion
+
+
+class RateLimitedDecisionTreeQuestionGenerator[StudyProgramme](LLMDecisionTreeQuestionGenerator[StudyProgramme]):
+    """
+    Question generator decorator limiting how many language model requests are in flight and how often they start.
+
+    One instance is shared by the whole tree build, so the limits are global however many subtrees are expanded
+    concurrently.
+    """
+
+    def __init__(
+            self,
+            generator: LLMDecisionTreeQuestionGenerator[StudyProgramme],
+            max_concurrency: int = 8,
+            requests_per_minute: Optional[float] = None,
+            clock: Callable[[], float] = time.monotonic,
+            sleep: Callable[[float], Awaitable[None]] = asyncio.sleep
+    ) -> None:
+        self._generator = generator
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._interval = 60.0 / requests_per_minute if requests_per_minute else 0.0
+        self._clock = clock
+        self._sleep = sleep
+        self._next_start: Optional[float] = None
+
+    async def generate_question(
+            self,
+            study_programmes: list[StudyProgramme],
+            rejected_questions: Sequence[DecisionTreeQuestion] = ()
+    ) -> DecisionTreeQuestion:
+        async with self._semaphore:
+            await self._wait_for_start_slot()
+            return await self._generator.generate_question(study_programmes, rejected_questions)
+
+    async def _wait_for_start_slot(self) -> None:
+        if not self._interval:
+            return
+        now = self._clock()
+        start = now if self._next_start is None else max(now, self._next_start)
+        self._next_start = start + self._interval
+        if start > now:
+            await self._sleep(start - now)
@@ -1,8 +1,15 @@
-from typing import Callable, Any, Awaitable, Union
+import asyncio
+import hashlib
+import json
+from collections.abc import Hashable, Iterable, Sequence
+from typing import Callable, Any, Union, Coroutine, NamedTuple, Optional
 
 from loguru import logger
 
-from src.application.interfaces import QuestionTreeGenerator, LLMDecisionTreeQuestionGenerator
+from src.application.interfaces import (
+    QuestionTreeGenerator, LLMDecisionTreeQuestionGenerator, QuestionTreeCheckpointJournal
+)
+from src.domain.dtos.decision_tree_question import DecisionTreeQuestion
 from src.domain.entities.binary_question import BinaryQuestion
 from src.domain.entities.options_question import OptionsQuestion, AnswerOption
 from src.domain.entities.question_tree import QuestionTree
@@ -10,99 +17,148 @@ from src.domain.entities.res_tuke_study_programme_data import ResTukeStudyProgra
 from src.interface_adapters.gateways.study_programmes_gateway_base import Page
 
 
+class OptionsFacet(NamedTuple):
+    question: str
+    get_value: Callable[[Page[ResTukeStudyProgrammeData]], Hashable]
+
+
+DEFAULT_FACETS = (
+    OptionsFacet("What is your preferred language?", lambda programme: programme.metadata.language),
+    OptionsFacet("What level of degree are you interested in?", lambda programme: programme.data.level_of_degree),
+    OptionsFacet("What study form are you interested in?", lambda programme: programme.data.study_form),
+)
+
+
+def group_by[Item, Key: Hashable](items: Iterable[Item], get_key: Callable[[Item], Key]) -> dict[Key, list[Item]]:
+    """
+    Partitions items by their keys in one pass.
+
+    :param items: Items to partition.
+    :param get_key: Key of an item, called once per item.
+    :return: Groups of items by key, in the order of the first item of every group and keeping the order of the items.
+    """
+    groups: dict[Key, list[Item]] = {}
+    for item in items:
+        groups.setdefault(get_key(item), []).append(item)
+    return groups
+
+
+class TreeShapeConstraints(NamedTuple):
+    max_size_ratio: Optional[float] = None
+    max_depth: Optional[int] = None
+
+
+class ShapeConstraintStatistics(NamedTuple):
+    rejected_splits: int
+    unresolved_splits: int
+
+
+class CheckpointStatistics(NamedTuple):
+    restored_splits: int
+    recorded_splits: int
+
+
 class ResTukeQuestionTreeGenerator(QuestionTreeGenerator[Page[ResTukeStudyProgrammeData]]):
     def __init__(
             self,
             llm_decision_tree_question_generator_service: LLMDecisionTreeQuestionGenerator[
                 Page[ResTukeStudyProgrammeData]
-            ]
+            ],
+            concurrent_subtrees: bool = True,
+            shape_constraints: TreeShapeConstraints = TreeShapeConstraints(),
+            max_split_attempts: int = 3,
+            checkpoint_journal: Optional[QuestionTreeCheckpointJournal] = None,
+            checkpoint_scope: str = "",
+            facets: Sequence[OptionsFacet] = DEFAULT_FACETS
     ) -> None:
+        """
+        :param llm_decision_tree_question_generator_service: Generator of binary questions.
+        :param concurrent_subtrees: Expand sibling subtrees concurrently instead of one after another. The resulting
+            tree is the same; the number of concurrent language model requests is limited by the question generator.
+        :param shape_constraints: Maximum ratio of the larger to the smaller group of a binary question and target
+            maximum number of questions from the root to a programme, including the options questions.
+        :param max_split_attempts: Number of questions requested for one set of programmes while the splits violate
+            the shape constraints. When all of them do, the most balanced one is used.
+        :param checkpoint_journal: Journal recording every accepted question by the hash of the programmes it splits.
+            Subsets already in the journal are split by the recorded question, so a resumed generation rebuilds the
+            completed subtrees without requesting any question and generates only what is missing. Recorded questions
+            violating the shape constraints are generated again.
+        :param checkpoint_scope: Configuration of the question generator, e.g. its model and split strategy. It is
+            hashed into the journal keys together with the shape constraints, so questions recorded by another
+            configuration are never reused.
+        :param facets: Options questions asked from the root, each splitting the programmes by its value. The answer
+            options are ordered by their text, so the tree does not depend on the order of the programmes. The binary
+            questions are generated below the last facet.
+        """
         self._llm_decision_tree_question_generator_service = llm_decision_tree_question_generator_service
+        self._concurrent_subtrees = concurrent_subtrees
+        self._shape_constraints = shape_constraints
+        self._max_split_attempts = max_split_attempts
+        self._rejected_splits = 0
+        self._unresolved_splits = 0
+        self._checkpoint_journal = checkpoint_journal
+        self._checkpoint_scope = checkpoint_scope
+        self._facets = facets
+        self._restored_splits = 0
+        self._recorded_splits = 0
+
+    @property
+    def shape_statistics(self) -> ShapeConstraintStatistics:
+        return ShapeConstraintStatistics(self._rejected_splits, self._unresolved_splits)
+
+    @property
+    def checkpoint_statistics(self) -> CheckpointStatistics:
+        return CheckpointStatistics(self._restored_splits, self._recorded_splits)
 
     async def generate(
             self,
             study_programmes: list[Page[ResTukeStudyProgrammeData]]
     ) -> QuestionTree[Page[ResTukeStudyProgrammeData]]:
-        root_question = await self._generate_preferred_language_question(study_programmes)
-        return QuestionTree(root=root_question)
-
-    async def _generate_preferred_language_question(
-            self, 
-            study_programmes: list[Page[ResTukeStudyProgrammeData]]
-    ) -> OptionsQuestion[Page[ResTukeStudyProgrammeData]]:
-        logger.debug("Generating preferred language question")
-        return await self._generate_options_question(
-            "What is your preferred language?",
-            study_programmes,
-            lambda x: x.metadata.language,
-            self._generate_level_of_degree_question
-        )
-
-    async def _generate_level_of_degree_question(
-            self, 
-            study_programmes: list[Page[ResTukeStudyProgrammeData]]
-    ) -> OptionsQuestion[Page[ResTukeStudyProgrammeData]]:
-        logger.debug("Generating level of degree question")
-        return await self._generate_options_question(
-            "What level of degree are you interested in?",
-            study_programmes,
-            lambda x: x.data.level_of_degree,
-            self._generate_study_form_question
-        )
+        root_node = await self._generate_facet_node(study_programmes, 0, 0)
+        return QuestionTree(root=root_node)
 
-    async def _generate_study_form_question(
-            self, 
-            study_programmes: list[Page[ResTukeStudyProgrammeData]]
-    ) -> OptionsQuestion[Page[ResTukeStudyProgrammeData]]:
-        logger.debug("Generating study form question")
-        return await self._generate_options_question(
-            "What study form are you interested in?",
-            study_programmes,
-            lambda x: x.data.study_form,
-            self._generate_binary_node
-        )
-
-    @staticmethod
-    async def _generate_options_question(
-        question_text: str,
-        study_programmes: list[Page[ResTukeStudyProgrammeData]],
-        get_property: Callable[[Page[ResTukeStudyProgrammeData]], Any],
-        next_step: Callable[
-            [list[Page[ResTukeStudyProgrammeData]]],
-            Awaitable[
-                Union[
-                    BinaryQuestion[Page[ResTukeStudyProgrammeData]],
-                    OptionsQuestion[Page[ResTukeStudyProgrammeData]],
-                    Page[ResTukeStudyProgrammeData]
-                ]
-            ]
+    async def _generate_facet_node(
+            self,
+            study_programmes: list[Page[ResTukeStudyProgrammeData]],
+            depth: int,
+            facet_index: int
+    ) -> Union[
+        OptionsQuestion[Page[ResTukeStudyProgrammeData]],
+        BinaryQuestion[Page[ResTukeStudyProgrammeData]],
+        Page[ResTukeStudyProgrammeData]
+    ]:
+        if facet_index == len(self._facets):
+            return await self._generate_binary_node(study_programmes, depth)
+        facet = self._facets[facet_index]
+        logger.debug(f"Generating options question '{facet.question}'")
+        groups = sorted(group_by(study_programmes, facet.get_value).items(), key=lambda group: str(group[0]))
+        answer_nodes = await self._expand_subtrees([
+            self._generate_facet_node(programmes, depth + 1, facet_index + 1) for _, programmes in groups
+        ])
+        answer_options = [
+            AnswerOption(text=str(value), answer_node=answer_node)
+            for (value, _), answer_node in zip(groups, answer_nodes)
         ]
-    ) -> OptionsQuestion[Page[ResTukeStudyProgrammeData]]:
-        distinct_values = {get_property(study_programme) for study_programme in study_programmes}
-        answer_options = []
-        for value in distinct_values:
-            filtered = [
-                study_programme for study_programme in study_programmes if get_property(study_programme) == value
-            ]
-            answer_node = await next_step(filtered)
-            answer_options.append(AnswerOption(text=str(value), answer_node=answer_node))
-
-        return OptionsQuestion(text=question_text, answer_options=answer_options)
+
+        return OptionsQuestion(text=facet.question, answer_options=answer_options)
 
     async def _generate_binary_node(
             self,
-            study_programmes: list[Page[ResTukeStudyProgrammeData]]
+            study_programmes: list[Page[ResTukeStudyProgrammeData]],
+            depth: int
     ) -> Union[BinaryQuestion[Page[ResTukeStudyProgrammeData]], Page[ResTukeStudyProgrammeData]]:
         if self._is_single_programme(study_programmes):
             return study_programmes[0]
 
-        question = await self._llm_decision_tree_question_generator_service.generate_question(study_programmes)
+        question = await self._generate_checkpointed_question(study_programmes, depth)
 
         yes_programmes = self._filter_programmes(study_programmes, question.yes_nodes)
         no_programmes = self._filter_programmes(study_programmes, question.no_nodes)
 
-        yes_node = await self._generate_binary_node(yes_programmes)
-        no_node = await self._generate_binary_node(no_programmes)
+        yes_node, no_node = await self._expand_subtrees([
+            self._generate_binary_node(yes_programmes, depth + 1),
+            self._generate_binary_node(no_programmes, depth + 1),
+        ])
 
         return BinaryQuestion(
             text=question.text,
@@ -110,6 +166,84 @@ class ResTukeQuestionTreeGenerator(QuestionTreeGenerator[Page[ResTukeStudyProgra
             no_answer_node=no_node,
         )
 
+    async def _generate_checkpointed_question(
+            self,
+            study_programmes: list[Page[ResTukeStudyProgrammeData]],
+            depth: int
+    ) -> DecisionTreeQuestion:
+        if self._checkpoint_journal is None:
+            return await self._generate_constrained_question(study_programmes, depth)
+        subset_key = self._subset_key(study_programmes)
+        question = self._checkpoint_journal.get(subset_key)
+        codes = sorted(study_programme.metadata.code for study_programme in study_programmes)
+        if question is not None and sorted(question.yes_nodes + question.no_nodes) == codes:
+            violation = self._find_shape_violation(question, len(study_programmes), depth)
+            if violation is None:
+                self._restored_splits += 1
+                return question
+            logger.warning(f"Regenerating checkpointed split '{question.text}' ({violation})")
+        question = await self._generate_constrained_question(study_programmes, depth)
+        self._checkpoint_journal.record(subset_key, question)
+        self._recorded_splits += 1
+        return question
+
+    def _subset_key(self, study_programmes: list[Page[ResTukeStudyProgrammeData]]) -> str:
+        subset_hash = hashlib.sha256()
+        subset_hash.update(json.dumps([self._checkpoint_scope, self._shape_constraints]).encode("utf-8"))
+        for study_programme in sorted(study_programmes, key=lambda programme: programme.metadata.code):
+            subset_hash.update(json.dumps(
+                [study_programme.metadata.code, study_programme.metadata.language, study_programme.data._asdict()],
+                default=str
+            ).encode("utf-8"))
+        return subset_hash.hexdigest()
+
+    async def _generate_constrained_question(
+            self,
+            study_programmes: list[Page[ResTukeStudyProgrammeData]],
+            depth: int
+    ) -> DecisionTreeQuestion:
+        rejected_questions: list[DecisionTreeQuestion] = []
+        for attempt in range(1, self._max_split_attempts + 1):
+            # The rejected splits are passed on, so caches and deterministic generators answer with a different one.
+            question = await self._llm_decision_tree_question_generator_service.generate_question(
+                study_programmes, tuple(rejected_questions)
+            )
+            violation = self._find_shape_violation(question, len(study_programmes), depth)
+            if violation is None:
+                return question
+            self._rejected_splits += 1
+            logger.warning(f"Rejected split '{question.text}' ({violation}), attempt {attempt} of "
+                           f"{self._max_split_attempts}")
+            rejected_questions.append(question)
+        most_balanced_question = max(rejected_questions, key=self._balance)
+        self._unresolved_splits += 1
+        logger.warning(f"Using the most balanced rejected split '{most_balanced_question.text}'")
+        return most_balanced_question
+
+    def _find_shape_violation(self, question: DecisionTreeQuestion, size: int, depth: int) -> Optional[str]:
+        smaller_size, larger_size = sorted((len(question.yes_nodes), len(question.no_nodes)))
+        max_size_ratio = self._shape_constraints.max_size_ratio
+        if max_size_ratio is not None and (smaller_size == 0 or larger_size / smaller_size > max_size_ratio):
+            return f"size ratio {larger_size}:{smaller_size} exceeds {max_size_ratio}"
+        max_depth = self._shape_constraints.max_depth
+        # Below the question every group needs at most as many programmes as a full binary tree of the remaining
+        # depth has leaves. A set too large for the remaining depth cannot be split within it at all.
+        if max_depth is not None and size <= 2 ** (max_depth - depth) and larger_size > 2 ** (max_depth - depth - 1):
+            return f"{larger_size} programmes do not fit into the remaining depth {max_depth - depth - 1}"
+        return None
+
+    @staticmethod
+    def _balance(question: DecisionTreeQuestion) -> float:
+        sizes = (len(question.yes_nodes), len(question.no_nodes))
+        return min(sizes) / max(sizes) if max(sizes) else 0.0
+
+    async def _expand_subtrees[Node](self, subtrees: list[Coroutine[Any, Any, Node]]) -> list[Node]:
+        if not self._concurrent_subtrees:
+            return [await subtree for subtree in subtrees]
+        async with asyncio.TaskGroup() as task_group:
+            tasks = [task_group.create_task(subtree) for subtree in subtrees]
+        return [task.result() for task in tasks]
+
     @staticmethod
     def _is_single_programme(study_programmes: list[Page[ResTukeStudyProgrammeData]]) -> bool:
         return len(study_programmes) == 1
@@ -119,4 +253,5 @@ class ResTukeQuestionTreeGenerator(QuestionTreeGenerator[Page[ResTukeStudyProgra
             study_programmes: list[Page[ResTukeStudyProgrammeData]],
             codes_list: list[str]
     ) -> list[Page[ResTukeStudyProgrammeData]]:
-        return [study_programme for study_programme in study_programmes if study_programme.metadata.code in codes_list]
+        codes = set(codes_list)
+        return [study_programme for study_programme in study_programmes if study_programme.metadata.code in codes]
@@ -0,0 +1,54 @@
+import asyncio
+from typing import AsyncIterator
+
+import pytest
+
+from src.application.streams import map_unordered, batched
+
+
+@pytest.mark.asyncio
+async def test_map_unordered_yields_all_results() -> None:
+    async def double(item: int) -> int:
+        await asyncio.sleep(0.001 * (item % 3))
+        return item * 2
+
+    results = [result async for result in map_unordered(range(20), double, workers=4, queue_size=2)]
+
+    assert sorted(results) == [item * 2 for item in range(20)]
+
+
+@pytest.mark.asyncio
+async def test_map_unordered_bounds_work_ahead_of_slow_consumer() -> None:
+    started: list[int] = []
+
+    async def record(item: int) -> int:
+        started.append(item)
+        return item
+
+    results = map_unordered(range(100), record, workers=3, queue_size=5)
+    await anext(results)
+    await asyncio.sleep(0.01)
+
+    assert len(started) <= 1 + 3 + 5
+    await results.aclose()
+
+
+@pytest.mark.asyncio
+async def test_map_unordered_propagates_errors() -> None:
+    async def fail_on_three(item: int) -> int:
+        if item == 3:
+            raise ValueError(item)
+        return item
+
+    with pytest.raises(ValueError):
+        async for _ in map_unordered(range(10), fail_on_three, workers=2, queue_size=2):
+            pass
+
+
+@pytest.mark.asyncio
+async def test_batched() -> None:
+    async def stream() -> AsyncIterator[int]:
+        for item in range(7):
+            yield item
+
+    assert [batch async for batch in batched(stream(), 3)] == [[0, 1, 2], [3, 4, 5], [6]]
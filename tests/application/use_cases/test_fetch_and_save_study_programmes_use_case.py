@@ -1,4 +1,4 @@
-from unittest.mock import AsyncMock, create_autospec
+from unittest.mock import AsyncMock, Mock, create_autospec
 
 import pytest
 
@@ -30,3 +30,20 @@ async def test_fetch_and_save_study_programmes_use_case(
     codes_source_mock.fetch_all.assert_called_once()
     study_programmes_repository_mock.get_by_codes.assert_called_once_with(test_codes)
     storage_mock.save_multiple.assert_called_once_with(test_study_programmes)
+
+
+@pytest.mark.asyncio
+async def test_fetch_and_save_study_programmes_use_case_reports_failed_codes(test_codes: list[str]) -> None:
+    codes_source_mock = Mock(fetch_all=AsyncMock(return_value=test_codes))
+    study_programmes_repository_mock = Mock(get_by_codes=AsyncMock(return_value=[]))
+    storage_mock = Mock(save_multiple=AsyncMock())
+    failed_codes_source_mock = Mock(get_failed_codes=Mock(return_value=["SP002"]))
+
+    use_case = FetchAndSaveStudyProgrammesUseCase(
+        codes_source=codes_source_mock,
+        study_programmes_repository=study_programmes_repository_mock,
+        storage=storage_mock,
+        failed_codes_source=failed_codes_source_mock
+    )
+
+    assert await use_case() == ["SP002"]
@@ -0,0 +1,41 @@
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+from src.application.use_cases.refresh_study_programmes import RefreshStudyProgrammesUseCase
+from src.domain.dtos.incremental_fetch_result import IncrementalFetchResult
+from src.domain.dtos.study_programme_page_key import StudyProgrammePageKey
+from src.domain.enums import Language
+
+
+@pytest.mark.asyncio
+async def test_refresh_study_programmes_use_case() -> None:
+    added_key = StudyProgrammePageKey("SP001", Language.ENGLISH)
+    changed_key = StudyProgrammePageKey("SP002", Language.ENGLISH)
+    unchanged_key = StudyProgrammePageKey("SP003", Language.ENGLISH)
+    removed_key = StudyProgrammePageKey("SP004", Language.ENGLISH)
+    known_content_hashes = {changed_key: "old", unchanged_key: "same", removed_key: "gone"}
+
+    codes_source_mock = Mock(fetch_all=AsyncMock(return_value=["SP001", "SP002", "SP003"]))
+    source_mock = Mock(get_changed_by_codes=AsyncMock(return_value=IncrementalFetchResult(
+        changed={added_key: "added page", changed_key: "changed page"},
+        unchanged=[unchanged_key]
+    )))
+    storage_mock = Mock(
+        get_content_hashes=AsyncMock(return_value=known_content_hashes),
+        upsert_multiple=AsyncMock(),
+        mark_removed=AsyncMock()
+    )
+    failed_codes_source_mock = Mock(get_failed_codes=Mock(return_value=["SP005"]))
+
+    use_case = RefreshStudyProgrammesUseCase(codes_source_mock, source_mock, storage_mock, failed_codes_source_mock)
+    summary = await use_case()
+
+    source_mock.get_changed_by_codes.assert_called_once_with(["SP001", "SP002", "SP003"], known_content_hashes)
+    storage_mock.upsert_multiple.assert_called_once_with(["added page", "changed page"])
+    storage_mock.mark_removed.assert_called_once_with([removed_key])
+    assert summary.added == [added_key]
+    assert summary.changed == [changed_key]
+    assert summary.unchanged == [unchanged_key]
+    assert summary.removed == [removed_key]
+    assert summary.failed_codes == ["SP005"]
@@ -0,0 +1,28 @@
+from typing import AsyncIterator
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+from src.application.use_cases.stream_and_save_study_programmes import StreamAndSaveStudyProgrammesUseCase
+
+
+@pytest.mark.asyncio
+async def test_stream_and_save_study_programmes_use_case_saves_in_batches(test_codes: list[str]) -> None:
+    async def stream_by_codes(_: list[str]) -> AsyncIterator[str]:
+        for index in range(5):
+            yield f"programme {index}"
+
+    codes_source_mock = Mock(fetch_all=AsyncMock(return_value=test_codes))
+    stream_mock = Mock(stream_by_codes=Mock(side_effect=stream_by_codes))
+    storage_mock = Mock(save_multiple=AsyncMock())
+    failed_codes_source_mock = Mock(get_failed_codes=Mock(return_value=["SP002"]))
+
+    use_case = StreamAndSaveStudyProgrammesUseCase(
+        codes_source_mock, stream_mock, storage_mock, batch_size=2, failed_codes_source=failed_codes_source_mock
+    )
+
+    assert await use_case() == ["SP002"]
+    stream_mock.stream_by_codes.assert_called_once_with(test_codes)
+    assert [call.args[0] for call in storage_mock.save_multiple.call_args_list] == [
+        ["programme 0", "programme 1"], ["programme 2", "programme 3"], ["programme 4"]
+    ]
@@ -0,0 +1,281 @@
+import asyncio
+import os
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src.domain.entities.binary_question import BinaryQuestion
+from src.domain.entities.question_tree import QuestionTree
+from src.domain.entities.res_tuke_study_programme_data import ResTukeStudyProgrammeData
+from src.infrastructure.api.app import app, lifespan
+from src.infrastructure.api.dependencies.question_tree_api_provider import QuestionTreeAPIProvider
+from src.infrastructure.api.exceptions import QuestionTreeReloadError
+from src.interface_adapters.exceptions import InvalidQuestionTreeFileError
+from src.interface_adapters.gateways.study_programmes_gateway_base import Page
+from src.interface_adapters.persistence.compiled_question_tree_storage import CompiledQuestionTreeStorage
+from src.interface_adapters.persistence.serializer_storage import SerializerStorage
+from src.interface_adapters.services.question_tree.session_manager import SessionLimits
+
+
+@pytest.fixture
+def question_tree(test_study_programmes: list[Page[ResTukeStudyProgrammeData]]) \
+        -> QuestionTree[Page[ResTukeStudyProgrammeData]]:
+    return QuestionTree(root=BinaryQuestion(
+        text="Do you like computers?", yes_answer_node=test_study_programmes[0], no_answer_node=test_study_programmes[1]
+    ))
+
+
+@pytest.fixture
+def other_question_tree(test_study_programmes: list[Page[ResTukeStudyProgrammeData]]) \
+        -> QuestionTree[Page[ResTukeStudyProgrammeData]]:
+    return QuestionTree(root=BinaryQuestion(
+        text="Do you like mining?", yes_answer_node=test_study_programmes[2], no_answer_node=test_study_programmes[3]
+    ))
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("file_name", ["tree.pkl", "tree.bin"])
+async def test_tree_is_warmed_up_before_serving(
+        tmp_path: Path,
+        monkeypatch: pytest.MonkeyPatch,
+        question_tree: QuestionTree[Page[ResTukeStudyProgrammeData]],
+        file_name: str
+) -> None:
+    path = tmp_path / file_name
+    if file_name.endswith(".bin"):
+        await CompiledQuestionTreeStorage(path).save(question_tree)
+    else:
+        await SerializerStorage[QuestionTree[Page[ResTukeStudyProgrammeData]]](str(path)).save(question_tree)
+        monkeypatch.setenv("allow_pickled_question_tree", "true")
+    monkeypatch.setenv("question_tree_path", str(path))
+
+    with TestClient(app) as client:
+        assert client.get("/ready").status_code == 200
+        session_id = client.post("/api/tree/session").json()
+        question = client.get(f"/api/tree/session/{session_id}/question").json()
+
+    assert question["question"] == "Do you like computers?"
+    assert client.get("/ready").status_code == 503
+
+
+def test_not_ready_without_warm_up() -> None:
+    client = TestClient(app)
+
+    assert client.get("/ready").status_code == 503
+    assert client.post("/api/tree/session").status_code == 503
+
+
+@pytest.mark.asyncio
+async def test_pickled_tree_is_refused_unless_allowed(
+        tmp_path: Path,
+        question_tree: QuestionTree[Page[ResTukeStudyProgrammeData]]
+) -> None:
+    path = tmp_path / "tree.pkl"
+    await SerializerStorage[QuestionTree[Page[ResTukeStudyProgrammeData]]](str(path)).save(question_tree)
+
+    with pytest.raises(InvalidQuestionTreeFileError):
+        await QuestionTreeAPIProvider(path).warm_up()
+
+
+def test_startup_fails_on_corrupted_tree(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    path = tmp_path / "tree.bin"
+    path.write_bytes(b"DUKETREE" + bytes(4))
+    monkeypatch.setenv("question_tree_path", str(path))
+
+    with pytest.raises(InvalidQuestionTreeFileError):
+        with TestClient(app):
+            pass
+
+
+@pytest.mark.asyncio
+async def test_reload_swaps_tree_for_new_sessions(
+        tmp_path: Path,
+        monkeypatch: pytest.MonkeyPatch,
+        question_tree: QuestionTree[Page[ResTukeStudyProgrammeData]],
+        other_question_tree: QuestionTree[Page[ResTukeStudyProgrammeData]]
+) -> None:
+    path = tmp_path / "tree.bin"
+    await CompiledQuestionTreeStorage(path).save(question_tree)
+    monkeypatch.setenv("question_tree_path", str(path))
+    monkeypatch.setenv("admin_token", "secret")
+
+    with TestClient(app, headers={"X-Admin-Token": "secret"}) as client:
+        old_session_id = client.post("/api/tree/session").json()
+        await CompiledQuestionTreeStorage(path).save(other_question_tree)
+
+        reload = client.post("/admin/question-tree/reload").json()
+        new_session_id = client.post("/api/tree/session").json()
+        old_question = client.get(f"/api/tree/session/{old_session_id}/question").json()
+        new_question = client.get(f"/api/tree/session/{new_session_id}/question").json()
+        versions = client.get("/admin/question-tree/versions").json()
+        close_status = client.delete(f"/api/tree/session/{old_session_id}").status_code
+        versions_after_close = client.get("/admin/question-tree/versions").json()
+
+    assert reload["version"] == 2 and reload["nbytes"] > 0
+    assert old_question["question"] == "Do you like computers?"
+    assert new_question["question"] == "Do you like mining?"
+    assert [(version["version"], version["sessions"], version["is_current"]) for version in versions] \
+        == [(1, 1, False), (2, 1, True)]
+    assert close_status == 204
+    assert [version["version"] for version in versions_after_close] == [2]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("admin_token, headers, status_code", [
+    (None, {"X-Admin-Token": "secret"}, 403),
+    ("secret", {}, 401),
+    ("secret", {"X-Admin-Token": "wrong"}, 401),
+])
+async def test_admin_api_requires_token(
+        tmp_path: Path,
+        monkeypatch: pytest.MonkeyPatch,
+        question_tree: QuestionTree[Page[ResTukeStudyProgrammeData]],
+        admin_token: str | None,
+        headers: dict[str, str],
+        status_code: int
+) -> None:
+    path = tmp_path / "tree.bin"
+    await CompiledQuestionTreeStorage(path).save(question_tree)
+    monkeypatch.setenv("question_tree_path", str(path))
+    if admin_token is not None:
+        monkeypatch.setenv("admin_token", admin_token)
+
+    with TestClient(app, headers=headers) as client:
+        reload_status = client.post("/admin/question-tree/reload").status_code
+        sessions_status = client.get("/admin/sessions").status_code
+
+    assert reload_status == sessions_status == status_code
+
+
+@pytest.mark.asyncio
+async def test_failed_reload_keeps_current_tree(
+        tmp_path: Path,
+        question_tree: QuestionTree[Page[ResTukeStudyProgrammeData]]
+) -> None:
+    path = tmp_path / "tree.bin"
+    await CompiledQuestionTreeStorage(path).save(question_tree)
+    provider = QuestionTreeAPIProvider(path)
+    await provider.warm_up()
+    path.write_bytes(b"DUKETREE" + bytes(4))
+
+    with pytest.raises(QuestionTreeReloadError):
+        await provider.reload()
+
+    assert [statistics.version for statistics in provider.api.tree_versions] == [1]
+
+
+@pytest.mark.asyncio
+async def test_watcher_reloads_changed_file(
+        tmp_path: Path,
+        question_tree: QuestionTree[Page[ResTukeStudyProgrammeData]],
+        other_question_tree: QuestionTree[Page[ResTukeStudyProgrammeData]]
+) -> None:
+    path = tmp_path / "tree.bin"
+    await CompiledQuestionTreeStorage(path).save(question_tree)
+    provider = QuestionTreeAPIProvider(path)
+    await provider.warm_up()
+    watcher = asyncio.create_task(provider.watch(0.01))
+
+    await CompiledQuestionTreeStorage(path).save(other_question_tree)
+    os.utime(path, ns=(path.stat().st_atime_ns, path.stat().st_mtime_ns + 1_000_000_000))
+    for _ in range(200):
+        if provider.api.tree_versions[-1].version == 2:
+            break
+        await asyncio.sleep(0.01)
+    watcher.cancel()
+
+    session_id = provider.api.create_session()
+    assert provider.api.get_current_question(session_id).question == "Do you like mining?"
+
+
+@pytest.mark.asyncio
+async def test_watcher_retries_file_after_failed_reload(
+        tmp_path: Path,
+        question_tree: QuestionTree[Page[ResTukeStudyProgrammeData]],
+        other_question_tree: QuestionTree[Page[ResTukeStudyProgrammeData]]
+) -> None:
+    path = tmp_path / "tree.bin"
+    await CompiledQuestionTreeStorage(path).save(question_tree)
+    provider = QuestionTreeAPIProvider(path)
+    await provider.warm_up()
+    modification_time_ns = path.stat().st_mtime_ns + 1_000_000_000
+    path.write_bytes(b"DUKETREE" + bytes(4))
+    os.utime(path, ns=(modification_time_ns, modification_time_ns))
+    with pytest.raises(QuestionTreeReloadError):
+        await provider.reload()
+
+    await CompiledQuestionTreeStorage(path).save(other_question_tree)
+    os.utime(path, ns=(modification_time_ns, modification_time_ns))
+    watcher = asyncio.create_task(provider.watch(0.01))
+    for _ in range(200):
+        if provider.api.tree_versions[-1].version == 2:
+            break
+        await asyncio.sleep(0.01)
+    watcher.cancel()
+
+    session_id = provider.api.create_session()
+    assert provider.api.get_current_question(session_id).question == "Do you like mining?"
+
+
+@pytest.mark.asyncio
+async def test_session_statistics(
+        tmp_path: Path,
+        monkeypatch: pytest.MonkeyPatch,
+        question_tree: QuestionTree[Page[ResTukeStudyProgrammeData]]
+) -> None:
+    path = tmp_path / "tree.bin"
+    await CompiledQuestionTreeStorage(path).save(question_tree)
+    monkeypatch.setenv("question_tree_path", str(path))
+    monkeypatch.setenv("max_sessions", "1")
+    monkeypatch.setenv("admin_token", "secret")
+
+    with TestClient(app, headers={"X-Admin-Token": "secret"}) as client:
+        first_session_id = client.post("/api/tree/session").json()
+        client.post("/api/tree/session")
+        evicted_status = client.get(f"/api/tree/session/{first_session_id}/question").status_code
+        statistics = client.get("/admin/sessions").json()
+
+    assert evicted_status == 404
+    assert statistics["live_sessions"] == 1
+    assert statistics["evicted_sessions"] == 1
+    assert statistics["bytes_per_session"] > 0
+
+
+@pytest.mark.asyncio
+async def test_sweeper_removes_idle_sessions(
+        tmp_path: Path,
+        question_tree: QuestionTree[Page[ResTukeStudyProgrammeData]]
+) -> None:
+    path = tmp_path / "tree.bin"
+    await CompiledQuestionTreeStorage(path).save(question_tree)
+    provider = QuestionTreeAPIProvider(path, SessionLimits(idle_ttl=0.01))
+    await provider.warm_up()
+    provider.api.create_session()
+    sweeper = asyncio.create_task(provider.sweep_sessions(0.01))
+
+    for _ in range(200):
+        if not provider.api.session_statistics.live_sessions:
+            break
+        await asyncio.sleep(0.01)
+    sweeper.cancel()
+
+    assert provider.api.session_statistics.expired_sessions == 1
+
+
+@pytest.mark.asyncio
+async def test_background_tasks_are_finished_on_shutdown(
+        tmp_path: Path,
+        monkeypatch: pytest.MonkeyPatch,
+        question_tree: QuestionTree[Page[ResTukeStudyProgrammeData]]
+) -> None:
+    path = tmp_path / "tree.bin"
+    await CompiledQuestionTreeStorage(path).save(question_tree)
+    monkeypatch.setenv("question_tree_path", str(path))
+    monkeypatch.setenv("question_tree_reload_interval", "0.01")
+    monkeypatch.setenv("session_sweep_interval", "0.01")
+
+    async with lifespan(app):
+        assert len(asyncio.all_tasks()) == 3
+
+    assert asyncio.all_tasks() == {asyncio.current_task()}
@@ -0,0 +1,57 @@
+from pathlib import Path
+
+import pytest
+
+from src.infrastructure.api.exceptions import InvalidQuestionTreeAPISettingError
+from src.infrastructure.config.question_tree_api_config import QuestionTreeAPIConfig
+from src.interface_adapters.services.question_tree.session_manager import SessionLimits
+
+_NAMES = ("question_tree_path", "allow_pickled_question_tree", "question_tree_reload_interval", "session_idle_ttl",
+          "max_sessions", "session_sweep_interval", "admin_token")
+
+
+def test_defaults(monkeypatch: pytest.MonkeyPatch) -> None:
+    for name in _NAMES:
+        monkeypatch.delenv(name, raising=False)
+
+    config = QuestionTreeAPIConfig()
+
+    assert config.question_tree_path == Path("data/questions-tree.bin")
+    assert not config.allow_pickle
+    assert config.reload_interval == 0
+    assert config.session_limits == SessionLimits()
+    assert config.session_sweep_interval == 60
+    assert config.admin_token is None
+
+
+def test_reads_environment(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("question_tree_path", "/srv/tree.bin")
+    monkeypatch.setenv("allow_pickled_question_tree", "yes")
+    monkeypatch.setenv("question_tree_reload_interval", "5")
+    monkeypatch.setenv("session_idle_ttl", "0")
+    monkeypatch.setenv("max_sessions", "200")
+    monkeypatch.setenv("session_sweep_interval", "2.5")
+    monkeypatch.setenv("admin_token", "secret")
+
+    config = QuestionTreeAPIConfig()
+
+    assert config.question_tree_path == Path("/srv/tree.bin")
+    assert config.allow_pickle
+    assert config.reload_interval == 5
+    assert config.session_limits == SessionLimits(idle_ttl=None, max_sessions=200)
+    assert config.session_sweep_interval == 2.5
+    assert config.admin_token == "secret"
+
+
+@pytest.mark.parametrize("name, value", [
+    ("question_tree_reload_interval", "often"),
+    ("session_idle_ttl", "-1"),
+    ("max_sessions", "1.5"),
+    ("max_sessions", "-3"),
+    ("allow_pickled_question_tree", "maybe"),
+])
+def test_invalid_values(monkeypatch: pytest.MonkeyPatch, name: str, value: str) -> None:
+    monkeypatch.setenv(name, value)
+
+    with pytest.raises(InvalidQuestionTreeAPISettingError):
+        QuestionTreeAPIConfig()
@@ -0,0 +1,38 @@
+import pytest
+
+from src.infrastructure.config.sqlalchemy_pool_config import SQLAlchemyPoolConfig
+from src.infrastructure.orm.exceptions import InvalidDatabasePoolSettingError
+from src.infrastructure.orm.factories.engine_factory import PoolSettings
+
+
+def test_defaults(monkeypatch: pytest.MonkeyPatch) -> None:
+    for name in ("db_pool_size", "db_max_overflow", "db_pool_pre_ping", "db_pool_recycle", "db_statement_cache_size",
+                 "db_pgbouncer"):
+        monkeypatch.delenv(name, raising=False)
+
+    assert SQLAlchemyPoolConfig().pool_settings == PoolSettings()
+
+
+def test_reads_environment(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("db_pool_size", "20")
+    monkeypatch.setenv("db_max_overflow", "0")
+    monkeypatch.setenv("db_pool_pre_ping", "false")
+    monkeypatch.setenv("db_pool_recycle", "-1")
+    monkeypatch.setenv("db_statement_cache_size", "500")
+    monkeypatch.setenv("db_pgbouncer", "yes")
+
+    assert SQLAlchemyPoolConfig().pool_settings == PoolSettings(
+        pool_size=20, max_overflow=0, pre_ping=False, recycle=-1, statement_cache_size=500, pgbouncer=True
+    )
+
+
+@pytest.mark.parametrize("name, value", [
+    ("db_pool_size", "many"),
+    ("db_pool_size", "-1"),
+    ("db_pgbouncer", "maybe"),
+])
+def test_invalid_values(monkeypatch: pytest.MonkeyPatch, name: str, value: str) -> None:
+    monkeypatch.setenv(name, value)
+
+    with pytest.raises(InvalidDatabasePoolSettingError):
+        SQLAlchemyPoolConfig()
@@ -0,0 +1,105 @@
+from typing import AsyncIterator
+
+import aiohttp
+import pytest
+import pytest_asyncio
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from src.infrastructure.loaders.aiohttp_web_loader import AiohttpWebLoader, ConnectorSettings
+from src.domain.dtos.conditional_page import PageValidators
+from src.interface_adapters.exceptions import PageLoadingError, HttpStatusError
+
+
+async def _programme_detail(request: web.Request) -> web.Response:
+    return web.Response(text=f"programme {request.match_info['code']}")
+
+
+async def _missing(_: web.Request) -> web.Response:
+    return web.Response(status=404)
+
+
+async def _throttled(_: web.Request) -> web.Response:
+    return web.Response(status=429, headers={"Retry-After": "12"})
+
+
+async def _versioned(request: web.Request) -> web.Response:
+    if request.headers.get("If-None-Match") == '"v1"':
+        return web.Response(status=304)
+    return web.Response(text="versioned page", headers={"ETag": '"v1"'})
+
+
+@pytest_asyncio.fixture
+async def stub_server() -> AsyncIterator[TestServer]:
+    application = web.Application()
+    application.router.add_get("/programme_detail/{code}", _programme_detail)
+    application.router.add_get("/missing", _missing)
+    application.router.add_get("/throttled", _throttled)
+    application.router.add_get("/versioned", _versioned)
+    server = TestServer(application)
+    async with server:
+        yield server
+
+
+def _connection_counting_trace_config(counter: list[int]) -> aiohttp.TraceConfig:
+    async def on_connection_create_end(*_: object) -> None:
+        counter.append(1)
+
+    trace_config = aiohttp.TraceConfig()
+    trace_config.on_connection_create_end.append(on_connection_create_end)
+    return trace_config
+
+
+@pytest.mark.asyncio
+async def test_load_returns_page_content(stub_server: TestServer) -> None:
+    async with AiohttpWebLoader() as loader:
+        content = await loader.load(str(stub_server.make_url("/programme_detail/SP001")))
+    assert content == "programme SP001"
+
+
+@pytest.mark.asyncio
+async def test_load_reuses_connections(stub_server: TestServer) -> None:
+    created_connections: list[int] = []
+    loader = AiohttpWebLoader(
+        ConnectorSettings(limit_per_host=1),
+        trace_configs=[_connection_counting_trace_config(created_connections)]
+    )
+    async with loader:
+        for code in ("SP001", "SP002", "SP003"):
+            await loader.load(str(stub_server.make_url(f"/programme_detail/{code}")))
+    assert len(created_connections) == 1
+
+
+@pytest.mark.asyncio
+async def test_load_raises_page_loading_error_on_http_error(stub_server: TestServer) -> None:
+    async with AiohttpWebLoader() as loader:
+        with pytest.raises(PageLoadingError):
+            await loader.load(str(stub_server.make_url("/missing")))
+
+
+@pytest.mark.asyncio
+async def test_load_without_open_session_raises() -> None:
+    with pytest.raises(RuntimeError):
+        await AiohttpWebLoader().load("http://localhost/")
+
+
+@pytest.mark.asyncio
+async def test_load_reports_status_and_retry_after(stub_server: TestServer) -> None:
+    async with AiohttpWebLoader() as loader:
+        with pytest.raises(HttpStatusError) as error_info:
+            await loader.load(str(stub_server.make_url("/throttled")))
+    assert error_info.value.status == 429
+    assert error_info.value.retry_after == 12.0
+
+
+@pytest.mark.asyncio
+async def test_load_conditional(stub_server: TestServer) -> None:
+    page_url = str(stub_server.make_url("/versioned"))
+    async with AiohttpWebLoader() as loader:
+        first_page = await loader.load_conditional(page_url, PageValidators())
+        second_page = await loader.load_conditional(page_url, first_page.validators)
+
+    assert first_page.content == "versioned page"
+    assert first_page.validators.etag == '"v1"'
+    assert second_page.not_modified
+    assert second_page.content is None
@@ -0,0 +1,123 @@
+from pathlib import Path
+from typing import AsyncIterator
+from unittest.mock import create_autospec
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import inspect, select, text
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, AsyncSession
+
+from src.infrastructure.interfaces import DatabaseConfig
+from src.infrastructure.orm.database_initializer import DatabaseInitializer
+from src.infrastructure.orm.enums import Degree, Language, StudyForm
+from src.infrastructure.orm.factories.engine_factory import EngineFactory
+from src.infrastructure.orm.factories.session_maker_factory import SessionMakerFactory
+from src.infrastructure.orm.models import Base, StudyProgramme
+
+_UNIQUE_INDEX = "ix_study_programmes_programme_code_page_language"
+
+
+@pytest_asyncio.fixture
+async def engine(tmp_path: Path) -> AsyncIterator[AsyncEngine]:
+    engine = EngineFactory(f"sqlite+aiosqlite:///{tmp_path / 'database.sqlite'}").create()
+    yield engine
+    await engine.dispose()
+
+
+@pytest.fixture
+def session_maker(engine: AsyncEngine) -> async_sessionmaker[AsyncSession]:
+    return SessionMakerFactory(engine).create()
+
+
+@pytest.fixture
+def database_initializer(
+        engine: AsyncEngine,
+        session_maker: async_sessionmaker[AsyncSession]
+) -> DatabaseInitializer:
+    return DatabaseInitializer(
+        engine=engine, session_maker=session_maker, base=Base, config=create_autospec(DatabaseConfig, instance=True)
+    )
+
+
+def _study_programme(programme_code: str, page_language: Language, name: str) -> StudyProgramme:
+    return StudyProgramme(
+        page_url=f"https://res.tuke.sk/api/programme_detail/{programme_code}", programme_code=programme_code,
+        page_language=page_language, name=name, study_field="Computer Science", level_of_degree=1,
+        study_form=StudyForm.PRESENT, degree=Degree.BACHELOR, length_of_study_in_years=3,
+        professionally_oriented=False, joint_study_program=False, languages_of_delivery=page_language,
+        description="Description", learning_objectives="Objectives", main_learning_outcomes="Outcomes",
+        faculty="Faculty"
+    )
+
+
+@pytest.mark.asyncio
+async def test_upgrade_deletes_duplicates_before_creating_unique_index(
+        engine: AsyncEngine,
+        session_maker: async_sessionmaker[AsyncSession],
+        database_initializer: DatabaseInitializer
+) -> None:
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+        await connection.execute(text(f"DROP INDEX {_UNIQUE_INDEX}"))
+    async with session_maker() as session:
+        session.add_all([
+            _study_programme("SP001", Language.ENGLISH, "First save"),
+            _study_programme("SP001", Language.SLOVAK, "Slovak page"),
+            _study_programme("SP001", Language.ENGLISH, "Second save"),
+        ])
+        await session.commit()
+
+    await database_initializer.upgrade_models()
+
+    async with session_maker() as session:
+        names = (await session.execute(select(StudyProgramme.name).order_by(StudyProgramme.id))).scalars().all()
+    async with engine.connect() as connection:
+        indexes = await connection.run_sync(lambda sync_connection: inspect(sync_connection).get_indexes(
+            StudyProgramme.__tablename__
+        ))
+    assert names == ["Slovak page", "Second save"]
+    assert any(index["name"] == _UNIQUE_INDEX and index["unique"] for index in indexes)
+
+
+@pytest.mark.asyncio
+async def test_upgrade_adds_missing_columns(
+        engine: AsyncEngine,
+        session_maker: async_sessionmaker[AsyncSession],
+        database_initializer: DatabaseInitializer
+) -> None:
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+        await connection.execute(text("ALTER TABLE study_programmes DROP COLUMN content_hash"))
+        await connection.execute(text("ALTER TABLE study_programmes DROP COLUMN removed"))
+        await connection.execute(text(
+            "INSERT INTO study_programmes (page_url, programme_code, page_language, name, study_field, "
+            "level_of_degree, study_form, degree, length_of_study_in_years, professionally_oriented, "
+            "joint_study_program, languages_of_delivery, description, learning_objectives, main_learning_outcomes, "
+            "faculty) VALUES ('https://res.tuke.sk/api/programme_detail/SP001', 'SP001', 'ENGLISH', 'Programme', "
+            "'Computer Science', 1, 'PRESENT', 'BACHELOR', 3, 0, 0, 'ENGLISH', 'Description', 'Objectives', "
+            "'Outcomes', 'Faculty')"
+        ))
+
+    await database_initializer.upgrade_models()
+
+    async with session_maker() as session:
+        study_programme = (await session.execute(select(StudyProgramme))).scalar_one()
+    assert study_programme.content_hash is None
+    assert study_programme.removed is False
+
+
+@pytest.mark.asyncio
+async def test_upgrade_keeps_up_to_date_tables(
+        session_maker: async_sessionmaker[AsyncSession],
+        database_initializer: DatabaseInitializer
+) -> None:
+    await database_initializer.upgrade_models()
+    async with session_maker() as session:
+        session.add(_study_programme("SP001", Language.ENGLISH, "Programme"))
+        await session.commit()
+
+    await database_initializer.upgrade_models()
+
+    async with session_maker() as session:
+        names = (await session.execute(select(StudyProgramme.name))).scalars().all()
+    assert names == ["Programme"]
@@ -0,0 +1,43 @@
+from pathlib import Path
+
+from src.domain.dtos.decision_tree_question import DecisionTreeQuestion
+from src.infrastructure.persistence.json_lines_checkpoint_journal import JsonLinesCheckpointJournal
+
+_QUESTION = DecisionTreeQuestion(text="Do you like computers?", yes_nodes=["SP001"], no_nodes=["SP002", "SP003"])
+
+
+def test_records_are_kept_when_resumed(tmp_path: Path) -> None:
+    journal = JsonLinesCheckpointJournal(tmp_path / "journal.jsonl")
+    journal.record("subset", _QUESTION)
+    journal.close()
+
+    resumed_journal = JsonLinesCheckpointJournal(tmp_path / "journal.jsonl", resume=True)
+
+    assert resumed_journal.get("subset") == _QUESTION
+    assert resumed_journal.get("missing") is None
+
+
+def test_journal_starts_empty_without_resume(tmp_path: Path) -> None:
+    journal = JsonLinesCheckpointJournal(tmp_path / "journal.jsonl")
+    journal.record("subset", _QUESTION)
+    journal.close()
+
+    new_journal = JsonLinesCheckpointJournal(tmp_path / "journal.jsonl")
+
+    assert new_journal.get("subset") is None
+    assert (tmp_path / "journal.jsonl").read_text("utf-8") == ""
+
+
+def test_torn_record_is_dropped(tmp_path: Path) -> None:
+    journal = JsonLinesCheckpointJournal(tmp_path / "journal.jsonl")
+    journal.record("first", _QUESTION)
+    journal.close()
+    with (tmp_path / "journal.jsonl").open("a", encoding="utf-8") as journal_file:
+        journal_file.write('{"subset": "second", "question": "Do you')
+
+    resumed_journal = JsonLinesCheckpointJournal(tmp_path / "journal.jsonl", resume=True)
+    resumed_journal.record("third", _QUESTION)
+    resumed_journal.close()
+
+    assert len(resumed_journal) == 2
+    assert len(JsonLinesCheckpointJournal(tmp_path / "journal.jsonl", resume=True)) == 2
@@ -90,3 +90,19 @@ class TestSQLAlchemyStudyProgrammeRepository:
     ) -> None:
         for test_programme, saved_programme in zip(test_study_programmes, saved_multiple_programmes):
             assert saved_programme.name == test_programme.data.name
+
+    @pytest.mark.asyncio
+    async def test_save_multiple_updates_existing_programmes(
+            self,
+            repository: SQLAlchemyStudyProgrammeRepository,
+            test_study_programmes: list[Page[ResTukeStudyProgrammeData]]
+    ) -> None:
+        await repository.save_multiple(test_study_programmes)
+        renamed = [
+            page._replace(data=page.data._replace(name=f"{page.data.name} renamed"))
+            for page in test_study_programmes
+        ]
+        await repository.save_multiple(renamed)
+
+        saved_programmes = await repository.get_all()
+        assert sorted(page.data.name for page in saved_programmes) == sorted(page.data.name for page in renamed)
@@ -0,0 +1,87 @@
+import asyncio
+from pathlib import Path
+
+import pytest
+
+from src.infrastructure.persistence.sqlite_key_value_cache import SQLiteKeyValueCache
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_put_and_get(tmp_path: Path) -> None:
+    cache = SQLiteKeyValueCache(tmp_path / "cache.sqlite")
+    cache.put("key", b"value")
+    assert cache.get("key") == b"value"
+    assert cache.get("missing") is None
+
+
+def test_values_persist_between_instances(tmp_path: Path) -> None:
+    SQLiteKeyValueCache(tmp_path / "cache.sqlite").put("key", b"value")
+    cache = SQLiteKeyValueCache(tmp_path / "cache.sqlite")
+    assert cache.get("key") == b"value"
+    assert cache.total_size == len(b"value")
+
+
+def test_overwrite_updates_total_size(tmp_path: Path) -> None:
+    cache = SQLiteKeyValueCache(tmp_path / "cache.sqlite")
+    cache.put("key", b"12345")
+    cache.put("key", b"12")
+    assert cache.total_size == 2
+
+
+def test_expired_entries_are_missing(tmp_path: Path) -> None:
+    clock = _Clock()
+    cache = SQLiteKeyValueCache(tmp_path / "cache.sqlite", max_age=60, clock=clock)
+    cache.put("old", b"value")
+    clock.now += 30
+    cache.put("new", b"value")
+    clock.now += 45
+
+    assert cache.get("old") is None
+    assert cache.get("new") == b"value"
+    assert cache.total_size == len(b"value")
+
+
+def test_evict_expired(tmp_path: Path) -> None:
+    clock = _Clock()
+    cache = SQLiteKeyValueCache(tmp_path / "cache.sqlite", max_age=60, clock=clock)
+    cache.put("a", b"value")
+    cache.put("b", b"value")
+    clock.now += 61
+
+    assert cache.evict_expired() == 2
+    assert cache.total_size == 0
+
+
+def test_least_recently_used_entries_are_evicted_over_size(tmp_path: Path) -> None:
+    clock = _Clock()
+    cache = SQLiteKeyValueCache(tmp_path / "cache.sqlite", max_size_bytes=10, clock=clock)
+    cache.put("a", b"1234")
+    clock.now += 1
+    cache.put("b", b"1234")
+    clock.now += 1
+    cache.get("a")
+    clock.now += 1
+    cache.put("c", b"1234")
+
+    assert cache.get("b") is None
+    assert cache.get("a") == b"1234"
+    assert cache.get("c") == b"1234"
+    assert cache.total_size == 8
+
+
+@pytest.mark.asyncio
+async def test_cache_is_usable_from_worker_threads(tmp_path: Path) -> None:
+    cache = SQLiteKeyValueCache(tmp_path / "cache.sqlite")
+
+    await asyncio.gather(*(asyncio.to_thread(cache.put, f"key{index}", bytes(index)) for index in range(50)))
+    values = await asyncio.gather(*(asyncio.to_thread(cache.get, f"key{index}") for index in range(50)))
+
+    assert values == [bytes(index) for index in range(50)]
+    assert cache.total_size == sum(range(50))
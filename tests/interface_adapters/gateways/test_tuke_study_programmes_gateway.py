@@ -1,3 +1,4 @@
+import asyncio
 from unittest.mock import create_autospec, AsyncMock, Mock
 
 import pytest
@@ -8,6 +9,7 @@ from src.domain.enums import Language
 from src.interface_adapters.exceptions import PageLoadingError
 from src.interface_adapters.gateways.study_programmes_gateway_base import Page
 from src.interface_adapters.gateways.tuke_study_programmes_gateway import ResTukeStudyProgrammesGateway
+from src.interface_adapters.services.host_concurrency_controller import HostConcurrencyController
 
 
 @pytest.mark.asyncio
@@ -84,3 +86,89 @@ async def test_get_by_codes_with_exception_during_page_loading(
         assert parse_one_mock.call_count == len(successfully_loaded_pages), \
             (f"Expected parse_one_mock to be called {len(successfully_loaded_pages)} times, "
              f"but it was called {parse_one_mock.call_count} times.")
+
+
+@pytest.mark.asyncio
+async def test_get_by_codes_applies_concurrency_limit(test_codes: list[str]) -> None:
+    in_flight: list[int] = []
+    peak_in_flight: list[int] = []
+
+    async def load(_: str) -> str:
+        in_flight.append(1)
+        peak_in_flight.append(len(in_flight))
+        await asyncio.sleep(0.01)
+        in_flight.pop()
+        return "page"
+
+    loader_mock = Mock(load=AsyncMock(side_effect=load))
+    parser_mock = Mock(parse_one=Mock(return_value="data"))
+    factory_mock = Mock(create=Mock(return_value=parser_mock))
+
+    gateway = ResTukeStudyProgrammesGateway(
+        loader=loader_mock,
+        language_parser_factory=factory_mock,
+        concurrency_controller=HostConcurrencyController(limit_per_host=2)
+    )
+    await gateway.get_by_codes(test_codes)
+
+    assert loader_mock.load.call_count == len(test_codes) * len(Language)
+    assert max(peak_in_flight) == 2
+
+
+@pytest.mark.asyncio
+async def test_get_failed_codes(test_codes: list[str]) -> None:
+    async def load(url: str) -> str:
+        if "SP002" in url:
+            raise PageLoadingError()
+        return "page"
+
+    gateway = ResTukeStudyProgrammesGateway(
+        loader=Mock(load=AsyncMock(side_effect=load)),
+        language_parser_factory=Mock(create=Mock(return_value=Mock(parse_one=Mock(return_value="data"))))
+    )
+    pages = await gateway.get_by_codes(test_codes)
+
+    assert len(pages) == (len(test_codes) - 1) * len(Language)
+    assert gateway.get_failed_codes() == ["SP002"]
+
+
+@pytest.mark.asyncio
+async def test_get_changed_by_codes_skips_parsing_of_unchanged_pages(test_codes: list[str]) -> None:
+    async def load(url: str) -> str:
+        return f"page {url}"
+
+    parser_mock = Mock(parse_one=Mock(return_value="data"))
+    gateway = ResTukeStudyProgrammesGateway(
+        loader=Mock(load=AsyncMock(side_effect=load)),
+        language_parser_factory=Mock(create=Mock(return_value=parser_mock))
+    )
+    pages = await gateway.get_by_codes(test_codes)
+    known_content_hashes = {
+        page.metadata.key: page.metadata.content_hash or "" for page in pages if page.metadata.code != "SP002"
+    }
+    parser_mock.parse_one.reset_mock()
+
+    result = await gateway.get_changed_by_codes(test_codes, known_content_hashes)
+
+    assert sorted(key.code for key in result.changed) == ["SP002"] * len(Language)
+    assert set(result.unchanged) == set(known_content_hashes)
+    assert parser_mock.parse_one.call_count == len(Language)
+
+
+@pytest.mark.asyncio
+async def test_stream_by_codes(test_codes: list[str]) -> None:
+    async def load(url: str) -> str:
+        if "SP002" in url:
+            raise PageLoadingError()
+        return "page"
+
+    gateway = ResTukeStudyProgrammesGateway(
+        loader=Mock(load=AsyncMock(side_effect=load)),
+        language_parser_factory=Mock(create=Mock(return_value=Mock(parse_one=Mock(return_value="data")))),
+        stream_buffer_size=2
+    )
+    pages = [page async for page in gateway.stream_by_codes(test_codes)]
+
+    assert len(pages) == (len(test_codes) - 1) * len(Language)
+    assert {page.data for page in pages} == {"data"}
+    assert gateway.get_failed_codes() == ["SP002"]
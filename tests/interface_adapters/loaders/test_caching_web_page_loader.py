@@ -0,0 +1,74 @@
+from pathlib import Path
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+from src.domain.dtos.conditional_page import ConditionalPage, PageValidators
+from src.infrastructure.persistence.sqlite_key_value_cache import SQLiteKeyValueCache
+from src.interface_adapters.exceptions import PageNotCachedError
+from src.interface_adapters.loaders.caching_web_page_loader import CachingWebPageLoader
+
+_URL = "https://res.tuke.sk/api/programme_detail/SP001?lang=en"
+
+
+@pytest.fixture
+def cache(tmp_path: Path) -> SQLiteKeyValueCache:
+    return SQLiteKeyValueCache(tmp_path / "pages.sqlite")
+
+
+@pytest.mark.asyncio
+async def test_first_load_downloads_and_caches_page(cache: SQLiteKeyValueCache) -> None:
+    validators = PageValidators(etag='"v1"', last_modified="Wed, 01 Oct 2025 00:00:00 GMT")
+    inner_loader = Mock(load_conditional=AsyncMock(return_value=ConditionalPage(False, "page", validators)))
+    loader = CachingWebPageLoader(inner_loader, cache)
+
+    assert await loader.load(_URL) == "page"
+    inner_loader.load_conditional.assert_awaited_once_with(_URL, PageValidators())
+    assert cache.get(_URL) is not None
+    assert loader.statistics.downloaded == 1
+
+
+@pytest.mark.asyncio
+async def test_not_modified_page_is_served_from_cache(cache: SQLiteKeyValueCache) -> None:
+    validators = PageValidators(etag='"v1"')
+    inner_loader = Mock(load_conditional=AsyncMock(side_effect=[
+        ConditionalPage(False, "page", validators),
+        ConditionalPage(True, validators=validators),
+    ]))
+    loader = CachingWebPageLoader(inner_loader, cache)
+
+    await loader.load(_URL)
+    assert await loader.load(_URL) == "page"
+    inner_loader.load_conditional.assert_awaited_with(_URL, validators)
+    assert loader.statistics.not_modified == 1
+
+
+@pytest.mark.asyncio
+async def test_changed_page_replaces_cached_copy(cache: SQLiteKeyValueCache) -> None:
+    inner_loader = Mock(load_conditional=AsyncMock(side_effect=[
+        ConditionalPage(False, "page v1", PageValidators(etag='"v1"')),
+        ConditionalPage(False, "page v2", PageValidators(etag='"v2"')),
+        ConditionalPage(True, validators=PageValidators(etag='"v2"')),
+    ]))
+    loader = CachingWebPageLoader(inner_loader, cache)
+
+    await loader.load(_URL)
+    await loader.load(_URL)
+    assert await loader.load(_URL) == "page v2"
+    inner_loader.load_conditional.assert_awaited_with(_URL, PageValidators(etag='"v2"'))
+
+
+@pytest.mark.asyncio
+async def test_offline_mode_replays_cache_without_network(cache: SQLiteKeyValueCache) -> None:
+    online_loader = CachingWebPageLoader(
+        Mock(load_conditional=AsyncMock(return_value=ConditionalPage(False, "page"))), cache
+    )
+    await online_loader.load(_URL)
+
+    network_loader = Mock(load_conditional=AsyncMock())
+    offline_loader = CachingWebPageLoader(network_loader, cache, offline=True)
+
+    assert await offline_loader.load(_URL) == "page"
+    with pytest.raises(PageNotCachedError):
+        await offline_loader.load("https://res.tuke.sk/api/programme_detail/SP002?lang=en")
+    network_loader.load_conditional.assert_not_awaited()
@@ -0,0 +1,126 @@
+import asyncio
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+from src.interface_adapters.exceptions import HttpStatusError, PageLoadingError, PageLoadingTimeoutError
+from src.interface_adapters.loaders.retrying_web_page_loader import RetryingWebPageLoader, RetryPolicy, ErrorBudget
+from src.interface_adapters.services.host_concurrency_controller import AIMDSettings, HostConcurrencyController
+
+_URL = "https://res.tuke.sk/api/programme_detail/SP001?lang=en"
+
+
+def _create_loader(
+        side_effect: list[object],
+        policy: RetryPolicy = RetryPolicy(),
+        error_budget: ErrorBudget | None = None
+) -> tuple[RetryingWebPageLoader, AsyncMock, list[float]]:
+    delays: list[float] = []
+
+    async def sleep(delay: float) -> None:
+        delays.append(delay)
+
+    inner_loader = Mock(load=AsyncMock(side_effect=side_effect))
+    loader = RetryingWebPageLoader(inner_loader, policy, error_budget, sleep=sleep, jitter=lambda: 1.0)
+    return loader, inner_loader.load, delays
+
+
+@pytest.mark.asyncio
+async def test_retries_transient_errors_with_exponential_backoff() -> None:
+    loader, load_mock, delays = _create_loader(
+        [PageLoadingError(), HttpStatusError(503), "page"], RetryPolicy(base_delay=1.0)
+    )
+
+    assert await loader.load(_URL) == "page"
+    assert load_mock.call_count == 3
+    assert delays == [1.0, 2.0]
+
+
+@pytest.mark.asyncio
+async def test_backoff_is_capped() -> None:
+    loader, _, delays = _create_loader(
+        [PageLoadingError()] * 4 + ["page"], RetryPolicy(max_retries=4, base_delay=1.0, max_delay=3.0)
+    )
+
+    await loader.load(_URL)
+    assert delays == [1.0, 2.0, 3.0, 3.0]
+
+
+@pytest.mark.asyncio
+async def test_gives_up_after_max_retries() -> None:
+    loader, load_mock, _ = _create_loader([PageLoadingError()] * 3, RetryPolicy(max_retries=2))
+
+    with pytest.raises(PageLoadingError):
+        await loader.load(_URL)
+    assert load_mock.call_count == 3
+
+
+@pytest.mark.asyncio
+async def test_does_not_retry_client_errors() -> None:
+    loader, load_mock, _ = _create_loader([HttpStatusError(404)])
+
+    with pytest.raises(HttpStatusError):
+        await loader.load(_URL)
+    assert load_mock.call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_honours_retry_after() -> None:
+    loader, _, delays = _create_loader([HttpStatusError(429, retry_after=7.0), "page"])
+
+    await loader.load(_URL)
+    assert delays == [7.0]
+
+
+@pytest.mark.asyncio
+async def test_gives_up_when_retry_after_exceeds_deadline() -> None:
+    loader, load_mock, _ = _create_loader(
+        [HttpStatusError(429, retry_after=60.0), "page"], RetryPolicy(total_deadline=10.0)
+    )
+
+    with pytest.raises(HttpStatusError):
+        await loader.load(_URL)
+    assert load_mock.call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_request_timeout_is_reported_as_page_loading_error() -> None:
+    async def hang(_: str) -> str:
+        await asyncio.sleep(10)
+        return "page"
+
+    loader = RetryingWebPageLoader(
+        Mock(load=AsyncMock(side_effect=hang)), RetryPolicy(max_retries=0, request_timeout=0.01)
+    )
+
+    with pytest.raises(PageLoadingTimeoutError):
+        await loader.load(_URL)
+
+
+@pytest.mark.asyncio
+async def test_error_budget_is_shared_and_stops_retries() -> None:
+    error_budget = ErrorBudget(max_retries=1)
+    loader, load_mock, _ = _create_loader([PageLoadingError()] * 3, error_budget=error_budget)
+
+    with pytest.raises(PageLoadingError):
+        await loader.load(_URL)
+    assert load_mock.call_count == 2
+    assert error_budget.is_exhausted
+
+
+@pytest.mark.asyncio
+async def test_retried_congestion_reduces_host_limit() -> None:
+    controller = HostConcurrencyController(limit_per_host=4, aimd=AIMDSettings())
+    in_flight_during_sleep: list[int] = []
+
+    async def sleep(delay: float) -> None:
+        in_flight_during_sleep.append(controller.statistics()["res.tuke.sk"].in_flight)
+
+    inner_loader = Mock(load=AsyncMock(side_effect=[HttpStatusError(429), "page"]))
+    loader = RetryingWebPageLoader(inner_loader, RetryPolicy(), concurrency_controller=controller, sleep=sleep)
+
+    assert await loader.load(_URL) == "page"
+    statistics = controller.statistics()["res.tuke.sk"]
+    assert statistics.congestion_events == 1
+    assert statistics.limit == 2
+    assert in_flight_during_sleep == [0]
@@ -5,6 +5,7 @@ import pytest
 from src.domain.entities.res_tuke_study_programme_data import ResTukeStudyProgrammeData
 from src.domain.entities.tuke_study_programme import TukeStudyProgramme
 from src.domain.enums import Language, Degree, StudyForm
+from src.interface_adapters.exceptions import ParserError
 from src.interface_adapters.parsers.res_tuke_study_programme_html_parser import ResTukeStudyProgrammeHtmlParser
 
 
@@ -114,3 +115,42 @@ class TestResTukeStudyProgrammeHtmlParserOnEnPage:
 
     def test_joint_study_program(self, page_parsing_results: TukeStudyProgramme) -> None:
         assert page_parsing_results.joint_study_program is False
+
+
+class TestResTukeStudyProgrammeHtmlParserFastExtraction:
+    @staticmethod
+    def _parse_both_ways(page: str, language: Language) -> tuple[ResTukeStudyProgrammeData, ResTukeStudyProgrammeData]:
+        return (
+            ResTukeStudyProgrammeHtmlParser(language, fast_extraction=True).parse_one(page),
+            ResTukeStudyProgrammeHtmlParser(language, fast_extraction=False).parse_one(page),
+        )
+
+    @pytest.mark.parametrize("language", [Language.SLOVAK, Language.ENGLISH])
+    def test_matches_xpath_extraction_on_fixtures(
+            self,
+            language: Language,
+            res_tuke_test_page_sk: Path,
+            res_tuke_test_page_en: Path
+    ) -> None:
+        page_path = res_tuke_test_page_sk if language == Language.SLOVAK else res_tuke_test_page_en
+        fast, reference = self._parse_both_ways(page_path.read_text(encoding="utf-8"), language)
+        assert fast == reference
+
+    def test_matches_xpath_extraction_with_several_main_elements(self, res_tuke_test_page_en: Path) -> None:
+        page = res_tuke_test_page_en.read_text(encoding="utf-8").replace(
+            "<main>", "<main><span>first</span></main><main>", 1
+        )
+        fast, reference = self._parse_both_ways(page, Language.ENGLISH)
+        assert fast == reference
+
+    def test_matches_xpath_extraction_when_mapping_key_is_substring(self, res_tuke_test_page_en: Path) -> None:
+        page = res_tuke_test_page_en.read_text(encoding="utf-8").replace("<span>Bc.</span>", "<span>Ing. Bc.</span>")
+        fast, reference = self._parse_both_ways(page, Language.ENGLISH)
+        assert fast == reference
+        assert fast.degree == Degree.BACHELOR
+
+    @pytest.mark.parametrize("fast_extraction", [True, False])
+    def test_missing_field(self, fast_extraction: bool) -> None:
+        parser = ResTukeStudyProgrammeHtmlParser(Language.ENGLISH, fast_extraction=fast_extraction)
+        with pytest.raises(ParserError):
+            parser.parse_one("<html><body><main><span>1</span></main></body></html>")
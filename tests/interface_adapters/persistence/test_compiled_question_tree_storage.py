@@ -0,0 +1,133 @@
+import struct
+from pathlib import Path
+
+import pytest
+
+from src.domain.entities.binary_question import BinaryQuestion
+from src.domain.entities.options_question import OptionsQuestion, AnswerOption
+from src.domain.entities.question_tree import QuestionTree
+from src.domain.entities.res_tuke_study_programme_data import ResTukeStudyProgrammeData
+from src.interface_adapters.exceptions import InvalidQuestionTreeFileError
+from src.interface_adapters.gateways.study_programmes_gateway_base import Page
+from src.interface_adapters.persistence.compiled_question_tree_storage import (
+    CompiledQuestionTreeStorage, DecompilingQuestionTreeRepository
+)
+from src.interface_adapters.services.question_tree.api import QuestionTreeAPI
+from src.interface_adapters.services.question_tree.compiled_question_tree import CompiledQuestionTree
+
+
+@pytest.fixture
+def question_tree(test_study_programmes: list[Page[ResTukeStudyProgrammeData]]) \
+        -> QuestionTree[Page[ResTukeStudyProgrammeData]]:
+    first, second, third = test_study_programmes[:3]
+    return QuestionTree(root=OptionsQuestion(text="Jazyk štúdia?", answer_options=[
+        AnswerOption(text="en", answer_node=BinaryQuestion(
+            text="Do you like computers?",
+            yes_answer_node=first,
+            no_answer_node=BinaryQuestion(text="Do you like mining?", yes_answer_node=second, no_answer_node=third)
+        )),
+        AnswerOption(text="sk", answer_node=first),
+    ]))
+
+
+@pytest.mark.asyncio
+async def test_saved_tree_is_mapped_unchanged(
+        tmp_path: Path,
+        question_tree: QuestionTree[Page[ResTukeStudyProgrammeData]]
+) -> None:
+    storage = CompiledQuestionTreeStorage(tmp_path / "tree.bin")
+    compiled_tree = CompiledQuestionTree.compile(question_tree)
+
+    await storage.save(question_tree)
+    mapped_tree = storage.load()
+
+    assert len(mapped_tree) == len(compiled_tree)
+    assert mapped_tree.programme_count == compiled_tree.programme_count
+    for node in range(len(compiled_tree)):
+        assert mapped_tree.kind(node) == compiled_tree.kind(node)
+        assert mapped_tree.answers(node) == compiled_tree.answers(node)
+        assert mapped_tree.programme_id(node) == compiled_tree.programme_id(node)
+        if node != CompiledQuestionTree.ROOT:
+            assert mapped_tree.answer_text(node) == compiled_tree.answer_text(node)
+        if mapped_tree.programme_id(node) == -1:
+            assert mapped_tree.text(node) == compiled_tree.text(node)
+        else:
+            assert mapped_tree.programme(node) == compiled_tree.programme(node)
+    assert CompiledQuestionTreeStorage.is_compiled_tree_file(tmp_path / "tree.bin")
+
+
+@pytest.mark.asyncio
+async def test_sessions_navigate_mapped_tree(
+        tmp_path: Path,
+        question_tree: QuestionTree[Page[ResTukeStudyProgrammeData]],
+        test_study_programmes: list[Page[ResTukeStudyProgrammeData]]
+) -> None:
+    storage = CompiledQuestionTreeStorage(tmp_path / "tree.bin")
+    await storage.save(question_tree)
+    api = QuestionTreeAPI(storage.load())
+
+    session_id = api.create_session()
+    answers = api.get_current_question(session_id).answers
+    result = api.answer_question(session_id, next(token for token, text in answers.items() if text == "sk"))
+
+    assert result == [test_study_programmes[0]]
+
+
+@pytest.mark.asyncio
+async def test_saved_tree_is_read_back_as_nested_questions(
+        tmp_path: Path,
+        question_tree: QuestionTree[Page[ResTukeStudyProgrammeData]]
+) -> None:
+    await CompiledQuestionTreeStorage(tmp_path / "tree.bin").save(question_tree)
+
+    assert await DecompilingQuestionTreeRepository(tmp_path / "tree.bin").get_all() == [question_tree]
+
+
+def test_file_of_other_format_is_rejected(tmp_path: Path) -> None:
+    (tmp_path / "tree.pkl").write_bytes(b"\x80\x04not a compiled tree")
+
+    with pytest.raises(InvalidQuestionTreeFileError):
+        CompiledQuestionTreeStorage(tmp_path / "tree.pkl").load()
+
+
+@pytest.mark.asyncio
+async def test_unsupported_version_is_rejected(
+        tmp_path: Path,
+        question_tree: QuestionTree[Page[ResTukeStudyProgrammeData]]
+) -> None:
+    path = tmp_path / "tree.bin"
+    await CompiledQuestionTreeStorage(path).save(question_tree)
+    contents = bytearray(path.read_bytes())
+    struct.pack_into("<I", contents, 8, 2)
+    path.write_bytes(bytes(contents))
+
+    with pytest.raises(InvalidQuestionTreeFileError, match="version 2"):
+        CompiledQuestionTreeStorage(path).load()
+
+
+@pytest.mark.asyncio
+async def test_wrong_section_count_is_reported_as_corruption(
+        tmp_path: Path,
+        question_tree: QuestionTree[Page[ResTukeStudyProgrammeData]]
+) -> None:
+    path = tmp_path / "tree.bin"
+    await CompiledQuestionTreeStorage(path).save(question_tree)
+    contents = bytearray(path.read_bytes())
+    struct.pack_into("<I", contents, 12, 3)
+    path.write_bytes(bytes(contents))
+
+    with pytest.raises(InvalidQuestionTreeFileError, match="is corrupted, it declares 3 sections"):
+        CompiledQuestionTreeStorage(path).load()
+
+
+@pytest.mark.asyncio
+async def test_truncated_section_table_is_reported_as_corruption(
+        tmp_path: Path,
+        question_tree: QuestionTree[Page[ResTukeStudyProgrammeData]]
+) -> None:
+    path = tmp_path / "tree.bin"
+    await CompiledQuestionTreeStorage(path).save(question_tree)
+    path.write_bytes(path.read_bytes()[:40])
+
+    with pytest.raises(InvalidQuestionTreeFileError, match="section table is truncated"):
+        CompiledQuestionTreeStorage(path).load()
@@ -4,8 +4,10 @@ import pytest
 
 from src.domain.entities.binary_question import BinaryQuestion
 from src.domain.entities.options_question import OptionsQuestion, AnswerOption
+from src.domain.entities.question_tree import QuestionTree
 from src.domain.entities.res_tuke_study_programme_data import ResTukeStudyProgrammeData
 from src.interface_adapters.gateways.study_programmes_gateway_base import Page
+from src.interface_adapters.services.question_tree.compiled_question_tree import CompiledQuestionTree
 from src.interface_adapters.services.question_tree.history_manager import HistoryManager
 from src.interface_adapters.services.question_tree.question_mapping_manager import QuestionsMappingManager
 from src.interface_adapters.services.question_tree.tree_iterator import TreeIterator
@@ -43,6 +45,22 @@ def mock_options_question(mock_page: Page[ResTukeStudyProgrammeData]) -> Options
     )
 
 
+@pytest.fixture
+def compiled_binary_question(
+    mock_binary_question: BinaryQuestion[Page[ResTukeStudyProgrammeData]]
+) -> CompiledQuestionTree:
+    """Compile a tree with the mock BinaryQuestion as its root."""
+    return CompiledQuestionTree.compile(QuestionTree(root=mock_binary_question))
+
+
+@pytest.fixture
+def compiled_options_question(
+    mock_options_question: OptionsQuestion[Page[ResTukeStudyProgrammeData]]
+) -> CompiledQuestionTree:
+    """Compile a tree with the mock OptionsQuestion as its root."""
+    return CompiledQuestionTree.compile(QuestionTree(root=mock_options_question))
+
+
 @pytest.fixture
 def history_manager() -> HistoryManager:
     """Create a HistoryManager instance."""
@@ -56,20 +74,22 @@ def unvisited_queue() -> UnvisitedQueue:
 
 
 @pytest.fixture
-def questions_mapping_manager() -> QuestionsMappingManager:
+def questions_mapping_manager(compiled_binary_question: CompiledQuestionTree) -> QuestionsMappingManager:
     """Create a QuestionsMappingManager instance."""
-    return QuestionsMappingManager()
+    return QuestionsMappingManager(compiled_binary_question)
 
 
 @pytest.fixture
 def tree_iterator(
     history_manager: HistoryManager, 
     unvisited_queue: UnvisitedQueue, 
-    questions_mapping_manager: QuestionsMappingManager
+    questions_mapping_manager: QuestionsMappingManager,
+    compiled_binary_question: CompiledQuestionTree
 ) -> TreeIterator:
     """Create a TreeIterator instance."""
     return TreeIterator(
         history=history_manager,
         queue=unvisited_queue,
-        tree_mapping_manager=questions_mapping_manager
+        tree_mapping_manager=questions_mapping_manager,
+        tree=compiled_binary_question
     )
@@ -0,0 +1,104 @@
+import pytest
+
+from src.domain.entities.binary_question import BinaryQuestion
+from src.domain.entities.options_question import OptionsQuestion, AnswerOption
+from src.domain.entities.question_tree import QuestionTree
+from src.domain.entities.res_tuke_study_programme_data import ResTukeStudyProgrammeData
+from src.interface_adapters.gateways.study_programmes_gateway_base import Page
+from src.interface_adapters.services.question_tree.compiled_question_tree import CompiledQuestionTree, NodeKind
+from src.interface_adapters.services.question_tree.exceptions import InvalidQuestionTreeError
+from src.interface_adapters.services.question_tree.type_aliases import TreeNode
+
+
+def _decompile(tree: CompiledQuestionTree, node: int) -> TreeNode:
+    kind = tree.kind(node)
+    if kind == NodeKind.PROGRAMME:
+        return tree.programme(node)
+    if kind == NodeKind.BINARY_QUESTION:
+        yes_node, no_node = (_decompile(tree, answer_node) for answer_node in tree.answers(node))
+        assert not isinstance(yes_node, OptionsQuestion) and not isinstance(no_node, OptionsQuestion)
+        return BinaryQuestion(tree.text(node), yes_node, no_node)
+    return OptionsQuestion(tree.text(node), [
+        AnswerOption(tree.answer_text(answer_node), _decompile(tree, answer_node)) for answer_node in tree.answers(node)
+    ])
+
+
+@pytest.mark.parametrize('tree_fixture', ['simple_binary_tree', 'complex_tree', 'options_transitions_tree', 'full_generation_tree'])
+def test_compiled_tree_keeps_structure(request: pytest.FixtureRequest, tree_fixture: str) -> None:
+    """Test the compiled tree describes the same questions, answers and programmes."""
+    tree: QuestionTree[Page[ResTukeStudyProgrammeData]] = request.getfixturevalue(tree_fixture)
+
+    compiled_tree = CompiledQuestionTree.compile(tree)
+
+    assert _decompile(compiled_tree, CompiledQuestionTree.ROOT) == tree.root
+
+
+@pytest.mark.parametrize('tree_fixture', ['simple_binary_tree', 'complex_tree', 'options_transitions_tree', 'full_generation_tree'])
+def test_decompiled_tree_equals_original(request: pytest.FixtureRequest, tree_fixture: str) -> None:
+    """Test decompiling rebuilds the nested questions the tree was compiled from."""
+    tree: QuestionTree[Page[ResTukeStudyProgrammeData]] = request.getfixturevalue(tree_fixture)
+
+    assert CompiledQuestionTree.compile(tree).decompile() == tree
+
+
+def test_children_are_contiguous(complex_tree: QuestionTree[Page[ResTukeStudyProgrammeData]]) -> None:
+    """Test the answers of every node lead to the following block of nodes in breadth-first order."""
+    compiled_tree = CompiledQuestionTree.compile(complex_tree)
+
+    children = [answer_node for node in range(len(compiled_tree)) for answer_node in compiled_tree.answers(node)]
+
+    assert children == list(range(1, len(compiled_tree)))
+    assert compiled_tree.answers(len(compiled_tree) - 1) == range(len(compiled_tree), len(compiled_tree))
+
+
+def test_texts_and_programmes_are_stored_once(test_study_programmes: list[Page[ResTukeStudyProgrammeData]]) -> None:
+    """Test repeated texts are interned and repeated programmes share one programme table entry."""
+    programme = test_study_programmes[0]
+    tree: QuestionTree[Page[ResTukeStudyProgrammeData]] = QuestionTree(root=BinaryQuestion(
+        text="Question?",
+        yes_answer_node=BinaryQuestion(text="Question?", yes_answer_node=programme, no_answer_node=programme),
+        no_answer_node=programme
+    ))
+
+    compiled_tree = CompiledQuestionTree.compile(tree)
+
+    assert len(compiled_tree) == 5
+    assert compiled_tree.programme_count == 1
+    assert compiled_tree._strings == ("Question?", "yes", "no")
+
+
+@pytest.mark.parametrize('tree_fixture', ['simple_binary_tree', 'complex_tree', 'options_transitions_tree', 'full_generation_tree'])
+def test_compiled_tree_is_valid(request: pytest.FixtureRequest, tree_fixture: str) -> None:
+    """Test compiled trees pass validation."""
+    tree: QuestionTree[Page[ResTukeStudyProgrammeData]] = request.getfixturevalue(tree_fixture)
+
+    CompiledQuestionTree.compile(tree).validate()
+
+
+@pytest.mark.parametrize('kinds, child_offsets, programme_ids', [
+    ([], [0], []),
+    ([1, 0, 0], [1, 3, 3], [-1, 0, 0]),
+    ([1, 0], [1, 2, 2], [-1, 0]),
+    ([1, 0, 0], [0, 3, 3, 3], [-1, 0, 0]),
+    ([1, 0, 0], [1, 3, 3, 3], [-1, 0, 5]),
+    ([7, 0, 0], [1, 3, 3, 3], [-1, 0, 0]),
+])
+def test_inconsistent_tree_is_invalid(
+        test_study_programme: Page[ResTukeStudyProgrammeData],
+        kinds: list[int],
+        child_offsets: list[int],
+        programme_ids: list[int]
+) -> None:
+    """Test empty trees, uncovered nodes, missing answers, cycles and missing programmes fail validation."""
+    tree = CompiledQuestionTree(
+        kinds=kinds,
+        text_ids=[0 if kind else -1 for kind in kinds],
+        answer_text_ids=[-1] + [1] * (len(kinds) - 1),
+        child_offsets=child_offsets,
+        programme_ids=programme_ids,
+        strings=["Question?", "yes"],
+        programmes=[test_study_programme]
+    )
+
+    with pytest.raises(InvalidQuestionTreeError):
+        tree.validate()
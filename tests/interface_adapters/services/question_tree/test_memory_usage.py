@@ -0,0 +1,43 @@
+import sys
+
+
+class _Buffer:
+    def __init__(self, texts: list[str]) -> None:
+        self.texts = texts
+
+    @property
+    def nbytes(self) -> int:
+        return 10
+
+from src.interface_adapters.services.question_tree.memory_usage import estimate_nbytes, estimate_nbytes_each
+
+
+def test_shared_objects_are_counted_once() -> None:
+    """Test an object referenced twice is counted once."""
+    text = "x" * 1000
+
+    assert estimate_nbytes([text, text]) == sys.getsizeof([text, text]) + sys.getsizeof(text)
+
+
+def test_objects_referenced_by_excluded_objects_are_not_counted() -> None:
+    """Test objects reached through excluded objects are left out, not only the excluded objects themselves."""
+    text = "x" * 1000
+    shared = {"texts": [text]}
+
+    assert estimate_nbytes([text], exclude=[shared]) == sys.getsizeof([text])
+
+
+def test_objects_referenced_by_excluded_buffers_are_not_counted() -> None:
+    """Test objects reporting their size do not hide what they reference from the exclusion."""
+    text = "x" * 1000
+
+    assert estimate_nbytes([_Buffer([text]), text]) == sys.getsizeof([None, None]) + 10 + sys.getsizeof(text)
+    assert estimate_nbytes([text], exclude=[_Buffer([text])]) == sys.getsizeof([text])
+
+
+def test_every_object_is_estimated_separately() -> None:
+    """Test objects measured together are each counted in full."""
+    text = "x" * 1000
+    first, second = [text], [text]
+
+    assert estimate_nbytes_each([first, second]) == [estimate_nbytes(first), estimate_nbytes(second)]
@@ -18,10 +18,10 @@ def test_init() -> None:
     assert isinstance(api, QuestionTreeAPI)
 
 
-def test_create_session() -> None:
+def test_create_session(mock_binary_question: BinaryQuestion[Page[ResTukeStudyProgrammeData]]) -> None:
     """Test creating a new session through the API."""
     mock_tree = MagicMock(spec=QuestionTree)
-    mock_tree.root = MagicMock()
+    mock_tree.root = mock_binary_question
     
     api = QuestionTreeAPI(mock_tree)
     session_id = api.create_session()
@@ -2,12 +2,16 @@ from src.domain.entities.binary_question import BinaryQuestion
 from src.domain.entities.options_question import OptionsQuestion
 from src.domain.entities.res_tuke_study_programme_data import ResTukeStudyProgrammeData
 from src.interface_adapters.gateways.study_programmes_gateway_base import Page
+from src.interface_adapters.services.question_tree.compiled_question_tree import CompiledQuestionTree
 from src.interface_adapters.services.question_tree.session import Session
 
 
-def test_init_with_binary_question(mock_binary_question: BinaryQuestion[Page[ResTukeStudyProgrammeData]]) -> None:
+def test_init_with_binary_question(
+    mock_binary_question: BinaryQuestion[Page[ResTukeStudyProgrammeData]],
+    compiled_binary_question: CompiledQuestionTree
+) -> None:
     """Test initialization with a binary question."""
-    session = Session(mock_binary_question)
+    session = Session(compiled_binary_question)
     current_node = session.get_current_node()
     
     assert current_node.question == mock_binary_question.text
@@ -17,9 +21,12 @@ def test_init_with_binary_question(mock_binary_question: BinaryQuestion[Page[Res
     assert "probably" in current_node.answers.values()
 
 
-def test_init_with_options_question(mock_options_question: OptionsQuestion[Page[ResTukeStudyProgrammeData]]) -> None:
+def test_init_with_options_question(
+    mock_options_question: OptionsQuestion[Page[ResTukeStudyProgrammeData]],
+    compiled_options_question: CompiledQuestionTree
+) -> None:
     """Test initialization with an options question."""
-    session = Session(mock_options_question)
+    session = Session(compiled_options_question)
     current_node = session.get_current_node()
     
     assert current_node.question == mock_options_question.text
@@ -29,11 +36,11 @@ def test_init_with_options_question(mock_options_question: OptionsQuestion[Page[
 
 
 def test_set_answer_binary_question(
-    mock_binary_question: BinaryQuestion[Page[ResTukeStudyProgrammeData]], 
+    compiled_binary_question: CompiledQuestionTree,
     mock_page: Page[ResTukeStudyProgrammeData]
 ) -> None:
     """Test setting an answer for a binary question."""
-    session = Session(mock_binary_question)
+    session = Session(compiled_binary_question)
     current_node = session.get_current_node()
 
     yes_token = [token for token, value in current_node.answers.items() if value == "yes"][0]
@@ -43,11 +50,11 @@ def test_set_answer_binary_question(
 
 
 def test_set_answer_options_question(
-    mock_options_question: OptionsQuestion[Page[ResTukeStudyProgrammeData]], 
+    compiled_options_question: CompiledQuestionTree,
     mock_page: Page[ResTukeStudyProgrammeData]
 ) -> None:
     """Test setting an answer for an options question."""
-    session = Session(mock_options_question)
+    session = Session(compiled_options_question)
     current_node = session.get_current_node()
 
     option_token = [token for token, value in current_node.answers.items() if value == "Option 1"][0]
@@ -1,37 +1,47 @@
+import gc
+import weakref
 from unittest.mock import MagicMock
 
 import pytest
 
+from src.domain.entities.binary_question import BinaryQuestion
 from src.domain.entities.question_tree import QuestionTree
+from src.domain.entities.res_tuke_study_programme_data import ResTukeStudyProgrammeData
+from src.interface_adapters.gateways.study_programmes_gateway_base import Page
+from src.interface_adapters.services.question_tree.compiled_question_tree import CompiledQuestionTree
 from src.interface_adapters.services.question_tree.exceptions import SessionNotFoundError
-from src.interface_adapters.services.question_tree.session_manager import SessionManager
+from src.interface_adapters.services.question_tree.session_manager import (
+    SessionLimits, SessionManager, TreeVersionStatistics
+)
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
 
 
 def test_init() -> None:
     """Test initialization of SessionManager."""
-    mock_tree = MagicMock(spec=QuestionTree)
+    mock_tree = MagicMock(spec=CompiledQuestionTree)
     manager = SessionManager(mock_tree)
     assert isinstance(manager, SessionManager)
 
 
-def test_create_session() -> None:
+def test_create_session(compiled_binary_question: CompiledQuestionTree) -> None:
     """Test creating a new session."""
-    mock_tree = MagicMock(spec=QuestionTree)
-    mock_tree.root = MagicMock()
-    
-    manager = SessionManager(mock_tree)
+    manager = SessionManager(compiled_binary_question)
     session_id = manager.create_session()
     
     assert isinstance(session_id, str)
     assert len(session_id) > 0
 
 
-def test_get_session_exists() -> None:
+def test_get_session_exists(compiled_binary_question: CompiledQuestionTree) -> None:
     """Test getting an existing session."""
-    mock_tree = MagicMock(spec=QuestionTree)
-    mock_tree.root = MagicMock()
-    
-    manager = SessionManager(mock_tree)
+    manager = SessionManager(compiled_binary_question)
     session_id = manager.create_session()
     
     session = manager.get_session(session_id)
@@ -40,7 +50,7 @@ def test_get_session_exists() -> None:
 
 def test_get_session_not_found() -> None:
     """Test exception is raised when session is not found."""
-    mock_tree = MagicMock(spec=QuestionTree)
+    mock_tree = MagicMock(spec=CompiledQuestionTree)
     manager = SessionManager(mock_tree)
     
     with pytest.raises(SessionNotFoundError):
@@ -49,10 +59,133 @@ def test_get_session_not_found() -> None:
 
 def test_generate_session_id() -> None:
     """Test session ID generation produces unique IDs."""
-    mock_tree = MagicMock(spec=QuestionTree)
+    mock_tree = MagicMock(spec=CompiledQuestionTree)
     manager = SessionManager(mock_tree)
     
     session_id1 = manager._generate_session_id()
     session_id2 = manager._generate_session_id()
     
     assert session_id1 != session_id2
+
+
+def test_close_session(compiled_binary_question: CompiledQuestionTree) -> None:
+    """Test a closed session can no longer be retrieved or closed."""
+    manager = SessionManager(compiled_binary_question)
+    session_id = manager.create_session()
+
+    manager.close_session(session_id)
+
+    with pytest.raises(SessionNotFoundError):
+        manager.get_session(session_id)
+    with pytest.raises(SessionNotFoundError):
+        manager.close_session(session_id)
+
+
+def test_swap_tree_pins_sessions_to_their_version(
+        mock_binary_question: BinaryQuestion[Page[ResTukeStudyProgrammeData]],
+        compiled_options_question: CompiledQuestionTree
+) -> None:
+    """Test existing sessions stay on their tree, new ones use the new tree and old versions are released."""
+    old_tree = CompiledQuestionTree.compile(QuestionTree(root=mock_binary_question))
+    old_tree_reference = weakref.ref(old_tree)
+    manager = SessionManager(old_tree)
+    old_session_id = manager.create_session()
+    del old_tree
+
+    assert manager.swap_tree(compiled_options_question) == 2
+    new_session_id = manager.create_session()
+
+    assert manager.get_session(old_session_id).get_current_node().question == "Test binary question?"
+    assert manager.get_session(new_session_id).get_current_node().question == "Test options question?"
+    assert [(statistics.version, statistics.sessions, statistics.is_current) for statistics in manager.tree_versions] \
+        == [(1, 1, False), (2, 1, True)]
+
+    manager.close_session(old_session_id)
+    gc.collect()
+
+    assert [statistics.version for statistics in manager.tree_versions] == [2]
+    assert old_tree_reference() is None
+
+
+def test_unused_version_is_released_on_swap(
+        compiled_binary_question: CompiledQuestionTree,
+        compiled_options_question: CompiledQuestionTree
+) -> None:
+    """Test a version without sessions is released as soon as it is swapped out."""
+    manager = SessionManager(compiled_binary_question)
+
+    manager.swap_tree(compiled_options_question)
+
+    assert manager.tree_versions == [TreeVersionStatistics(2, 0, compiled_options_question.nbytes, True)]
+
+
+def test_idle_session_expires(compiled_binary_question: CompiledQuestionTree) -> None:
+    """Test a session idle for longer than the TTL is gone, while a used one is kept alive."""
+    clock = _Clock()
+    manager = SessionManager(compiled_binary_question, SessionLimits(idle_ttl=10, max_sessions=None), clock)
+    idle_session_id = manager.create_session()
+    used_session_id = manager.create_session()
+
+    clock.now = 8
+    manager.get_session(used_session_id)
+    clock.now = 15
+
+    assert manager.get_session(used_session_id) is not None
+    with pytest.raises(SessionNotFoundError):
+        manager.get_session(idle_session_id)
+    assert manager.statistics.live_sessions == 1
+    assert manager.statistics.expired_sessions == 1
+
+
+def test_remove_expired_sessions(compiled_binary_question: CompiledQuestionTree) -> None:
+    """Test the sweep removes exactly the sessions idle for longer than the TTL."""
+    clock = _Clock()
+    manager = SessionManager(compiled_binary_question, SessionLimits(idle_ttl=10, max_sessions=None), clock)
+    expired_session_ids = [manager.create_session() for _ in range(3)]
+    clock.now = 5
+    live_session_id = manager.create_session()
+    clock.now = 12
+
+    assert manager.remove_expired_sessions() == 3
+
+    for session_id in expired_session_ids:
+        with pytest.raises(SessionNotFoundError):
+            manager.get_session(session_id)
+    assert manager.get_session(live_session_id) is not None
+    assert manager.tree_versions[0].sessions == 1
+
+
+def test_least_recently_used_session_is_evicted(compiled_binary_question: CompiledQuestionTree) -> None:
+    """Test the least recently used session is evicted when the session limit is reached."""
+    manager = SessionManager(compiled_binary_question, SessionLimits(idle_ttl=None, max_sessions=2))
+    first_session_id = manager.create_session()
+    second_session_id = manager.create_session()
+    manager.get_session(first_session_id)
+
+    third_session_id = manager.create_session()
+
+    with pytest.raises(SessionNotFoundError):
+        manager.get_session(second_session_id)
+    assert manager.get_session(first_session_id) is not None
+    assert manager.get_session(third_session_id) is not None
+    assert manager.statistics.evicted_sessions == 1
+    assert manager.statistics.live_sessions == 2
+
+
+def test_statistics_exclude_shared_tree(test_study_programmes: list[Page[ResTukeStudyProgrammeData]]) -> None:
+    """Test the memory per session does not count the tree all sessions share."""
+    large_programme = test_study_programmes[0]._replace(
+        data=test_study_programmes[0].data._replace(description="x" * 1_000_000)
+    )
+    tree = CompiledQuestionTree.compile(QuestionTree(root=BinaryQuestion(
+        text="Question?", yes_answer_node=large_programme, no_answer_node=test_study_programmes[1]
+    )))
+    manager = SessionManager(tree)
+    assert manager.statistics.bytes_per_session == 0
+
+    manager.create_session()
+    statistics = manager.statistics
+
+    assert tree.nbytes > 1_000_000
+    assert 0 < statistics.bytes_per_session < 100_000
+    assert statistics[:3] == (1, 0, 0)
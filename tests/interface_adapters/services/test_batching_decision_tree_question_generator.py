@@ -0,0 +1,64 @@
+import asyncio
+from collections.abc import Sequence
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+from src.domain.dtos.decision_tree_question import DecisionTreeQuestion
+from src.interface_adapters.exceptions import QuestionGenerationError
+from src.interface_adapters.services.batching_decision_tree_question_generator import (
+    BatchingDecisionTreeQuestionGenerator, BatchingStatistics
+)
+
+
+def _questions(
+        subsets: list[list[str]],
+        rejected_questions: Sequence[Sequence[DecisionTreeQuestion]] = ()
+) -> list[DecisionTreeQuestion]:
+    return [DecisionTreeQuestion(f"Q{subset[0]}?", subset[:1], subset[1:]) for subset in subsets]
+
+
+@pytest.mark.asyncio
+async def test_concurrent_subsets_are_generated_in_one_batch() -> None:
+    inner_generator = Mock(generate_questions=AsyncMock(side_effect=_questions))
+    generator: BatchingDecisionTreeQuestionGenerator[str] = BatchingDecisionTreeQuestionGenerator(inner_generator)
+
+    questions = await asyncio.gather(
+        generator.generate_question(["A", "B"]),
+        generator.generate_question(["C", "D"]),
+        generator.generate_question(["E", "F"])
+    )
+
+    assert [question.text for question in questions] == ["QA?", "QC?", "QE?"]
+    inner_generator.generate_questions.assert_awaited_once_with([["A", "B"], ["C", "D"], ["E", "F"]], [(), (), ()])
+    assert generator.statistics == BatchingStatistics(batches=1, subsets=3)
+
+
+@pytest.mark.asyncio
+async def test_full_batch_is_sent_without_waiting() -> None:
+    inner_generator = Mock(generate_questions=AsyncMock(side_effect=_questions))
+    generator: BatchingDecisionTreeQuestionGenerator[str] = BatchingDecisionTreeQuestionGenerator(
+        inner_generator, max_batch_size=2, max_wait=10.0
+    )
+
+    await asyncio.wait_for(
+        asyncio.gather(*(generator.generate_question([code, "X"]) for code in "ABCD")),
+        timeout=1.0
+    )
+
+    assert inner_generator.generate_questions.await_count == 2
+    assert generator.statistics == BatchingStatistics(batches=2, subsets=4)
+
+
+@pytest.mark.asyncio
+async def test_batch_error_is_raised_for_every_subset() -> None:
+    inner_generator = Mock(generate_questions=AsyncMock(side_effect=QuestionGenerationError("failed")))
+    generator: BatchingDecisionTreeQuestionGenerator[str] = BatchingDecisionTreeQuestionGenerator(inner_generator)
+
+    results = await asyncio.gather(
+        generator.generate_question(["A", "B"]),
+        generator.generate_question(["C", "D"]),
+        return_exceptions=True
+    )
+
+    assert all(isinstance(result, QuestionGenerationError) for result in results)
@@ -0,0 +1,149 @@
+from collections.abc import Sequence
+from pathlib import Path
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+from src.domain.dtos.decision_tree_question import DecisionTreeQuestion
+from src.domain.entities.res_tuke_study_programme_data import ResTukeStudyProgrammeData
+from src.infrastructure.persistence.sqlite_key_value_cache import SQLiteKeyValueCache
+from src.interface_adapters.gateways.study_programmes_gateway_base import Page
+from src.interface_adapters.services.caching_decision_tree_question_generator import (
+    CachingDecisionTreeQuestionGenerator
+)
+from src.interface_adapters.services.res_tuke_question_tree_generator import (
+    ResTukeQuestionTreeGenerator, TreeShapeConstraints
+)
+
+_QUESTION = DecisionTreeQuestion(text="Do you like computers?", yes_nodes=["SP001"], no_nodes=["SP002", "SP003"])
+
+
+@pytest.fixture
+def cache(tmp_path: Path) -> SQLiteKeyValueCache:
+    return SQLiteKeyValueCache(tmp_path / "questions.sqlite")
+
+
+@pytest.fixture
+def programmes(test_study_programmes: list[Page[ResTukeStudyProgrammeData]]) -> list[Page[ResTukeStudyProgrammeData]]:
+    return test_study_programmes[:3]
+
+
+@pytest.mark.asyncio
+async def test_question_is_reused_for_same_programmes_in_any_order(
+        cache: SQLiteKeyValueCache,
+        programmes: list[Page[ResTukeStudyProgrammeData]]
+) -> None:
+    inner_generator = Mock(generate_question=AsyncMock(return_value=_QUESTION))
+    generator = CachingDecisionTreeQuestionGenerator(inner_generator, cache, "gpt-4o", "1")
+
+    assert await generator.generate_question(programmes) == _QUESTION
+    assert await generator.generate_question(list(reversed(programmes))) == _QUESTION
+
+    inner_generator.generate_question.assert_awaited_once_with(programmes, ())
+    assert generator.statistics.hits == 1
+    assert generator.statistics.misses == 1
+
+
+@pytest.mark.asyncio
+async def test_question_survives_restart(cache: SQLiteKeyValueCache, tmp_path: Path,
+                                         programmes: list[Page[ResTukeStudyProgrammeData]]) -> None:
+    await CachingDecisionTreeQuestionGenerator(
+        Mock(generate_question=AsyncMock(return_value=_QUESTION)), cache, "gpt-4o", "1"
+    ).generate_question(programmes)
+    cache.close()
+
+    inner_generator = Mock(generate_question=AsyncMock())
+    generator = CachingDecisionTreeQuestionGenerator(
+        inner_generator, SQLiteKeyValueCache(tmp_path / "questions.sqlite"), "gpt-4o", "1"
+    )
+
+    assert await generator.generate_question(programmes) == _QUESTION
+    inner_generator.generate_question.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("model, prompt_version, changed_name", [
+    ("gpt-4o-mini", "1", None),
+    ("gpt-4o", "2", None),
+    ("gpt-4o", "1", "Renamed programme"),
+])
+async def test_question_is_regenerated_when_key_changes(
+        cache: SQLiteKeyValueCache,
+        programmes: list[Page[ResTukeStudyProgrammeData]],
+        model: str,
+        prompt_version: str,
+        changed_name: str | None
+) -> None:
+    await CachingDecisionTreeQuestionGenerator(
+        Mock(generate_question=AsyncMock(return_value=_QUESTION)), cache, "gpt-4o", "1"
+    ).generate_question(programmes)
+    if changed_name is not None:
+        programmes = [programmes[0]._replace(data=programmes[0].data._replace(name=changed_name)), *programmes[1:]]
+
+    inner_generator = Mock(generate_question=AsyncMock(return_value=_QUESTION))
+    generator = CachingDecisionTreeQuestionGenerator(inner_generator, cache, model, prompt_version)
+    await generator.generate_question(programmes)
+
+    inner_generator.generate_question.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_tree_regeneration_only_asks_for_changed_subsets(
+        cache: SQLiteKeyValueCache,
+        test_study_programmes: list[Page[ResTukeStudyProgrammeData]]
+) -> None:
+    async def halve(
+            study_programmes: list[Page[ResTukeStudyProgrammeData]],
+            rejected_questions: Sequence[DecisionTreeQuestion]
+    ) -> DecisionTreeQuestion:
+        codes = sorted(study_programme.metadata.code for study_programme in study_programmes)
+        return DecisionTreeQuestion(text=f"Split {codes}", yes_nodes=codes[:len(codes) // 2],
+                                    no_nodes=codes[len(codes) // 2:])
+
+    template = test_study_programmes[0]
+    programmes = [template._replace(metadata=template.metadata._replace(code=f"P{index:02d}")) for index in range(16)]
+    inner_generator = Mock(generate_question=AsyncMock(side_effect=halve))
+    tree_generator = ResTukeQuestionTreeGenerator(
+        CachingDecisionTreeQuestionGenerator(inner_generator, cache, "gpt-4o", "1")
+    )
+    first_tree = await tree_generator.generate(programmes)
+    assert inner_generator.generate_question.await_count == 15
+
+    inner_generator.generate_question.reset_mock()
+    programmes[5] = programmes[5]._replace(data=programmes[5].data._replace(description="Changed description"))
+    second_tree = await tree_generator.generate(programmes)
+
+    assert inner_generator.generate_question.await_count == 4
+    assert str(second_tree.root.answer_options[0].answer_node.answer_options[0].text) == str(  # type: ignore[union-attr]
+        first_tree.root.answer_options[0].answer_node.answer_options[0].text  # type: ignore[union-attr]
+    )
+
+
+@pytest.mark.asyncio
+async def test_rejected_split_is_not_served_again_from_cache(
+        cache: SQLiteKeyValueCache,
+        test_study_programmes: list[Page[ResTukeStudyProgrammeData]]
+) -> None:
+    async def split_off_first_until_rejected(
+            study_programmes: list[Page[ResTukeStudyProgrammeData]],
+            rejected_questions: Sequence[DecisionTreeQuestion]
+    ) -> DecisionTreeQuestion:
+        codes = sorted(study_programme.metadata.code for study_programme in study_programmes)
+        split = len(codes) // 2 if rejected_questions else 1
+        return DecisionTreeQuestion(text=f"Split {codes}", yes_nodes=codes[:split], no_nodes=codes[split:])
+
+    template = test_study_programmes[0]
+    programmes = [template._replace(metadata=template.metadata._replace(code=f"P{index:02d}")) for index in range(8)]
+    inner_generator = Mock(generate_question=AsyncMock(side_effect=split_off_first_until_rejected))
+    tree_generator = ResTukeQuestionTreeGenerator(
+        CachingDecisionTreeQuestionGenerator(inner_generator, cache, "gpt-4o", "1"),
+        shape_constraints=TreeShapeConstraints(max_size_ratio=1.5)
+    )
+    await tree_generator.generate(programmes)
+    assert tree_generator.shape_statistics.unresolved_splits == 0
+
+    inner_generator.generate_question.reset_mock()
+    await tree_generator.generate(programmes)
+
+    inner_generator.generate_question.assert_not_awaited()
+    assert tree_generator.shape_statistics.unresolved_splits == 0
@@ -0,0 +1,66 @@
+import pytest
+
+from src.domain.entities.res_tuke_study_programme_data import ResTukeStudyProgrammeData
+from src.interface_adapters.gateways.study_programmes_gateway_base import Page
+from src.interface_adapters.services.compact_prompt_encoder import CompactPromptEncoder
+
+
+@pytest.fixture
+def long_programmes(
+        test_study_programmes: list[Page[ResTukeStudyProgrammeData]]
+) -> list[Page[ResTukeStudyProgrammeData]]:
+    sentences = " ".join(f"Sentence number {index} about the programme." for index in range(100))
+    return [
+        programme._replace(data=programme.data._replace(description=sentences, learning_objectives=sentences))
+        for programme in test_study_programmes
+    ]
+
+
+def test_encode_builds_table_with_aliases(test_study_programmes: list[Page[ResTukeStudyProgrammeData]]) -> None:
+    encoder = CompactPromptEncoder()
+
+    encoded = encoder.encode(test_study_programmes)
+
+    rows = encoded.text.split("\n")
+    assert rows[0] == CompactPromptEncoder.HEADER
+    assert len(rows) == len(test_study_programmes) + 1
+    assert all(row.startswith(f"p{index}|") for index, row in enumerate(rows[1:], 1))
+    assert list(encoded.aliases.values()) == [programme.metadata.code for programme in test_study_programmes]
+    assert encoded.approximate_tokens == encoder.estimate_tokens(encoded.text)
+
+
+def test_encode_keeps_full_texts_within_budget(test_study_programmes: list[Page[ResTukeStudyProgrammeData]]) -> None:
+    encoded = CompactPromptEncoder(token_budget=100_000).encode(test_study_programmes)
+
+    assert " ".join(test_study_programmes[0].data.description.split()) in encoded.text
+
+
+def test_encode_summarises_texts_over_budget(long_programmes: list[Page[ResTukeStudyProgrammeData]]) -> None:
+    full_tokens = CompactPromptEncoder(token_budget=100_000).encode(long_programmes).approximate_tokens
+    encoder = CompactPromptEncoder(token_budget=full_tokens // 4)
+
+    encoded = encoder.encode(long_programmes)
+
+    assert encoded.approximate_tokens <= full_tokens // 4
+    assert "Sentence number 0 about the programme." in encoded.text
+    assert "Sentence number 99 about the programme." not in encoded.text
+
+
+def test_encode_drops_texts_when_summaries_do_not_fit(
+        long_programmes: list[Page[ResTukeStudyProgrammeData]]
+) -> None:
+    encoded = CompactPromptEncoder(token_budget=1).encode(long_programmes)
+
+    rows = encoded.text.split("\n")[1:]
+    assert all(row.endswith("||") for row in rows)
+
+
+def test_summaries_are_computed_once(long_programmes: list[Page[ResTukeStudyProgrammeData]]) -> None:
+    encoder = CompactPromptEncoder(token_budget=500, summary_lengths=(200,))
+    encoder.encode(long_programmes)
+    cached_summaries = dict(encoder._summaries)
+
+    encoder.encode(long_programmes)
+
+    assert len(cached_summaries) == 1
+    assert encoder._summaries == cached_summaries
@@ -0,0 +1,165 @@
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+from src.domain.dtos.decision_tree_question import DecisionTreeQuestion
+from src.domain.entities.res_tuke_study_programme_data import ResTukeStudyProgrammeData
+from src.interface_adapters.gateways.study_programmes_gateway_base import Page
+from src.interface_adapters.services.heuristic_decision_tree_question_generator import (
+    HeuristicDecisionTreeQuestionGenerator
+)
+from src.interface_adapters.services.hybrid_decision_tree_question_generator import (
+    HybridDecisionTreeQuestionGenerator, HybridSplitStatistics
+)
+
+_COMPUTING_TEXT = "Software engineering, computer networks, programming and algorithms."
+_MINING_TEXT = "Mining, geology, raw materials extraction and geotechnics."
+
+
+def _programme(
+        template: Page[ResTukeStudyProgrammeData],
+        code: str,
+        faculty: str = "Faculty",
+        professionally_oriented: bool = False,
+        text: str = _COMPUTING_TEXT
+) -> Page[ResTukeStudyProgrammeData]:
+    return Page(
+        data=template.data._replace(
+            faculty=faculty,
+            study_field="Field",
+            professionally_oriented=professionally_oriented,
+            joint_study_program=False,
+            length_of_study_in_years=3,
+            description=text,
+            learning_objectives=text
+        ),
+        metadata=template.metadata._replace(code=code)
+    )
+
+
+def _assert_partition(question: DecisionTreeQuestion, programmes: list[Page[ResTukeStudyProgrammeData]]) -> None:
+    assert question.yes_nodes and question.no_nodes
+    assert sorted(question.yes_nodes + question.no_nodes) == sorted(programme.metadata.code for programme in programmes)
+
+
+@pytest.mark.asyncio
+async def test_balanced_attribute_split_is_preferred(
+        test_study_programmes: list[Page[ResTukeStudyProgrammeData]]
+) -> None:
+    template = test_study_programmes[0]
+    programmes = [
+        _programme(template, "A1", faculty="Faculty A"),
+        _programme(template, "A2", faculty="Faculty A", professionally_oriented=True),
+        _programme(template, "B1", faculty="Faculty B"),
+        _programme(template, "B2", faculty="Faculty B"),
+    ]
+
+    question = await HeuristicDecisionTreeQuestionGenerator().generate_question(programmes)
+
+    assert question == DecisionTreeQuestion("Would you like to study at the Faculty A?", ["A1", "A2"], ["B1", "B2"])
+
+
+@pytest.mark.asyncio
+async def test_rejected_split_is_not_repeated(test_study_programmes: list[Page[ResTukeStudyProgrammeData]]) -> None:
+    template = test_study_programmes[0]
+    programmes = [
+        _programme(template, "A1", faculty="Faculty A", professionally_oriented=True),
+        _programme(template, "A2", faculty="Faculty A"),
+        _programme(template, "B1", faculty="Faculty B", professionally_oriented=True),
+        _programme(template, "B2", faculty="Faculty B"),
+    ]
+    generator = HeuristicDecisionTreeQuestionGenerator()
+    rejected_question = await generator.generate_question(programmes)
+
+    question = await generator.generate_question(programmes, [rejected_question])
+
+    assert rejected_question.text == "Would you like to study at the Faculty A?"
+    assert question == DecisionTreeQuestion(
+        "Do you prefer a professionally oriented programme focused on practice?", ["A1", "B1"], ["A2", "B2"]
+    )
+
+
+def test_unbalanced_attribute_split_is_rejected(test_study_programmes: list[Page[ResTukeStudyProgrammeData]]) -> None:
+    template = test_study_programmes[0]
+    programmes = [_programme(template, "A1", professionally_oriented=True)] + [
+        _programme(template, f"B{index}") for index in range(9)
+    ]
+    generator = HeuristicDecisionTreeQuestionGenerator(min_balance=0.25)
+
+    best_split = generator.best_attribute_split(programmes)
+
+    assert best_split is not None
+    assert best_split.balance == pytest.approx(0.1)
+    assert generator.attribute_split(programmes) is None
+
+
+@pytest.mark.asyncio
+async def test_texts_are_clustered_without_attribute_split(
+        test_study_programmes: list[Page[ResTukeStudyProgrammeData]]
+) -> None:
+    template = test_study_programmes[0]
+    programmes = [
+        _programme(template, "C1"),
+        _programme(template, "M1", text=_MINING_TEXT),
+        _programme(template, "C2", text=_COMPUTING_TEXT + " Computer security."),
+        _programme(template, "M2", text=_MINING_TEXT + " Mining safety."),
+    ]
+
+    question = await HeuristicDecisionTreeQuestionGenerator().generate_question(programmes)
+
+    _assert_partition(question, programmes)
+    assert {frozenset(question.yes_nodes), frozenset(question.no_nodes)} == {
+        frozenset({"C1", "C2"}), frozenset({"M1", "M2"})
+    }
+    assert question.text.startswith("Are you interested in topics such as")
+
+
+@pytest.mark.asyncio
+async def test_identical_programmes_are_halved(test_study_programmes: list[Page[ResTukeStudyProgrammeData]]) -> None:
+    programmes = [_programme(test_study_programmes[0], f"P{index}") for index in range(5)]
+
+    question = await HeuristicDecisionTreeQuestionGenerator().generate_question(programmes)
+
+    _assert_partition(question, programmes)
+    assert question.text == "Are you interested in one of the programmes Programme 1 EN (P0) or Programme 1 EN (P1)?"
+    assert question.yes_nodes == ["P0", "P1"]
+
+
+@pytest.mark.asyncio
+async def test_halved_question_names_programmes_answering_yes(
+        test_study_programmes: list[Page[ResTukeStudyProgrammeData]]
+) -> None:
+    programmes = [
+        _programme(test_study_programmes[0], code, text="")
+        for code in ["P1", "P2", "P3", "P4"]
+    ]
+    programmes = [
+        programme._replace(data=programme.data._replace(name=name))
+        for programme, name in zip(programmes, ["Mining", "Computer Science", "Geology", "Economics"])
+    ]
+
+    question = await HeuristicDecisionTreeQuestionGenerator().generate_question(programmes)
+
+    assert question == DecisionTreeQuestion(
+        "Are you interested in one of the programmes Computer Science or Economics?", ["P2", "P4"], ["P3", "P1"]
+    )
+
+
+@pytest.mark.asyncio
+async def test_hybrid_asks_language_model_only_without_attribute_split(
+        test_study_programmes: list[Page[ResTukeStudyProgrammeData]]
+) -> None:
+    template = test_study_programmes[0]
+    split_by_faculty = [_programme(template, "A1", faculty="Faculty A"), _programme(template, "B1", faculty="Faculty B")]
+    unsplittable = [_programme(template, "P1"), _programme(template, "P2")]
+    language_model_question = DecisionTreeQuestion("Do you like programming?", ["P1"], ["P2"])
+    language_model_generator = Mock(generate_question=AsyncMock(return_value=language_model_question))
+    generator = HybridDecisionTreeQuestionGenerator(HeuristicDecisionTreeQuestionGenerator(), language_model_generator)
+
+    local_question = await generator.generate_question(split_by_faculty)
+    question = await generator.generate_question(unsplittable)
+
+    assert local_question.yes_nodes == ["A1"]
+    assert question == language_model_question
+    language_model_generator.generate_question.assert_awaited_once_with(unsplittable, ())
+    assert generator.statistics == HybridSplitStatistics(local=1, language_model=1)
@@ -0,0 +1,78 @@
+import asyncio
+
+import pytest
+
+from src.interface_adapters.exceptions import HttpStatusError
+from src.interface_adapters.services.host_concurrency_controller import HostConcurrencyController, AIMDSettings
+
+_URL = "https://res.tuke.sk/api/programme_detail/SP001?lang=en"
+
+
+async def _hold_slot(controller: HostConcurrencyController, url: str, in_flight: list[int]) -> None:
+    async with controller.limit(url):
+        in_flight.append(controller.statistics()[url.split("/")[2]].in_flight)
+        await asyncio.sleep(0.01)
+
+
+@pytest.mark.asyncio
+async def test_fixed_limit_caps_in_flight_requests() -> None:
+    controller = HostConcurrencyController(limit_per_host=3)
+    in_flight: list[int] = []
+
+    await asyncio.gather(*(_hold_slot(controller, _URL, in_flight) for _ in range(12)))
+
+    statistics = controller.statistics()["res.tuke.sk"]
+    assert max(in_flight) == 3
+    assert statistics.peak_in_flight == 3
+    assert statistics.completed == 12
+    assert statistics.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_limits_are_per_host() -> None:
+    controller = HostConcurrencyController(limit_per_host=1)
+    in_flight: list[int] = []
+
+    await asyncio.gather(
+        _hold_slot(controller, "https://a.example/1", in_flight),
+        _hold_slot(controller, "https://b.example/1", in_flight),
+    )
+
+    assert set(controller.statistics()) == {"a.example", "b.example"}
+    assert all(statistics.peak_in_flight == 1 for statistics in controller.statistics().values())
+
+
+@pytest.mark.asyncio
+async def test_aimd_decreases_limit_on_throttling() -> None:
+    controller = HostConcurrencyController(limit_per_host=8, aimd=AIMDSettings(min_limit=2))
+
+    with pytest.raises(HttpStatusError):
+        async with controller.limit(_URL):
+            raise HttpStatusError(429)
+
+    statistics = controller.statistics()["res.tuke.sk"]
+    assert statistics.limit == 4
+    assert statistics.congestion_events == 1
+    assert statistics.failed == 1
+
+
+@pytest.mark.asyncio
+async def test_aimd_ignores_non_congestion_errors() -> None:
+    controller = HostConcurrencyController(limit_per_host=8, aimd=AIMDSettings())
+
+    with pytest.raises(HttpStatusError):
+        async with controller.limit(_URL):
+            raise HttpStatusError(404)
+
+    assert controller.statistics()["res.tuke.sk"].limit == 8
+
+
+@pytest.mark.asyncio
+async def test_aimd_increases_limit_while_healthy() -> None:
+    controller = HostConcurrencyController(limit_per_host=2, aimd=AIMDSettings(max_limit=4))
+
+    for _ in range(20):
+        async with controller.limit(_URL):
+            pass
+
+    assert controller.statistics()["res.tuke.sk"].limit == 4
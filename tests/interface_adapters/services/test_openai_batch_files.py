@@ -0,0 +1,95 @@
+import json
+from pathlib import Path
+from typing import Any
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+from src.domain.dtos.decision_tree_question import DecisionTreeQuestion
+from src.domain.entities.res_tuke_study_programme_data import ResTukeStudyProgrammeData
+from src.infrastructure.persistence.sqlite_key_value_cache import SQLiteKeyValueCache
+from src.interface_adapters.exceptions import QuestionsExportedError
+from src.interface_adapters.gateways.study_programmes_gateway_base import Page
+from src.interface_adapters.services.caching_decision_tree_question_generator import (
+    CachingDecisionTreeQuestionGenerator, question_cache_key
+)
+from src.interface_adapters.services.openai_batch_files import (
+    BatchImportSummary, OpenAIBatchRequestExporter, OpenAIBatchResultImporter
+)
+from src.interface_adapters.services.openai_decision_tree_question_generator import (
+    OpenAIDecisionTreeQuestionGenerator
+)
+
+
+def _result(custom_id: str, content: dict[str, Any], status_code: int = 200) -> str:
+    body = {"choices": [{"message": {"content": json.dumps(content)}}]}
+    return json.dumps({"custom_id": custom_id, "response": {"status_code": status_code, "body": body}, "error": None})
+
+
+@pytest.mark.asyncio
+async def test_exported_requests_are_imported_into_question_cache(
+        tmp_path: Path,
+        test_study_programmes: list[Page[ResTukeStudyProgrammeData]]
+) -> None:
+    programmes = list({programme.metadata.code: programme for programme in test_study_programmes}.values())
+    subsets = [programmes[:2], programmes[1:]]
+    requests_path, aliases_path = tmp_path / "requests.jsonl", tmp_path / "requests.aliases.json"
+    async with OpenAIDecisionTreeQuestionGenerator("test-key") as openai_generator:
+        exporter = OpenAIBatchRequestExporter(
+            openai_generator,
+            lambda subset, rejected_questions: question_cache_key(subset, "gpt-4o", "1", rejected_questions),
+            requests_path,
+            aliases_path
+        )
+        with pytest.raises(QuestionsExportedError):
+            await exporter.generate_questions(subsets)
+
+    requests = [json.loads(line) for line in requests_path.read_text("utf-8").splitlines()]
+    assert [request["url"] for request in requests] == ["/v1/chat/completions"] * 2
+    results_path = tmp_path / "results.jsonl"
+    results_path.write_text("\n".join([
+        _result(requests[0]["custom_id"], {"question": "Q1?", "yes": ["p1"], "no": ["p2"]}),
+        _result(requests[1]["custom_id"], {"question": "Q2?", "yes": ["p1", "p2"], "no": []}),
+        _result("unknown", {}, status_code=500)
+    ]), "utf-8")
+    cache = SQLiteKeyValueCache(tmp_path / "questions.sqlite")
+
+    summary = OpenAIBatchResultImporter(cache).import_results(results_path, aliases_path)
+
+    assert summary == BatchImportSummary(imported=1, invalid=1, failed=1)
+    inner_generator = Mock(generate_question=AsyncMock())
+    generator = CachingDecisionTreeQuestionGenerator(inner_generator, cache, "gpt-4o", "1")
+    question = await generator.generate_question(subsets[0])
+    assert (question.text, question.yes_nodes, question.no_nodes) == ("Q1?", ["SP001"], ["SP002"])
+    inner_generator.generate_question.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_requests_with_rejected_questions_are_imported_under_their_cache_key(
+        tmp_path: Path,
+        test_study_programmes: list[Page[ResTukeStudyProgrammeData]]
+) -> None:
+    programmes = list({programme.metadata.code: programme for programme in test_study_programmes}.values())[:2]
+    rejected_questions = [DecisionTreeQuestion(text="Q0?", yes_nodes=["SP001", "SP002"], no_nodes=[])]
+    requests_path, aliases_path = tmp_path / "requests.jsonl", tmp_path / "requests.aliases.json"
+    async with OpenAIDecisionTreeQuestionGenerator("test-key") as openai_generator:
+        exporter = OpenAIBatchRequestExporter(
+            openai_generator,
+            lambda subset, rejected: question_cache_key(subset, "gpt-4o", "1", rejected),
+            requests_path,
+            aliases_path
+        )
+        with pytest.raises(QuestionsExportedError):
+            await exporter.generate_questions([programmes], [rejected_questions])
+
+    request = json.loads(requests_path.read_text("utf-8"))
+    results_path = tmp_path / "results.jsonl"
+    results_path.write_text(_result(request["custom_id"], {"question": "Q1?", "yes": ["p1"], "no": ["p2"]}), "utf-8")
+    cache = SQLiteKeyValueCache(tmp_path / "questions.sqlite")
+    OpenAIBatchResultImporter(cache).import_results(results_path, aliases_path)
+
+    inner_generator = Mock(generate_question=AsyncMock())
+    generator = CachingDecisionTreeQuestionGenerator(inner_generator, cache, "gpt-4o", "1")
+    question = await generator.generate_question(programmes, rejected_questions)
+    assert question.text == "Q1?"
+    inner_generator.generate_question.assert_not_awaited()
@@ -0,0 +1,421 @@
+import asyncio
+import json
+import re
+from typing import AsyncIterator, Any
+
+import openai
+import pytest
+import pytest_asyncio
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from src.domain.dtos.decision_tree_question import DecisionTreeQuestion
+from src.domain.entities.res_tuke_study_programme_data import ResTukeStudyProgrammeData
+from src.interface_adapters.exceptions import QuestionGenerationError
+from src.interface_adapters.gateways.study_programmes_gateway_base import Page
+from src.interface_adapters.services.compact_prompt_encoder import CompactPromptEncoder
+from src.interface_adapters.services.openai_decision_tree_question_generator import (
+    OpenAIDecisionTreeQuestionGenerator, OpenAIClientSettings, PartitionRepairStatistics
+)
+
+
+class _StubChatCompletions:
+    def __init__(self) -> None:
+        self.peers: list[object] = []
+        self.delay = 0.0
+        self.scripted_responses: list[dict[str, Any]] = []
+        self.refusals = 0
+        self.requests: list[dict[str, Any]] = []
+
+    async def handle(self, request: web.Request) -> web.Response:
+        self.peers.append(request.transport.get_extra_info("peername") if request.transport else None)
+        body = await request.json()
+        self.requests.append(body)
+        await asyncio.sleep(self.delay)
+        if self.refusals:
+            self.refusals -= 1
+            return web.json_response({
+                "id": "chatcmpl-stub",
+                "object": "chat.completion",
+                "created": 0,
+                "model": body["model"],
+                "choices": [{
+                    "index": 0,
+                    "finish_reason": "stop",
+                    "message": {"role": "assistant", "content": None, "refusal": "I cannot help with that."}
+                }]
+            })
+        if self.scripted_responses:
+            content = json.dumps(self.scripted_responses.pop(0))
+        else:
+            aliases = re.findall(r"^(p\d+)\|", body["messages"][1]["content"][0]["text"], re.MULTILINE)
+            content = json.dumps({"question": "Do you like computers?", "yes": aliases[:1], "no": aliases[1:]})
+        return web.json_response({
+            "id": "chatcmpl-stub",
+            "object": "chat.completion",
+            "created": 0,
+            "model": body["model"],
+            "choices": [{
+                "index": 0,
+                "finish_reason": "stop",
+                "message": {"role": "assistant", "content": content}
+            }],
+            "usage": {"prompt_tokens": 100, "completion_tokens": 10, "total_tokens": 110}
+        })
+
+
+@pytest.fixture
+def chat_completions() -> _StubChatCompletions:
+    return _StubChatCompletions()
+
+
+@pytest_asyncio.fixture
+async def stub_server(chat_completions: _StubChatCompletions) -> AsyncIterator[TestServer]:
+    application = web.Application()
+    application.router.add_post("/v1/chat/completions", chat_completions.handle)
+    server = TestServer(application)
+    async with server:
+        yield server
+
+
+@pytest.fixture
+def distinct_programmes(
+        test_study_programmes: list[Page[ResTukeStudyProgrammeData]]
+) -> list[Page[ResTukeStudyProgrammeData]]:
+    return list({programme.metadata.code: programme for programme in test_study_programmes}.values())
+
+
+def _client_settings(server: TestServer, request_timeout: float = 10.0) -> OpenAIClientSettings:
+    return OpenAIClientSettings(base_url=str(server.make_url("/v1")), request_timeout=request_timeout, max_retries=0)
+
+
+@pytest.mark.asyncio
+async def test_generate_question_uses_base_url(
+        stub_server: TestServer,
+        test_study_programmes: list[Page[ResTukeStudyProgrammeData]]
+) -> None:
+    async with OpenAIDecisionTreeQuestionGenerator("test-key", client_settings=_client_settings(stub_server)) \
+            as generator:
+        question = await generator.generate_question(test_study_programmes)
+
+    assert question.text == "Do you like computers?"
+    assert set(question.yes_nodes + question.no_nodes) == {
+        programme.metadata.code for programme in test_study_programmes
+    }
+
+
+@pytest.mark.asyncio
+async def test_requests_reuse_one_connection(
+        stub_server: TestServer,
+        chat_completions: _StubChatCompletions,
+        test_study_programmes: list[Page[ResTukeStudyProgrammeData]]
+) -> None:
+    async with OpenAIDecisionTreeQuestionGenerator("test-key", client_settings=_client_settings(stub_server)) \
+            as generator:
+        for _ in range(5):
+            await generator.generate_question(test_study_programmes)
+
+    assert len(chat_completions.peers) == 5
+    assert len(set(chat_completions.peers)) == 1
+
+
+@pytest.mark.asyncio
+async def test_request_timeout_is_applied(
+        stub_server: TestServer,
+        chat_completions: _StubChatCompletions,
+        test_study_programmes: list[Page[ResTukeStudyProgrammeData]]
+) -> None:
+    chat_completions.delay = 1.0
+    settings = _client_settings(stub_server, request_timeout=0.1)
+    async with OpenAIDecisionTreeQuestionGenerator("test-key", client_settings=settings) as generator:
+        with pytest.raises(openai.APITimeoutError):
+            await generator.generate_question(test_study_programmes)
+
+
+@pytest.mark.asyncio
+async def test_aclose_closes_client(
+        stub_server: TestServer,
+        test_study_programmes: list[Page[ResTukeStudyProgrammeData]]
+) -> None:
+    generator = OpenAIDecisionTreeQuestionGenerator("test-key", client_settings=_client_settings(stub_server))
+    await generator.aclose()
+
+    with pytest.raises(openai.APIConnectionError):
+        await generator.generate_question(test_study_programmes)
+
+
+@pytest.mark.asyncio
+async def test_duplicated_and_unknown_codes_are_dropped(
+        stub_server: TestServer,
+        chat_completions: _StubChatCompletions,
+        distinct_programmes: list[Page[ResTukeStudyProgrammeData]]
+) -> None:
+    chat_completions.scripted_responses = [
+        {"question": "Q?", "yes": ["SP001", "SP002", "SP999"], "no": ["SP002", "SP003", "SP003"]}
+    ]
+    async with OpenAIDecisionTreeQuestionGenerator("test-key", client_settings=_client_settings(stub_server)) \
+            as generator:
+        question = await generator.generate_question(distinct_programmes)
+
+    assert question.yes_nodes == ["SP001", "SP002"]
+    assert question.no_nodes == ["SP003"]
+    assert len(chat_completions.requests) == 1
+    assert generator.repair_statistics == PartitionRepairStatistics(1, 1, 0, 0, 0)
+
+
+@pytest.mark.asyncio
+async def test_missing_codes_are_classified_by_follow_up_prompt(
+        stub_server: TestServer,
+        chat_completions: _StubChatCompletions,
+        distinct_programmes: list[Page[ResTukeStudyProgrammeData]]
+) -> None:
+    chat_completions.scripted_responses = [
+        {"question": "Q?", "yes": ["SP001"], "no": []},
+        {"yes": [], "no": ["SP002", "SP003"]}
+    ]
+    async with OpenAIDecisionTreeQuestionGenerator("test-key", client_settings=_client_settings(stub_server)) \
+            as generator:
+        question = await generator.generate_question(distinct_programmes)
+
+    assert question.yes_nodes == ["SP001"]
+    assert question.no_nodes == ["SP002", "SP003"]
+    follow_up_message = chat_completions.requests[1]["messages"][1]["content"][0]["text"]
+    assert follow_up_message.startswith("Question: Q?")
+    assert "SP001" not in follow_up_message
+    assert chat_completions.requests[1]["response_format"]["json_schema"]["name"] == (
+        "binary_decision_tree_classification"
+    )
+    assert generator.repair_statistics == PartitionRepairStatistics(1, 0, 1, 0, 0)
+
+
+@pytest.mark.asyncio
+async def test_empty_group_is_regenerated(
+        stub_server: TestServer,
+        chat_completions: _StubChatCompletions,
+        distinct_programmes: list[Page[ResTukeStudyProgrammeData]]
+) -> None:
+    chat_completions.scripted_responses = [
+        {"question": "Q1?", "yes": ["SP001", "SP002", "SP003"], "no": []},
+        {"question": "Q2?", "yes": ["SP001"], "no": ["SP002", "SP003"]}
+    ]
+    async with OpenAIDecisionTreeQuestionGenerator("test-key", client_settings=_client_settings(stub_server)) \
+            as generator:
+        question = await generator.generate_question(distinct_programmes)
+
+    assert question.text == "Q2?"
+    assert generator.repair_statistics == PartitionRepairStatistics(1, 0, 0, 1, 0)
+
+
+@pytest.mark.asyncio
+async def test_regeneration_is_capped(
+        stub_server: TestServer,
+        chat_completions: _StubChatCompletions,
+        distinct_programmes: list[Page[ResTukeStudyProgrammeData]]
+) -> None:
+    chat_completions.scripted_responses = [
+        {"question": "Q?", "yes": ["SP001", "SP002", "SP003"], "no": []} for _ in range(10)
+    ]
+    settings = _client_settings(stub_server)
+    async with OpenAIDecisionTreeQuestionGenerator("test-key", client_settings=settings, max_attempts=2) \
+            as generator:
+        with pytest.raises(QuestionGenerationError):
+            await generator.generate_question(distinct_programmes)
+
+    assert len(chat_completions.requests) == 2
+    assert generator.repair_statistics == PartitionRepairStatistics(1, 0, 0, 1, 1)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("malformed_response", [
+    {"question": "Q1?", "yes": ["SP001"]},
+    {"question": "Q1?", "yes": None, "no": ["SP002", "SP003"]},
+])
+async def test_malformed_response_is_regenerated(
+        stub_server: TestServer,
+        chat_completions: _StubChatCompletions,
+        distinct_programmes: list[Page[ResTukeStudyProgrammeData]],
+        malformed_response: dict[str, Any]
+) -> None:
+    chat_completions.scripted_responses = [
+        malformed_response,
+        {"question": "Q2?", "yes": ["SP001"], "no": ["SP002", "SP003"]}
+    ]
+    async with OpenAIDecisionTreeQuestionGenerator("test-key", client_settings=_client_settings(stub_server)) \
+            as generator:
+        question = await generator.generate_question(distinct_programmes)
+
+    assert question.text == "Q2?"
+    assert len(chat_completions.requests) == 2
+
+
+@pytest.mark.asyncio
+async def test_refusal_is_regenerated(
+        stub_server: TestServer,
+        chat_completions: _StubChatCompletions,
+        distinct_programmes: list[Page[ResTukeStudyProgrammeData]]
+) -> None:
+    chat_completions.refusals = 1
+    async with OpenAIDecisionTreeQuestionGenerator("test-key", client_settings=_client_settings(stub_server)) \
+            as generator:
+        question = await generator.generate_question(distinct_programmes)
+
+    assert question.text == "Do you like computers?"
+    assert len(chat_completions.requests) == 2
+    assert generator.repair_statistics == PartitionRepairStatistics(1, 0, 0, 1, 0)
+
+
+@pytest.mark.asyncio
+async def test_prompt_refers_to_programmes_by_alias(
+        stub_server: TestServer,
+        chat_completions: _StubChatCompletions,
+        distinct_programmes: list[Page[ResTukeStudyProgrammeData]]
+) -> None:
+    chat_completions.scripted_responses = [{"question": "Q?", "yes": ["p1", "p3"], "no": ["p2"]}]
+    async with OpenAIDecisionTreeQuestionGenerator("test-key", client_settings=_client_settings(stub_server)) \
+            as generator:
+        question = await generator.generate_question(distinct_programmes)
+
+    user_message = chat_completions.requests[0]["messages"][1]["content"][0]["text"]
+    assert "SP001" not in user_message
+    assert question.yes_nodes == ["SP001", "SP003"]
+    assert question.no_nodes == ["SP002"]
+
+
+@pytest.mark.asyncio
+async def test_rejected_questions_are_listed_in_prompt(
+        stub_server: TestServer,
+        chat_completions: _StubChatCompletions,
+        distinct_programmes: list[Page[ResTukeStudyProgrammeData]]
+) -> None:
+    rejected_question = DecisionTreeQuestion(text="Rejected?", yes_nodes=["SP001", "SP002"], no_nodes=["SP003"])
+    async with OpenAIDecisionTreeQuestionGenerator("test-key", client_settings=_client_settings(stub_server)) \
+            as generator:
+        await generator.generate_question(distinct_programmes)
+        await generator.generate_question(distinct_programmes, [rejected_question])
+
+    first_message, retry_message = (request["messages"][1]["content"][0]["text"] for request in chat_completions.requests)
+    assert "Rejected?" not in first_message
+    assert "- Rejected? (2 'yes', 1 'no')" in retry_message
+
+
+@pytest.mark.asyncio
+async def test_token_usage_is_accumulated(
+        stub_server: TestServer,
+        distinct_programmes: list[Page[ResTukeStudyProgrammeData]]
+) -> None:
+    async with OpenAIDecisionTreeQuestionGenerator("test-key", client_settings=_client_settings(stub_server)) \
+            as generator:
+        await generator.generate_question(distinct_programmes)
+        await generator.generate_question(distinct_programmes)
+
+    token_usage = generator.token_usage
+    assert token_usage.requests == 2
+    assert token_usage.estimated_prompt_tokens > 0
+    assert token_usage.prompt_tokens == 200
+    assert token_usage.completion_tokens == 20
+
+
+@pytest.mark.asyncio
+async def test_subsets_are_generated_in_one_request(
+        stub_server: TestServer,
+        chat_completions: _StubChatCompletions,
+        distinct_programmes: list[Page[ResTukeStudyProgrammeData]]
+) -> None:
+    chat_completions.scripted_responses = [{"splits": [
+        {"subset": "s2", "question": "Q2?", "yes": ["p1"], "no": ["p2"]},
+        {"subset": "s1", "question": "Q1?", "yes": ["p2"], "no": ["p1"]}
+    ]}]
+    subsets = [distinct_programmes[:2], distinct_programmes[1:]]
+    async with OpenAIDecisionTreeQuestionGenerator("test-key", client_settings=_client_settings(stub_server)) \
+            as generator:
+        questions = await generator.generate_questions(subsets)
+
+    assert [(question.text, question.yes_nodes, question.no_nodes) for question in questions] == [
+        ("Q1?", ["SP002"], ["SP001"]),
+        ("Q2?", ["SP002"], ["SP003"])
+    ]
+    assert len(chat_completions.requests) == 1
+    assert chat_completions.requests[0]["response_format"]["json_schema"]["name"] == "binary_decision_tree_questions"
+
+
+@pytest.mark.asyncio
+async def test_subset_missing_from_batched_response_is_generated_alone(
+        stub_server: TestServer,
+        chat_completions: _StubChatCompletions,
+        distinct_programmes: list[Page[ResTukeStudyProgrammeData]]
+) -> None:
+    chat_completions.scripted_responses = [{"splits": [
+        {"subset": "s1", "question": "Q1?", "yes": ["p1"], "no": ["p2"]}
+    ]}]
+    subsets = [distinct_programmes[:2], distinct_programmes[1:]]
+    async with OpenAIDecisionTreeQuestionGenerator("test-key", client_settings=_client_settings(stub_server)) \
+            as generator:
+        questions = await generator.generate_questions(subsets)
+
+    assert questions[0].text == "Q1?"
+    assert questions[1].text == "Do you like computers?"
+    assert set(questions[1].yes_nodes + questions[1].no_nodes) == {"SP002", "SP003"}
+    assert len(chat_completions.requests) == 2
+
+
+@pytest.mark.asyncio
+async def test_subsets_over_token_budget_are_requested_separately(
+        stub_server: TestServer,
+        chat_completions: _StubChatCompletions,
+        distinct_programmes: list[Page[ResTukeStudyProgrammeData]]
+) -> None:
+    subsets = [distinct_programmes[:2], distinct_programmes[1:]]
+    prompt_encoder = CompactPromptEncoder(token_budget=1, summary_lengths=())
+    async with OpenAIDecisionTreeQuestionGenerator(
+            "test-key", client_settings=_client_settings(stub_server), prompt_encoder=prompt_encoder
+    ) as generator:
+        questions = await generator.generate_questions(subsets)
+
+    assert len(questions) == 2
+    assert len(chat_completions.requests) == 2
+    assert all(
+        request["response_format"]["json_schema"]["name"] == "binary_decision_tree_question"
+        for request in chat_completions.requests
+    )
+
+
+@pytest.mark.asyncio
+async def test_batched_requests_fit_output_token_limit(
+        stub_server: TestServer,
+        chat_completions: _StubChatCompletions,
+        distinct_programmes: list[Page[ResTukeStudyProgrammeData]]
+) -> None:
+    subsets = [distinct_programmes[:2], distinct_programmes[1:], distinct_programmes[:2], distinct_programmes[1:]]
+    async with OpenAIDecisionTreeQuestionGenerator(
+            "test-key", client_settings=_client_settings(stub_server), max_tokens=2048, max_output_tokens=4096
+    ) as generator:
+        await generator.generate_questions(subsets)
+
+    batched_requests = [
+        request for request in chat_completions.requests
+        if request["response_format"]["json_schema"]["name"] == "binary_decision_tree_questions"
+    ]
+    assert len(batched_requests) == 2
+    assert all(request["max_tokens"] == 4096 for request in batched_requests)
+
+
+@pytest.mark.asyncio
+async def test_malformed_subset_in_batched_response_is_generated_alone(
+        stub_server: TestServer,
+        chat_completions: _StubChatCompletions,
+        distinct_programmes: list[Page[ResTukeStudyProgrammeData]]
+) -> None:
+    chat_completions.scripted_responses = [{"splits": [
+        {"subset": "s1", "question": "Q1?", "yes": ["p1"]},
+        {"subset": "s2", "question": "Q2?", "yes": ["p1"], "no": ["p2"]},
+        {"question": "Q3?"}
+    ]}]
+    subsets = [distinct_programmes[:2], distinct_programmes[1:]]
+    async with OpenAIDecisionTreeQuestionGenerator("test-key", client_settings=_client_settings(stub_server)) \
+            as generator:
+        questions = await generator.generate_questions(subsets)
+
+    assert questions[0].text == "Do you like computers?"
+    assert set(questions[0].yes_nodes + questions[0].no_nodes) == {"SP001", "SP002"}
+    assert (questions[1].text, questions[1].yes_nodes, questions[1].no_nodes) == ("Q2?", ["SP002"], ["SP003"])
+    assert len(chat_completions.requests) == 2
@@ -0,0 +1,32 @@
+from pathlib import Path
+
+import pytest
+
+from src.domain.enums import Language
+from src.interface_adapters.factories.language_parser_factory import ResTukeLanguageParserFactory
+from src.interface_adapters.services.parse_executor import InlineParseExecutor, PoolParseExecutor, ParseExecutorKind
+
+
+@pytest.fixture
+def pages(res_tuke_test_page_sk: Path, res_tuke_test_page_en: Path) -> list[tuple[Language, str]]:
+    page_sk = res_tuke_test_page_sk.read_text(encoding="utf-8")
+    page_en = res_tuke_test_page_en.read_text(encoding="utf-8")
+    return [(Language.SLOVAK, page_sk), (Language.ENGLISH, page_en)] * 5
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("kind", [ParseExecutorKind.THREAD, ParseExecutorKind.PROCESS])
+async def test_pool_parse_executor_matches_inline_parsing(
+        pages: list[tuple[Language, str]],
+        kind: ParseExecutorKind
+) -> None:
+    expected = await InlineParseExecutor(ResTukeLanguageParserFactory()).parse_multiple(pages)
+
+    with PoolParseExecutor(ResTukeLanguageParserFactory, kind, workers=2, chunk_size=3) as parse_executor:
+        assert parse_executor.batch_size == 6
+        assert await parse_executor.parse_multiple(pages) == expected
+
+
+def test_pool_parse_executor_rejects_inline_kind() -> None:
+    with pytest.raises(ValueError):
+        PoolParseExecutor(ResTukeLanguageParserFactory, ParseExecutorKind.INLINE)
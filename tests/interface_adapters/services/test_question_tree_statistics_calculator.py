@@ -0,0 +1,38 @@
+import pytest
+
+from src.domain.entities.question_tree import QuestionTree
+from src.domain.entities.res_tuke_study_programme_data import ResTukeStudyProgrammeData
+from src.interface_adapters.gateways.study_programmes_gateway_base import Page
+from src.interface_adapters.services.question_tree_statistics_calculator import DepthQuestionTreeStatisticsCalculator
+
+
+def test_calculate_complex_tree(complex_tree: QuestionTree[Page[ResTukeStudyProgrammeData]]) -> None:
+    statistics = DepthQuestionTreeStatisticsCalculator[Page[ResTukeStudyProgrammeData]]().calculate(complex_tree)
+
+    assert statistics.leaves == 3
+    assert statistics.questions == 2
+    assert statistics.depth_histogram == {1: 1, 2: 2}
+    assert statistics.max_depth == 2
+    assert statistics.expected_path_length == pytest.approx(5 / 3)
+    assert statistics.leaf_balance == pytest.approx((1 / 2 + 1) / 2)
+
+
+def test_calculate_counts_options_questions(
+        options_transitions_tree: QuestionTree[Page[ResTukeStudyProgrammeData]]
+) -> None:
+    statistics = DepthQuestionTreeStatisticsCalculator[Page[ResTukeStudyProgrammeData]]().calculate(
+        options_transitions_tree
+    )
+
+    assert statistics.depth_histogram == {1: 2}
+    assert statistics.questions == 1
+    assert statistics.leaf_balance == 1.0
+
+
+def test_calculate_single_programme_tree(test_study_programmes: list[Page[ResTukeStudyProgrammeData]]) -> None:
+    tree = QuestionTree(root=test_study_programmes[0])
+
+    statistics = DepthQuestionTreeStatisticsCalculator[Page[ResTukeStudyProgrammeData]]().calculate(tree)
+
+    assert statistics.depth_histogram == {0: 1}
+    assert statistics.expected_path_length == 0.0
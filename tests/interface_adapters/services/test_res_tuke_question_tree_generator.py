@@ -0,0 +1,311 @@
+import asyncio
+from collections.abc import Sequence
+from pathlib import Path
+
+import pytest
+
+from src.domain.dtos.decision_tree_question import DecisionTreeQuestion
+from src.domain.entities.options_question import OptionsQuestion
+from src.domain.entities.res_tuke_study_programme_data import ResTukeStudyProgrammeData
+from src.infrastructure.persistence.json_lines_checkpoint_journal import JsonLinesCheckpointJournal
+from src.interface_adapters.gateways.study_programmes_gateway_base import Page
+from src.interface_adapters.services.rate_limited_decision_tree_question_generator import (
+    RateLimitedDecisionTreeQuestionGenerator
+)
+from src.interface_adapters.services.question_tree_statistics_calculator import DepthQuestionTreeStatisticsCalculator
+from src.interface_adapters.services.res_tuke_question_tree_generator import (
+    ResTukeQuestionTreeGenerator, TreeShapeConstraints, ShapeConstraintStatistics, CheckpointStatistics, OptionsFacet,
+    group_by
+)
+
+
+class _HalvingQuestionGenerator:
+    def __init__(self) -> None:
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.calls = 0
+
+    async def generate_question(
+            self,
+            study_programmes: list[Page[ResTukeStudyProgrammeData]],
+            rejected_questions: Sequence[DecisionTreeQuestion] = ()
+    ) -> DecisionTreeQuestion:
+        self.calls += 1
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+        codes = sorted(study_programme.metadata.code for study_programme in study_programmes)
+        middle = len(codes) // 2
+        return DecisionTreeQuestion(text=f"Split {codes}", yes_nodes=codes[:middle], no_nodes=codes[middle:])
+
+
+class _FailingQuestionGenerator(_HalvingQuestionGenerator):
+    def __init__(self, failing_call: int) -> None:
+        super().__init__()
+        self._failing_call = failing_call
+
+    async def generate_question(
+            self,
+            study_programmes: list[Page[ResTukeStudyProgrammeData]],
+            rejected_questions: Sequence[DecisionTreeQuestion] = ()
+    ) -> DecisionTreeQuestion:
+        if self.calls + 1 == self._failing_call:
+            raise RuntimeError("API call failed")
+        return await super().generate_question(study_programmes, rejected_questions)
+
+
+class _UnbalancedFirstQuestionGenerator:
+    """Answers every set of programmes first with a split into ``first_share`` and the rest, then halves it."""
+
+    def __init__(self, first_share: float, unbalanced_answers: int = 1) -> None:
+        self._first_share = first_share
+        self._unbalanced_answers = unbalanced_answers
+        self._answers: dict[tuple[str, ...], int] = {}
+
+    async def generate_question(
+            self,
+            study_programmes: list[Page[ResTukeStudyProgrammeData]],
+            rejected_questions: Sequence[DecisionTreeQuestion] = ()
+    ) -> DecisionTreeQuestion:
+        codes = sorted(study_programme.metadata.code for study_programme in study_programmes)
+        answers = self._answers.get(tuple(codes), 0)
+        self._answers[tuple(codes)] = answers + 1
+        if answers < self._unbalanced_answers:
+            split = max(1, int(len(codes) * self._first_share))
+        else:
+            split = len(codes) // 2
+        return DecisionTreeQuestion(text=f"Split {codes}", yes_nodes=codes[:split], no_nodes=codes[split:])
+
+
+@pytest.fixture
+def study_programmes(test_study_programmes: list[Page[ResTukeStudyProgrammeData]]) \
+        -> list[Page[ResTukeStudyProgrammeData]]:
+    template = test_study_programmes[0]
+    return [
+        template._replace(metadata=template.metadata._replace(code=f"P{index:02d}"))
+        for index in range(16)
+    ]
+
+
+@pytest.mark.asyncio
+async def test_concurrent_build_matches_serial_build(study_programmes: list[Page[ResTukeStudyProgrammeData]]) -> None:
+    serial_generator = _HalvingQuestionGenerator()
+    concurrent_generator = _HalvingQuestionGenerator()
+
+    serial_tree = await ResTukeQuestionTreeGenerator(serial_generator, concurrent_subtrees=False).generate(
+        study_programmes
+    )
+    concurrent_tree = await ResTukeQuestionTreeGenerator(concurrent_generator).generate(study_programmes)
+
+    assert concurrent_tree == serial_tree
+    assert concurrent_generator.calls == serial_generator.calls == len(study_programmes) - 1
+    assert serial_generator.peak_in_flight == 1
+    assert concurrent_generator.peak_in_flight == len(study_programmes) // 2
+
+
+@pytest.mark.asyncio
+async def test_rate_limited_generator_limits_concurrency(
+        study_programmes: list[Page[ResTukeStudyProgrammeData]]
+) -> None:
+    question_generator = _HalvingQuestionGenerator()
+    limited_generator = RateLimitedDecisionTreeQuestionGenerator(question_generator, max_concurrency=3)
+
+    await ResTukeQuestionTreeGenerator(limited_generator).generate(study_programmes)
+
+    assert question_generator.peak_in_flight == 3
+
+
+@pytest.mark.asyncio
+async def test_rate_limited_generator_spaces_request_starts(
+        study_programmes: list[Page[ResTukeStudyProgrammeData]]
+) -> None:
+    sleeps: list[float] = []
+
+    async def sleep(seconds: float) -> None:
+        sleeps.append(seconds)
+
+    limited_generator = RateLimitedDecisionTreeQuestionGenerator(
+        _HalvingQuestionGenerator(), requests_per_minute=60, clock=lambda: 100.0, sleep=sleep
+    )
+    await asyncio.gather(*(limited_generator.generate_question(study_programmes[:2]) for _ in range(3)))
+
+    assert sleeps == [1.0, 2.0]
+
+
+@pytest.mark.asyncio
+async def test_unbalanced_splits_are_re_requested(study_programmes: list[Page[ResTukeStudyProgrammeData]]) -> None:
+    generator = ResTukeQuestionTreeGenerator(
+        _UnbalancedFirstQuestionGenerator(first_share=0.0), shape_constraints=TreeShapeConstraints(max_size_ratio=1.5)
+    )
+
+    tree = await generator.generate(study_programmes)
+
+    statistics = DepthQuestionTreeStatisticsCalculator[Page[ResTukeStudyProgrammeData]]().calculate(tree)
+    assert statistics.depth_histogram == {3 + 4: 16}
+    assert statistics.leaf_balance == 1.0
+    assert generator.shape_statistics == ShapeConstraintStatistics(rejected_splits=1 + 2 + 4, unresolved_splits=0)
+
+
+@pytest.mark.asyncio
+async def test_splits_too_deep_for_max_depth_are_re_requested(
+        study_programmes: list[Page[ResTukeStudyProgrammeData]]
+) -> None:
+    generator = ResTukeQuestionTreeGenerator(
+        _UnbalancedFirstQuestionGenerator(first_share=0.625), shape_constraints=TreeShapeConstraints(max_depth=3 + 4)
+    )
+
+    tree = await generator.generate(study_programmes)
+
+    statistics = DepthQuestionTreeStatisticsCalculator[Page[ResTukeStudyProgrammeData]]().calculate(tree)
+    assert statistics.max_depth == 3 + 4
+    assert generator.shape_statistics.unresolved_splits == 0
+
+
+@pytest.mark.asyncio
+async def test_most_balanced_split_is_used_when_attempts_run_out(
+        study_programmes: list[Page[ResTukeStudyProgrammeData]]
+) -> None:
+    generator = ResTukeQuestionTreeGenerator(
+        _UnbalancedFirstQuestionGenerator(first_share=0.0, unbalanced_answers=100),
+        shape_constraints=TreeShapeConstraints(max_size_ratio=1.5),
+        max_split_attempts=2
+    )
+
+    tree = await generator.generate(study_programmes)
+
+    statistics = DepthQuestionTreeStatisticsCalculator[Page[ResTukeStudyProgrammeData]]().calculate(tree)
+    assert statistics.leaves == len(study_programmes)
+    assert statistics.max_depth == 3 + 15
+    assert generator.shape_statistics == ShapeConstraintStatistics(rejected_splits=2 * 14, unresolved_splits=14)
+
+
+@pytest.mark.asyncio
+async def test_resumed_generation_requests_only_missing_questions(
+        tmp_path: Path,
+        study_programmes: list[Page[ResTukeStudyProgrammeData]]
+) -> None:
+    expected_tree = await ResTukeQuestionTreeGenerator(_HalvingQuestionGenerator()).generate(study_programmes)
+    journal = JsonLinesCheckpointJournal(tmp_path / "tree.journal.jsonl")
+    with pytest.raises(ExceptionGroup):
+        await ResTukeQuestionTreeGenerator(
+            _FailingQuestionGenerator(failing_call=10), concurrent_subtrees=True, checkpoint_journal=journal
+        ).generate(study_programmes)
+    journal.close()
+
+    question_generator = _HalvingQuestionGenerator()
+    resumed_journal = JsonLinesCheckpointJournal(tmp_path / "tree.journal.jsonl", resume=True)
+    tree_generator = ResTukeQuestionTreeGenerator(question_generator, checkpoint_journal=resumed_journal)
+    tree = await tree_generator.generate(study_programmes)
+    resumed_journal.close()
+
+    assert tree == expected_tree
+    assert tree_generator.checkpoint_statistics == CheckpointStatistics(
+        restored_splits=len(study_programmes) - 1 - question_generator.calls,
+        recorded_splits=question_generator.calls
+    )
+    assert 0 < question_generator.calls < len(study_programmes) - 1
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("checkpoint_scope, shape_constraints", [
+    ("gpt-4o-mini", TreeShapeConstraints()),
+    ("gpt-4o", TreeShapeConstraints(max_size_ratio=1.5)),
+])
+async def test_journal_of_another_configuration_is_not_reused(
+        tmp_path: Path,
+        study_programmes: list[Page[ResTukeStudyProgrammeData]],
+        checkpoint_scope: str,
+        shape_constraints: TreeShapeConstraints
+) -> None:
+    journal = JsonLinesCheckpointJournal(tmp_path / "tree.journal.jsonl")
+    await ResTukeQuestionTreeGenerator(
+        _HalvingQuestionGenerator(), checkpoint_journal=journal, checkpoint_scope="gpt-4o"
+    ).generate(study_programmes)
+    journal.close()
+
+    resumed_journal = JsonLinesCheckpointJournal(tmp_path / "tree.journal.jsonl", resume=True)
+    tree_generator = ResTukeQuestionTreeGenerator(
+        _HalvingQuestionGenerator(), shape_constraints=shape_constraints, checkpoint_journal=resumed_journal,
+        checkpoint_scope=checkpoint_scope
+    )
+    await tree_generator.generate(study_programmes)
+    resumed_journal.close()
+
+    assert tree_generator.checkpoint_statistics.restored_splits == 0
+
+
+@pytest.mark.asyncio
+async def test_restored_split_violating_shape_constraints_is_regenerated(
+        tmp_path: Path,
+        study_programmes: list[Page[ResTukeStudyProgrammeData]]
+) -> None:
+    shape_constraints = TreeShapeConstraints(max_size_ratio=1.5)
+    journal = JsonLinesCheckpointJournal(tmp_path / "tree.journal.jsonl")
+    unbalanced_question = await _UnbalancedFirstQuestionGenerator(first_share=0.0).generate_question(study_programmes)
+    journal.record(
+        ResTukeQuestionTreeGenerator(_HalvingQuestionGenerator(), shape_constraints=shape_constraints)._subset_key(
+            study_programmes
+        ),
+        unbalanced_question
+    )
+    journal.close()
+
+    resumed_journal = JsonLinesCheckpointJournal(tmp_path / "tree.journal.jsonl", resume=True)
+    question_generator = _HalvingQuestionGenerator()
+    tree_generator = ResTukeQuestionTreeGenerator(
+        question_generator, shape_constraints=shape_constraints, checkpoint_journal=resumed_journal
+    )
+    tree = await tree_generator.generate(study_programmes)
+    resumed_journal.close()
+
+    statistics = DepthQuestionTreeStatisticsCalculator[Page[ResTukeStudyProgrammeData]]().calculate(tree)
+    assert statistics.leaf_balance == 1.0
+    assert question_generator.calls == len(study_programmes) - 1
+    assert tree_generator.checkpoint_statistics.restored_splits == 0
+
+
+def test_group_by_partitions_in_one_pass() -> None:
+    keys: list[int] = []
+
+    def get_key(item: int) -> int:
+        keys.append(item)
+        return item % 3
+
+    groups = group_by([5, 1, 3, 4, 2, 6], get_key)
+
+    assert groups == {2: [5, 2], 1: [1, 4], 0: [3, 6]}
+    assert keys == [5, 1, 3, 4, 2, 6]
+
+
+@pytest.mark.asyncio
+async def test_options_do_not_depend_on_programme_order(
+        study_programmes: list[Page[ResTukeStudyProgrammeData]]
+) -> None:
+    programmes = [
+        programme._replace(data=programme.data._replace(level_of_degree=index % 3 + 1))
+        for index, programme in enumerate(study_programmes)
+    ]
+    tree_generator = ResTukeQuestionTreeGenerator(_HalvingQuestionGenerator())
+
+    tree = await tree_generator.generate(programmes)
+    reversed_tree = await tree_generator.generate(list(reversed(programmes)))
+
+    assert tree == reversed_tree
+    assert isinstance(tree.root, OptionsQuestion)
+    level_question = tree.root.answer_options[0].answer_node
+    assert isinstance(level_question, OptionsQuestion)
+    assert [option.text for option in level_question.answer_options] == ["1", "2", "3"]
+
+
+@pytest.mark.asyncio
+async def test_facets_are_declared_as_data(study_programmes: list[Page[ResTukeStudyProgrammeData]]) -> None:
+    facets = [OptionsFacet("Which half?", lambda programme: programme.metadata.code < "P08")]
+    question_generator = _HalvingQuestionGenerator()
+
+    tree = await ResTukeQuestionTreeGenerator(question_generator, facets=facets).generate(study_programmes)
+
+    assert isinstance(tree.root, OptionsQuestion)
+    assert tree.root.text == "Which half?"
+    assert [option.text for option in tree.root.answer_options] == ["False", "True"]
+    assert question_generator.calls == len(study_programmes) - 2